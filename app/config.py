@@ -0,0 +1,245 @@
+"""
+Service configuration
+
+Settings shared by the API (app.main) and the queue workers (app.worker), read from environment variables.
+
+Configuration (environment variables):
+    - REDIS_HOST / REDIS_PORT: Redis server holding task statuses and results (default: redis:6379).
+    - REDIS_MAX_CONNECTIONS: Size of the API's asyncio Redis connection pool (default: 50).
+    - SPLAT_PATH: Directory containing the SPLAT! binaries (default: /app/splat).
+    - SPLAT_TILE_FETCH_WORKERS: Maximum number of terrain tiles fetched and converted concurrently (default: 4).
+    - SPLAT_TERRAIN_SOURCE: Where terrain tiles are fetched from, "s3", "local" (a mirror directory) or "http",
+      all in the layout of the AWS terrain tiles bucket, or a comma-separated chain of them tried in order, e.g.
+      "local,s3" for a mirror of hot regions in front of the bucket (default: s3).
+    - SPLAT_TERRAIN_MIRROR_COMPLETE: Whether the local or HTTP mirror holds every tile of the bucket, so tiles
+      missing from it are sea level, e.g. in air-gapped environments (default: false). Otherwise a tile missing
+      from the mirror is fetched from the next source of the chain, or is an error if there is none.
+    - SPLAT_TERRAIN_BUCKET / SPLAT_TERRAIN_ENDPOINT_URL: Bucket and endpoint of the S3 terrain source
+      (default: elevation-tiles-prod on AWS, read anonymously).
+    - SPLAT_TERRAIN_DIR: Mirror directory of the local terrain source.
+    - SPLAT_TERRAIN_URL: Base URL of the HTTP terrain source (default: https://elevation-tiles-prod.s3.amazonaws.com).
+    - SPLAT_TERRAIN_POOL_CONNECTIONS: Connection pool size of the S3 or HTTP terrain source, at least the number
+      of tiles fetched concurrently by predictions and pre-warming (default: 16).
+    - SPLAT_TERRAIN_CACHE_DIR: Directory of the cached raw terrain tiles and converted .sdf files (default: .splat_tiles).
+    - SPLAT_TERRAIN_RAW_CACHE_SIZE_GB: Maximum size of the cached raw terrain tiles in GB (default: 1).
+    - SPLAT_TERRAIN_SDF_CACHE_SIZE_GB: Maximum size of the cached (compressed) .sdf files in GB (default: 1).
+    - SPLAT_TERRAIN_MEMORY_CACHE_MB: Maximum size of the .sdf files each SPLAT! process keeps in memory in MB,
+      0 disables the memory tier (default: 0).
+    - SPLAT_SDF_CONVERTER: "numpy" converts terrain tiles in-process, "srtm2sdf" with the SPLAT! utility (default: numpy).
+    - SPLAT_SDF_VALIDATION_RATE: Fraction of in-process tile conversions diffed against srtm2sdf (default: 0).
+    - SPLAT_SDF_STORE_DIR: Directory (e.g. on tmpfs) of materialized .sdf terrain files (default: .splat_sdf).
+    - SPLAT_SDF_STORE_SIZE_GB: Maximum size of the materialized .sdf terrain files in GB (default: 2).
+    - SPLAT_TILE_INDEX_DIR: Directory of the index of terrain tiles present in (or absent from) the bucket
+      (default: .splat_tile_index).
+    - SPLAT_PATH_LOSS_CACHE_DIR: Directory of cached path-loss grids (default: .splat_path_loss).
+    - SPLAT_PATH_LOSS_CACHE_SIZE_GB: Maximum size of the cached path-loss grids in GB, 0 disables them (default: 1).
+    - SPLAT_QUEUE_MODE: "local" runs SPLAT! jobs on an in-process worker pool, "redis" only enqueues them in
+      Redis for separate worker processes started with `python -m app.worker` (default: local).
+    - SPLAT_MAX_WORKERS: Maximum number of concurrent SPLAT! jobs in local mode (default: 2).
+    - SPLAT_MAX_QUEUE: Maximum number of jobs waiting for a worker before /predict returns 503 (default: 16).
+    - SPLAT_WORKER_CONCURRENCY: Number of jobs each queue worker process runs concurrently (default: 1).
+    - SPLAT_RESULT_CACHE_MAX_MB: Maximum size of the cached results in MB, 0 disables the cache (default: 512).
+    - SPLAT_RESULT_CACHE_TTL: Lifetime of a cached result in seconds (default: 86400).
+    - SPLAT_TILE_CACHE_MB: Maximum size of the map tiles cached by each API process in MB (default: 64).
+    - SPLAT_RESULT_STORE: Where result GeoTIFFs and signal levels are stored, "filesystem" or "s3"; Redis only
+      holds pointers to them (default: filesystem).
+    - SPLAT_RESULT_STORE_DIR: Directory of the filesystem result store, a volume shared with the queue workers
+      in redis mode (default: .splat_results).
+    - SPLAT_RESULT_STORE_SIZE_GB: Maximum size of the filesystem result store in GB (default: 4).
+    - SPLAT_RESULT_STORE_BUCKET / SPLAT_RESULT_STORE_PREFIX: Bucket and key prefix of the S3 result store
+      (default prefix: results/).
+    - SPLAT_RESULT_STORE_ENDPOINT_URL: Endpoint of an S3-compatible service such as MinIO (default: AWS).
+    - SPLAT_ADMIN_TOKEN: Bearer token of the /admin endpoints, which are disabled if it is unset.
+    - SPLAT_PREWARM_MAX_TILES: Maximum number of terrain tiles of one /admin/prewarm job (default: 2000).
+    - SPLAT_COMPOSITE_MAX_PIXELS: Maximum size in pixels of the best-server composite of a batch or network, about
+      3 bytes per pixel while it is built; larger batches are rejected when they are submitted, and sites growing a
+      network beyond it are refused (default: 100000000).
+    - SPLAT_NETWORK_TTL: Lifetime of a network (see /networks) in seconds since its last change (default: 86400).
+    - SPLAT_NETWORK_STORE_DIR: Directory of the network mosaics and site copies with the filesystem result store,
+      which are never evicted before they expire (default: .splat_networks).
+    - SPLAT_NETWORK_STORE_PREFIX: Key prefix of the network mosaics and site copies in the bucket of the S3 result
+      store, outside the lifecycle rule of the results (default: networks/).
+"""
+
+import os
+from typing import Optional, Type, Union
+
+import redis
+import redis.asyncio
+
+from app.services.result_cache import ResultCache, ResultCacheBase
+from app.services.result_store import FilesystemResultStore, ResultStore, S3ResultStore
+from app.services.splat import Splat
+from app.services.terrain_source import (
+    ChainedTerrainSource,
+    HttpTerrainSource,
+    LocalTerrainSource,
+    S3TerrainSource,
+    TerrainSource,
+)
+
+REDIS_HOST = os.environ.get("REDIS_HOST", "redis")
+REDIS_PORT = int(os.environ.get("REDIS_PORT", 6379))
+REDIS_MAX_CONNECTIONS = int(os.environ.get("REDIS_MAX_CONNECTIONS", 50))
+
+SPLAT_PATH = os.environ.get("SPLAT_PATH", "/app/splat")
+SPLAT_TILE_FETCH_WORKERS = int(os.environ.get("SPLAT_TILE_FETCH_WORKERS", 4))
+SPLAT_TERRAIN_SOURCE = [source.strip() for source in os.environ.get("SPLAT_TERRAIN_SOURCE", "s3").split(",")]
+if not set(SPLAT_TERRAIN_SOURCE) <= {"s3", "local", "http"}:
+    raise ValueError(
+        f"Unsupported SPLAT_TERRAIN_SOURCE '{','.join(SPLAT_TERRAIN_SOURCE)}', expected 's3', 'local' or 'http', "
+        f"or a comma-separated chain of them."
+    )
+SPLAT_TERRAIN_MIRROR_COMPLETE = os.environ.get("SPLAT_TERRAIN_MIRROR_COMPLETE", "false").lower() in ("1", "true", "yes")
+SPLAT_TERRAIN_BUCKET = os.environ.get("SPLAT_TERRAIN_BUCKET", "elevation-tiles-prod")
+SPLAT_TERRAIN_ENDPOINT_URL = os.environ.get("SPLAT_TERRAIN_ENDPOINT_URL")
+SPLAT_TERRAIN_DIR = os.environ.get("SPLAT_TERRAIN_DIR")
+SPLAT_TERRAIN_URL = os.environ.get("SPLAT_TERRAIN_URL", "https://elevation-tiles-prod.s3.amazonaws.com")
+SPLAT_TERRAIN_POOL_CONNECTIONS = int(os.environ.get("SPLAT_TERRAIN_POOL_CONNECTIONS", 16))
+SPLAT_TERRAIN_CACHE_DIR = os.environ.get("SPLAT_TERRAIN_CACHE_DIR", ".splat_tiles")
+SPLAT_TERRAIN_RAW_CACHE_SIZE_GB = float(os.environ.get("SPLAT_TERRAIN_RAW_CACHE_SIZE_GB", 1))
+SPLAT_TERRAIN_SDF_CACHE_SIZE_GB = float(os.environ.get("SPLAT_TERRAIN_SDF_CACHE_SIZE_GB", 1))
+SPLAT_TERRAIN_MEMORY_CACHE_MB = float(os.environ.get("SPLAT_TERRAIN_MEMORY_CACHE_MB", 0))
+SPLAT_SDF_CONVERTER = os.environ.get("SPLAT_SDF_CONVERTER", "numpy")
+SPLAT_SDF_VALIDATION_RATE = float(os.environ.get("SPLAT_SDF_VALIDATION_RATE", 0))
+SPLAT_SDF_STORE_DIR = os.environ.get("SPLAT_SDF_STORE_DIR", ".splat_sdf")
+SPLAT_SDF_STORE_SIZE_GB = float(os.environ.get("SPLAT_SDF_STORE_SIZE_GB", 2))
+SPLAT_TILE_INDEX_DIR = os.environ.get("SPLAT_TILE_INDEX_DIR", ".splat_tile_index")
+SPLAT_PATH_LOSS_CACHE_DIR = os.environ.get("SPLAT_PATH_LOSS_CACHE_DIR", ".splat_path_loss")
+SPLAT_PATH_LOSS_CACHE_SIZE_GB = float(os.environ.get("SPLAT_PATH_LOSS_CACHE_SIZE_GB", 1))
+
+SPLAT_QUEUE_MODE = os.environ.get("SPLAT_QUEUE_MODE", "local")
+if SPLAT_QUEUE_MODE not in ("local", "redis"):
+    raise ValueError(f"Unsupported SPLAT_QUEUE_MODE '{SPLAT_QUEUE_MODE}', expected 'local' or 'redis'.")
+
+SPLAT_MAX_WORKERS = int(os.environ.get("SPLAT_MAX_WORKERS", 2))
+SPLAT_MAX_QUEUE = int(os.environ.get("SPLAT_MAX_QUEUE", 16))
+SPLAT_WORKER_CONCURRENCY = int(os.environ.get("SPLAT_WORKER_CONCURRENCY", 1))
+
+SPLAT_RESULT_CACHE_MAX_MB = float(os.environ.get("SPLAT_RESULT_CACHE_MAX_MB", 512))
+SPLAT_RESULT_CACHE_TTL = int(os.environ.get("SPLAT_RESULT_CACHE_TTL", 86400))
+
+SPLAT_TILE_CACHE_MB = float(os.environ.get("SPLAT_TILE_CACHE_MB", 64))
+
+SPLAT_RESULT_STORE = os.environ.get("SPLAT_RESULT_STORE", "filesystem")
+if SPLAT_RESULT_STORE not in ("filesystem", "s3"):
+    raise ValueError(f"Unsupported SPLAT_RESULT_STORE '{SPLAT_RESULT_STORE}', expected 'filesystem' or 's3'.")
+
+SPLAT_RESULT_STORE_DIR = os.environ.get("SPLAT_RESULT_STORE_DIR", ".splat_results")
+SPLAT_RESULT_STORE_SIZE_GB = float(os.environ.get("SPLAT_RESULT_STORE_SIZE_GB", 4))
+SPLAT_RESULT_STORE_BUCKET = os.environ.get("SPLAT_RESULT_STORE_BUCKET")
+SPLAT_RESULT_STORE_PREFIX = os.environ.get("SPLAT_RESULT_STORE_PREFIX", "results/")
+SPLAT_RESULT_STORE_ENDPOINT_URL = os.environ.get("SPLAT_RESULT_STORE_ENDPOINT_URL")
+
+SPLAT_ADMIN_TOKEN = os.environ.get("SPLAT_ADMIN_TOKEN")
+SPLAT_PREWARM_MAX_TILES = int(os.environ.get("SPLAT_PREWARM_MAX_TILES", 2000))
+
+SPLAT_COMPOSITE_MAX_PIXELS = int(os.environ.get("SPLAT_COMPOSITE_MAX_PIXELS", 100_000_000))
+
+SPLAT_NETWORK_TTL = int(os.environ.get("SPLAT_NETWORK_TTL", 86400))
+SPLAT_NETWORK_STORE_DIR = os.environ.get("SPLAT_NETWORK_STORE_DIR", ".splat_networks")
+SPLAT_NETWORK_STORE_PREFIX = os.environ.get("SPLAT_NETWORK_STORE_PREFIX", "networks/")
+
+
+def create_redis_client() -> redis.StrictRedis:
+    """Redis client for binary data."""
+    return redis.StrictRedis(host=REDIS_HOST, port=REDIS_PORT, decode_responses=False)
+
+
+def create_async_redis_client() -> redis.asyncio.Redis:
+    """asyncio Redis client for binary data, with a pool of at most REDIS_MAX_CONNECTIONS connections."""
+    pool = redis.asyncio.ConnectionPool(
+        host=REDIS_HOST, port=REDIS_PORT, max_connections=REDIS_MAX_CONNECTIONS, decode_responses=False
+    )
+    return redis.asyncio.Redis(connection_pool=pool)
+
+
+def create_terrain_source() -> TerrainSource:
+    """Terrain source configured from the environment, chaining the sources if there are several."""
+    sources = []
+    for source in SPLAT_TERRAIN_SOURCE:
+        if source == "local":
+            if not SPLAT_TERRAIN_DIR:
+                raise ValueError("SPLAT_TERRAIN_DIR is required with SPLAT_TERRAIN_SOURCE=local.")
+            sources.append(LocalTerrainSource(SPLAT_TERRAIN_DIR, authoritative=SPLAT_TERRAIN_MIRROR_COMPLETE))
+        elif source == "http":
+            sources.append(
+                HttpTerrainSource(
+                    SPLAT_TERRAIN_URL,
+                    max_pool_connections=SPLAT_TERRAIN_POOL_CONNECTIONS,
+                    authoritative=SPLAT_TERRAIN_MIRROR_COMPLETE,
+                )
+            )
+        else:
+            sources.append(
+                S3TerrainSource(
+                    SPLAT_TERRAIN_BUCKET,
+                    endpoint_url=SPLAT_TERRAIN_ENDPOINT_URL,
+                    max_pool_connections=SPLAT_TERRAIN_POOL_CONNECTIONS,
+                )
+            )
+
+    return sources[0] if len(sources) == 1 else ChainedTerrainSource(sources)
+
+
+def create_splat_service() -> Splat:
+    """SPLAT! service configured from the environment."""
+    return Splat(
+        splat_path=SPLAT_PATH,
+        terrain_source=create_terrain_source(),
+        cache_dir=SPLAT_TERRAIN_CACHE_DIR,
+        cache_size_gb=SPLAT_TERRAIN_RAW_CACHE_SIZE_GB,
+        sdf_cache_size_gb=SPLAT_TERRAIN_SDF_CACHE_SIZE_GB,
+        sdf_memory_cache_mb=SPLAT_TERRAIN_MEMORY_CACHE_MB,
+        tile_fetch_workers=SPLAT_TILE_FETCH_WORKERS,
+        sdf_converter=SPLAT_SDF_CONVERTER,
+        sdf_validation_rate=SPLAT_SDF_VALIDATION_RATE,
+        sdf_store_dir=SPLAT_SDF_STORE_DIR,
+        sdf_store_size_gb=SPLAT_SDF_STORE_SIZE_GB,
+        path_loss_cache_dir=SPLAT_PATH_LOSS_CACHE_DIR,
+        path_loss_cache_size_gb=SPLAT_PATH_LOSS_CACHE_SIZE_GB,
+        tile_index_dir=SPLAT_TILE_INDEX_DIR,
+    )
+
+
+def create_result_store() -> ResultStore:
+    """Result store configured from the environment."""
+    if SPLAT_RESULT_STORE == "s3":
+        if not SPLAT_RESULT_STORE_BUCKET:
+            raise ValueError("SPLAT_RESULT_STORE_BUCKET is required with SPLAT_RESULT_STORE=s3.")
+        return S3ResultStore(
+            SPLAT_RESULT_STORE_BUCKET,
+            prefix=SPLAT_RESULT_STORE_PREFIX,
+            endpoint_url=SPLAT_RESULT_STORE_ENDPOINT_URL,
+        )
+
+    return FilesystemResultStore(SPLAT_RESULT_STORE_DIR, size_limit_gb=SPLAT_RESULT_STORE_SIZE_GB)
+
+
+def create_network_store() -> ResultStore:
+    """Store of the network mosaics and site copies configured from the environment, never evicting them."""
+    if SPLAT_RESULT_STORE == "s3":
+        return S3ResultStore(
+            SPLAT_RESULT_STORE_BUCKET,
+            prefix=SPLAT_NETWORK_STORE_PREFIX,
+            endpoint_url=SPLAT_RESULT_STORE_ENDPOINT_URL,
+        )
+
+    return FilesystemResultStore(SPLAT_NETWORK_STORE_DIR, size_limit_gb=None)
+
+
+def create_result_cache(
+    redis_client: Union[redis.StrictRedis, redis.asyncio.Redis],
+    result_store: ResultStore,
+    cache_class: Type[ResultCacheBase] = ResultCache,
+) -> Optional[ResultCacheBase]:
+    """Result cache configured from the environment, or None if it is disabled."""
+    if SPLAT_RESULT_CACHE_MAX_MB <= 0:
+        return None
+
+    return cache_class(
+        redis_client,
+        result_store=result_store,
+        max_bytes=int(SPLAT_RESULT_CACHE_MAX_MB * 1024 * 1024),
+        ttl=SPLAT_RESULT_CACHE_TTL,
+    )
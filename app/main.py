@@ -6,33 +6,113 @@ using the ITM (Irregular Terrain Model) via SPLAT! (https://github.com/jmcmellen
 
 Endpoints:
     - /predict: Accepts a signal coverage prediction request and starts a background task.
-    - /status/{task_id}: Retrieves the status of a given prediction task.
+    - /predict/batch: Accepts several transmitters with shared settings and starts a task for each.
+    - /batch/{batch_id}: Retrieves the status of a batch and of its tasks.
+    - /batch/{batch_id}/composite: Retrieves the best-server composite of a completed batch (GeoTIFF file).
+    - /networks: Creates a network of completed predictions with a running best-server composite.
+    - /networks/{network_id}: Retrieves a network, or deletes a site from it (/networks/{network_id}/sites/{slot}).
+    - /networks/{network_id}/sites: Adds a completed prediction to a network.
+    - /networks/{network_id}/composite: Retrieves the best-server composite of a network (GeoTIFF file).
+    - /status/{task_id}: Retrieves the status of a given prediction task, optionally waiting for it to finish.
+    - /status/{task_id}/events: Streams the progress of a given prediction task as Server-Sent Events.
     - /result/{task_id}: Retrieves the result (GeoTIFF file) of a given prediction task.
+    - /render/{task_id}: Re-renders a completed prediction with another colormap and dBm range.
+    - /tiles/{task_id}/{z}/{x}/{y}.png: Serves a completed prediction as Web Mercator map tiles (also .webp).
+    - /queue: Reports the load on the SPLAT! worker pool or Redis job queue.
+    - /cache: Reports the result cache and terrain cache usage and hit/miss counters.
+    - /admin/prewarm: Pre-warms the terrain cache for a region, sites or past requests (token-gated), and
+      reports the progress of a pre-warming job (/admin/prewarm/{job_id}).
+
+Configuration is read from environment variables, see app.config.
 """
 
-import redis
-from fastapi import FastAPI, BackgroundTasks
-from fastapi.responses import JSONResponse, StreamingResponse
+from contextlib import asynccontextmanager
+from typing import List, Literal, Optional, Tuple
+from fastapi import BackgroundTasks, FastAPI, Header, Query
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+from redis.exceptions import LockError
+from starlette.concurrency import run_in_threadpool
 from uuid import uuid4
+from app import config
+from app.services.coalesce import AsyncJobCoalescer, JobCoalescer
+from app.services.downloads import REVALIDATE_CACHE_CONTROL, etag_matches, file_response
+from app.services.job_queue import AsyncRedisJobQueue
+from app.services.mosaic import estimate_composite_pixels, render_composite
+from app.services.networks import NetworkRegistry
+from app.services.prewarm import prewarm, sites_from_request_log, tiles_for_sites, tiles_in_bbox
+from app.services.result_cache import AsyncResultCache, request_digest
+from app.services.result_store import StoredResult
 from app.services.splat import Splat
-from app.models.CoveragePredictionRequest import CoveragePredictionRequest
+from app.services.task_events import TERMINAL_STATUSES, TaskEventBroker, publish_task_event
+from app.services.tasks import run_splat
+from app.services.tiles import TileRenderer
+from app.services.worker_pool import SplatWorkerPool, QueueFullError
+from app.models.BatchPredictionRequest import BatchPredictionRequest
+from app.models.CoveragePredictionRequest import AVAILABLE_COLORMAPS, CoveragePredictionRequest
+from app.models.NetworkRequest import NetworkRequest, NetworkSiteRequest
+from app.models.PrewarmRequest import PrewarmRequest
+import asyncio
+import hashlib
+import hmac
+import json
 import logging
-import io
-# import os
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Initialize Redis client for binary data
-redis_client = redis.StrictRedis(host="redis", port=6379, decode_responses=False)
+# Initialize the pooled asyncio Redis client used by the endpoints
+async_redis_client = config.create_async_redis_client()
+
+# Result GeoTIFFs and signal levels live in the result store, Redis only holds pointers to them
+result_store = config.create_result_store()
+
+async_result_cache = config.create_result_cache(async_redis_client, result_store, cache_class=AsyncResultCache)
+async_coalescer = AsyncJobCoalescer(async_redis_client)
+
+# Progress and completion events of the tasks, pushed to clients waiting on /status
+task_events = TaskEventBroker(async_redis_client)
+
+if config.SPLAT_QUEUE_MODE == "local":
+    # Initialize SPLAT service and the bounded pool that owns SPLAT! executions. The jobs run in
+    # threads, so they store their results with a synchronous Redis client.
+    redis_client = config.create_redis_client()
+    result_cache = config.create_result_cache(redis_client, result_store)
+    coalescer = JobCoalescer(redis_client)
+    splat_service = config.create_splat_service()
+    worker_pool = SplatWorkerPool(
+        max_workers=config.SPLAT_MAX_WORKERS,
+        max_queue=config.SPLAT_MAX_QUEUE,
+    )
+    job_queue = None
+else:
+    # SPLAT! runs in separate `python -m app.worker` processes
+    splat_service = None
+    worker_pool = None
+    job_queue = AsyncRedisJobQueue(async_redis_client, max_queue=config.SPLAT_MAX_QUEUE)
+
+# Networks of completed predictions and their composites
+networks = NetworkRegistry(
+    async_redis_client, result_store, config.create_network_store(), ttl=config.SPLAT_NETWORK_TTL,
+    max_pixels=config.SPLAT_COMPOSITE_MAX_PIXELS,
+)
+
+# Map tiles cut from completed predictions, cached per API process
+tile_renderer = TileRenderer(cache_bytes=int(config.SPLAT_TILE_CACHE_MB * 1024 * 1024))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    if worker_pool is not None:
+        worker_pool.shutdown(wait=False)
+    await task_events.close()
+    await async_redis_client.aclose()
 
-# Initialize SPLAT service
-splat_service = Splat(splat_path="/app/splat")
 
 # Initialize FastAPI app
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # Add CORS middleware to allow requests from your frontend
 app.add_middleware(
@@ -43,121 +123,926 @@ app.add_middleware(
     allow_headers=["*"],  # Allow all headers
 )
 
-def run_splat(task_id: str, request: CoveragePredictionRequest):
+@app.post("/predict")
+async def predict(payload: CoveragePredictionRequest) -> JSONResponse:
+    """
+    Predict signal coverage using SPLAT!.
+    Accepts a CoveragePredictionRequest and processes it on the SPLAT! worker pool or Redis job queue.
+
+    - Returns the completed task of an identical earlier request if it is in the result cache.
+    - Otherwise generates a unique task ID.
+    - Sets the initial task status to "processing" in Redis.
+    - Returns the running task of an identical request instead, if there is one.
+    - Submits the `run_splat` function to the worker pool, or enqueues the request for the queue workers.
+    - Returns a 503 error if the queue is full.
+
+    Args:
+        payload (CoveragePredictionRequest): The parameters required for the SPLAT! coverage prediction.
+
+    Returns:
+        JSONResponse: A response containing the unique task ID to track the prediction progress.
+    """
+    digest = request_digest(payload)
+    task_id, existing = await claim_prediction(payload, digest)
+    if existing is not None:
+        return JSONResponse({"task_id": task_id, existing: True})
+
+    try:
+        await submit_prediction(task_id, payload)
+    except QueueFullError as e:
+        logger.warning(f"Rejected task {task_id}: {e}")
+        await async_redis_client.delete(f"{task_id}:status")
+        await async_coalescer.release(digest, task_id)
+        return JSONResponse(
+            {"error": "Server is busy, please try again later."},
+            status_code=503,
+            headers={"Retry-After": "10"},
+        )
+    return JSONResponse({"task_id": task_id})
+
+async def claim_prediction(payload: CoveragePredictionRequest, digest: str) -> Tuple[str, Optional[str]]:
     """
-    Execute the SPLAT! coverage prediction and store the resulting GeoTIFF data in Redis.
+    Find the task answering a coverage prediction request, or create a new one.
 
     Args:
-        task_id (str): UUID identifier for the task.
-        request (CoveragePredictionRequest): The parameters for the SPLAT! prediction.
+        payload (CoveragePredictionRequest): The coverage prediction request.
+        digest (str): The request digest (see `request_digest`).
+
+    Returns:
+        Tuple[str, Optional[str]]: The task ID, and "cached" or "coalesced" for the completed or running task
+            of an identical request, or None for a new "processing" task to pass to `submit_prediction`.
+    """
+    if async_result_cache is not None:
+        cached_task_id = await async_result_cache.get(digest)
+        if cached_task_id is not None:
+            return cached_task_id, "cached"
+
+    task_id = str(uuid4())
+    await async_redis_client.setex(f"{task_id}:status", 3600, "processing")
 
-    Workflow:
-        - Runs the SPLAT! coverage prediction.
-        - Stores the resulting GeoTIFF data and the task status ("completed") in Redis.
-        - On failure, stores the task status as "failed" and logs the error in Redis.
+    if job_queue is None:
+        # the job lives in this process, whose heartbeat keeps the claim alive (see `JobCoalescer.keep_alive`)
+        running_task_id = await async_coalescer.claim(digest, task_id, ttl=coalescer.heartbeat_ttl)
+    else:
+        running_task_id = await async_coalescer.claim(digest, task_id)
+    if running_task_id is not None:
+        await async_redis_client.delete(f"{task_id}:status")
+        return running_task_id, "coalesced"
+
+    if job_queue is None:
+        coalescer.keep_alive(digest, task_id)
+    return task_id, None
+
+async def submit_prediction(task_id: str, payload: CoveragePredictionRequest) -> None:
+    """
+    Run a new task on the SPLAT! worker pool, or enqueue it for the queue workers.
 
     Raises:
-        Exception: If SPLAT! fails during execution.
+        QueueFullError: If the queue is full.
+    """
+    if job_queue is not None:
+        await job_queue.enqueue(task_id, payload)
+    else:
+        worker_pool.submit(
+            run_splat, splat_service, redis_client, result_store, task_id, payload, result_cache, coalescer
+        )
+
+async def fail_prediction(task_id: str, digest: str, error: str) -> None:
+    """Mark a new task that could not be run as "failed" and release its claim."""
+    async with async_redis_client.pipeline(transaction=True) as pipe:
+        pipe.setex(f"{task_id}:error", 3600, error)
+        pipe.setex(f"{task_id}:status", 3600, "failed")
+        publish_task_event(async_redis_client, task_id, "failed", details={"error": error}, pipe=pipe)
+        await pipe.execute()
+    await async_coalescer.release(digest, task_id)
+
+@app.post("/predict/batch")
+async def predict_batch(payload: BatchPredictionRequest, background_tasks: BackgroundTasks) -> JSONResponse:
+    """
+    Predict the signal coverage of several transmitters sharing their environment and model settings.
+
+    - Starts a task per transmitter like /predict, reusing cached and running tasks of identical requests.
+    - The union of the transmitters' terrain tiles is prepared once, so tiles shared by nearby transmitters are
+      fetched and converted once: in local mode by a job on the worker pool before the tasks are submitted, in
+      redis mode by a job enqueued ahead of the tasks.
+    - The per-transmitter results are served by /result, the best-server composite by /batch/{batch_id}/composite.
+    - Returns a 422 error if the composite of the transmitters would exceed SPLAT_COMPOSITE_MAX_PIXELS, and a
+      503 error if the queue cannot take all the tasks and the terrain job.
+
+    Args:
+        payload (BatchPredictionRequest): The transmitters and their shared settings.
+        background_tasks (BackgroundTasks): Runs the terrain preparation and submission after responding.
+
+    Returns:
+        JSONResponse: The batch ID and the task ID of each transmitter.
     """
+    requests = payload.site_requests()
+    composite_pixels = estimate_composite_pixels(requests)
+    if composite_pixels > config.SPLAT_COMPOSITE_MAX_PIXELS:
+        return JSONResponse(
+            {
+                "error": f"The composite of the transmitters would have about {composite_pixels} pixels, more than "
+                f"the limit of {config.SPLAT_COMPOSITE_MAX_PIXELS}; split the batch by region."
+            },
+            status_code=422,
+        )
+
+    # one more slot for the job preparing the terrain
+    if job_queue is not None:
+        available = job_queue.max_queue - await job_queue.depth() if job_queue.max_queue else len(requests) + 1
+    else:
+        available = worker_pool.available
+    if len(requests) + 1 > available:
+        logger.warning(f"Rejected batch of {len(requests)} tasks, {available} queue slots available.")
+        return JSONResponse(
+            {"error": "Server is busy, please try again later."},
+            status_code=503,
+            headers={"Retry-After": "10"},
+        )
+
+    batch_id = str(uuid4())
+    sites = []
+    new_tasks = []
+    for transmitter, request in zip(payload.transmitters, requests):
+        digest = request_digest(request)
+        task_id, existing = await claim_prediction(request, digest)
+        sites.append({"name": transmitter.name, "task_id": task_id})
+        if existing is None:
+            new_tasks.append((task_id, request, digest))
+
+    output = requests[0].model_dump(
+        include={"colormap", "min_dbm", "max_dbm", "output_profile", "compression", "predictor"}
+    )
+    await async_redis_client.setex(f"{batch_id}:batch", 3600, json.dumps({"sites": sites, "output": output}))
+    background_tasks.add_task(run_batch, batch_id, new_tasks)
+
+    return JSONResponse({"batch_id": batch_id, "sites": sites})
+
+async def run_batch(batch_id: str, new_tasks: List[Tuple[str, CoveragePredictionRequest, str]]) -> None:
+    """Prepare the terrain of the new tasks of a batch once, then submit them."""
+    if not new_tasks:
+        return
+
+    requests = [request for _, request, _ in new_tasks]
     try:
-        logger.info(f"Starting SPLAT! coverage prediction for task {task_id}.")
-        geotiff_data = splat_service.coverage_prediction(request)
-
-        # Log before storing in Redis
-        logger.info(f"Storing result in Redis for task {task_id}")
-        redis_client.setex(task_id, 3600, geotiff_data)
-        redis_client.setex(f"{task_id}:status", 3600, "completed")
-        logger.info(f"Task {task_id} marked as completed.")
-    except Exception as e:
-        logger.error(f"Error in SPLAT! task {task_id}: {e}")
-        redis_client.setex(f"{task_id}:status", 3600, "failed")
-        redis_client.setex(f"{task_id}:error", 3600, str(e))
-        raise
+        if job_queue is not None:
+            await job_queue.enqueue_terrain(batch_id, requests)
+        else:
+            await asyncio.wrap_future(worker_pool.submit(splat_service.prepare_terrain, requests))
+    except QueueFullError as e:
+        # each task still prepares its own terrain
+        logger.warning(f"Rejected the terrain job of batch {batch_id}: {e}")
+    except RuntimeError as e:
+        logger.error(f"Batch {batch_id} failed: {e}")
+        for task_id, _, digest in new_tasks:
+            await fail_prediction(task_id, digest, str(e))
+        return
 
-@app.post("/predict")
-async def predict(payload: CoveragePredictionRequest, background_tasks: BackgroundTasks) -> JSONResponse:
+    for task_id, request, digest in new_tasks:
+        try:
+            await submit_prediction(task_id, request)
+        except QueueFullError as e:
+            logger.warning(f"Rejected task {task_id} of batch {batch_id}: {e}")
+            await fail_prediction(task_id, digest, "Server is busy, please try again later.")
+
+async def batch_state(batch_id: str) -> Tuple[Optional[dict], Optional[str], List[str]]:
     """
-    Predict signal coverage using SPLAT!.
-    Accepts a CoveragePredictionRequest and processes it in the background.
+    Read a batch and the status of its tasks from Redis.
 
-    - Generates a unique task ID.
-    - Sets the initial task status to "processing" in Redis.
-    - Adds the `run_splat` function to the background task queue.
+    Args:
+        batch_id (str): The unique identifier for the batch.
+
+    Returns:
+        Tuple[Optional[dict], Optional[str], List[str]]: The batch (None if it is not found), its status
+            ("processing" while any task is, then "completed", "partial" if some tasks failed or expired,
+            or "failed" if none completed) and the status of each task.
+    """
+    batch = await async_redis_client.get(f"{batch_id}:batch")
+    if not batch:
+        return None, None, []
+
+    batch = json.loads(batch)
+    async with async_redis_client.pipeline(transaction=False) as pipe:
+        for site in batch["sites"]:
+            pipe.get(f"{site['task_id']}:status")
+        statuses = [status.decode("utf-8") if status else "expired" for status in await pipe.execute()]
+
+    if "processing" in statuses:
+        status = "processing"
+    elif all(status == "completed" for status in statuses):
+        status = "completed"
+    elif "completed" in statuses:
+        status = "partial"
+    else:
+        status = "failed"
+    return batch, status, statuses
+
+@app.get("/batch/{batch_id}")
+async def get_batch(batch_id: str):
+    """
+    Retrieve the status of a batch and of each of its tasks.
 
     Args:
-        payload (CoveragePredictionRequest): The parameters required for the SPLAT! coverage prediction.
-        background_tasks (BackgroundTasks): FastAPI background tasks.
+        batch_id (str): The unique identifier for the batch.
 
     Returns:
-        JSONResponse: A response containing the unique task ID to track the prediction progress.
+        JSONResponse: The batch status and the name, task ID and status of each transmitter, or an error
+            message if the batch is not found.
     """
-    task_id = str(uuid4())
-    redis_client.setex(f"{task_id}:status", 3600, "processing")
-    background_tasks.add_task(run_splat, task_id, payload)
-    return JSONResponse({"task_id": task_id})
+    batch, status, statuses = await batch_state(batch_id)
+    if batch is None:
+        logger.warning(f"Batch {batch_id} not found in Redis.")
+        return JSONResponse({"error": "Batch not found"}, status_code=404)
+
+    sites = [{**site, "status": site_status} for site, site_status in zip(batch["sites"], statuses)]
+    return JSONResponse({"batch_id": batch_id, "status": status, "sites": sites})
+
+@app.get("/batch/{batch_id}/composite")
+async def get_batch_composite(
+    batch_id: str,
+    layer: Literal["coverage", "signal", "best_server"] = Query("coverage"),
+    if_none_match: Optional[str] = Header(None),
+    range_header: Optional[str] = Header(None, alias="Range"),
+    if_range: Optional[str] = Header(None),
+):
+    """
+    Retrieve the best-server composite of a finished batch: the strongest signal of any transmitter.
+
+    - The composite is built once from the signal levels of the completed tasks, on a grid covering all of
+      them at their finest resolution, and kept in the result store as long as the batch. Concurrent requests
+      wait for the first one to build it, and get a 503 error if that takes longer than a minute.
+    - Returns a 422 error if the composite would exceed SPLAT_COMPOSITE_MAX_PIXELS.
+    - The "coverage" layer is a palette GeoTIFF like /result, "signal" the int16 signal levels in dBm and
+      "best_server" the uint8 index of the strongest transmitter in the batch (255 without coverage).
+    - Returns the batch status if a task is still processing, and supports conditional and byte range
+      requests like /result.
+
+    Args:
+        batch_id (str): The unique identifier for the batch.
+        layer (str): The composite layer, "coverage", "signal" or "best_server". Defaults to "coverage".
+        if_none_match (Optional[str]): ETags of the layer the client already has.
+        range_header (Optional[str]): Byte range of the layer to send.
+        if_range (Optional[str]): ETag the byte range is conditional on.
+
+    Returns:
+        JSONResponse: Batch status if it is still "processing" or "failed," or an error message.
+        Response: The GeoTIFF file or a byte range of it, or 304.
+    """
+    batch, status, statuses = await batch_state(batch_id)
+    if batch is None:
+        logger.warning(f"Batch {batch_id} not found in Redis.")
+        return JSONResponse({"error": "Batch not found"}, status_code=404)
+    elif status in ("processing", "failed"):
+        return JSONResponse({"status": status})
+
+    layer_key = f"{batch_id}:composite:{layer}"
+    result = await open_composite_layer(layer_key)
+    if result is None:
+        try:
+            # single-flight: concurrent requests wait for the first one to build the composite
+            async with async_redis_client.lock(f"{batch_id}:composite:lock", timeout=300, blocking_timeout=60):
+                result = await open_composite_layer(layer_key)
+                if result is None:
+                    error = await build_batch_composite(batch_id, batch, statuses)
+                    if error is not None:
+                        return error
+                    result = await open_composite_layer(layer_key)
+        except LockError:
+            # raised on release too, once the lock expired under a slow build
+            if result is None:
+                return JSONResponse({"error": "Composite is being built, try again later"}, status_code=503)
+
+        if result is None:
+            return JSONResponse({"error": "Composite expired"}, status_code=410)
+
+    return file_response(result, "image/tiff", f"{batch_id}-{layer}.tif", if_none_match, range_header, if_range)
+
+async def open_composite_layer(layer_key: str) -> Optional[StoredResult]:
+    """Open a layer of a batch composite in the result store, or return None if it was not built or has expired."""
+    pointer = await async_redis_client.get(layer_key)
+    return await run_in_threadpool(result_store.open, pointer.decode("utf-8")) if pointer else None
+
+async def build_batch_composite(batch_id: str, batch: dict, statuses: List[str]) -> Optional[JSONResponse]:
+    """
+    Build the composite layers of a batch from the signal levels of its completed tasks, and store them for as
+    long as the batch lives.
+
+    Returns:
+        Optional[JSONResponse]: An error response if the composite cannot be built, otherwise None.
+    """
+    async with async_redis_client.pipeline(transaction=False) as pipe:
+        for site in batch["sites"]:
+            pipe.get(f"{site['task_id']}:signal")
+        pipe.ttl(f"{batch_id}:batch")
+        *signal_keys, ttl = await pipe.execute()
+
+    signal_geotiffs = [
+        await run_in_threadpool(result_store.get, signal_key.decode("utf-8"))
+        if signal_key and site_status == "completed" else None
+        for signal_key, site_status in zip(signal_keys, statuses)
+    ]
+    if not any(signal_geotiffs):
+        return JSONResponse({"error": "No signal levels found"}, status_code=404)
+
+    output = batch["output"]
+    try:
+        layers = await run_in_threadpool(
+            render_composite, signal_geotiffs, output["colormap"], output["min_dbm"], output["max_dbm"],
+            output["output_profile"], output["compression"], output["predictor"], config.SPLAT_COMPOSITE_MAX_PIXELS,
+        )
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=422)
+
+    ttl = ttl if ttl > 0 else 3600
+    for name, data in layers.items():
+        await run_in_threadpool(result_store.put, f"{batch_id}:composite:{name}", data, ttl)
+    async with async_redis_client.pipeline(transaction=False) as pipe:
+        for name in layers:
+            pipe.setex(f"{batch_id}:composite:{name}", ttl, f"{batch_id}:composite:{name}")
+        await pipe.execute()
+    logger.info(f"Built the composite of batch {batch_id} from {sum(1 for g in signal_geotiffs if g)} tasks.")
+    return None
+
+async def task_state(task_id: str) -> Tuple[Optional[str], dict]:
+    """
+    Read the status of a task and its latest event from Redis in one round trip.
+
+    Args:
+        task_id (str): The unique identifier for the task.
+
+    Returns:
+        Tuple[Optional[str], dict]: The task status, or None if the task is not found, and the latest event
+            (with the stage of a processing task, see `task_event`).
+    """
+    async with async_redis_client.pipeline(transaction=False) as pipe:
+        pipe.get(f"{task_id}:status")
+        pipe.get(f"{task_id}:progress")
+        status, progress = await pipe.execute()
+
+    if not status:
+        return None, {}
+
+    status = status.decode("utf-8")
+    event = json.loads(progress) if progress else {}
+    if event.get("status") != status:
+        event = {"task_id": task_id, "status": status}
+    return status, event
 
 @app.get("/status/{task_id}")
-async def get_status(task_id: str):
+async def get_status(task_id: str, wait: float = Query(0, ge=0, le=60)):
     """
     Retrieve the status of a given SPLAT! task.
 
     - Checks Redis for the task status.
-    - Returns "processing", "completed", or "failed" based on the status.
+    - Returns "processing", "completed", or "failed" based on the status, and the stage of a processing task.
+    - With `wait`, holds the request until the task finishes or `wait` seconds have passed (long polling).
+      Completion is pushed through Redis pub/sub, so waiting costs no Redis round trips, unless the
+      subscription is down, in which case the status is read from Redis every second.
     - Returns a 404 error if the task ID is not found.
 
     Args:
         task_id (str): The unique identifier for the task.
+        wait (float): Maximum number of seconds to wait for a processing task to finish. Defaults to 0.
 
     Returns:
         JSONResponse: The task status or an error message if the task is not found.
     """
-    status = redis_client.get(f"{task_id}:status")
+    status, event = await task_state(task_id)
+    if status is not None and wait > 0 and status not in TERMINAL_STATUSES:
+        deadline = asyncio.get_running_loop().time() + wait
+        async with task_events.subscribe(task_id, timeout=task_events.wait_interval(wait)) as events:
+            # read the status again now that events are received
+            status, event = await task_state(task_id)
+
+            while status is not None and status not in TERMINAL_STATUSES:
+                remaining = deadline - asyncio.get_running_loop().time()
+                if remaining <= 0:
+                    break
+                try:
+                    event = await asyncio.wait_for(events.get(), task_events.wait_interval(remaining))
+                    status = event["status"]
+                except asyncio.TimeoutError:
+                    # without an active subscription, events can be missed
+                    status, event = await task_state(task_id)
+
+    if not status:
+        logger.warning(f"Task {task_id} not found in Redis.")
+        return JSONResponse({"error": "Task not found"}, status_code=404)
+
+    response = {"task_id": task_id, "status": status}
+    if status == "processing" and "stage" in event:
+        response["progress"] = {key: value for key, value in event.items() if key not in response}
+    return JSONResponse(response)
+
+@app.get("/status/{task_id}/events")
+async def get_status_events(task_id: str):
+    """
+    Stream the progress of a given SPLAT! task as Server-Sent Events, until it completes or fails.
+
+    - The first event is the current state of the task, so clients can connect at any time.
+    - Events are named after the task status ("processing", "completed" or "failed") and carry the JSON
+      encoded task event, e.g. `{"task_id": ..., "status": "processing", "stage": "splat_running"}`.
+    - A comment is sent every 15 seconds without events to keep proxies from closing the connection.
+    - Returns a 404 error if the task ID is not found.
+
+    Args:
+        task_id (str): The unique identifier for the task.
+
+    Returns:
+        StreamingResponse: The `text/event-stream` of the task events.
+        JSONResponse: An error message if the task is not found.
+    """
+    status, _ = await task_state(task_id)
     if not status:
         logger.warning(f"Task {task_id} not found in Redis.")
         return JSONResponse({"error": "Task not found"}, status_code=404)
 
-    return JSONResponse({"task_id": task_id, "status": status.decode("utf-8")})
+    def server_sent_event(event: dict) -> str:
+        return f"event: {event['status']}\ndata: {json.dumps(event)}\n\n"
+
+    async def stream():
+        async with task_events.subscribe(task_id, timeout=task_events.wait_interval(15)) as events:
+            status, event = await task_state(task_id)
+            if status is None:
+                yield server_sent_event({"task_id": task_id, "status": "failed", "error": "Task expired"})
+                return
+
+            yield server_sent_event(event)
+            while status not in TERMINAL_STATUSES:
+                try:
+                    event = await asyncio.wait_for(events.get(), task_events.wait_interval(15))
+                except asyncio.TimeoutError:
+                    # also catches events missed while the subscription was down, and a task whose worker
+                    # died without publishing its final event
+                    previous = event
+                    status, event = await task_state(task_id)
+                    if status is None:
+                        yield server_sent_event({"task_id": task_id, "status": "failed", "error": "Task expired"})
+                        return
+                    yield server_sent_event(event) if event != previous else ": keepalive\n\n"
+                    continue
+
+                status = event["status"]
+                yield server_sent_event(event)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 @app.get("/result/{task_id}")
-async def get_result(task_id: str):
+async def get_result(
+    task_id: str,
+    if_none_match: Optional[str] = Header(None),
+    range_header: Optional[str] = Header(None, alias="Range"),
+    if_range: Optional[str] = Header(None),
+):
     """
     Retrieve SPLAT! task status or GeoTIFF result.
 
-    - Checks the task status in Redis.
-    - If "completed," retrieves the GeoTIFF data and serves it as a downloadable file.
+    - Fetches the task status and result pointer from Redis in one round trip.
+    - If "completed," streams the GeoTIFF data from the result store as a downloadable file, with a
+      content ETag, immutable caching and byte ranges (see `file_response`).
     - If "failed," returns the error message stored in Redis.
     - If "processing", indicate the same in the response.
 
     Args:
         task_id (str): The unique identifier for the task.
+        if_none_match (Optional[str]): ETags of the result the client already has.
+        range_header (Optional[str]): Byte range of the result to send.
+        if_range (Optional[str]): ETag the byte range is conditional on.
 
     Returns:
         JSONResponse: Task status if the task is still "processing" or "failed."
-        StreamingResponse: A downloadable GeoTIFF file if the task is "completed."
+        Response: The GeoTIFF file or a byte range of it if the task is "completed," or 304.
     """
-    status = redis_client.get(f"{task_id}:status")
+    async with async_redis_client.pipeline(transaction=False) as pipe:
+        pipe.get(f"{task_id}:status")
+        pipe.get(task_id)
+        pipe.get(f"{task_id}:error")
+        status, result_key, error = await pipe.execute()
+
     if not status:
         logger.warning(f"Task {task_id} not found in Redis.")
         return JSONResponse({"error": "Task not found"}, status_code=404)
 
     status = status.decode("utf-8")
     if status == "completed":
-        geotiff_data = redis_client.get(task_id)
-        if not geotiff_data:
+        if not result_key:
             logger.error(f"No data found for completed task {task_id}.")
             return JSONResponse({"error": "No result found"}, status_code=500)
 
-        geotiff_file = io.BytesIO(geotiff_data)
-        return StreamingResponse(
-            geotiff_file,
-            media_type="image/tiff",
-            headers={"Content-Disposition": f"attachment; filename={task_id}.tif"}
-        )
+        result = await run_in_threadpool(result_store.open, result_key.decode("utf-8"))
+        if result is None:
+            logger.warning(f"Result of task {task_id} is no longer in the result store.")
+            return JSONResponse({"error": "Result expired"}, status_code=410)
+
+        return file_response(result, "image/tiff", f"{task_id}.tif", if_none_match, range_header, if_range)
     elif status == "failed":
-        error = redis_client.get(f"{task_id}:error")
         return JSONResponse({"status": "failed", "error": error.decode("utf-8")})
 
     logger.info(f"Task {task_id} is still processing.")
     return JSONResponse({"status": "processing"})
 
+@app.get("/render/{task_id}")
+async def render_result(
+    task_id: str,
+    colormap: Literal[tuple(AVAILABLE_COLORMAPS)] = Query("rainbow"),
+    min_dbm: float = Query(-130.0),
+    max_dbm: float = Query(-30.0),
+    if_none_match: Optional[str] = Header(None),
+    range_header: Optional[str] = Header(None, alias="Range"),
+    if_range: Optional[str] = Header(None),
+):
+    """
+    Render a completed SPLAT! task with a different colormap and dBm range, without running SPLAT! again.
+
+    - Serves a previously rendered variant from the result store if there is one.
+    - Otherwise renders the task's stored signal levels and keeps the variant as long as the task.
+    - Returns the task status like /result if the task is not completed.
+    - Supports conditional and byte range requests like /result.
+
+    Args:
+        task_id (str): The unique identifier for the task.
+        colormap (str): Matplotlib colormap to use.
+        min_dbm (float): Minimum dBm value for the colormap.
+        max_dbm (float): Maximum dBm value for the colormap.
+        if_none_match (Optional[str]): ETags of the rendering the client already has.
+        range_header (Optional[str]): Byte range of the rendering to send.
+        if_range (Optional[str]): ETag the byte range is conditional on.
+
+    Returns:
+        JSONResponse: Task status if the task is not completed, or an error message.
+        Response: The GeoTIFF file or a byte range of it if the task is "completed," or 304.
+    """
+    if min_dbm >= max_dbm:
+        return JSONResponse({"error": "min_dbm must be less than max_dbm"}, status_code=400)
+
+    render_key = f"{task_id}:render:{colormap}:{min_dbm:g}:{max_dbm:g}"
+    async with async_redis_client.pipeline(transaction=False) as pipe:
+        pipe.get(f"{task_id}:status")
+        pipe.get(render_key)
+        pipe.get(f"{task_id}:error")
+        status, render_pointer, error = await pipe.execute()
+
+    if not status:
+        logger.warning(f"Task {task_id} not found in Redis.")
+        return JSONResponse({"error": "Task not found"}, status_code=404)
+
+    status = status.decode("utf-8")
+    if status == "failed":
+        return JSONResponse({"status": "failed", "error": error.decode("utf-8")})
+    elif status != "completed":
+        return JSONResponse({"status": status})
+
+    result = None
+    if render_pointer is not None:
+        result = await run_in_threadpool(result_store.open, render_pointer.decode("utf-8"))
+
+    if result is None:
+        async with async_redis_client.pipeline(transaction=False) as pipe:
+            pipe.get(f"{task_id}:signal")
+            pipe.ttl(f"{task_id}:signal")
+            signal_key, ttl = await pipe.execute()
+
+        signal_data = None
+        if signal_key:
+            signal_data = await run_in_threadpool(result_store.get, signal_key.decode("utf-8"))
+        if not signal_data:
+            logger.error(f"No signal levels found for completed task {task_id}.")
+            return JSONResponse({"error": "No signal levels found"}, status_code=404)
+
+        geotiff_data = await run_in_threadpool(
+            Splat.render_signal_geotiff, signal_data, colormap, min_dbm, max_dbm
+        )
+        ttl = ttl if ttl > 0 else 3600
+        await run_in_threadpool(result_store.put, render_key, geotiff_data, ttl)
+        await async_redis_client.setex(render_key, ttl, render_key)
+        logger.info(f"Rendered task {task_id} with colormap '{colormap}' from {min_dbm} to {max_dbm} dBm.")
+
+        result = await run_in_threadpool(result_store.open, render_key)
+        if result is None:
+            return JSONResponse({"error": "Rendering expired"}, status_code=410)
+
+    return file_response(result, "image/tiff", f"{task_id}.tif", if_none_match, range_header, if_range)
+
+@app.post("/networks")
+async def create_network(payload: NetworkRequest) -> JSONResponse:
+    """
+    Create an empty network, to which completed predictions are added one at a time.
+
+    Args:
+        payload (NetworkRequest): Output settings of the network's coverage composite.
+
+    Returns:
+        JSONResponse: The network ID.
+    """
+    network_id = await networks.create(payload.model_dump())
+    return JSONResponse({"network_id": network_id})
+
+@app.get("/networks/{network_id}")
+async def get_network(network_id: str):
+    """
+    Retrieve a network: its version and its sites by slot (their index in the best-server layer).
+
+    Args:
+        network_id (str): The unique identifier for the network.
+
+    Returns:
+        JSONResponse: The network, or an error message if it is not found.
+    """
+    record = await networks.get(network_id)
+    if record is None:
+        return JSONResponse({"error": "Network not found"}, status_code=404)
+
+    return JSONResponse({"network_id": network_id, **record})
+
+@app.post("/networks/{network_id}/sites")
+async def add_network_site(network_id: str, payload: NetworkSiteRequest):
+    """
+    Add a completed prediction to a network.
+
+    - The site is merged into the window of the composite it covers; the rest of the composite is unchanged.
+    - The network keeps its own copy of the signal levels, so it outlives the task.
+
+    Args:
+        network_id (str): The unique identifier for the network.
+        payload (NetworkSiteRequest): The task ID and name of the site.
+
+    Returns:
+        JSONResponse: The slot of the site, the new network version and the updated window of the composite,
+            or an error message if the network is not found (404), the task is not completed or the composite
+            would exceed SPLAT_COMPOSITE_MAX_PIXELS (409), or the network is being changed by another request
+            for too long (503).
+    """
+    try:
+        return JSONResponse(await networks.add_site(network_id, payload.task_id, payload.name))
+    except KeyError:
+        return JSONResponse({"error": "Network not found"}, status_code=404)
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=409)
+    except LockError:
+        return JSONResponse({"error": "Network is busy, try again later"}, status_code=503)
+
+@app.delete("/networks/{network_id}/sites/{slot}")
+async def remove_network_site(network_id: str, slot: int):
+    """
+    Remove a site from a network.
+
+    - Only the window of the composite the site covered is recomputed, from the other sites overlapping it.
+
+    Args:
+        network_id (str): The unique identifier for the network.
+        slot (int): The slot of the site.
+
+    Returns:
+        JSONResponse: The new network version and the recomputed window of the composite, or an error message
+            if the network or site is not found (404) or the network has expired (409).
+    """
+    try:
+        return JSONResponse(await networks.remove_site(network_id, slot))
+    except KeyError:
+        return JSONResponse({"error": "Network or site not found"}, status_code=404)
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=409)
+    except LockError:
+        return JSONResponse({"error": "Network is busy, try again later"}, status_code=503)
+
+@app.get("/networks/{network_id}/composite")
+async def get_network_composite(
+    network_id: str,
+    layer: Literal["coverage", "signal", "best_server"] = Query("coverage"),
+    if_none_match: Optional[str] = Header(None),
+    range_header: Optional[str] = Header(None, alias="Range"),
+    if_range: Optional[str] = Header(None),
+):
+    """
+    Retrieve the best-server composite of a network, like /batch/{batch_id}/composite.
+
+    - Each version of the network is rendered once and kept in the result store; the ETag changes with it.
+    - The composite changes with the network under the same URL, so it is sent with `Cache-Control: no-cache`:
+      clients and CDNs revalidate their copy with If-None-Match, which returns 304 while it is current.
+
+    Args:
+        network_id (str): The unique identifier for the network.
+        layer (str): The composite layer, "coverage", "signal" or "best_server". Defaults to "coverage".
+        if_none_match (Optional[str]): ETags of the layer the client already has.
+        range_header (Optional[str]): Byte range of the layer to send.
+        if_range (Optional[str]): ETag the byte range is conditional on.
+
+    Returns:
+        JSONResponse: An error message if the network is not found or has no sites.
+        Response: The GeoTIFF file or a byte range of it, or 304.
+    """
+    try:
+        result = await networks.layer(network_id, layer)
+    except KeyError:
+        return JSONResponse({"error": "Network not found"}, status_code=404)
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=409)
+
+    if result is None:
+        return JSONResponse({"error": "Network has no sites"}, status_code=404)
+
+    return file_response(
+        result, "image/tiff", f"{network_id}-{layer}.tif", if_none_match, range_header, if_range,
+        cache_control=REVALIDATE_CACHE_CONTROL,
+    )
+
+@app.get("/tiles/{task_id}/{z}/{x}/{y}.{fmt}")
+async def get_tile(
+    task_id: str,
+    z: int,
+    x: int,
+    y: int,
+    fmt: Literal["png", "webp"],
+    if_none_match: Optional[str] = Header(None),
+):
+    """
+    Serve a completed SPLAT! task as a Web Mercator (EPSG:3857) XYZ map tile.
+
+    - Tiles are cut from the result GeoTIFF on demand and cached in memory.
+    - The result of a task never changes, so tiles have stable ETags and conditional requests return 304.
+    - Tiles outside the prediction are transparent.
+
+    Args:
+        task_id (str): The unique identifier for the task.
+        z (int): Zoom level.
+        x (int): Tile column, from the west.
+        y (int): Tile row, from the north.
+        fmt (str): Image format, "png" or "webp".
+        if_none_match (Optional[str]): ETags of the tile the client already has.
+
+    Returns:
+        Response: The tile image, or 304 if the client's copy is current.
+        JSONResponse: Task status if the task is not completed, or an error message.
+    """
+    if not 0 <= z <= 24 or not 0 <= x < 2 ** z or not 0 <= y < 2 ** z:
+        return JSONResponse({"error": "Tile out of range"}, status_code=404)
+
+    etag = '"' + hashlib.sha1(f"{task_id}/{z}/{x}/{y}.{fmt}".encode("utf-8")).hexdigest() + '"'
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=3600"}
+    if etag_matches(etag, if_none_match):
+        return Response(status_code=304, headers=headers)
+
+    media_type = f"image/{fmt}"
+    tile = tile_renderer.cached_tile(task_id, z, x, y, fmt)
+    if tile is not None:
+        return Response(tile, media_type=media_type, headers=headers)
+
+    source = tile_renderer.source(task_id)
+    if source is None:
+        async with async_redis_client.pipeline(transaction=False) as pipe:
+            pipe.get(f"{task_id}:status")
+            pipe.get(task_id)
+            status, result_key = await pipe.execute()
+
+        if not status:
+            logger.warning(f"Task {task_id} not found in Redis.")
+            return JSONResponse({"error": "Task not found"}, status_code=404)
+        elif status != b"completed":
+            return JSONResponse({"status": status.decode("utf-8")}, status_code=404)
+        elif not result_key:
+            logger.error(f"No data found for completed task {task_id}.")
+            return JSONResponse({"error": "No result found"}, status_code=500)
+
+        geotiff_data = await run_in_threadpool(result_store.get, result_key.decode("utf-8"))
+        if geotiff_data is None:
+            logger.warning(f"Result of task {task_id} is no longer in the result store.")
+            return JSONResponse({"error": "Result expired"}, status_code=410)
+
+        source = await run_in_threadpool(tile_renderer.load_source, task_id, geotiff_data)
+
+    tile = await run_in_threadpool(tile_renderer.render_tile, task_id, source, z, x, y, fmt)
+    return Response(tile, media_type=media_type, headers=headers)
+
+@app.get("/queue")
+async def get_queue():
+    """
+    Report the load on the SPLAT! worker pool or Redis job queue.
+
+    Returns:
+        JSONResponse: The queue mode, and the limits and number of running and queued jobs.
+    """
+    if job_queue is not None:
+        return JSONResponse({"mode": "redis", "max_queue": job_queue.max_queue, "queued": await job_queue.depth()})
+
+    return JSONResponse({"mode": "local", **worker_pool.stats()})
+
+@app.get("/cache")
+async def get_cache():
+    """
+    Report the result cache usage and hit/miss counters.
+
+    - In local queue mode, also reports the terrain cache of the SPLAT! workers by tier under `terrain`.
+
+    Returns:
+        JSONResponse: The cache statistics, or an error if the result cache is disabled.
+    """
+    if async_result_cache is None:
+        return JSONResponse({"error": "Result cache is disabled"}, status_code=404)
+
+    stats = await async_result_cache.stats()
+    if splat_service is not None:
+        stats["terrain"] = await run_in_threadpool(splat_service.terrain_cache.stats)
+    return JSONResponse(stats)
+
+def check_admin_token(authorization: Optional[str]) -> Optional[JSONResponse]:
+    """Return an error response unless the request carries the admin bearer token, or None if it does."""
+    if not config.SPLAT_ADMIN_TOKEN:
+        return JSONResponse({"error": "Admin endpoints are disabled"}, status_code=404)
+
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(token.encode(), config.SPLAT_ADMIN_TOKEN.encode()):
+        return JSONResponse({"error": "Invalid admin token"}, status_code=401, headers={"WWW-Authenticate": "Bearer"})
+    return None
+
+def run_prewarm(job_id: str, tile_names: List[str], payload: PrewarmRequest) -> None:
+    """Pre-warm the terrain tiles of a job, recording its progress in Redis."""
+    def record(state: dict) -> None:
+        redis_client.setex(f"prewarm:{job_id}", 86400, json.dumps(state))
+
+    try:
+        counters = prewarm(
+            splat_service,
+            tile_names,
+            payload.high_resolution,
+            workers=payload.workers,
+            rate=payload.rate,
+            progress=lambda counters: record({"status": "running", **counters}),
+        )
+        record({"status": "completed", **counters})
+    except Exception as e:
+        logger.error(f"Pre-warming job {job_id} failed: {e}")
+        record({"status": "failed", "error": str(e)})
+
+@app.post("/admin/prewarm")
+async def create_prewarm(
+    payload: PrewarmRequest,
+    background_tasks: BackgroundTasks,
+    authorization: Optional[str] = Header(None),
+):
+    """
+    Pre-warm the terrain cache of the SPLAT! workers for a bounding box, a list of sites or replayed requests.
+
+    - Requires the `SPLAT_ADMIN_TOKEN` as a bearer token.
+    - Runs in the background with the requested concurrency and rate limit; poll /admin/prewarm/{job_id}.
+    - Only available in local queue mode; in redis mode run `python -m app.services.prewarm` with the workers.
+
+    Args:
+        payload (PrewarmRequest): The region, sites or requests to pre-warm, and the concurrency and rate limit.
+        authorization (Optional[str]): The bearer token.
+
+    Returns:
+        JSONResponse: The job ID and its number of tiles (202), or an error message.
+    """
+    error = check_admin_token(authorization)
+    if error is not None:
+        return error
+    if splat_service is None:
+        return JSONResponse(
+            {"error": "The terrain cache belongs to the queue workers, run `python -m app.services.prewarm` there"},
+            status_code=409,
+        )
+
+    sites = [(site.lat, site.lon, site.radius) for site in payload.sites]
+    sites += sites_from_request_log(json.dumps(request) for request in payload.requests)
+    tile_names = dict.fromkeys(tiles_in_bbox(*payload.bbox) if payload.bbox else [])
+    tile_names.update(dict.fromkeys(tiles_for_sites(sites)))
+    if len(tile_names) > config.SPLAT_PREWARM_MAX_TILES:
+        return JSONResponse(
+            {"error": f"{len(tile_names)} tiles exceed the limit of {config.SPLAT_PREWARM_MAX_TILES} per job"},
+            status_code=422,
+        )
+
+    job_id = str(uuid4())
+    state = {"status": "running", "total": len(tile_names), "done": 0, "cached": 0, "prepared": 0, "failed": 0}
+    await async_redis_client.setex(f"prewarm:{job_id}", 86400, json.dumps(state))
+    background_tasks.add_task(run_prewarm, job_id, list(tile_names), payload)
+
+    logger.info(f"Started pre-warming job {job_id} for {len(tile_names)} terrain tiles.")
+    return JSONResponse({"job_id": job_id, "tiles": len(tile_names)}, status_code=202)
+
+@app.get("/admin/prewarm/{job_id}")
+async def get_prewarm(job_id: str, authorization: Optional[str] = Header(None)):
+    """
+    Report the progress of a pre-warming job.
+
+    Args:
+        job_id (str): The unique identifier for the job.
+        authorization (Optional[str]): The bearer token.
+
+    Returns:
+        JSONResponse: The job status ("running", "completed" or "failed") and its tile counters, or an error message.
+    """
+    error = check_admin_token(authorization)
+    if error is not None:
+        return error
+
+    state = await async_redis_client.get(f"prewarm:{job_id}")
+    if state is None:
+        return JSONResponse({"error": "Job not found"}, status_code=404)
+    return JSONResponse({"job_id": job_id, **json.loads(state)})
+
 app.mount("/", StaticFiles(directory="app/ui", html=True), name="ui")
@@ -0,0 +1,61 @@
+from pydantic import BaseModel, Field, model_validator
+from typing import Any, Dict, List, Optional
+
+from app.models.CoveragePredictionRequest import CoveragePredictionRequest
+
+# Per-transmitter fields of a CoveragePredictionRequest, the others are shared by the whole batch
+SITE_FIELDS = ("lat", "lon", "tx_height", "tx_power", "tx_gain")
+
+
+class TransmitterSite(BaseModel):
+    """
+    One transmitter of a batch prediction. Unset fields take the value of the batch settings.
+    """
+
+    name: Optional[str] = Field(None, max_length=100, description="Name of the site, e.g. the node name")
+    lat: float = Field(
+        ge=-90, le=90, description="Transmitter latitude in degrees (-90 to 90)"
+    )
+    lon: float = Field(
+        ge=-180, le=180, description="Transmitter longitude in degrees (-180 to 180)"
+    )
+    tx_height: Optional[float] = Field(
+        None, ge=1, description="Transmitter height above ground in meters (>= 1 m)"
+    )
+    tx_power: Optional[float] = Field(None, gt=0, description="Transmitter power in dBm (>= 1 dBm)")
+    tx_gain: Optional[float] = Field(None, ge=0, description="Transmitter antenna gain in dB (>= 0)")
+
+
+class BatchPredictionRequest(BaseModel):
+    """
+    Input payload for /predict/batch.
+    """
+
+    transmitters: List[TransmitterSite] = Field(
+        min_length=1, max_length=64, description="The transmitters to predict (1 to 64)"
+    )
+    settings: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="Fields of a /predict request shared by all transmitters (receiver, environment, model and "
+        "output settings), and defaults for the transmitter fields left unset.",
+    )
+
+    @model_validator(mode="after")
+    def validate_sites(self) -> "BatchPredictionRequest":
+        self.site_requests()
+        return self
+
+    def site_requests(self) -> List[CoveragePredictionRequest]:
+        """
+        The coverage prediction request of every transmitter.
+
+        Returns:
+            List[CoveragePredictionRequest]: One request per transmitter, in order.
+
+        Raises:
+            ValueError: If the settings and a transmitter do not make a valid request.
+        """
+        return [
+            CoveragePredictionRequest(**{**self.settings, **site.model_dump(include=set(SITE_FIELDS), exclude_none=True)})
+            for site in self.transmitters
+        ]
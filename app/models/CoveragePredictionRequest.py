@@ -100,6 +100,18 @@ class CoveragePredictionRequest(BaseModel):
         -30.0,
         description="Maximum dBm value for the colormap (default: -30.0).",
     )
+    output_profile: Literal["geotiff", "cog"] = Field(
+        "geotiff",
+        description="Layout of the result GeoTIFF, 'geotiff' (striped) or 'cog' (Cloud-Optimized GeoTIFF with 256x256 tiles and overviews) (default: 'geotiff').",
+    )
+    compression: Literal["lzw", "deflate", "zstd"] = Field(
+        "lzw",
+        description="Compression codec of the result GeoTIFF, 'lzw', 'deflate' or 'zstd' (default: 'lzw').",
+    )
+    predictor: bool = Field(
+        False,
+        description="Apply horizontal differencing to the result GeoTIFF before compression (default: False).",
+    )
 
     high_resolution: bool = Field(
         False,
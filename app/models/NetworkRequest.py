@@ -0,0 +1,44 @@
+from pydantic import BaseModel, Field
+from typing import Optional, Literal
+
+from app.models.CoveragePredictionRequest import AVAILABLE_COLORMAPS
+
+
+class NetworkRequest(BaseModel):
+    """
+    Input payload for /networks: output settings of the network's coverage composite.
+    """
+
+    colormap: Literal[tuple(AVAILABLE_COLORMAPS)] = Field(
+        "rainbow",
+        description=f"Matplotlib colormap to use. Available options: {', '.join(AVAILABLE_COLORMAPS)}",
+    )
+    min_dbm: float = Field(
+        -130.0,
+        description="Minimum dBm value for the colormap (default: -130.0).",
+    )
+    max_dbm: float = Field(
+        -30.0,
+        description="Maximum dBm value for the colormap (default: -30.0).",
+    )
+    output_profile: Literal["geotiff", "cog"] = Field(
+        "geotiff",
+        description="Layout of the coverage GeoTIFF, 'geotiff' (striped) or 'cog' (Cloud-Optimized GeoTIFF) (default: 'geotiff').",
+    )
+    compression: Literal["lzw", "deflate", "zstd"] = Field(
+        "lzw",
+        description="Compression codec of the coverage GeoTIFF, 'lzw', 'deflate' or 'zstd' (default: 'lzw').",
+    )
+    predictor: bool = Field(
+        False,
+        description="Apply horizontal differencing to the coverage GeoTIFF before compression (default: False).",
+    )
+
+
+class NetworkSiteRequest(BaseModel):
+    """
+    Input payload for /networks/{network_id}/sites: a completed prediction to add to the network.
+    """
+
+    task_id: str = Field(description="ID of a completed /predict task")
+    name: Optional[str] = Field(None, max_length=100, description="Name of the site, e.g. the node name")
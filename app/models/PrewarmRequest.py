@@ -0,0 +1,46 @@
+import math
+
+from pydantic import BaseModel, Field, model_validator
+from typing import Any, Dict, List, Optional
+
+
+class PrewarmSite(BaseModel):
+    """
+    A site whose terrain is pre-warmed.
+    """
+
+    lat: float = Field(ge=-90, le=90, description="Latitude in degrees (-90 to 90)")
+    lon: float = Field(ge=-180, le=180, description="Longitude in degrees (-180 to 180)")
+    radius: float = Field(1000.0, ge=1, le=100000, description="Radius in meters (1 m to 100 km)")
+
+
+class PrewarmRequest(BaseModel):
+    """
+    Input payload for /admin/prewarm. The tiles of the bounding box, the sites and the replayed requests are
+    pre-warmed together.
+    """
+
+    bbox: Optional[List[float]] = Field(
+        None,
+        min_length=4,
+        max_length=4,
+        description="Bounding box to pre-warm every tile of, as [south, west, north, east] in degrees",
+    )
+    sites: List[PrewarmSite] = Field(default_factory=list, description="Sites to pre-warm the terrain of")
+    requests: List[Dict[str, Any]] = Field(
+        default_factory=list,
+        description="Past /predict payloads to replay; only their lat, lon and radius are used",
+    )
+    high_resolution: bool = Field(False, description="Prepare -hd.sdf files instead of .sdf files")
+    workers: int = Field(2, ge=1, le=16, description="Tiles prepared concurrently (1 to 16)")
+    rate: Optional[float] = Field(None, gt=0, description="Maximum tiles started per second (default: no limit)")
+
+    @model_validator(mode="after")
+    def validate_targets(self) -> "PrewarmRequest":
+        if self.bbox is None and not self.sites and not self.requests:
+            raise ValueError("Nothing to pre-warm: provide a bbox, sites or requests.")
+        if self.bbox is not None and not all(math.isfinite(value) for value in self.bbox):
+            raise ValueError("The bbox must be finite numbers.")
+        if self.bbox is not None and not (-90 <= self.bbox[0] <= self.bbox[2] <= 90):
+            raise ValueError("The bbox must be [south, west, north, east] with south <= north.")
+        return self
@@ -0,0 +1,222 @@
+import logging
+import threading
+import time
+from typing import Optional, Set, Tuple, Union
+
+import redis
+import redis.asyncio
+
+
+logger = logging.getLogger(__name__)
+
+# Delete a key only if it still holds the given value, so a finished job never releases a newer claim.
+_RELEASE_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+
+# Replace a stale claim only if it was not released or taken over by another request meanwhile.
+_TAKEOVER_SCRIPT = """
+local current = redis.call("GET", KEYS[1])
+if current == ARGV[1] or current == false then
+    redis.call("SET", KEYS[1], ARGV[2], "EX", ARGV[3])
+    return 1
+end
+return 0
+"""
+
+# Extend a claim only if it is still held by the given task.
+_KEEP_ALIVE_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("EXPIRE", KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+class JobCoalescerBase:
+    def __init__(
+        self,
+        redis_client: Union[redis.StrictRedis, redis.asyncio.Redis],
+        ttl: int = 3600,
+        heartbeat_ttl: int = 30,
+        prefix: str = "inflight",
+    ):
+        """
+        Registry of in-flight SPLAT! jobs keyed by request digest (see `request_digest`).
+
+        The first request for a digest claims it with its task ID; identical requests that arrive while
+        that job is still running attach to the same task instead of starting another SPLAT! run. The
+        registry lives in Redis, so duplicates are coalesced across all API processes.
+
+        A claim lives for `ttl` seconds while its job waits in the Redis job queue, which does not lose jobs.
+        Once a process owns the job (a queue worker running it, or the API's worker pool in local mode), it
+        keeps the claim alive with a heartbeat (see `keep_alive`) and the claim only lives `heartbeat_ttl`
+        seconds past the last one, so identical requests stop attaching to the task soon after its process
+        died. A claim whose task failed or expired is taken over atomically by the next request.
+
+        The API endpoints claim digests (see AsyncJobCoalescer); the processes running the jobs keep their
+        claims alive and release them (see JobCoalescer).
+
+        Args:
+            redis_client (Union[redis.StrictRedis, redis.asyncio.Redis]): Redis client shared with the task
+                status keys, synchronous or asyncio depending on the subclass.
+            ttl (int): Lifetime of a claim in seconds without a heartbeat. Defaults to 3600, the lifetime of a
+                task status.
+            heartbeat_ttl (int): Lifetime of a claim in seconds past the last heartbeat of its owner. Defaults to 30.
+            prefix (str): Prefix for the Redis keys used by the registry. Defaults to `inflight`.
+        """
+        self.redis_client = redis_client
+        self.ttl = ttl
+        self.heartbeat_ttl = heartbeat_ttl
+        self.prefix = prefix
+        self._release_script = redis_client.register_script(_RELEASE_SCRIPT)
+        self._takeover_script = redis_client.register_script(_TAKEOVER_SCRIPT)
+
+    def _claim_key(self, digest: str) -> str:
+        return f"{self.prefix}:{digest}"
+
+
+class JobCoalescer(JobCoalescerBase):
+    """Registry of in-flight jobs for synchronous code, backed by a `redis.StrictRedis` client."""
+
+    def __init__(self, redis_client: redis.StrictRedis, **kwargs):
+        super().__init__(redis_client, **kwargs)
+        self._keep_alive_script = redis_client.register_script(_KEEP_ALIVE_SCRIPT)
+
+        self._held: Set[Tuple[str, str]] = set()  # (digest, task ID) of the claims kept alive by this process
+        self._held_lock = threading.Lock()
+        self._heartbeat: Optional[threading.Thread] = None
+
+    def claim(self, digest: str, task_id: str, ttl: Optional[int] = None) -> Optional[str]:
+        """
+        Claim a request digest for a new task, unless an identical job is already running.
+
+        The caller must have set the "processing" status of `task_id` before claiming.
+
+        Args:
+            digest (str): The request digest.
+            task_id (str): The ID of the new task.
+            ttl (Optional[int]): Lifetime of the claim in seconds, `ttl` of the coalescer if None.
+
+        Returns:
+            Optional[str]: The ID of the running task to attach to, or None if `task_id` now owns the digest
+                (or, if the claim kept changing hands, runs without one).
+        """
+        key = self._claim_key(digest)
+        ttl = ttl or self.ttl
+        for _ in range(3):
+            if self.redis_client.set(key, task_id, nx=True, ex=ttl):
+                return None
+
+            existing = self.redis_client.get(key)
+            if existing is None:
+                # released meanwhile, claim it again
+                continue
+
+            existing = existing.decode("utf-8")
+            status = self.redis_client.get(f"{existing}:status")
+            if status is not None and status != b"failed":
+                logger.info(f"Coalescing request {digest} into running task {existing}.")
+                return existing
+
+            # The previous claim is stale (the job failed or its status expired), take it over.
+            if self._takeover_script(keys=[key], args=[existing, task_id, ttl]):
+                return None
+
+        logger.warning(f"Claim of request {digest} keeps changing hands, running task {task_id} without one.")
+        return None
+
+    def keep_alive(self, digest: str, task_id: str) -> None:
+        """
+        Keep the claim of a task on a request digest alive with a heartbeat from this process until it is released.
+
+        The claim is extended to `heartbeat_ttl` seconds every third of that time by a background thread,
+        so it expires shortly after this process dies instead of after `ttl`.
+
+        Args:
+            digest (str): The request digest.
+            task_id (str): The ID of the task owning the claim.
+        """
+        with self._held_lock:
+            self._held.add((digest, task_id))
+            if self._heartbeat is None:
+                self._heartbeat = threading.Thread(target=self._beat, name="splat-claim-heartbeat", daemon=True)
+                self._heartbeat.start()
+
+    def _beat(self) -> None:
+        """Extend the claims kept alive by this process, forever (the thread is a daemon)."""
+        while True:
+            time.sleep(self.heartbeat_ttl / 3)
+            with self._held_lock:
+                held = list(self._held)
+
+            for digest, task_id in held:
+                try:
+                    extended = self._keep_alive_script(
+                        keys=[self._claim_key(digest)], args=[task_id, self.heartbeat_ttl]
+                    )
+                except redis.RedisError as e:
+                    logger.warning(f"Failed to extend the claim of task {task_id}: {e}")
+                    continue
+
+                if not extended:
+                    # released, expired or taken over meanwhile
+                    with self._held_lock:
+                        self._held.discard((digest, task_id))
+
+    def release(self, digest: str, task_id: str) -> None:
+        """
+        Release the claim on a request digest once `task_id` has finished.
+
+        Args:
+            digest (str): The request digest.
+            task_id (str): The ID of the finished task.
+        """
+        with self._held_lock:
+            self._held.discard((digest, task_id))
+        self._release_script(keys=[self._claim_key(digest)], args=[task_id])
+
+
+class AsyncJobCoalescer(JobCoalescerBase):
+    """
+    Registry of in-flight jobs for asyncio code, backed by a `redis.asyncio` client.
+
+    Used by the API endpoints to claim request digests without blocking the event loop. Claims are
+    released by the synchronous JobCoalescer in the SPLAT! workers.
+    """
+
+    def __init__(self, redis_client: redis.asyncio.Redis, **kwargs):
+        super().__init__(redis_client, **kwargs)
+
+    async def claim(self, digest: str, task_id: str, ttl: Optional[int] = None) -> Optional[str]:
+        """Asynchronous `JobCoalescer.claim`."""
+        key = self._claim_key(digest)
+        ttl = ttl or self.ttl
+        for _ in range(3):
+            if await self.redis_client.set(key, task_id, nx=True, ex=ttl):
+                return None
+
+            existing = await self.redis_client.get(key)
+            if existing is None:
+                # released meanwhile, claim it again
+                continue
+
+            existing = existing.decode("utf-8")
+            status = await self.redis_client.get(f"{existing}:status")
+            if status is not None and status != b"failed":
+                logger.info(f"Coalescing request {digest} into running task {existing}.")
+                return existing
+
+            # The previous claim is stale (the job failed or its status expired), take it over.
+            if await self._takeover_script(keys=[key], args=[existing, task_id, ttl]):
+                return None
+
+        logger.warning(f"Claim of request {digest} keeps changing hands, running task {task_id} without one.")
+        return None
+
+    async def release(self, digest: str, task_id: str) -> None:
+        """Asynchronous `JobCoalescer.release`."""
+        await self._release_script(keys=[self._claim_key(digest)], args=[task_id])
@@ -0,0 +1,139 @@
+import logging
+from typing import Optional, Tuple
+
+from fastapi.responses import Response, StreamingResponse
+
+from app.services.result_store import StoredResult
+
+
+logger = logging.getLogger(__name__)
+
+# The result of a task never changes, so clients and CDNs may keep it until it expires from Redis.
+IMMUTABLE_CACHE_CONTROL = "public, max-age=86400, immutable"
+
+# Content served under a URL whose content changes (e.g. the composite of a network) must be revalidated with
+# its ETag before each use.
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+
+def etag_matches(etag: str, header: Optional[str]) -> bool:
+    """
+    Whether an If-None-Match or If-Range header lists an ETag.
+
+    Args:
+        etag (str): The quoted ETag of the current content.
+        header (Optional[str]): The header value, a comma separated list of ETags or "*".
+
+    Returns:
+        bool: True if the header matches the ETag (weak comparison).
+    """
+    if header is None:
+        return False
+    if header.strip() == "*":
+        return True
+    return etag in [tag.strip().removeprefix("W/") for tag in header.split(",")]
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single byte range of a Range header.
+
+    Only single ranges are supported; multiple ranges and other units are ignored, which HTTP allows a
+    server to do by sending the full content.
+
+    Args:
+        header (str): The Range header value, e.g. "bytes=0-1023", "bytes=1024-" or "bytes=-512".
+        size (int): Size of the content in bytes.
+
+    Returns:
+        Optional[Tuple[int, int]]: The first and last byte positions (inclusive), or None to send the full
+            content.
+
+    Raises:
+        ValueError: If the range does not overlap the content (416 Range Not Satisfiable).
+    """
+    unit, _, ranges = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in ranges:
+        return None
+
+    first, sep, last = (part.strip() for part in ranges.partition("-"))
+    if not sep or not (first or last) or not all(part.isdigit() for part in (first, last) if part):
+        return None
+
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            raise ValueError(f"Unsatisfiable range '{header}' for {size} bytes.")
+        return max(size - length, 0), size - 1
+
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        raise ValueError(f"Unsatisfiable range '{header}' for {size} bytes.")
+    return start, end
+
+
+def file_response(
+    result: StoredResult,
+    media_type: str,
+    filename: str,
+    if_none_match: Optional[str] = None,
+    range_header: Optional[str] = None,
+    if_range: Optional[str] = None,
+    cache_control: str = IMMUTABLE_CACHE_CONTROL,
+) -> Response:
+    """
+    Stream a stored result with conditional GET and byte range support.
+
+    - The ETag is a hash of the content, so If-None-Match returns 304 without reading the result.
+    - A single byte range returns 206 with only that slice read from the store, so COG-aware clients can
+      fetch the header and the tiles they need. If-Range (strong comparison) falls back to the full
+      content if the ETag changed.
+    - The body is streamed from the store in chunks, with its Content-Length.
+
+    Args:
+        result (StoredResult): The result to serve, closed once it has been sent.
+        media_type (str): Content type of the result.
+        filename (str): File name suggested to the client in Content-Disposition.
+        if_none_match (Optional[str]): If-None-Match request header.
+        range_header (Optional[str]): Range request header.
+        if_range (Optional[str]): If-Range request header.
+        cache_control (str): Cache-Control response header. Defaults to `IMMUTABLE_CACHE_CONTROL`, for results
+            that never change under their URL.
+
+    Returns:
+        Response: 200 with the full content, 206 with a byte range, 304 if the client's copy is current, or
+            416 if the range is not satisfiable.
+    """
+    etag = result.etag
+    headers = {
+        "ETag": etag,
+        "Cache-Control": cache_control,
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": f"attachment; filename={filename}",
+    }
+
+    if etag_matches(etag, if_none_match):
+        result.close()
+        return Response(status_code=304, headers=headers)
+
+    size = result.size
+    if range_header is not None and (if_range is None or if_range.strip() == etag):
+        try:
+            byte_range = parse_range(range_header, size)
+        except ValueError as e:
+            logger.info(str(e))
+            result.close()
+            return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+
+        if byte_range is not None:
+            start, end = byte_range
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+            headers["Content-Length"] = str(end - start + 1)
+            return StreamingResponse(
+                result.iter_range(start, end), status_code=206, media_type=media_type, headers=headers
+            )
+
+    headers["Content-Length"] = str(size)
+    return StreamingResponse(result.iter_range(), media_type=media_type, headers=headers)
@@ -0,0 +1,226 @@
+import json
+import logging
+from typing import List, NamedTuple, Optional, Union
+
+import redis
+import redis.asyncio
+
+from app.models.CoveragePredictionRequest import CoveragePredictionRequest
+from app.services.worker_pool import QueueFullError
+
+
+logger = logging.getLogger(__name__)
+
+
+class QueuedJob(NamedTuple):
+    """
+    A job taken from the queue by a worker, to acknowledge with `RedisJobQueue.ack` once it is finished.
+
+    A prediction job has a `request`; a terrain job (see `RedisJobQueue.enqueue_terrain`) has the `terrain`
+    requests whose terrain it prepares instead, and the ID of their batch as its `task_id`.
+    """
+
+    task_id: str
+    request: Optional[CoveragePredictionRequest]
+    payload: bytes
+    terrain: Optional[List[CoveragePredictionRequest]] = None
+
+
+class RedisJobQueueBase:
+    def __init__(
+        self,
+        redis_client: Union[redis.StrictRedis, redis.asyncio.Redis],
+        queue_name: str = "splat:jobs",
+        max_queue: int = 0,
+        heartbeat_ttl: int = 30,
+    ):
+        """
+        Redis list backed queue of SPLAT! coverage prediction jobs.
+
+        The API enqueues serialized CoveragePredictionRequests (see AsyncRedisJobQueue) and any number of
+        worker processes (see app.worker) take and execute them (see RedisJobQueue), so API replicas and
+        SPLAT! workers can be scaled independently against a single Redis.
+
+        Jobs are not popped destructively: a worker atomically moves each job into its own processing list
+        and removes it from there once the job is finished (`ack`). Workers refresh a heartbeat key while
+        they are alive (`heartbeat`), and the jobs of a worker whose heartbeat expired, e.g. because its
+        container was killed mid-job, are moved back to the front of the queue by `reap`.
+
+        Args:
+            redis_client (Union[redis.StrictRedis, redis.asyncio.Redis]): Redis client shared with the task
+                status keys, synchronous or asyncio depending on the subclass.
+            queue_name (str): Name of the Redis list holding pending jobs. Defaults to `splat:jobs`.
+            max_queue (int): Maximum number of pending jobs, 0 for unbounded. Defaults to 0.
+            heartbeat_ttl (int): Seconds without a heartbeat after which a worker is considered dead and its
+                jobs are requeued. Defaults to 30.
+        """
+        self.redis_client = redis_client
+        self.queue_name = queue_name
+        self.max_queue = max_queue
+        self.heartbeat_ttl = heartbeat_ttl
+
+        self._workers_key = f"{queue_name}:workers"  # set of the IDs of the workers with a processing list
+        self._dead_key = f"{queue_name}:dead"  # list of the payloads of the jobs that could not be decoded
+
+    def _processing_key(self, worker_id: str) -> str:
+        return f"{self.queue_name}:processing:{worker_id}"
+
+    def _heartbeat_key(self, worker_id: str) -> str:
+        return f"{self.queue_name}:heartbeat:{worker_id}"
+
+    def _full_error(self) -> QueueFullError:
+        return QueueFullError(f"SPLAT! job queue '{self.queue_name}' is full ({self.max_queue} queued).")
+
+    @staticmethod
+    def _payload(task_id: str, request: CoveragePredictionRequest) -> str:
+        return json.dumps({"task_id": task_id, "request": request.model_dump()})
+
+    @staticmethod
+    def _terrain_payload(batch_id: str, requests: List[CoveragePredictionRequest]) -> str:
+        return json.dumps({"task_id": batch_id, "terrain": [request.model_dump() for request in requests]})
+
+
+class RedisJobQueue(RedisJobQueueBase):
+    """Job queue for the SPLAT! workers, backed by a synchronous `redis.StrictRedis` client."""
+
+    def enqueue(self, task_id: str, request: CoveragePredictionRequest) -> None:
+        """
+        Add a job to the back of the queue.
+
+        Args:
+            task_id (str): UUID identifier for the task.
+            request (CoveragePredictionRequest): The parameters for the SPLAT! prediction.
+
+        Raises:
+            QueueFullError: If the queue already holds `max_queue` pending jobs.
+        """
+        if self.max_queue and self.depth() >= self.max_queue:
+            raise self._full_error()
+
+        self.redis_client.lpush(self.queue_name, self._payload(task_id, request))
+        logger.debug(f"Enqueued task {task_id} on '{self.queue_name}'.")
+
+    def enqueue_terrain(self, batch_id: str, requests: List[CoveragePredictionRequest]) -> None:
+        """
+        Add a job preparing the terrain of several predictions at once (see `Splat.prepare_terrain`) to the back
+        of the queue.
+
+        Enqueued ahead of the predictions of a batch, the job is taken first, so the predictions taken by other
+        workers meanwhile wait on the terrain tiles it is preparing (see `TerrainCache.lock`) instead of each
+        fetching the tiles they share.
+
+        Args:
+            batch_id (str): UUID identifier for the batch.
+            requests (List[CoveragePredictionRequest]): The predictions of the batch.
+
+        Raises:
+            QueueFullError: If the queue already holds `max_queue` pending jobs.
+        """
+        if self.max_queue and self.depth() >= self.max_queue:
+            raise self._full_error()
+
+        self.redis_client.lpush(self.queue_name, self._terrain_payload(batch_id, requests))
+        logger.debug(f"Enqueued the terrain of batch {batch_id} on '{self.queue_name}'.")
+
+    def dequeue(self, worker_id: str, timeout: int = 5) -> Optional[QueuedJob]:
+        """
+        Move the oldest job from the queue to the processing list of a worker, blocking for up to `timeout` seconds.
+
+        Args:
+            worker_id (str): The ID of the worker, whose heartbeat must be kept alive until the job is acknowledged.
+            timeout (int): Seconds to wait for a job. Defaults to 5.
+
+        Returns:
+            Optional[QueuedJob]: The job, or None on timeout or if the job could not be decoded.
+        """
+        processing_key = self._processing_key(worker_id)
+        payload = self.redis_client.blmove(self.queue_name, processing_key, timeout, "RIGHT", "LEFT")
+        if payload is None:
+            return None
+
+        try:
+            job = json.loads(payload)
+            if "terrain" in job:
+                terrain = [CoveragePredictionRequest.model_validate(request) for request in job["terrain"]]
+                return QueuedJob(job["task_id"], None, payload, terrain)
+            return QueuedJob(job["task_id"], CoveragePredictionRequest.model_validate(job["request"]), payload)
+        except (ValueError, KeyError, TypeError) as e:
+            # requeueing would only fail again, on every worker
+            with self.redis_client.pipeline(transaction=True) as pipe:
+                pipe.lpush(self._dead_key, payload)
+                pipe.lrem(processing_key, 1, payload)
+                pipe.execute()
+            logger.error(f"Moved an undecodable job to '{self._dead_key}': {e}")
+            return None
+
+    def ack(self, worker_id: str, job: QueuedJob) -> None:
+        """Remove a finished job (completed or failed) from the processing list of a worker."""
+        self.redis_client.lrem(self._processing_key(worker_id), 1, job.payload)
+
+    def heartbeat(self, worker_id: str) -> None:
+        """Record that a worker is alive for another `heartbeat_ttl` seconds."""
+        with self.redis_client.pipeline(transaction=True) as pipe:
+            pipe.sadd(self._workers_key, worker_id)
+            pipe.set(self._heartbeat_key(worker_id), 1, ex=self.heartbeat_ttl)
+            pipe.execute()
+
+    def reap(self) -> int:
+        """
+        Move the jobs of dead workers (without a heartbeat) back to the front of the queue.
+
+        Safe to call from any number of workers at once: each job is moved atomically, so it is requeued once.
+
+        Returns:
+            int: The number of requeued jobs.
+        """
+        requeued = 0
+        for worker_id in self.redis_client.smembers(self._workers_key):
+            worker_id = worker_id.decode("utf-8")
+            if self.redis_client.exists(self._heartbeat_key(worker_id)):
+                continue
+
+            # newest first, so the oldest job ends up at the front of the queue
+            processing_key = self._processing_key(worker_id)
+            while self.redis_client.lmove(processing_key, self.queue_name, "LEFT", "RIGHT") is not None:
+                requeued += 1
+            self.redis_client.srem(self._workers_key, worker_id)
+
+        if requeued:
+            logger.warning(f"Requeued {requeued} job(s) of dead workers on '{self.queue_name}'.")
+        return requeued
+
+    def depth(self) -> int:
+        """Number of jobs waiting to be picked up by a worker."""
+        return self.redis_client.llen(self.queue_name)
+
+
+class AsyncRedisJobQueue(RedisJobQueueBase):
+    """
+    Job queue for asyncio code, backed by a `redis.asyncio` client.
+
+    Used by the API endpoints to enqueue jobs without blocking the event loop. Jobs are taken by the
+    synchronous RedisJobQueue in the SPLAT! workers.
+    """
+
+    def __init__(self, redis_client: redis.asyncio.Redis, **kwargs):
+        super().__init__(redis_client, **kwargs)
+
+    async def enqueue(self, task_id: str, request: CoveragePredictionRequest) -> None:
+        """Asynchronous `RedisJobQueue.enqueue`."""
+        if self.max_queue and await self.depth() >= self.max_queue:
+            raise self._full_error()
+
+        await self.redis_client.lpush(self.queue_name, self._payload(task_id, request))
+        logger.debug(f"Enqueued task {task_id} on '{self.queue_name}'.")
+
+    async def enqueue_terrain(self, batch_id: str, requests: List[CoveragePredictionRequest]) -> None:
+        """Asynchronous `RedisJobQueue.enqueue_terrain`."""
+        if self.max_queue and await self.depth() >= self.max_queue:
+            raise self._full_error()
+
+        await self.redis_client.lpush(self.queue_name, self._terrain_payload(batch_id, requests))
+        logger.debug(f"Enqueued the terrain of batch {batch_id} on '{self.queue_name}'.")
+
+    async def depth(self) -> int:
+        """Asynchronous `RedisJobQueue.depth`."""
+        return await self.redis_client.llen(self.queue_name)
@@ -0,0 +1,507 @@
+import io
+import json
+import logging
+import math
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import rasterio
+from rasterio.enums import Resampling
+from rasterio.transform import Affine
+from rasterio.warp import reproject
+from rasterio.windows import Window, transform as window_transform
+
+from app.models.CoveragePredictionRequest import CoveragePredictionRequest
+from app.services.splat import EARTH_RADIUS, SIGNAL_NODATA, Splat
+
+
+logger = logging.getLogger(__name__)
+
+# Best-server pixel value where no site has coverage, so a mosaic holds at most 255 sites
+BEST_SERVER_NODATA = 255
+
+# Resolution of the maps SPLAT! draws: that of the terrain, 1200 pixels per degree (3600 with -hd.sdf files)
+SPLAT_PIXELS_PER_DEGREE = 1200
+SPLAT_HD_PIXELS_PER_DEGREE = 3600
+
+
+def read_signal_geotiff(signal_data: bytes) -> Tuple[np.ndarray, Affine]:
+    """
+    Decode a signal level GeoTIFF (see `Splat.coverage_prediction_with_signal`).
+
+    Args:
+        signal_data (bytes): Binary content of the int16 signal level GeoTIFF.
+
+    Returns:
+        Tuple[np.ndarray, Affine]: The signal levels in dBm, SIGNAL_NODATA where there is no coverage, and
+            their geotransform in EPSG:4326.
+    """
+    with rasterio.MemoryFile(signal_data) as memfile:
+        with memfile.open() as src:
+            return src.read(1, masked=True).filled(SIGNAL_NODATA), src.transform
+
+
+def common_grid(sites: List[Tuple[np.ndarray, Affine]]) -> Tuple[Affine, int, int]:
+    """
+    Smallest EPSG:4326 grid covering every site, at the finest resolution among them.
+
+    Args:
+        sites (List[Tuple[np.ndarray, Affine]]): Signal levels and geotransform of each site.
+
+    Returns:
+        Tuple[Affine, int, int]: The geotransform, width and height of the grid.
+    """
+    res_x = min(abs(transform.a) for _, transform in sites)
+    res_y = min(abs(transform.e) for _, transform in sites)
+    west = min(transform.c for _, transform in sites)
+    north = max(transform.f for _, transform in sites)
+    east = max(transform.c + signal.shape[1] * transform.a for signal, transform in sites)
+    south = min(transform.f + signal.shape[0] * transform.e for signal, transform in sites)
+
+    width = math.ceil((east - west) / res_x - 1e-6)
+    height = math.ceil((north - south) / res_y - 1e-6)
+    return Affine(res_x, 0.0, west, 0.0, -res_y, north), width, height
+
+
+def estimate_composite_pixels(requests: List[CoveragePredictionRequest]) -> int:
+    """
+    Upper bound of the number of pixels of the best-server composite of several predictions.
+
+    Each prediction is taken to cover its radius rounded out to whole terrain tiles, at the resolution of its
+    terrain, and the composite the bounding box of them all at the finest resolution (see `common_grid`).
+    Checking it before running a batch rejects composites too large to build before any work is done.
+
+    Args:
+        requests (List[CoveragePredictionRequest]): The coverage prediction requests.
+
+    Returns:
+        int: The estimated width times height of the composite.
+    """
+    south, west, north, east = 90.0, 180.0, -90.0, -180.0
+    pixels_per_degree = SPLAT_PIXELS_PER_DEGREE
+    for request in requests:
+        request = Splat.normalize_request(request)
+        lat_radius = math.degrees(request.radius / EARTH_RADIUS)
+        lon_radius = min(lat_radius / max(math.cos(math.radians(request.lat)), 1e-6), 180.0)
+        south = min(south, max(math.floor(request.lat - lat_radius), -90))
+        north = max(north, min(math.ceil(request.lat + lat_radius), 90))
+        west = min(west, math.floor(request.lon - lon_radius))
+        east = max(east, math.ceil(request.lon + lon_radius))
+        if request.high_resolution:
+            pixels_per_degree = SPLAT_HD_PIXELS_PER_DEGREE
+
+    return round((north - south) * pixels_per_degree) * round((east - west) * pixels_per_degree)
+
+
+def site_window(
+    shape: Tuple[int, int], transform: Affine, grid_transform: Affine, grid_shape: Tuple[int, int]
+) -> Optional[Window]:
+    """
+    Window of a grid covered by a site's signal levels.
+
+    Args:
+        shape (Tuple[int, int]): Height and width of the site's signal levels.
+        transform (Affine): Geotransform of the site's signal levels.
+        grid_transform (Affine): Geotransform of the grid.
+        grid_shape (Tuple[int, int]): Height and width of the grid.
+
+    Returns:
+        Optional[Window]: The whole pixel window of the grid, or None if the site is outside the grid.
+    """
+    inverse = ~grid_transform
+    left, top = inverse * (transform.c, transform.f)
+    right, bottom = inverse * (transform.c + shape[1] * transform.a, transform.f + shape[0] * transform.e)
+
+    col_start, row_start = max(0, math.floor(left + 1e-6)), max(0, math.floor(top + 1e-6))
+    col_stop = min(grid_shape[1], math.ceil(right - 1e-6))
+    row_stop = min(grid_shape[0], math.ceil(bottom - 1e-6))
+    if col_stop <= col_start or row_stop <= row_start:
+        return None
+    return Window(col_start, row_start, col_stop - col_start, row_stop - row_start)
+
+
+def resample_to_window(signal: np.ndarray, transform: Affine, window: Window, grid_transform: Affine) -> np.ndarray:
+    """
+    Resample a site's signal levels onto a window of a grid with nearest neighbour resampling.
+
+    On grids with the same resolution and alignment as the site this is an exact copy of the levels.
+
+    Args:
+        signal (np.ndarray): Signal levels of the site in dBm.
+        transform (Affine): Geotransform of the site's signal levels.
+        window (Window): Window of the grid (see `site_window`).
+        grid_transform (Affine): Geotransform of the grid.
+
+    Returns:
+        np.ndarray: int16 signal levels of the window, SIGNAL_NODATA outside the site.
+    """
+    resampled = np.full((int(window.height), int(window.width)), SIGNAL_NODATA, dtype=np.int16)
+    reproject(
+        source=signal,
+        destination=resampled,
+        src_transform=transform,
+        src_crs="EPSG:4326",
+        src_nodata=SIGNAL_NODATA,
+        dst_transform=window_transform(window, grid_transform),
+        dst_crs="EPSG:4326",
+        dst_nodata=SIGNAL_NODATA,
+        resampling=Resampling.nearest,
+    )
+    return resampled
+
+
+def composite_signals(
+    sites: List[Optional[Tuple[np.ndarray, Affine]]], max_pixels: Optional[int] = None
+) -> Tuple[np.ndarray, np.ndarray, Affine]:
+    """
+    Combine the signal levels of several sites into their best-server composite on a common grid.
+
+    Every pixel holds the strongest signal of any site and the index of that site. Each site is resampled
+    only onto the window it covers and merged with whole-array comparisons, so the cost grows with the
+    sites' areas rather than with the number of sites times the mosaic area.
+
+    Args:
+        sites (List[Optional[Tuple[np.ndarray, Affine]]]): Signal levels and geotransform of each site, or
+            None for a site without results, which keeps its index but is left out.
+        max_pixels (Optional[int]): Maximum width times height of the composite grid, or None for no limit.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, Affine]: The strongest int16 signal levels in dBm (SIGNAL_NODATA
+            without coverage), the uint8 index of the best site (BEST_SERVER_NODATA without coverage) and
+            their geotransform in EPSG:4326.
+
+    Raises:
+        ValueError: If there are no sites, more than a uint8 best-server index can hold, or if the grid would
+            exceed `max_pixels`.
+    """
+    present = [site for site in sites if site is not None]
+    if not present:
+        raise ValueError("A composite needs at least one site.")
+    if len(sites) >= BEST_SERVER_NODATA:
+        raise ValueError(f"A composite holds at most {BEST_SERVER_NODATA - 1} sites, got {len(sites)}.")
+
+    grid_transform, width, height = common_grid(present)
+    if max_pixels is not None and width * height > max_pixels:
+        raise ValueError(f"A composite of {width}x{height} pixels exceeds the limit of {max_pixels} pixels.")
+
+    signal = np.full((height, width), SIGNAL_NODATA, dtype=np.int16)
+    best_server = np.full((height, width), BEST_SERVER_NODATA, dtype=np.uint8)
+
+    for index, site in enumerate(sites):
+        if site is None:
+            continue
+        site_signal, transform = site
+        window = site_window(site_signal.shape, transform, grid_transform, (height, width))
+        if window is None:
+            continue
+        rows, cols = window.toslices()
+        resampled = resample_to_window(site_signal, transform, window, grid_transform)
+
+        stronger = resampled > signal[rows, cols]
+        np.copyto(signal[rows, cols], resampled, where=stronger)
+        np.copyto(best_server[rows, cols], np.uint8(index), where=stronger)
+
+    return signal, best_server, grid_transform
+
+
+def create_best_server_geotiff(best_server: np.ndarray, transform: Affine) -> bytes:
+    """
+    Generate a single-band uint8 GeoTIFF of best-server site indexes, with BEST_SERVER_NODATA as NoData.
+
+    Args:
+        best_server (np.ndarray): Index of the best site of each pixel.
+        transform (Affine): Geotransform of the indexes in EPSG:4326.
+
+    Returns:
+        bytes: The binary content of the GeoTIFF file.
+    """
+    height, width = best_server.shape
+    with io.BytesIO() as buffer:
+        with rasterio.open(
+            buffer,
+            "w",
+            driver="GTiff",
+            height=height,
+            width=width,
+            count=1,
+            dtype="uint8",
+            crs="EPSG:4326",
+            transform=transform,
+            compress="deflate",
+            nodata=BEST_SERVER_NODATA,
+        ) as dst:
+            dst.write(best_server, 1)
+
+        return buffer.getvalue()
+
+
+def composite_layers(
+    signal: np.ndarray,
+    best_server: np.ndarray,
+    transform: Affine,
+    colormap_name: str,
+    min_dbm: float,
+    max_dbm: float,
+    profile: str = "geotiff",
+    compression: str = "lzw",
+    predictor: bool = False,
+) -> Dict[str, bytes]:
+    """
+    Encode a best-server composite (see `composite_signals`) as GeoTIFFs.
+
+    Returns:
+        Dict[str, bytes]: The "coverage" palette GeoTIFF (like a /result), the int16 "signal" levels and the
+            uint8 "best_server" site indexes.
+    """
+    indexes = Splat._palette_indexes(signal, min_dbm, max_dbm)
+    return {
+        "coverage": Splat._create_palette_geotiff(
+            indexes, transform, colormap_name, min_dbm, max_dbm,
+            profile=profile, compression=compression, predictor=predictor,
+        ),
+        "signal": Splat._create_signal_geotiff(signal, transform),
+        "best_server": create_best_server_geotiff(best_server, transform),
+    }
+
+
+def render_composite(
+    signal_geotiffs: List[Optional[bytes]],
+    colormap_name: str,
+    min_dbm: float,
+    max_dbm: float,
+    profile: str = "geotiff",
+    compression: str = "lzw",
+    predictor: bool = False,
+    max_pixels: Optional[int] = None,
+) -> Dict[str, bytes]:
+    """
+    Build the best-server composite of several predictions as GeoTIFFs.
+
+    Args:
+        signal_geotiffs (List[Optional[bytes]]): Signal level GeoTIFF of each site, or None for a site
+            without results.
+        colormap_name (str): Name of the matplotlib colormap of the coverage layer.
+        min_dbm (float): Minimum dBm value for the colormap scale.
+        max_dbm (float): Maximum dBm value for the colormap scale.
+        profile (str): GeoTIFF layout of the coverage layer, "geotiff" or "cog". Defaults to "geotiff".
+        compression (str): Compression codec of the coverage layer. Defaults to "lzw".
+        predictor (bool): Apply horizontal differencing to the coverage layer. Defaults to False.
+        max_pixels (Optional[int]): Maximum width times height of the composite, or None for no limit.
+
+    Returns:
+        Dict[str, bytes]: The "coverage" palette GeoTIFF (like a /result), the int16 "signal" levels and the
+            uint8 "best_server" site indexes.
+
+    Raises:
+        ValueError: If the sites cannot make a composite, e.g. one exceeding `max_pixels` (see `composite_signals`).
+        RuntimeError: If the composite cannot be built.
+    """
+    try:
+        sites = [read_signal_geotiff(data) if data is not None else None for data in signal_geotiffs]
+        signal, best_server, transform = composite_signals(sites, max_pixels)
+        return composite_layers(
+            signal, best_server, transform, colormap_name, min_dbm, max_dbm, profile, compression, predictor
+        )
+    except ValueError:
+        raise
+    except Exception as e:
+        logger.error(f"Error building composite: {e}")
+        raise RuntimeError(f"Error building composite: {e}")
+
+
+class NetworkMosaic:
+    def __init__(self, res_x: float, res_y: float):
+        """
+        Running best-server composite of a network of sites, updated one site at a time.
+
+        The composite lives on a grid anchored at 180°W, 90°N with a fixed resolution, so it only ever grows
+        by whole pixels to take in a new site and never has to be resampled. Adding a site merges it into
+        the window it covers; removing one clears its window and merges the other sites overlapping that
+        window again. Neither touches the rest of the mosaic.
+
+        Each site gets a slot, its index in the best-server layer; slots of removed sites are reused.
+
+        Args:
+            res_x (float): Width of a pixel in degrees.
+            res_y (float): Height of a pixel in degrees.
+        """
+        self.res_x = res_x
+        self.res_y = res_y
+        self.col_offset = 0  # grid origin, in pixels from 180°W
+        self.row_offset = 0  # grid origin, in pixels from 90°N
+        self.signal = np.full((0, 0), SIGNAL_NODATA, dtype=np.int16)
+        self.best_server = np.full((0, 0), BEST_SERVER_NODATA, dtype=np.uint8)
+        self.sites = {}  # slot -> {"bounds": (col_start, row_start, col_stop, row_stop) from 180°W / 90°N, ...}
+
+    @property
+    def transform(self) -> Affine:
+        """Geotransform of the mosaic in EPSG:4326."""
+        return Affine(
+            self.res_x, 0.0, -180.0 + self.col_offset * self.res_x,
+            0.0, -self.res_y, 90.0 - self.row_offset * self.res_y,
+        )
+
+    def _site_bounds(self, shape: Tuple[int, int], transform: Affine) -> Tuple[int, int, int, int]:
+        """Whole pixel bounds of a site on the global grid of the mosaic."""
+        west, north = transform.c, transform.f
+        east, south = west + shape[1] * transform.a, north + shape[0] * transform.e
+        return (
+            math.floor((west + 180.0) / self.res_x + 1e-6),
+            math.floor((90.0 - north) / self.res_y + 1e-6),
+            math.ceil((east + 180.0) / self.res_x - 1e-6),
+            math.ceil((90.0 - south) / self.res_y - 1e-6),
+        )
+
+    def _window(self, bounds: Tuple[int, int, int, int]) -> Window:
+        """Window of the mosaic arrays for global pixel bounds."""
+        col_start, row_start, col_stop, row_stop = bounds
+        return Window(
+            col_start - self.col_offset, row_start - self.row_offset, col_stop - col_start, row_stop - row_start
+        )
+
+    def _grow(self, bounds: Tuple[int, int, int, int]) -> None:
+        """Pad the mosaic so that it covers global pixel bounds."""
+        height, width = self.signal.shape
+        if not self.sites:
+            col_start, row_start, col_stop, row_stop = bounds
+        else:
+            col_start = min(bounds[0], self.col_offset)
+            row_start = min(bounds[1], self.row_offset)
+            col_stop = max(bounds[2], self.col_offset + width)
+            row_stop = max(bounds[3], self.row_offset + height)
+
+        if (col_start, row_start, col_stop - col_start, row_stop - row_start) == (
+            self.col_offset, self.row_offset, width, height
+        ):
+            return
+
+        signal = np.full((row_stop - row_start, col_stop - col_start), SIGNAL_NODATA, dtype=np.int16)
+        best_server = np.full(signal.shape, BEST_SERVER_NODATA, dtype=np.uint8)
+        if self.sites:
+            rows = slice(self.row_offset - row_start, self.row_offset - row_start + height)
+            cols = slice(self.col_offset - col_start, self.col_offset - col_start + width)
+            signal[rows, cols] = self.signal
+            best_server[rows, cols] = self.best_server
+
+        self.signal, self.best_server = signal, best_server
+        self.col_offset, self.row_offset = col_start, row_start
+
+    def _merge(self, slot: int, signal: np.ndarray, transform: Affine, window: Window) -> None:
+        """Merge a site's signal levels into a window of the mosaic, where they are stronger."""
+        rows, cols = window.toslices()
+        resampled = resample_to_window(signal, transform, window, self.transform)
+        stronger = resampled > self.signal[rows, cols]
+        np.copyto(self.signal[rows, cols], resampled, where=stronger)
+        np.copyto(self.best_server[rows, cols], np.uint8(slot), where=stronger)
+
+    def copy(self) -> "NetworkMosaic":
+        """Copy of the mosaic that can be changed while the original is still being read."""
+        mosaic = NetworkMosaic(self.res_x, self.res_y)
+        mosaic.col_offset, mosaic.row_offset = self.col_offset, self.row_offset
+        mosaic.signal, mosaic.best_server = self.signal.copy(), self.best_server.copy()
+        mosaic.sites = {slot: dict(site) for slot, site in self.sites.items()}
+        return mosaic
+
+    def add(
+        self, signal: np.ndarray, transform: Affine, max_pixels: Optional[int] = None, **metadata
+    ) -> Tuple[int, Window]:
+        """
+        Add a site to the network.
+
+        Args:
+            signal (np.ndarray): Signal levels of the site in dBm (see `read_signal_geotiff`).
+            transform (Affine): Geotransform of the site's signal levels.
+            max_pixels (Optional[int]): Maximum width times height of the mosaic, or None for no limit.
+            **metadata: Fields kept with the site, e.g. its task ID and name.
+
+        Returns:
+            Tuple[int, Window]: The slot of the site, and the window of the mosaic it updated.
+
+        Raises:
+            ValueError: If the network already has the maximum number of sites, or if the mosaic would grow
+                beyond `max_pixels`. The mosaic is left unchanged.
+        """
+        slot = next((slot for slot in range(BEST_SERVER_NODATA) if slot not in self.sites), None)
+        if slot is None:
+            raise ValueError(f"A network holds at most {BEST_SERVER_NODATA} sites.")
+
+        bounds = self._site_bounds(signal.shape, transform)
+        if max_pixels is not None:
+            col_start, row_start, col_stop, row_stop = bounds
+            if self.sites:
+                height, width = self.signal.shape
+                col_start, row_start = min(col_start, self.col_offset), min(row_start, self.row_offset)
+                col_stop, row_stop = max(col_stop, self.col_offset + width), max(row_stop, self.row_offset + height)
+            width, height = col_stop - col_start, row_stop - row_start
+            if width * height > max_pixels:
+                raise ValueError(f"A network of {width}x{height} pixels exceeds the limit of {max_pixels} pixels.")
+
+        self._grow(bounds)
+        self.sites[slot] = {**metadata, "bounds": bounds}
+
+        window = self._window(bounds)
+        self._merge(slot, signal, transform, window)
+        return slot, window
+
+    def remove(self, slot: int, load_site: Callable[[int], Tuple[np.ndarray, Affine]]) -> Window:
+        """
+        Remove a site from the network and recompute the window it covered.
+
+        Args:
+            slot (int): The slot of the site.
+            load_site (Callable[[int], Tuple[np.ndarray, Affine]]): Returns the signal levels and geotransform
+                of another site of the network overlapping the window.
+
+        Returns:
+            Window: The window of the mosaic that was recomputed.
+
+        Raises:
+            KeyError: If there is no site in the slot.
+        """
+        col_start, row_start, col_stop, row_stop = self.sites.pop(slot)["bounds"]
+        window = self._window((col_start, row_start, col_stop, row_stop))
+        rows, cols = window.toslices()
+        self.signal[rows, cols] = SIGNAL_NODATA
+        self.best_server[rows, cols] = BEST_SERVER_NODATA
+
+        for other_slot, site in sorted(self.sites.items()):
+            other = site["bounds"]
+            overlap = (
+                max(col_start, other[0]), max(row_start, other[1]), min(col_stop, other[2]), min(row_stop, other[3])
+            )
+            if overlap[2] > overlap[0] and overlap[3] > overlap[1]:
+                other_signal, other_transform = load_site(other_slot)
+                self._merge(other_slot, other_signal, other_transform, self._window(overlap))
+
+        return window
+
+    def to_bytes(self) -> bytes:
+        """Serialize the mosaic."""
+        state = {
+            "res_x": self.res_x,
+            "res_y": self.res_y,
+            "col_offset": self.col_offset,
+            "row_offset": self.row_offset,
+            "sites": {str(slot): site for slot, site in self.sites.items()},
+        }
+        with io.BytesIO() as buffer:
+            np.savez_compressed(
+                buffer, signal=self.signal, best_server=self.best_server, state=np.array(json.dumps(state))
+            )
+            return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "NetworkMosaic":
+        """Deserialize a mosaic written by `to_bytes`."""
+        with np.load(io.BytesIO(data)) as arrays:
+            state = json.loads(str(arrays["state"]))
+            mosaic = cls(state["res_x"], state["res_y"])
+            mosaic.signal = arrays["signal"]
+            mosaic.best_server = arrays["best_server"]
+
+        mosaic.col_offset = state["col_offset"]
+        mosaic.row_offset = state["row_offset"]
+        mosaic.sites = {
+            int(slot): {**site, "bounds": tuple(site["bounds"])} for slot, site in state["sites"].items()
+        }
+        return mosaic
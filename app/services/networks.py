@@ -0,0 +1,256 @@
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+from uuid import uuid4
+
+import redis.asyncio
+from starlette.concurrency import run_in_threadpool
+
+from app.services.mosaic import NetworkMosaic, composite_layers, read_signal_geotiff
+from app.services.result_store import ResultStore, StoredResult
+
+
+logger = logging.getLogger(__name__)
+
+
+class NetworkRegistry:
+    def __init__(
+        self,
+        redis_client: redis.asyncio.Redis,
+        result_store: ResultStore,
+        network_store: ResultStore,
+        ttl: int = 86400,
+        prefix: str = "network",
+        max_cached: int = 8,
+        max_pixels: Optional[int] = None,
+    ):
+        """
+        Server-side networks: sets of completed predictions with a running best-server composite.
+
+        A network is a Redis record (its output settings and version) plus, in the network store, its
+        NetworkMosaic and a copy of the signal levels of every site, so it outlives the tasks it was built
+        from. The mosaic is only updated incrementally and cannot be rebuilt once the tasks have expired, so
+        the network store must not evict anything before it expires with the network; every change keeps the
+        site copies alive for another `ttl`. The rendered layers of each version can be rendered again from
+        the mosaic and are kept in the result store.
+
+        Adding or removing a site updates the mosaic window that site covers (see `NetworkMosaic`)
+        under a Redis lock, so concurrent changes from several API processes are serialized. The mosaics
+        of recently changed networks are also kept in memory, keyed by version, to skip decoding them; a
+        change works on a copy, so a version being rendered meanwhile is never modified.
+
+        Args:
+            redis_client (redis.asyncio.Redis): Redis client shared with the task status keys.
+            result_store (ResultStore): Store holding the task results and the rendered layers.
+            network_store (ResultStore): Store holding the mosaics and site copies, without eviction (see
+                `config.create_network_store`).
+            ttl (int): Lifetime of a network in seconds since its last change. Defaults to 24 hours.
+            prefix (str): Prefix for the Redis and result store keys of the networks. Defaults to `network`.
+            max_cached (int): Maximum number of mosaics kept in memory. Defaults to 8.
+            max_pixels (Optional[int]): Maximum width times height of a network's mosaic, or None for no limit.
+        """
+        self.redis_client = redis_client
+        self.result_store = result_store
+        self.network_store = network_store
+        self.ttl = ttl
+        self.prefix = prefix
+        self.max_cached = max_cached
+        self.max_pixels = max_pixels
+
+        self._mosaics: "OrderedDict[str, Tuple[int, NetworkMosaic]]" = OrderedDict()
+        self._mosaics_lock = threading.Lock()
+
+    def _key(self, network_id: str, suffix: str = "") -> str:
+        return f"{self.prefix}:{network_id}{suffix}"
+
+    async def create(self, output: dict) -> str:
+        """
+        Create an empty network.
+
+        Args:
+            output (dict): Output settings of the coverage layer: colormap, min_dbm, max_dbm, output_profile,
+                compression and predictor.
+
+        Returns:
+            str: The network ID.
+        """
+        network_id = str(uuid4())
+        record = {"output": output, "version": 0, "sites": {}}
+        await self.redis_client.setex(self._key(network_id), self.ttl, json.dumps(record))
+        return network_id
+
+    async def get(self, network_id: str) -> Optional[dict]:
+        """Return the record of a network (output settings, version and sites by slot), or None."""
+        record = await self.redis_client.get(self._key(network_id))
+        return json.loads(record) if record else None
+
+    def _load_mosaic(self, network_id: str, version: int, copy: bool = False) -> Optional[NetworkMosaic]:
+        """Return a version of a network's mosaic, or a copy of the one in memory if `copy` is set to change it."""
+        with self._mosaics_lock:
+            cached = self._mosaics.get(network_id)
+            if cached is not None and cached[0] == version:
+                self._mosaics.move_to_end(network_id)
+                return cached[1].copy() if copy else cached[1]
+
+        data = self.network_store.get(self._key(network_id, f":mosaic:{version}"))
+        return NetworkMosaic.from_bytes(data) if data is not None else None
+
+    def _save_mosaic(self, network_id: str, version: int, mosaic: NetworkMosaic) -> None:
+        """Store a new version of a network's mosaic, and keep the copies of its sites as long."""
+        self.network_store.put(self._key(network_id, f":mosaic:{version}"), mosaic.to_bytes(), self.ttl)
+        # the previous version stays for layers being rendered meanwhile, older ones are no longer read
+        self.network_store.delete(self._key(network_id, f":mosaic:{version - 2}"))
+        for slot in mosaic.sites:
+            self.network_store.touch(self._key(network_id, f":site:{slot}"), self.ttl)
+        with self._mosaics_lock:
+            self._mosaics[network_id] = (version, mosaic)
+            self._mosaics.move_to_end(network_id)
+            while len(self._mosaics) > self.max_cached:
+                self._mosaics.popitem(last=False)
+
+    async def _save_record(self, network_id: str, record: dict, mosaic: NetworkMosaic) -> None:
+        record["sites"] = {
+            str(slot): {key: value for key, value in site.items() if key != "bounds"}
+            for slot, site in sorted(mosaic.sites.items())
+        }
+        await self.redis_client.setex(self._key(network_id), self.ttl, json.dumps(record))
+
+    async def add_site(self, network_id: str, task_id: str, name: Optional[str] = None) -> dict:
+        """
+        Add the result of a completed task to a network.
+
+        Args:
+            network_id (str): The network ID.
+            task_id (str): The ID of a completed task.
+            name (Optional[str]): Name of the site.
+
+        Returns:
+            dict: The slot of the site (its best-server index), the new network version and the updated
+                window of the mosaic.
+
+        Raises:
+            KeyError: If the network is not found.
+            ValueError: If the task is not completed, its result or the network mosaic has expired, or the
+                mosaic would exceed `max_pixels`.
+        """
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            pipe.get(f"{task_id}:status")
+            pipe.get(f"{task_id}:signal")
+            status, signal_key = await pipe.execute()
+        if status != b"completed" or not signal_key:
+            raise ValueError(f"Task {task_id} is not completed.")
+
+        signal_data = await run_in_threadpool(self.result_store.get, signal_key.decode("utf-8"))
+        if signal_data is None:
+            raise ValueError(f"Result of task {task_id} has expired.")
+
+        async with self.redis_client.lock(self._key(network_id, ":lock"), timeout=60, blocking_timeout=30):
+            record = await self.get(network_id)
+            if record is None:
+                raise KeyError(network_id)
+            version = record["version"] + 1
+
+            def update():
+                signal, transform = read_signal_geotiff(signal_data)
+                mosaic = self._load_mosaic(network_id, record["version"], copy=True) if record["sites"] else None
+                if record["sites"] and mosaic is None:
+                    raise ValueError(f"Mosaic of network {network_id} has expired.")
+                mosaic = mosaic or NetworkMosaic(abs(transform.a), abs(transform.e))
+
+                slot, window = mosaic.add(signal, transform, self.max_pixels, task_id=task_id, name=name)
+                self.network_store.put(self._key(network_id, f":site:{slot}"), signal_data, self.ttl)
+                self._save_mosaic(network_id, version, mosaic)
+                return mosaic, slot, window
+
+            mosaic, slot, window = await run_in_threadpool(update)
+            record["version"] = version
+            await self._save_record(network_id, record, mosaic)
+
+        logger.info(f"Added task {task_id} to network {network_id} as site {slot}, updating {window}.")
+        return {"slot": slot, "version": version, "window": window.todict()}
+
+    async def remove_site(self, network_id: str, slot: int) -> dict:
+        """
+        Remove a site from a network.
+
+        Args:
+            network_id (str): The network ID.
+            slot (int): The slot of the site.
+
+        Returns:
+            dict: The new network version and the recomputed window of the mosaic.
+
+        Raises:
+            KeyError: If the network or the site is not found.
+            ValueError: If the network mosaic or the result of an overlapping site has expired.
+        """
+        async with self.redis_client.lock(self._key(network_id, ":lock"), timeout=60, blocking_timeout=30):
+            record = await self.get(network_id)
+            if record is None or str(slot) not in record["sites"]:
+                raise KeyError(network_id if record is None else slot)
+            version = record["version"] + 1
+
+            def load_site(other_slot: int):
+                data = self.network_store.get(self._key(network_id, f":site:{other_slot}"))
+                if data is None:
+                    raise ValueError(f"Site {other_slot} of network {network_id} has expired.")
+                return read_signal_geotiff(data)
+
+            def update():
+                mosaic = self._load_mosaic(network_id, record["version"], copy=True)
+                if mosaic is None:
+                    raise ValueError(f"Mosaic of network {network_id} has expired.")
+                window = mosaic.remove(slot, load_site)
+                self._save_mosaic(network_id, version, mosaic)
+                self.network_store.delete(self._key(network_id, f":site:{slot}"))
+                return mosaic, window
+
+            mosaic, window = await run_in_threadpool(update)
+            record["version"] = version
+            await self._save_record(network_id, record, mosaic)
+
+        logger.info(f"Removed site {slot} from network {network_id}, recomputing {window}.")
+        return {"version": version, "window": window.todict()}
+
+    async def layer(self, network_id: str, layer: str) -> Optional[StoredResult]:
+        """
+        Open a layer of the composite of a network, rendering the current version if needed.
+
+        Args:
+            network_id (str): The network ID.
+            layer (str): "coverage", "signal" or "best_server" (see `composite_layers`).
+
+        Returns:
+            Optional[StoredResult]: The GeoTIFF of the layer, or None if the network has no sites.
+
+        Raises:
+            KeyError: If the network is not found.
+            ValueError: If the network mosaic has expired.
+        """
+        record = await self.get(network_id)
+        if record is None:
+            raise KeyError(network_id)
+        if not record["sites"]:
+            return None
+
+        version = record["version"]
+        result = await run_in_threadpool(self.result_store.open, self._key(network_id, f":{layer}:{version}"))
+        if result is not None:
+            return result
+
+        def render():
+            mosaic = self._load_mosaic(network_id, version)
+            if mosaic is None:
+                raise ValueError(f"Mosaic of network {network_id} has expired.")
+            output = record["output"]
+            layers = composite_layers(
+                mosaic.signal, mosaic.best_server, mosaic.transform, output["colormap"], output["min_dbm"],
+                output["max_dbm"], output["output_profile"], output["compression"], output["predictor"],
+            )
+            for name, data in layers.items():
+                self.result_store.put(self._key(network_id, f":{name}:{version}"), data, self.ttl)
+            return self.result_store.open(self._key(network_id, f":{layer}:{version}"))
+
+        return await run_in_threadpool(render)
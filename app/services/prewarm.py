@@ -0,0 +1,251 @@
+"""
+Terrain cache pre-warming
+
+Downloads and converts the terrain tiles of a region or of a list of sites ahead of time, so the first
+predictions after a deploy or a cache wipe do not pay for S3 and the .sdf conversion. Tiles are prepared with
+`Splat._prepare_terrain_tile`, which fills the raw and .sdf tiers of the terrain cache and records missing tiles
+in the tile index; tiles already in the .sdf tier are skipped.
+
+Run it at container start or nightly, with the same cache directories (environment) as the SPLAT! workers:
+
+    python -m app.services.prewarm --bbox 44 -80 47 -72
+    python -m app.services.prewarm --site 45.42 -75.69 50000 --site 43.65 -79.38 100000
+    python -m app.services.prewarm --replay requests.log --rate 2
+
+The same is available to administrators as the /admin/prewarm endpoint of the API in local queue mode.
+"""
+
+import argparse
+import json
+import logging
+import math
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from app import config
+from app.models.CoveragePredictionRequest import CoveragePredictionRequest
+from app.services.splat import Splat
+
+logger = logging.getLogger(__name__)
+
+# A transmitter site to pre-warm the terrain of: latitude, longitude (degrees) and radius (meters)
+Site = Tuple[float, float, float]
+
+
+def _tile_name(lat_tile: int, lon_tile: int) -> str:
+    ns = "N" if lat_tile >= 0 else "S"
+    ew = "E" if lon_tile >= 0 else "W"
+    return f"{ns}{abs(lat_tile):02d}{ew}{abs(lon_tile):03d}.hgt.gz"
+
+
+def tiles_in_bbox(south: float, west: float, north: float, east: float) -> List[str]:
+    """
+    Terrain tiles (.hgt.gz names) covering a bounding box.
+
+    Args:
+        south (float): Southern latitude in degrees.
+        west (float): Western longitude in degrees.
+        north (float): Northern latitude in degrees.
+        east (float): Eastern longitude in degrees, less than `west` if the box crosses the antimeridian.
+
+    Returns:
+        List[str]: The tile names.
+    """
+    if not all(math.isfinite(value) for value in (south, west, north, east)):
+        raise ValueError("The bounding box is not made of finite numbers.")
+    if south > north:
+        raise ValueError("The southern latitude of the bounding box is north of its northern latitude.")
+
+    if east < west:
+        east += 360
+    lon_range = range(math.floor(west), max(math.ceil(east), math.floor(west) + 1))
+    lon_tiles = sorted({(tile + 180) % 360 - 180 for tile in lon_range})
+    lat_tiles = range(max(math.floor(south), -90), min(max(math.ceil(north), math.floor(south) + 1), 90))
+
+    return [_tile_name(lat_tile, lon_tile) for lat_tile in lat_tiles for lon_tile in lon_tiles]
+
+
+def tiles_for_sites(sites: Iterable[Site]) -> List[str]:
+    """
+    Terrain tiles (.hgt.gz names) needed by predictions of the given sites, without duplicates.
+
+    Args:
+        sites (Iterable[Site]): Latitude, longitude and radius of each site. Radii are capped like predictions.
+
+    Returns:
+        List[str]: The tile names, in order of first use.
+    """
+    tiles = {}
+    for lat, lon, radius in sites:
+        for tile in Splat._calculate_required_terrain_tiles(lat, lon, min(radius, 100000.0)):
+            tiles.setdefault(tile[0], None)
+    return list(tiles)
+
+
+def sites_from_request_log(lines: Iterable[str]) -> List[Site]:
+    """
+    Sites of the coverage prediction requests in a log, to replay the terrain of past traffic.
+
+    Each line holding a JSON object with `lat` and `lon` counts as a request, whether it is a bare /predict
+    payload (JSON lines) or follows a log prefix, as in the "Coverage prediction request: {...}" debug logs.
+    Requests without a radius get the default radius of a prediction. Requests whose latitude, longitude or
+    radius is not a finite number (JSON allows NaN and Infinity) are skipped like malformed lines.
+
+    Args:
+        lines (Iterable[str]): The lines of the log.
+
+    Returns:
+        List[Site]: The latitude, longitude and radius of each request, without duplicates.
+    """
+    default_radius = CoveragePredictionRequest.model_fields["radius"].default
+    sites = {}
+    for line in lines:
+        start = line.find("{")
+        if start < 0:
+            continue
+        try:
+            payload = json.loads(line[start:])
+            site = (float(payload["lat"]), float(payload["lon"]), float(payload.get("radius", default_radius)))
+        except (ValueError, KeyError, TypeError):
+            continue
+        if not all(math.isfinite(value) for value in site):
+            continue
+        sites.setdefault(site, None)
+    return list(sites)
+
+
+class _RateLimiter:
+    def __init__(self, rate: Optional[float]):
+        """Spaces out calls to `wait` to at most `rate` per second across threads (no limit if None)."""
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+def prewarm(
+    splat_service: Splat,
+    tile_names: List[str],
+    high_resolution: bool = False,
+    workers: int = 4,
+    rate: Optional[float] = None,
+    progress: Optional[Callable[[dict], None]] = None,
+) -> dict:
+    """
+    Prepare terrain tiles in the terrain cache, several at a time.
+
+    Args:
+        splat_service (Splat): The SPLAT! service whose terrain cache is filled.
+        tile_names (List[str]): The .hgt.gz names of the tiles.
+        high_resolution (bool): Whether to prepare -hd.sdf files instead of .sdf files. Defaults to False.
+        workers (int): Number of tiles prepared concurrently. Defaults to 4.
+        rate (Optional[float]): Maximum number of tiles started per second (cached tiles excepted), to limit
+            the load on S3 and on the instance, or None for no limit. Defaults to None.
+        progress (Optional[Callable[[dict], None]]): Called with the counters after each tile.
+
+    Returns:
+        dict: The number of tiles in total, done, already cached, prepared and failed.
+    """
+    counters = {"total": len(tile_names), "done": 0, "cached": 0, "prepared": 0, "failed": 0}
+    lock = threading.Lock()
+    limiter = _RateLimiter(rate)
+    availability = splat_service.tile_index.get_many(tile_names)
+
+    def prepare(tile_name: str) -> None:
+        sdf_name = Splat._hgt_filename_to_sdf_filename(tile_name, high_resolution)
+        if splat_service.terrain_cache.has_sdf(sdf_name):
+            outcome = "cached"
+        else:
+            limiter.wait()
+            try:
+                splat_service._prepare_terrain_tile(tile_name, high_resolution, availability[tile_name])
+                outcome = "prepared"
+            except Exception as e:
+                logger.warning(f"Failed to prepare terrain tile {tile_name}: {e}")
+                outcome = "failed"
+
+        with lock:
+            counters[outcome] += 1
+            counters["done"] += 1
+            snapshot = dict(counters)
+        if progress is not None:
+            progress(snapshot)
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="splat-prewarm") as executor:
+        list(executor.map(prepare, tile_names))
+
+    logger.info(
+        f"Pre-warmed {counters['total']} terrain tiles: {counters['prepared']} prepared, "
+        f"{counters['cached']} already cached, {counters['failed']} failed."
+    )
+    return counters
+
+
+def _parse_site(value: str) -> Site:
+    try:
+        lat, lon, radius = (float(part) for part in value.replace(",", " ").split())
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"'{value}' is not LAT LON RADIUS.")
+    if not all(math.isfinite(part) for part in (lat, lon, radius)):
+        raise argparse.ArgumentTypeError(f"'{value}' is not made of finite numbers.")
+    return lat, lon, radius
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Pre-warm the SPLAT! terrain cache.")
+    parser.add_argument("--bbox", nargs=4, type=float, metavar=("SOUTH", "WEST", "NORTH", "EAST"), action="append",
+                        default=[], help="Bounding box to prepare every tile of (repeatable).")
+    parser.add_argument("--site", nargs=3, metavar=("LAT", "LON", "RADIUS"), action="append", default=[],
+                        help="Site and radius in meters to prepare the tiles of (repeatable).")
+    parser.add_argument("--sites-file", help="File of sites, one 'LAT LON RADIUS' (or LAT,LON,RADIUS) per line.")
+    parser.add_argument("--replay", action="append", default=[],
+                        help="Log of past /predict requests (JSON lines or debug logs) to prepare the tiles of.")
+    parser.add_argument("--workers", type=int, default=4, help="Tiles prepared concurrently (default: 4).")
+    parser.add_argument("--rate", type=float, help="Maximum tiles started per second (default: no limit).")
+    parser.add_argument("--high-resolution", action="store_true", help="Prepare -hd.sdf files.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    sites = [_parse_site(" ".join(site)) for site in args.site]
+    if args.sites_file:
+        with open(args.sites_file) as sites_file:
+            sites += [_parse_site(line) for line in sites_file if line.strip() and not line.startswith("#")]
+    for path in args.replay:
+        with open(path) as log_file:
+            sites += sites_from_request_log(log_file)
+
+    tile_names: Dict[str, None] = {}
+    for bbox in args.bbox:
+        tile_names.update(dict.fromkeys(tiles_in_bbox(*bbox)))
+    tile_names.update(dict.fromkeys(tiles_for_sites(sites)))
+    if not tile_names:
+        parser.error("nothing to pre-warm, pass --bbox, --site, --sites-file or --replay")
+
+    splat_service = config.create_splat_service()
+    report_every = max(1, len(tile_names) // 20)
+
+    def progress(counters: dict) -> None:
+        if counters["done"] % report_every == 0 or counters["done"] == counters["total"]:
+            logger.info(f"Pre-warming: {counters['done']}/{counters['total']} tiles ({counters})")
+
+    counters = prewarm(
+        splat_service, list(tile_names), args.high_resolution, workers=args.workers, rate=args.rate, progress=progress
+    )
+    return 1 if counters["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
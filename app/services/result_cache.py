@@ -0,0 +1,308 @@
+import hashlib
+import json
+import logging
+import time
+from typing import List, Optional, Union
+
+import redis
+import redis.asyncio
+from starlette.concurrency import run_in_threadpool
+
+from app.models.CoveragePredictionRequest import CoveragePredictionRequest
+from app.services.result_store import ResultStore
+from app.services.splat import Splat
+
+
+logger = logging.getLogger(__name__)
+
+# Bump when a change to the SPLAT! pipeline makes previously cached results stale.
+CACHE_VERSION = 2
+
+# Number of least recently used entries checked for expiry on each put.
+PRUNE_BATCH = 32
+
+# Drop an entry and its size, only if it still refers to the given task (and was not cached again meanwhile).
+_DROP_SCRIPT = """
+if redis.call("GET", KEYS[1]) ~= ARGV[2] then
+    return 0
+end
+local size = tonumber(redis.call("HGET", KEYS[3], ARGV[1]) or "0")
+redis.call("DEL", KEYS[1])
+redis.call("ZREM", KEYS[2], ARGV[1])
+redis.call("HDEL", KEYS[3], ARGV[1])
+redis.call("DECRBY", KEYS[4], size)
+return 1
+"""
+
+
+def request_digest(request: CoveragePredictionRequest) -> str:
+    """
+    Stable content hash of a coverage prediction request.
+
+    The request is normalized with `Splat.normalize_request` first, so requests that only differ in
+    values the server overrides (e.g. a radius above the 100 km limit) share a digest.
+
+    Args:
+        request (CoveragePredictionRequest): The coverage prediction request object.
+
+    Returns:
+        str: Hex encoded SHA-256 digest of the canonical request.
+    """
+    canonical = json.dumps(
+        {"version": CACHE_VERSION, "request": Splat.normalize_request(request).model_dump()},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResultCacheBase:
+    def __init__(
+        self,
+        redis_client: Union[redis.StrictRedis, redis.asyncio.Redis],
+        result_store: Optional[ResultStore] = None,
+        max_bytes: int = 512 * 1024 * 1024,
+        ttl: int = 86400,
+        prefix: str = "result_cache",
+    ):
+        """
+        Content-addressed cache of completed SPLAT! predictions.
+
+        Entries map a request digest (see `request_digest`) to the ID of a completed task, whose
+        result, signal level and status keys are kept alive for `ttl` seconds. A cache hit therefore hands out a task
+        that is already complete without copying the GeoTIFF. When the cached results exceed
+        `max_bytes`, the least recently used entries are dropped and their tasks fall back to the
+        normal one hour expiry.
+
+        The bytes themselves live in the result store, which bounds its size with its own LRU and may drop
+        a result the cache still refers to. A hit is therefore only reported once the result and signal
+        levels of the task are found in the store; otherwise the entry is dropped and counted as a miss, so
+        the request runs again instead of handing out a task whose result has gone.
+
+        Results are recorded by the SPLAT! workers (see ResultCache) and looked up by the API endpoints
+        (see AsyncResultCache).
+
+        Args:
+            redis_client (Union[redis.StrictRedis, redis.asyncio.Redis]): Redis client shared with the task
+                status keys, synchronous or asyncio depending on the subclass.
+            result_store (Optional[ResultStore]): Store holding the cached results, checked on each hit. If
+                None, hits are only checked against the task keys in Redis.
+            max_bytes (int): Maximum total size of the cached results in bytes. Defaults to 512 MB.
+            ttl (int): Lifetime of a cache entry in seconds. Defaults to 24 hours.
+            prefix (str): Prefix for the Redis keys used by the cache. Defaults to `result_cache`.
+        """
+        self.redis_client = redis_client
+        self.result_store = result_store
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.prefix = prefix
+
+        self._index_key = f"{prefix}:index"  # sorted set of digests by last access time
+        self._sizes_key = f"{prefix}:sizes"  # hash of digest -> result size in bytes
+        self._bytes_key = f"{prefix}:bytes"
+        self._hits_key = f"{prefix}:hits"
+        self._misses_key = f"{prefix}:misses"
+        self._drop_script = redis_client.register_script(_DROP_SCRIPT)
+
+    def _entry_key(self, digest: str) -> str:
+        return f"{self.prefix}:{digest}"
+
+    def _drop_keys(self, digest: str) -> List[str]:
+        return [self._entry_key(digest), self._index_key, self._sizes_key, self._bytes_key]
+
+    def _stored(self, pointers: List[Optional[bytes]]) -> bool:
+        """Whether the result and signal levels the pointers of a task refer to are still in the result store."""
+        if any(pointer is None for pointer in pointers):
+            return False
+        if self.result_store is None:
+            return True
+        return all(self.result_store.exists(pointer.decode("utf-8")) for pointer in pointers)
+
+    def _stats(self, entries: int, size: Optional[bytes], hits: Optional[bytes], misses: Optional[bytes]) -> dict:
+        return {
+            "entries": entries,
+            "bytes": int(size or 0),
+            "max_bytes": self.max_bytes,
+            "ttl": self.ttl,
+            "hits": int(hits or 0),
+            "misses": int(misses or 0),
+        }
+
+
+class ResultCache(ResultCacheBase):
+    """Result cache for the SPLAT! workers, backed by a synchronous `redis.StrictRedis` client."""
+
+    def get(self, digest: str) -> Optional[str]:
+        """
+        Look up the completed task for a request digest.
+
+        Args:
+            digest (str): The request digest.
+
+        Returns:
+            Optional[str]: The ID of a completed task with the cached result, or None on a miss.
+        """
+        task_id = self.redis_client.get(self._entry_key(digest))
+        if task_id is not None:
+            task_id = task_id.decode("utf-8")
+            if self._stored(self.redis_client.mget(task_id, f"{task_id}:signal")):
+                with self.redis_client.pipeline() as pipe:
+                    pipe.zadd(self._index_key, {digest: time.time()})
+                    pipe.incr(self._hits_key)
+                    pipe.execute()
+                logger.info(f"Result cache hit: {digest} -> task {task_id}.")
+                return task_id
+
+            self._drop_script(keys=self._drop_keys(digest), args=[digest, task_id])
+            logger.info(f"Dropped {digest} from the result cache, the result of task {task_id} is gone.")
+
+        self.redis_client.incr(self._misses_key)
+        return None
+
+    def put(self, digest: str, task_id: str, size: int) -> None:
+        """
+        Record a completed task as the cached result for a request digest.
+
+        Args:
+            digest (str): The request digest.
+            task_id (str): The ID of the completed task.
+            size (int): Size of the task's result and signal levels in bytes.
+        """
+        if size > self.max_bytes:
+            logger.debug(f"Result for task {task_id} is larger than the result cache, not caching.")
+            return
+
+        with self.redis_client.pipeline() as pipe:
+            while True:
+                try:
+                    # a digest cached again (e.g. after its entry expired) replaces its previous size
+                    pipe.watch(self._sizes_key)
+                    previous_size = int(pipe.hget(self._sizes_key, digest) or 0)
+                    pipe.multi()
+                    pipe.set(self._entry_key(digest), task_id, ex=self.ttl)
+                    pipe.expire(task_id, self.ttl)
+                    pipe.expire(f"{task_id}:status", self.ttl)
+                    pipe.expire(f"{task_id}:signal", self.ttl)
+                    pipe.zadd(self._index_key, {digest: time.time()})
+                    pipe.hset(self._sizes_key, digest, size)
+                    pipe.incrby(self._bytes_key, size - previous_size)
+                    pipe.execute()
+                    break
+                except redis.WatchError:
+                    continue
+
+        logger.info(f"Cached result of task {task_id} as {digest}.")
+        self._prune()
+        self._evict()
+
+    def _prune(self) -> None:
+        """
+        Drop the index and size of the entries that expired after their TTL, so they no longer count.
+
+        Only the `PRUNE_BATCH` least recently used entries are checked, which keeps each put O(1) however large the
+        index grows. Expired entries are mostly the least recently used ones; any other expired entry is pruned once it
+        reaches the oldest end, or dropped by `_evict` before that.
+        """
+        digests = [
+            digest.decode("utf-8") for digest in self.redis_client.zrange(self._index_key, 0, PRUNE_BATCH - 1)
+        ]
+        with self.redis_client.pipeline(transaction=False) as pipe:
+            for digest in digests:
+                pipe.exists(self._entry_key(digest))
+            alive = pipe.execute()
+
+        for digest in (digest for digest, exists in zip(digests, alive) if not exists):
+            with self.redis_client.pipeline() as pipe:
+                try:
+                    pipe.watch(self._entry_key(digest), self._sizes_key)
+                    if pipe.exists(self._entry_key(digest)):
+                        continue
+                    size = int(pipe.hget(self._sizes_key, digest) or 0)
+                    pipe.multi()
+                    pipe.zrem(self._index_key, digest)
+                    pipe.hdel(self._sizes_key, digest)
+                    pipe.decrby(self._bytes_key, size)
+                    pipe.execute()
+                except redis.WatchError:
+                    # cached again meanwhile
+                    continue
+
+            logger.debug(f"Pruned expired entry {digest} ({size} bytes) from the result cache.")
+
+    def _evict(self) -> None:
+        """Drop the least recently used entries until the cache fits within `max_bytes`."""
+        while int(self.redis_client.get(self._bytes_key) or 0) > self.max_bytes:
+            popped = self.redis_client.zpopmin(self._index_key)
+            if not popped:
+                break
+
+            digest = popped[0][0].decode("utf-8")
+            size = int(self.redis_client.hget(self._sizes_key, digest) or 0)
+            task_id = self.redis_client.get(self._entry_key(digest))
+
+            with self.redis_client.pipeline() as pipe:
+                pipe.hdel(self._sizes_key, digest)
+                pipe.decrby(self._bytes_key, size)
+                pipe.delete(self._entry_key(digest))
+                if task_id is not None:
+                    task_id = task_id.decode("utf-8")
+                    pipe.expire(task_id, 3600, lt=True)
+                    pipe.expire(f"{task_id}:status", 3600, lt=True)
+                    pipe.expire(f"{task_id}:signal", 3600, lt=True)
+                pipe.execute()
+
+            logger.debug(f"Evicted {digest} ({size} bytes) from the result cache.")
+
+    def stats(self) -> dict:
+        """Snapshot of the cache limits, usage and hit/miss counters."""
+        with self.redis_client.pipeline() as pipe:
+            pipe.zcard(self._index_key)
+            pipe.get(self._bytes_key)
+            pipe.get(self._hits_key)
+            pipe.get(self._misses_key)
+            entries, size, hits, misses = pipe.execute()
+
+        return self._stats(entries, size, hits, misses)
+
+
+class AsyncResultCache(ResultCacheBase):
+    """
+    Result cache for asyncio code, backed by a `redis.asyncio` client.
+
+    Used by the API endpoints to look up cached results without blocking the event loop. Results are
+    recorded by the synchronous ResultCache in the SPLAT! workers.
+    """
+
+    def __init__(self, redis_client: redis.asyncio.Redis, **kwargs):
+        super().__init__(redis_client, **kwargs)
+
+    async def get(self, digest: str) -> Optional[str]:
+        """Asynchronous `ResultCache.get`."""
+        task_id = await self.redis_client.get(self._entry_key(digest))
+        if task_id is not None:
+            task_id = task_id.decode("utf-8")
+            pointers = await self.redis_client.mget(task_id, f"{task_id}:signal")
+            if await run_in_threadpool(self._stored, pointers):
+                async with self.redis_client.pipeline() as pipe:
+                    pipe.zadd(self._index_key, {digest: time.time()})
+                    pipe.incr(self._hits_key)
+                    await pipe.execute()
+                logger.info(f"Result cache hit: {digest} -> task {task_id}.")
+                return task_id
+
+            await self._drop_script(keys=self._drop_keys(digest), args=[digest, task_id])
+            logger.info(f"Dropped {digest} from the result cache, the result of task {task_id} is gone.")
+
+        await self.redis_client.incr(self._misses_key)
+        return None
+
+    async def stats(self) -> dict:
+        """Asynchronous `ResultCache.stats`."""
+        async with self.redis_client.pipeline() as pipe:
+            pipe.zcard(self._index_key)
+            pipe.get(self._bytes_key)
+            pipe.get(self._hits_key)
+            pipe.get(self._misses_key)
+            entries, size, hits, misses = await pipe.execute()
+
+        return self._stats(entries, size, hits, misses)
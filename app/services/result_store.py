@@ -0,0 +1,290 @@
+import hashlib
+import io
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import BinaryIO, Callable, Iterator, Optional
+
+import boto3
+from botocore.exceptions import ClientError
+from diskcache import Cache
+
+
+logger = logging.getLogger(__name__)
+
+
+def content_etag(data: bytes) -> str:
+    """Strong HTTP ETag of a binary result, derived from its content."""
+    return '"' + hashlib.blake2b(data, digest_size=16).hexdigest() + '"'
+
+
+class StoredResult:
+    def __init__(
+        self,
+        size: int,
+        etag: str,
+        read_range: Callable[[int, int], Iterator[bytes]],
+        close: Callable[[], None] = lambda: None,
+    ):
+        """
+        Handle on a result in a ResultStore, read in chunks instead of being loaded into memory.
+
+        Args:
+            size (int): Size of the result in bytes.
+            etag (str): Strong HTTP ETag of the result (see `content_etag`).
+            read_range (Callable[[int, int], Iterator[bytes]]): Yields the bytes from the first to the last
+                position (inclusive) in chunks, then releases the handle.
+            close (Callable[[], None]): Releases the handle without reading.
+        """
+        self.size = size
+        self.etag = etag
+        self._read_range = read_range
+        self._close = close
+
+    def iter_range(self, start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
+        """Yield the bytes from `start` to `end` (inclusive, defaults to the last byte) in chunks."""
+        return self._read_range(start, self.size - 1 if end is None else end)
+
+    def close(self) -> None:
+        """Release the handle if the result is not read."""
+        self._close()
+
+
+class ResultStore:
+    """
+    Storage for the binary outputs of SPLAT! tasks (result GeoTIFFs, signal levels and renderings).
+
+    Redis only keeps the task status and, under the usual `{task_id}`, `{task_id}:signal` and
+    `{task_id}:render:...` keys, a pointer to the stored bytes (their key in the store). The pointers
+    expire with the task; the store bounds its own size and keeps entries for at most their TTL, so a
+    pointer can outlive the data it refers to, in which case the result is reported as expired.
+    """
+
+    def put(self, key: str, data: bytes, ttl: int) -> None:
+        """
+        Store a result.
+
+        Args:
+            key (str): The key of the result, written to Redis as the pointer.
+            data (bytes): The content of the result.
+            ttl (int): Lifetime of the result in seconds.
+        """
+        raise NotImplementedError
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the content of a result, or None if it has expired or was evicted."""
+        raise NotImplementedError
+
+    def open(self, key: str) -> Optional[StoredResult]:
+        """Return a handle to stream a result from, or None if it has expired or was evicted."""
+        raise NotImplementedError
+
+    def exists(self, key: str) -> bool:
+        """Whether a result is still stored, i.e. has neither expired nor been evicted, without reading it."""
+        raise NotImplementedError
+
+    def touch(self, key: str, ttl: int) -> bool:
+        """Keep a result for another `ttl` seconds, returning whether it was still stored."""
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        """Remove a result before it expires, if it is stored."""
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        """Snapshot of the store backend and usage."""
+        raise NotImplementedError
+
+
+class FilesystemResultStore(ResultStore):
+    def __init__(
+        self, directory: str = ".splat_results", size_limit_gb: Optional[float] = 4.0, chunk_size: int = 256 * 1024
+    ):
+        """
+        Result store on a local (or shared) filesystem.
+
+        Results are kept in a diskcache, which writes large values to their own files, expires them after
+        their TTL and evicts the least recently used ones beyond `size_limit_gb`. Results are streamed from
+        their files; a file evicted while it is being read stays readable until it is closed. When the API
+        and the queue workers run in separate containers, the directory must be a shared volume.
+
+        Args:
+            directory (str): Directory holding the results. Defaults to `.splat_results`.
+            size_limit_gb (Optional[float]): Maximum total size of the results in gigabytes (GB), or None to
+                never evict results before they expire (e.g. state that cannot be recomputed). Defaults to 4.0.
+            chunk_size (int): Size of the chunks results are streamed in. Defaults to 256 kB.
+        """
+        self.directory = directory
+        self.size_limit_gb = size_limit_gb
+        self.chunk_size = chunk_size
+        if size_limit_gb is None:
+            self.cache = Cache(directory, eviction_policy="none")
+        else:
+            self.cache = Cache(
+                directory,
+                size_limit=int(size_limit_gb * 1024 * 1024 * 1024),
+                eviction_policy="least-recently-used",
+            )
+
+        limit = "no size limit" if size_limit_gb is None else f"a size limit of {size_limit_gb} GB"
+        logger.info(f"Initialized result store at '{directory}' with {limit}.")
+
+    def put(self, key: str, data: bytes, ttl: int) -> None:
+        self.cache.set(key, data, expire=ttl, tag=content_etag(data))
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.cache.get(key)
+
+    def exists(self, key: str) -> bool:
+        return key in self.cache
+
+    def touch(self, key: str, ttl: int) -> bool:
+        return self.cache.touch(key, expire=ttl)
+
+    def delete(self, key: str) -> None:
+        self.cache.delete(key)
+
+    def open(self, key: str) -> Optional[StoredResult]:
+        handle, etag = self.cache.get(key, read=True, tag=True)
+        if handle is None:
+            return None
+        if isinstance(handle, bytes):
+            # small values are kept in the cache database rather than in their own files
+            handle = io.BytesIO(handle)
+
+        size = handle.seek(0, io.SEEK_END)
+        return StoredResult(size, etag, lambda start, end: self._read_range(handle, start, end), handle.close)
+
+    def _read_range(self, handle: BinaryIO, start: int, end: int) -> Iterator[bytes]:
+        try:
+            handle.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = handle.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+        finally:
+            handle.close()
+
+    def stats(self) -> dict:
+        return {
+            "backend": "filesystem",
+            "entries": len(self.cache),
+            "bytes": self.cache.volume(),
+            "max_bytes": int(self.size_limit_gb * 1024 * 1024 * 1024) if self.size_limit_gb is not None else None,
+        }
+
+
+class S3ResultStore(ResultStore):
+    def __init__(
+        self,
+        bucket_name: str,
+        prefix: str = "results/",
+        endpoint_url: Optional[str] = None,
+        chunk_size: int = 256 * 1024,
+    ):
+        """
+        Result store in an S3-compatible bucket, shared by any number of API and worker instances.
+
+        Each result is an object with an `Expires` time, after which the store no longer returns it.
+        S3 has no size limit to enforce, so expired objects should be removed with a lifecycle rule on the
+        prefix (e.g. expiring objects after one or two days, the longest result TTL).
+
+        Args:
+            bucket_name (str): Name of the bucket.
+            prefix (str): Prefix of the result objects in the bucket. Defaults to `results/`.
+            endpoint_url (Optional[str]): Endpoint of an S3-compatible service (e.g. MinIO), or None for AWS.
+            chunk_size (int): Size of the chunks results are streamed in. Defaults to 256 kB.
+        """
+        self.bucket_name = bucket_name
+        self.prefix = prefix
+        self.chunk_size = chunk_size
+        self.s3 = boto3.client("s3", endpoint_url=endpoint_url)
+
+        logger.info(f"Initialized result store in bucket '{bucket_name}' under '{prefix}'.")
+
+    def _object_key(self, key: str) -> str:
+        return f"{self.prefix}{key}"
+
+    @staticmethod
+    def _expired(response: dict) -> bool:
+        expires = response.get("Expires")
+        return expires is not None and expires <= datetime.now(timezone.utc)
+
+    def put(self, key: str, data: bytes, ttl: int) -> None:
+        self.s3.put_object(
+            Bucket=self.bucket_name,
+            Key=self._object_key(key),
+            Body=data,
+            Expires=datetime.now(timezone.utc) + timedelta(seconds=ttl),
+            Metadata={"etag": content_etag(data)},
+        )
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            response = self.s3.get_object(Bucket=self.bucket_name, Key=self._object_key(key))
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("NoSuchKey", "404"):
+                return None
+            raise
+
+        with response["Body"] as body:
+            return None if self._expired(response) else body.read()
+
+    def open(self, key: str) -> Optional[StoredResult]:
+        object_key = self._object_key(key)
+        try:
+            response = self.s3.head_object(Bucket=self.bucket_name, Key=object_key)
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("NoSuchKey", "404"):
+                return None
+            raise
+
+        if self._expired(response):
+            return None
+
+        etag = response["Metadata"].get("etag", response["ETag"])
+        return StoredResult(response["ContentLength"], etag, lambda start, end: self._read_range(object_key, start, end))
+
+    def exists(self, key: str) -> bool:
+        try:
+            response = self.s3.head_object(Bucket=self.bucket_name, Key=self._object_key(key))
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("NoSuchKey", "404"):
+                return False
+            raise
+        return not self._expired(response)
+
+    def touch(self, key: str, ttl: int) -> bool:
+        object_key = self._object_key(key)
+        try:
+            response = self.s3.head_object(Bucket=self.bucket_name, Key=object_key)
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("NoSuchKey", "404"):
+                return False
+            raise
+        if self._expired(response):
+            return False
+
+        # objects are immutable, so the new expiry time is set by copying the object onto itself
+        self.s3.copy_object(
+            Bucket=self.bucket_name,
+            Key=object_key,
+            CopySource={"Bucket": self.bucket_name, "Key": object_key},
+            Expires=datetime.now(timezone.utc) + timedelta(seconds=ttl),
+            Metadata=response["Metadata"],
+            MetadataDirective="REPLACE",
+        )
+        return True
+
+    def delete(self, key: str) -> None:
+        self.s3.delete_object(Bucket=self.bucket_name, Key=self._object_key(key))
+
+    def _read_range(self, object_key: str, start: int, end: int) -> Iterator[bytes]:
+        response = self.s3.get_object(Bucket=self.bucket_name, Key=object_key, Range=f"bytes={start}-{end}")
+        with response["Body"] as body:
+            yield from body.iter_chunks(self.chunk_size)
+
+    def stats(self) -> dict:
+        return {"backend": "s3", "bucket": self.bucket_name, "prefix": self.prefix}
@@ -0,0 +1,426 @@
+"""
+In-process SRTM .hgt to SPLAT! .sdf conversion
+
+Vectorized NumPy re-implementation of the pipeline previously used by `Splat._convert_hgt_to_sdf`: gunzip the
+1-arcsecond .hgt.gz tile, average it down to 3-arcseconds (as rasterio's `Resampling.average` does) unless
+high resolution output is requested, and format it exactly like SPLAT!'s srtm2sdf / srtm2sdf-hd utilities.
+No temporary files or subprocesses are involved.
+
+srtm2sdf writes a 4 line header (max_west, min_north, min_west, max_north) followed by one elevation per line,
+starting at the south-east corner and scanning west, then north, row by row. The northernmost row and the
+easternmost column of the .hgt tile are omitted, as they overlap the neighbouring tiles. Elevations below
+`min_elevation` (0 m, srtm2sdf's default) including data voids are replaced by the last elevation above it.
+
+The module can also be run as a script to diff its output against srtm2sdf for a sample of tiles:
+
+    python -m app.services.sdf /app/splat/srtm2sdf N35W120.hgt.gz N36W120.hgt.gz ...
+"""
+
+import argparse
+import gzip
+import io
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import zlib
+from typing import Optional, Tuple
+
+import numpy as np
+import rasterio
+from rasterio.enums import Resampling
+from rasterio.transform import Affine
+
+logger = logging.getLogger(__name__)
+
+HGT_NODATA = -32768
+
+# Size of a decompressed 1-arcsecond .hgt tile, the largest there is
+HGT_MAX_BYTES = 3601 * 3601 * 2
+
+# Size of the chunks .hgt.gz tiles are decompressed in
+HGT_CHUNK_SIZE = 1024 * 1024
+
+
+def _build_line_table() -> Tuple[np.ndarray, np.ndarray]:
+    """Zero-padded "%d\\n" text of every int16 value, and the length of each line, indexed by value + 32768."""
+    lines = [f"{value}\n".encode("ascii") for value in range(-32768, 32768)]
+    lengths = np.array([len(line) for line in lines], dtype=np.int64)
+    table = np.frombuffer(b"".join(line.ljust(7, b"\0") for line in lines), dtype=np.uint8)
+    return table.reshape(-1, 7), lengths
+
+
+_LINE_TABLE, _LINE_LENGTHS = _build_line_table()
+
+
+def _tile_bounds(tile_name: str) -> Tuple[int, int, int, int]:
+    """
+    SPLAT! tile bounds for an .hgt(.gz) filename, computed the same way as srtm2sdf.
+
+    Returns:
+        Tuple[int, int, int, int]: max_west, min_north, min_west and max_north in SPLAT! degrees west.
+    """
+    if tile_name[0] not in "NS" or tile_name[3] not in "EW":
+        raise ValueError(f"'{tile_name}' doesn't look like an SRTM .hgt filename.")
+
+    max_west = int(tile_name[4:7])
+    if tile_name[3] == "E":
+        max_west = 360 - max_west
+    min_west = max_west - 1
+    if max_west == 360:
+        max_west = 0
+
+    min_north = int(tile_name[1:3]) * (1 if tile_name[0] == "N" else -1)
+    max_north = min_north + 1
+
+    return max_west, min_north, min_west, max_north
+
+
+def _average_weights(src_size: int, dst_size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Source indices and weights of an area-weighted average from `src_size` to `dst_size` pixels.
+
+    Each destination pixel covers [i * ratio, (i + 1) * ratio) source pixels and every source pixel is
+    weighted by its overlap with that window, matching GDAL's average resampling for non-integer ratios.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (dst_size, k) arrays of source indices and weights. Unused slots
+            have a weight of 0.
+    """
+    ratio = src_size / dst_size
+    starts = np.arange(dst_size) * ratio
+    ends = starts + ratio
+
+    first = np.floor(starts + 1e-8).astype(np.int64)
+    last = np.minimum(np.ceil(ends - 1e-8).astype(np.int64), src_size)
+    width = int((last - first).max())
+
+    indices = first[:, None] + np.arange(width)[None, :]
+    weights = np.minimum(indices + 1, ends[:, None]) - np.maximum(indices, starts[:, None])
+    weights = np.where(indices < last[:, None], weights, 0.0)
+
+    return np.minimum(indices, src_size - 1), weights
+
+
+def downsample_average(elevation: np.ndarray, size: int, nodata: int = HGT_NODATA) -> np.ndarray:
+    """
+    Area-weighted average downsampling of a square elevation grid, ignoring `nodata` samples.
+
+    Equivalent to reading the tile through rasterio with `out_shape=(size, size)` and `Resampling.average`:
+    GDAL accumulates in double precision, stores the average in a float32 working buffer and then rounds it
+    half away from zero. Output pixels without any valid sample are `nodata`.
+
+    Args:
+        elevation (np.ndarray): Square int16 elevation grid.
+        size (int): Width and height of the output grid.
+        nodata (int): Value marking data voids. Defaults to -32768.
+
+    Returns:
+        np.ndarray: The downsampled int16 grid.
+    """
+    rows, row_weights = _average_weights(elevation.shape[0], size)
+    cols, col_weights = _average_weights(elevation.shape[1], size)
+
+    valid = elevation != nodata
+    values = np.where(valid, elevation, 0).astype(np.float64)
+
+    total = np.zeros((size, size))
+    total_weight = np.zeros((size, size))
+    for a in range(rows.shape[1]):
+        row_values = values[rows[:, a]]
+        row_valid = valid[rows[:, a]]
+        for b in range(cols.shape[1]):
+            weight = row_weights[:, a, None] * col_weights[None, :, b] * row_valid[:, cols[:, b]]
+            total += row_values[:, cols[:, b]] * weight
+            total_weight += weight
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = (total / total_weight).astype(np.float32)
+    half = np.float32(0.5)
+    rounded = np.where(mean >= 0, np.floor(mean + half), np.ceil(mean - half))
+
+    return np.where(total_weight > 0, rounded, nodata).astype(np.int16)
+
+
+def _fill_below_min_elevation(values: np.ndarray, min_elevation: int) -> np.ndarray:
+    """
+    Replace values below `min_elevation` with the last preceding value above it, in scan order.
+
+    Values before the first one above `min_elevation` become 0, and values equal to it are kept without
+    becoming the new replacement value, as in srtm2sdf.
+    """
+    good = values > min_elevation
+    last_good_index = np.maximum.accumulate(np.where(good, np.arange(values.size), -1))
+    last_good = np.where(last_good_index >= 0, values[np.maximum(last_good_index, 0)], 0)
+    return np.where(values < min_elevation, last_good, values)
+
+
+def elevation_to_sdf(
+    elevation: np.ndarray, tile_name: str, min_elevation: int = 0
+) -> bytes:
+    """
+    Format an (ippd + 1) x (ippd + 1) elevation grid as a SPLAT! .sdf file.
+
+    Args:
+        elevation (np.ndarray): Elevation grid in .hgt order (north-west corner first).
+        tile_name (str): The name of the terrain tile (e.g., N35W120.hgt.gz).
+        min_elevation (int): Elevations below this are treated as voids. Defaults to 0, like srtm2sdf.
+
+    Returns:
+        bytes: The content of the .sdf or -hd.sdf file.
+    """
+    ippd = elevation.shape[0] - 1
+
+    # south to north without the northernmost row, east to west without the easternmost column
+    values = elevation[ippd:0:-1, ippd - 1::-1].astype(np.int32).ravel()
+    values = _fill_below_min_elevation(values, min_elevation)
+
+    # look up the text of every elevation and drop the padding, instead of formatting values one at a time
+    index = values + 32768
+    lines = _LINE_TABLE[index]
+    body = lines[np.arange(lines.shape[1])[None, :] < _LINE_LENGTHS[index][:, None]]
+
+    header = "".join(f"{value}\n" for value in _tile_bounds(tile_name))
+    return header.encode("ascii") + body.tobytes()
+
+
+class HgtDecompressor:
+    def __init__(self, tile_name: str):
+        """
+        Streamed decompression of an .hgt.gz terrain tile into a preallocated elevation grid.
+
+        Chunks are decompressed as they are fed, e.g. while the tile is being downloaded, into a buffer the
+        size of the largest (1-arcsecond) tile, instead of decompressing the whole tile at once once it is
+        in memory.
+
+        Args:
+            tile_name (str): The name of the terrain tile (e.g., N35W120.hgt.gz), for error messages.
+        """
+        self.tile_name = tile_name
+        self._decompressor = zlib.decompressobj(wbits=16 + zlib.MAX_WBITS)
+        self._buffer = np.empty(HGT_MAX_BYTES, dtype=np.uint8)
+        self._size = 0
+
+    def feed(self, chunk: bytes) -> None:
+        """Decompress the next chunk of the .hgt.gz tile."""
+        self._append(self._decompressor.decompress(chunk))
+
+    def feed_all(self, tile: bytes) -> None:
+        """Decompress a whole .hgt.gz tile (or its remainder) in chunks."""
+        view = memoryview(tile)
+        for start in range(0, len(view), HGT_CHUNK_SIZE):
+            self.feed(view[start:start + HGT_CHUNK_SIZE])
+
+    def _append(self, data: bytes) -> None:
+        if self._size + len(data) > HGT_MAX_BYTES:
+            raise ValueError(f"{self.tile_name} is larger than a 3601x3601 .hgt tile.")
+        self._buffer[self._size:self._size + len(data)] = np.frombuffer(data, dtype=np.uint8)
+        self._size += len(data)
+
+    @property
+    def complete(self) -> bool:
+        """Whether the end of the gzip stream has been reached."""
+        return self._decompressor.eof
+
+    def elevation(self) -> np.ndarray:
+        """
+        The decompressed elevation grid, once every chunk has been fed.
+
+        Returns:
+            np.ndarray: The square big-endian int16 grid, north-west corner first.
+
+        Raises:
+            ValueError: If the tile is truncated or not a square 1 or 3-arcsecond .hgt grid.
+        """
+        self._append(self._decompressor.flush())
+        if not self._decompressor.eof:
+            raise ValueError(f"{self.tile_name} is truncated.")
+
+        samples = self._size // 2
+        size = int(round(samples ** 0.5))
+        if size * size != samples or size not in (1201, 3601):
+            raise ValueError(f"{self.tile_name} is not a 1201x1201 or 3601x3601 .hgt tile ({self._size} bytes).")
+
+        return self._buffer[:self._size].view(">i2").reshape(size, size)
+
+
+def hgt_elevation(tile: bytes, tile_name: str) -> np.ndarray:
+    """
+    Decompress a .hgt.gz terrain tile to its elevation grid.
+
+    Args:
+        tile (bytes): The binary content of the .hgt.gz terrain tile.
+        tile_name (str): The name of the terrain tile (e.g., N35W120.hgt.gz).
+
+    Returns:
+        np.ndarray: The square big-endian int16 grid, north-west corner first.
+
+    Raises:
+        ValueError: If the tile is not a square 1 or 3-arcsecond .hgt grid.
+    """
+    decompressor = HgtDecompressor(tile_name)
+    decompressor.feed_all(tile)
+    return decompressor.elevation()
+
+
+def hgt_to_sdf(
+    tile: Optional[bytes], tile_name: str, high_resolution: bool = False, elevation: Optional[np.ndarray] = None
+) -> bytes:
+    """
+    Convert a .hgt.gz terrain tile to the content of a SPLAT! .sdf or -hd.sdf file.
+
+    Args:
+        tile (Optional[bytes]): The binary content of the .hgt.gz terrain tile.
+        tile_name (str): The name of the terrain tile (e.g., N35W120.hgt.gz).
+        high_resolution (bool): Whether to generate a high-resolution -hd.sdf file. Defaults to False.
+        elevation (Optional[np.ndarray]): The tile already decompressed (see `HgtDecompressor`), in which
+            case `tile` is not used.
+
+    Returns:
+        bytes: The content of the .sdf or -hd.sdf file.
+
+    Raises:
+        ValueError: If the tile is not a square 1 or 3-arcsecond .hgt grid.
+    """
+    if elevation is None:
+        elevation = hgt_elevation(tile, tile_name)
+    size = elevation.shape[0]
+    if high_resolution and size != 3601:
+        raise ValueError(f"{tile_name} has no 1-arcsecond data for a high-resolution .sdf file.")
+
+    if not high_resolution and size != 1201:
+        elevation = downsample_average(elevation, 1201)
+
+    return elevation_to_sdf(elevation, tile_name)
+
+
+def sea_level_sdf(tile_name: str, high_resolution: bool = False) -> bytes:
+    """
+    A SPLAT! .sdf or -hd.sdf file at sea level everywhere, for tiles missing from the terrain data (open ocean).
+
+    Args:
+        tile_name (str): The name of the terrain tile (e.g., N35W120.hgt.gz).
+        high_resolution (bool): Whether to generate a high-resolution -hd.sdf file. Defaults to False.
+
+    Returns:
+        bytes: The content of the .sdf or -hd.sdf file.
+    """
+    size = 3601 if high_resolution else 1201
+    return elevation_to_sdf(np.zeros((size, size), dtype=np.int16), tile_name)
+
+
+def srtm2sdf_hgt_to_sdf(tile: bytes, tile_name: str, binary: str, high_resolution: bool = False) -> bytes:
+    """
+    Reference conversion of a .hgt.gz terrain tile through rasterio and the srtm2sdf or srtm2sdf-hd utility.
+
+    Args:
+        tile (bytes): The binary content of the .hgt.gz terrain tile.
+        tile_name (str): The name of the terrain tile (e.g., N35W120.hgt.gz).
+        binary (str): Path to the srtm2sdf or srtm2sdf-hd binary.
+        high_resolution (bool): Whether to generate a high-resolution -hd.sdf file. Defaults to False.
+
+    Returns:
+        bytes: The content of the .sdf or -hd.sdf file written by srtm2sdf.
+
+    Raises:
+        subprocess.CalledProcessError: If srtm2sdf fails.
+        RuntimeError: If srtm2sdf does not write exactly one .sdf file.
+    """
+    with tempfile.TemporaryDirectory() as tmpdir:
+        # Decompress the tile into the temporary directory
+        hgt_path = os.path.join(tmpdir, tile_name.replace(".gz", ""))
+        logger.info(f"Decompressing {tile_name} into {hgt_path}.")
+        with gzip.GzipFile(fileobj=io.BytesIO(tile)) as gz_file:
+            with open(hgt_path, "wb") as hgt_file:
+                hgt_file.write(gz_file.read())
+
+        # Downsample to 3-arcsecond resolution if not in high-resolution mode
+        if not high_resolution:
+            logger.info(f"Downsampling {hgt_path} to 3-arcsecond resolution.")
+            with rasterio.open(hgt_path) as src:
+                # Apply a scaling factor to transform for 3-arcsecond resolution
+                scale_factor = 3  # 3-arcsecond is 3 times coarser than 1-arcsecond
+                transform = src.transform * Affine.scale(scale_factor, scale_factor)
+
+                # Resample data to 3-arcsecond resolution
+                data = src.read(
+                    # 3-arcsecond SRTM tiles always have dimensions of 1201x1201 pixels.
+                    out_shape=(
+                        src.count,  # Number of bands
+                        1201,   # Downsampled height
+                        1201,   # Downsampled width
+                    ),
+                    resampling=Resampling.average,
+                )
+
+                # Update metadata for the new dataset
+                meta = src.meta.copy()
+                meta.update(
+                    {
+                        "transform": transform,
+                        "width": 1201,
+                        "height": 1201,
+                    }
+                )
+
+            # Overwrite the temporary file with downsampled data
+            with rasterio.open(hgt_path, "w", **meta) as dst:
+                dst.write(data)
+
+        # Call srtm2sdf or srtm2sdf-hd in the temporary directory
+        logger.info(f"Converting {hgt_path} using {binary}.")
+        result = subprocess.run(
+            [binary, os.path.basename(hgt_path)],
+            cwd=tmpdir,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        logger.debug(f"srtm2sdf output:\n{result.stderr}")
+
+        sdf_names = [name for name in os.listdir(tmpdir) if name.endswith(".sdf")]
+        if len(sdf_names) != 1:
+            raise RuntimeError(f"Expected one .sdf file from {binary}, found {sdf_names}.")
+        with open(os.path.join(tmpdir, sdf_names[0]), "rb") as sdf_file:
+            return sdf_file.read()
+
+
+def diff_sdf(expected: bytes, actual: bytes) -> Optional[str]:
+    """
+    Describe the first difference between two .sdf files.
+
+    Returns:
+        Optional[str]: None if the files are byte-identical, otherwise the first differing line.
+    """
+    if expected == actual:
+        return None
+
+    expected_lines = expected.split(b"\n")
+    actual_lines = actual.split(b"\n")
+    for line, (a, b) in enumerate(zip(expected_lines, actual_lines)):
+        if a != b:
+            return f"line {line + 1}: expected {a!r}, got {b!r}"
+    return f"expected {len(expected_lines)} lines, got {len(actual_lines)}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Diff the NumPy .sdf converter against srtm2sdf")
+    parser.add_argument("srtm2sdf", type=str, help="Path to the srtm2sdf (or srtm2sdf-hd with --high-resolution) binary")
+    parser.add_argument("tiles", type=str, nargs="+", help=".hgt.gz terrain tiles to compare")
+    parser.add_argument("--high-resolution", action="store_true", help="Compare 1-arcsecond -hd.sdf output")
+    args = parser.parse_args()
+
+    mismatches = 0
+    for path in args.tiles:
+        tile_name = os.path.basename(path)
+        with open(path, "rb") as tile_file:
+            tile = tile_file.read()
+
+        expected = srtm2sdf_hgt_to_sdf(tile, tile_name, args.srtm2sdf, args.high_resolution)
+        difference = diff_sdf(expected, hgt_to_sdf(tile, tile_name, args.high_resolution))
+        if difference:
+            mismatches += 1
+        print(f"{tile_name}: {difference or 'identical'}")
+
+    sys.exit(1 if mismatches else 0)
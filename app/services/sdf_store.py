@@ -0,0 +1,134 @@
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from typing import Callable
+
+
+logger = logging.getLogger(__name__)
+
+
+class SdfStore:
+    def __init__(self, directory: str = ".splat_sdf", size_limit_gb: float = 2.0):
+        """
+        Long-lived directory of materialized SPLAT! .sdf terrain files.
+
+        Each prediction's working directory gets hard links to the .sdf files it needs instead of fresh
+        copies, so terrain that is already materialized costs no bytes of I/O. Working directories are
+        created under the store (see `temporary_directory`) so they are always on the same filesystem.
+
+        When the store grows beyond `size_limit_gb`, the least recently used files are unlinked. This is
+        safe while SPLAT! is running: a hard link (or an open file handle) keeps the data alive until the
+        prediction's working directory is removed, and the next prediction simply materializes the file
+        again. If hard links are not supported, files are copied instead. Symbolic links are never used,
+        as eviction would break them.
+
+        Args:
+            directory (str): Directory holding the .sdf files. May be on tmpfs. Defaults to `.splat_sdf`.
+            size_limit_gb (float): Maximum total size of the stored .sdf files in gigabytes (GB). Defaults to 2.0.
+        """
+        self.directory = os.path.abspath(directory)
+        self.size_limit = int(size_limit_gb * 1024 * 1024 * 1024)
+        self.work_dir = os.path.join(self.directory, ".work")
+        os.makedirs(self.work_dir, exist_ok=True)
+
+        self._evict_lock = threading.Lock()
+
+        logger.info(
+            f"Initialized SDF store at '{self.directory}' with a size limit of {size_limit_gb} GB."
+        )
+
+    def temporary_directory(self) -> tempfile.TemporaryDirectory:
+        """Create a working directory for a SPLAT! run on the same filesystem as the store."""
+        return tempfile.TemporaryDirectory(dir=self.work_dir)
+
+    def link(self, sdf_name: str, dest_dir: str, loader: Callable[[], bytes]) -> None:
+        """
+        Place `sdf_name` in `dest_dir`, materializing it in the store first if needed.
+
+        Args:
+            sdf_name (str): The .sdf or -hd.sdf filename.
+            dest_dir (str): The directory to link the file into.
+            loader (Callable[[], bytes]): Returns the .sdf content if the store does not have it.
+        """
+        path = os.path.join(self.directory, sdf_name)
+        dest = os.path.join(dest_dir, sdf_name)
+
+        for _ in range(3):
+            if not os.path.exists(path):
+                self._put(sdf_name, loader())
+            try:
+                os.link(path, dest)
+            except FileNotFoundError:
+                # evicted between materializing and linking, try again
+                continue
+            except OSError:
+                shutil.copyfile(path, dest)
+
+            try:
+                os.utime(path)  # mark as recently used
+            except FileNotFoundError:
+                pass
+            return
+
+        raise RuntimeError(f"Failed to materialize {sdf_name} in '{self.directory}'.")
+
+    def contains(self, sdf_name: str) -> bool:
+        """Whether `sdf_name` is materialized in the store."""
+        return os.path.exists(os.path.join(self.directory, sdf_name))
+
+    def ensure(self, sdf_name: str, loader: Callable[[], bytes]) -> None:
+        """
+        Materialize `sdf_name` in the store if it is missing, without linking it anywhere.
+
+        Args:
+            sdf_name (str): The .sdf or -hd.sdf filename.
+            loader (Callable[[], bytes]): Returns the .sdf content if the store does not have it.
+        """
+        path = os.path.join(self.directory, sdf_name)
+        try:
+            os.utime(path)  # mark as recently used
+        except FileNotFoundError:
+            self._put(sdf_name, loader())
+
+    def _put(self, sdf_name: str, data: bytes) -> None:
+        """Atomically write an .sdf file into the store, then evict old files if the store is too large."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.work_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(data)
+            os.replace(tmp_path, os.path.join(self.directory, sdf_name))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+        logger.debug(f"Materialized {sdf_name} in the SDF store.")
+        self._evict()
+
+    def _evict(self) -> None:
+        """Unlink the least recently used .sdf files until the store fits within its size limit."""
+        with self._evict_lock:
+            entries = []
+            total = 0
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if not entry.is_file() or not entry.name.endswith(".sdf"):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+
+            for _, size, path in sorted(entries):
+                if total <= self.size_limit:
+                    break
+                try:
+                    os.unlink(path)
+                    logger.debug(f"Evicted {os.path.basename(path)} from the SDF store.")
+                except FileNotFoundError:
+                    pass
+                total -= size
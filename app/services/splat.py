@@ -1,28 +1,30 @@
-import gzip
+import hashlib
+import json
 import logging
 import math
 import os
 import io
+import random
 import subprocess
-import tempfile
 import xml.etree.ElementTree as ET
-from typing import Literal, List, Tuple
-from rasterio.transform import Affine
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Literal, List, Optional, Tuple
 
-import boto3
-from botocore import UNSIGNED
-from botocore.config import Config
-from botocore.exceptions import ClientError
 from diskcache import Cache
 
 import matplotlib.pyplot as plt
 import numpy as np
 import rasterio
-from rasterio.enums import Resampling
-from rasterio.transform import from_bounds
+import rasterio.shutil
+from rasterio.transform import Affine, from_bounds
 from PIL import Image
 
 from app.models.CoveragePredictionRequest import CoveragePredictionRequest
+from app.services import sdf
+from app.services.sdf_store import SdfStore
+from app.services.terrain_cache import TerrainCache
+from app.services.terrain_index import TerrainTileIndex, TileAvailability
+from app.services.terrain_source import S3TerrainSource, TerrainSource
 
 
 logger = logging.getLogger(__name__)
@@ -31,6 +33,31 @@ logging.getLogger("botocore").setLevel(logging.WARNING)
 logging.getLogger("s3transfer").setLevel(logging.WARNING)
 logging.getLogger("urllib3").setLevel(logging.WARNING)
 
+# NoData value of the decoded signal levels
+SIGNAL_NODATA = -32768
+
+# Pixels of a SPLAT! PPM decoded at a time, small enough for their packed colors to stay in the CPU cache
+PPM_DECODE_CHUNK = 65536
+
+# Request fields that do not change the path loss: tx_power, tx_gain and system_loss only set the ERP,
+# signal_threshold only masks the output and the rest only control how the signal levels are drawn.
+PATH_LOSS_INDEPENDENT_FIELDS = {
+    "tx_power", "tx_gain", "system_loss", "signal_threshold", "colormap", "min_dbm", "max_dbm",
+    "output_profile", "compression", "predictor",
+}
+
+# Earth radius used by SPLAT! (in meters), for the angular radius of a coverage circle
+EARTH_RADIUS = 6371000.0
+
+# Typical sizes of a compressed 1-arcsecond .hgt.gz terrain tile and of the .sdf / -hd.sdf files converted from
+# it (about 4 bytes per elevation sample), for the estimates of `Splat.terrain_estimate`.
+HGT_ESTIMATED_BYTES = 10 * 1024 * 1024
+SDF_ESTIMATED_BYTES = 1200 * 1200 * 4
+SDF_HD_ESTIMATED_BYTES = 3600 * 3600 * 4
+
+# Bump when a change to the SPLAT! pipeline makes previously cached path-loss grids stale.
+PATH_LOSS_GRID_VERSION = 1
+
 
 class Splat:
     def __init__(
@@ -38,13 +65,24 @@ class Splat:
         splat_path: str,
         cache_dir: str = ".splat_tiles",
         cache_size_gb: float = 1.0,
+        sdf_cache_size_gb: float = 1.0,
+        sdf_memory_cache_mb: float = 0.0,
         bucket_name: str = "elevation-tiles-prod",
-        bucket_prefix:str = "v2/skadi"
+        bucket_prefix:str = "v2/skadi",
+        tile_fetch_workers: int = 4,
+        sdf_converter: Literal["numpy", "srtm2sdf"] = "numpy",
+        sdf_validation_rate: float = 0.0,
+        sdf_store_dir: str = ".splat_sdf",
+        sdf_store_size_gb: float = 2.0,
+        path_loss_cache_dir: str = ".splat_path_loss",
+        path_loss_cache_size_gb: float = 1.0,
+        tile_index_dir: str = ".splat_tile_index",
+        terrain_source: Optional[TerrainSource] = None,
     ):
         """
         SPLAT! wrapper class. Provides methods for generating SPLAT! RF coverage maps in GeoTIFF format.
         This class automatically downloads and caches the necessary terrain data from AWS:
-        https://registry.opendata.aws/terrain-tiles/.
+        https://registry.opendata.aws/terrain-tiles/, or from another TerrainSource with the same layout.
 
         SPLAT! and its optional utilities (splat, splat-hd, srtm2sdf, srtm2sdf-hd) must be installed
         in the `splat_path` directory and be executable.
@@ -54,14 +92,38 @@ class Splat:
 
         Args:
             splat_path (str): Path to the directory containing the SPLAT! binaries.
-            cache_dir (str): Directory to store cached terrain tiles.
-            cache_size_gb (float): Maximum size of the cache in gigabytes (GB). Defaults to 1.0.
+            cache_dir (str): Directory to store cached terrain tiles (see TerrainCache).
+            cache_size_gb (float): Maximum size of the cached raw terrain tiles in gigabytes (GB). Defaults to 1.0.
                 When the size of the cached tiles exceeds this value, the oldest tiles are deleted
                 and will be re-downloaded as required.
-            bucket_name (str): Name of the S3 bucket containing terrain tiles. Defaults to the AWS
-                open data bucket `elevation-tiles-prod`.
+            sdf_cache_size_gb (float): Maximum size of the cached (compressed) .sdf files converted from the terrain
+                tiles in gigabytes (GB), a budget separate from the raw tiles'. Defaults to 1.0.
+            sdf_memory_cache_mb (float): Maximum size of the most recently used .sdf files kept in memory, in front
+                of the terrain tile cache, in megabytes (MB). 0 disables the memory tier. Defaults to 0.
+            bucket_name (str): Name of the S3 bucket containing terrain tiles, unless `terrain_source` is given.
+                Defaults to the AWS open data bucket `elevation-tiles-prod`.
             bucket_prefix (str): Folder in the S3 bucket containing the terrain tiles. Defaults to
                 `v2/skadi`, which contains 1-arcsecond terrain data for most of the world.
+            tile_fetch_workers (int): Maximum number of terrain tiles downloaded and converted concurrently,
+                shared by all predictions running on this instance. Also sets the size of the S3 connection
+                pool, unless `terrain_source` is given. Defaults to 4.
+            sdf_converter (str): How terrain tiles are converted to SPLAT! .sdf files: "numpy" uses the
+                in-process converter in app.services.sdf, "srtm2sdf" the SPLAT! utilities. Defaults to "numpy".
+            sdf_validation_rate (float): Fraction (0-1) of in-process conversions that are also run through
+                srtm2sdf and diffed against it. Defaults to 0.0.
+            sdf_store_dir (str): Directory of materialized .sdf files that are hard linked into each prediction's
+                working directory (see SdfStore). Defaults to `.splat_sdf`.
+            sdf_store_size_gb (float): Maximum size of the materialized .sdf files in gigabytes (GB). Defaults to 2.0.
+            path_loss_cache_dir (str): Directory to store cached path-loss grids, from which requests that only
+                differ in power, gain, loss, threshold or display settings are derived without running SPLAT!.
+            path_loss_cache_size_gb (float): Maximum size of the path-loss grid cache in gigabytes (GB). 0 disables
+                the cache. Defaults to 1.0.
+            tile_index_dir (str): Directory of the index recording which terrain tiles exist in the bucket, and
+                under which prefix (see TerrainTileIndex). Tiles missing from the bucket, such as open ocean, are
+                synthesized at sea level without asking S3 again. Defaults to `.splat_tile_index`.
+            terrain_source (Optional[TerrainSource]): Where terrain tiles are fetched from: an S3 bucket, a local
+                mirror or an HTTP server with the bucket's layout, or a chain of them (see
+                app.services.terrain_source). Defaults to the `bucket_name` S3 bucket.
         """
 
         # Check the provided SPLAT! path exists
@@ -108,18 +170,34 @@ class Splat:
                 f"'srtm2sdf_hd_binary' binary not found or not executable at '{self.srtm2sdf_hd_binary}'"
             )
 
-        self.tile_cache = Cache(
-            cache_dir, size_limit=int(cache_size_gb * 1024 * 1024 * 1024)
+        self.terrain_cache = TerrainCache(
+            cache_dir,
+            raw_size_gb=cache_size_gb,
+            sdf_size_gb=sdf_cache_size_gb,
+            memory_bytes=int(sdf_memory_cache_mb * 1024 * 1024),
         )
 
-        self.s3 = boto3.client("s3", config=Config(signature_version=UNSIGNED))
-        self.bucket_name = bucket_name
+        self.terrain_source = terrain_source or S3TerrainSource(bucket_name, max_pool_connections=tile_fetch_workers)
         self.bucket_prefix = bucket_prefix
+        self.tile_index = TerrainTileIndex(tile_index_dir, namespace=f"{self.terrain_source.name}/{bucket_prefix}")
+
+        self.sdf_store = SdfStore(sdf_store_dir, size_limit_gb=sdf_store_size_gb)
+
+        self.path_loss_cache = (
+            Cache(path_loss_cache_dir, size_limit=int(path_loss_cache_size_gb * 1024 * 1024 * 1024))
+            if path_loss_cache_size_gb > 0
+            else None
+        )
+
+        self.sdf_converter = sdf_converter
+        self.sdf_validation_rate = sdf_validation_rate
 
-        logger.info(
-            f"Initialized SPLAT! with terrain tile cache at '{cache_dir}' with a size limit of {cache_size_gb} GB."
+        self.tile_executor = ThreadPoolExecutor(
+            max_workers=tile_fetch_workers, thread_name_prefix="splat-tiles"
         )
 
+        logger.info(f"Initialized SPLAT! with terrain tile cache at '{cache_dir}'.")
+
     def coverage_prediction(self, request: CoveragePredictionRequest) -> bytes:
         """
         Execute a SPLAT! coverage prediction using the provided CoveragePredictionRequest.
@@ -133,30 +211,73 @@ class Splat:
         Raises:
             RuntimeError: If SPLAT! fails to execute.
         """
-        logger.debug(f"Coverage prediction request: {request.json()}")
+        geotiff_data, _ = self.coverage_prediction_with_signal(request)
+        return geotiff_data
+
+    def coverage_prediction_with_signal(
+            self,
+            request: CoveragePredictionRequest,
+            progress: Optional[Callable[[str, Optional[dict]], None]] = None,
+    ) -> Tuple[bytes, bytes]:
+        """
+        Execute a SPLAT! coverage prediction, also returning the colormap independent signal levels.
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            try:
-                logger.debug(f"Temporary directory created: {tmpdir}")
+        The signal levels can be rendered again with any colormap and dBm range with `render_signal_geotiff`,
+        without running SPLAT! again. If a cached path-loss grid covers the request, the prediction is derived
+        from it instead of running SPLAT! (see `_derive_from_path_loss_grid`).
 
-                # FIXME: Eventually support high-resolution terrain data
-                request.high_resolution = False
+        Args:
+            request (CoveragePredictionRequest): The coverage prediction request object.
+            progress (Optional[Callable[[str, Optional[dict]], None]]): Called with the name and details of
+                each stage as it is reached: "tiles_planned" (with the estimate of `terrain_estimate`),
+                "tiles_fetched" (after each terrain tile, with the number done and the total), "sdf_ready",
+                "splat_running" and "encoding".
 
-                # Set hard limit of 100 km radius
-                if request.radius > 100000:
-                    logger.debug(f"User tried to set radius of {request.radius} meters, setting to 100 km.")
-                    request.radius = 100000
+        Returns:
+            Tuple[bytes, bytes]: the SPLAT! coverage prediction as a GeoTIFF, and the signal levels as an
+                int16 GeoTIFF in dBm (see `_create_signal_geotiff`).
 
-                # determine the required terrain tiles
-                required_tiles = Splat._calculate_required_terrain_tiles(request.lat, request.lon, request.radius)
+        Raises:
+            RuntimeError: If SPLAT! fails to execute.
+        """
+        logger.debug(f"Coverage prediction request: {request.json()}")
+
+        request = Splat.normalize_request(request)
+        report = progress or (lambda stage, details=None: None)
 
-                # download and convert terrain tiles to SPLAT! sdf
-                for tile_name, sdf_name, sdf_hd_name in required_tiles:
-                    tile_data = self._download_terrain_tile(tile_name)
-                    sdf_data = self._convert_hgt_to_sdf(tile_data, tile_name, high_resolution=request.high_resolution)
+        derived = self._derive_from_path_loss_grid(request)
+        if derived is not None:
+            return derived
 
-                    with open(os.path.join(tmpdir, sdf_hd_name if request.high_resolution else sdf_name), "wb") as sdf_file:
-                        sdf_file.write(sdf_data)
+        with self.sdf_store.temporary_directory() as tmpdir:
+            try:
+                logger.debug(f"Temporary directory created: {tmpdir}")
+
+                # determine the required terrain tiles
+                required_tiles = Splat._calculate_required_terrain_tiles(
+                    request.lat, request.lon, request.radius, self.tile_index
+                )
+                estimate = self._estimate_terrain_tiles(required_tiles, request.high_resolution)
+                logger.info(
+                    f"Prediction needs {estimate['tiles']} terrain tiles ({estimate['absent']} at sea level, "
+                    f"{estimate['missing']} to prepare), about {estimate['download_bytes'] / 1e6:.0f} MB to download "
+                    f"and {estimate['sdf_bytes'] / 1e6:.0f} MB of .sdf files."
+                )
+                report("tiles_planned", estimate)
+
+                # link the SPLAT! sdf terrain files into the working directory, downloading and converting
+                # the ones missing from the SDF store several tiles at a time
+                linked_tiles = self.tile_executor.map(
+                    lambda tile: self.sdf_store.link(
+                        tile[2] if request.high_resolution else tile[1],
+                        tmpdir,
+                        lambda: self._prepare_terrain_tile(tile[0], request.high_resolution, tile[3]),
+                    ),
+                    required_tiles,
+                )
+                for done, _ in enumerate(linked_tiles, 1):
+                    report("tiles_fetched", {"done": done, "total": len(required_tiles)})
+                report("sdf_ready")
 
                 # write transmitter / qth file
                 with open(os.path.join(tmpdir, "tx.qth"), "wb") as qth_file:
@@ -213,6 +334,7 @@ class Splat:
                     "-kml",
                 ]
                 logger.debug(f"Executing SPLAT! command: {' '.join(splat_command)}")
+                report("splat_running")
 
                 splat_result = subprocess.run(
                     splat_command,
@@ -238,26 +360,105 @@ class Splat:
                     with open(os.path.join(tmpdir, "output.kml"), "rb") as kml_file:
                         ppm_data = ppm_file.read()
                         kml_data = kml_file.read()
-                        geotiff_data = Splat._create_splat_geotiff(ppm_data,kml_data,request.colormap,request.min_dbm,request.max_dbm)
+
+                report("encoding")
+
+                signal, indexes = Splat._decode_splat_ppm(ppm_data, request.colormap, request.min_dbm, request.max_dbm)
+                north, south, east, west = Splat._parse_kml_bounds(kml_data)
+                transform = from_bounds(west, south, east, north, signal.shape[1], signal.shape[0])
+                geotiff_data = Splat._create_palette_geotiff(
+                    indexes, transform, request.colormap, request.min_dbm, request.max_dbm,
+                    profile=request.output_profile, compression=request.compression, predictor=request.predictor,
+                )
+                signal_data = Splat._create_signal_geotiff(signal, transform)
+
+                self._store_path_loss_grid(request, signal, transform)
 
                 logger.info("SPLAT! coverage prediction completed successfully.")
-                return geotiff_data
+                return geotiff_data, signal_data
 
             except Exception as e:
                 logger.error(f"Error during coverage prediction: {e}")
                 raise RuntimeError(f"Error during coverage prediction: {e}")
 
+    def prepare_terrain(self, requests: List[CoveragePredictionRequest]) -> int:
+        """
+        Materialize the terrain of several predictions in the SDF store ahead of running them.
+
+        The union of the predictions' terrain tiles is fetched and converted once, several tiles at a time,
+        so predictions of nearby transmitters (e.g. a batch, see /predict/batch) only link the tiles they
+        share instead of each fetching them.
+
+        Args:
+            requests (List[CoveragePredictionRequest]): The coverage prediction requests.
+
+        Returns:
+            int: The number of distinct terrain tiles.
+
+        Raises:
+            RuntimeError: If a terrain tile cannot be prepared.
+        """
+        tiles = {}
+        for request in requests:
+            request = Splat.normalize_request(request)
+            for tile in Splat._calculate_required_terrain_tiles(
+                request.lat, request.lon, request.radius, self.tile_index
+            ):
+                sdf_name = tile[2] if request.high_resolution else tile[1]
+                tiles[sdf_name] = (tile[0], request.high_resolution, tile[3])
+
+        try:
+            list(self.tile_executor.map(
+                lambda item: self.sdf_store.ensure(item[0], lambda: self._prepare_terrain_tile(*item[1])),
+                tiles.items(),
+            ))
+        except Exception as e:
+            logger.error(f"Error preparing terrain tiles: {e}")
+            raise RuntimeError(f"Error preparing terrain tiles: {e}")
+
+        logger.info(f"Prepared {len(tiles)} terrain tiles for {len(requests)} predictions.")
+        return len(tiles)
+
+    @staticmethod
+    def normalize_request(request: CoveragePredictionRequest) -> CoveragePredictionRequest:
+        """
+        Apply the server-side limits to a coverage prediction request.
+
+        Two requests with the same normalized form produce the same SPLAT! output, so this is also
+        the canonical form used to identify cached results.
+
+        Args:
+            request (CoveragePredictionRequest): The coverage prediction request object.
+
+        Returns:
+            CoveragePredictionRequest: A normalized copy of the request.
+        """
+        # Re-validate rather than copy so integer defaults of float fields are coerced like parsed JSON values.
+        request = CoveragePredictionRequest.model_validate(request.model_dump())
+
+        # FIXME: Eventually support high-resolution terrain data
+        request.high_resolution = False
+
+        # Set hard limit of 100 km radius
+        if request.radius > 100000:
+            logger.debug(f"User tried to set radius of {request.radius} meters, setting to 100 km.")
+            request.radius = 100000.0
+
+        return request
+
     @staticmethod
     def _calculate_required_terrain_tiles(
-            lat: float, lon: float, radius: float
-    ) -> List[Tuple[str, str, str]]:
+            lat: float, lon: float, radius: float, tile_index: Optional[TerrainTileIndex] = None
+    ) -> List[Tuple[str, str, str, Optional[TileAvailability]]]:
         """
         Determine the set of required terrain tiles for the specified area and their corresponding .sdf / -hd.sdf
         filenames. This is used for downloading terrain data for SPLAT! which requires the files to follow a specific
         naming convention.
 
-        Calculates the geographic bounding box based on the provided latitude, longitude, and radius, then
-        determines the necessary tiles to cover the area. It returns filenames in the following formats:
+        Only the 1x1 degree tiles that intersect the coverage circle are returned, rather than every tile of its
+        bounding box: the candidates within the circle's latitude and longitude range (all longitudes if it
+        contains a pole) are kept if their great-circle distance to the center (see `_distance_to_tile`) is
+        within the radius. Longitudes wrap around the antimeridian. It returns filenames in the following formats:
 
             - .hgt.gz files: raw 1 arc-second terrain elevation tiles stored in AWS Open Data / S3.
             - .sdf files: Used for standard resolution (3-arcsecond) terrain data in SPLAT!.
@@ -276,55 +477,130 @@ class Splat:
             lat (float): Latitude of the center point in degrees.
             lon (float): Longitude of the center point in degrees.
             radius (float): Simulation coverage radius in meters.
+            tile_index (Optional[TerrainTileIndex]): If provided, the index the availability of each tile is
+                looked up in.
 
         Returns:
-            List[Tuple[str, str, str]]: A list of tuples, each containing:
+            List[Tuple[str, str, str, Optional[TileAvailability]]]: A list of tuples, each containing:
                 - .hgt.gz filename (str)
                 - Corresponding .sdf filename (str)
                 - Corresponding .sdf-hd filename (str)
+                - Where the tile is available, "v2", "v1" or "absent", or None if unknown (Optional[str])
         """
 
-        earth_radius = 6378137  # meters, approximate.
-
-        # Convert radius to angular distance in degrees
-        delta_deg = (radius / earth_radius) * (180 / math.pi)
-
-        # Compute bounding box in degrees
-        lat_min = lat - delta_deg
-        lat_max = lat + delta_deg
-        lon_min = lon - delta_deg / math.cos(math.radians(lat))
-        lon_max = lon + delta_deg / math.cos(math.radians(lat))
+        # Angular radius of the coverage circle, on a sphere of SPLAT!'s earth radius
+        delta = radius / EARTH_RADIUS
+        delta_deg = math.degrees(delta)
 
-        # Determine tile boundaries (rounded to 1-degree tiles)
-        lat_min_tile = math.floor(lat_min)
-        lat_max_tile = math.floor(lat_max)
-        lon_min_tile = math.floor(lon_min)
-        lon_max_tile = math.floor(lon_max)
+        # Latitude range of the circle, and its longitude range unless it contains a pole
+        lat_min_tile = max(math.floor(lat - delta_deg), -90)
+        lat_max_tile = min(math.floor(lat + delta_deg), 89)
+        if lat + delta_deg >= 90 or lat - delta_deg <= -90 or math.sin(delta) >= math.cos(math.radians(lat)):
+            lon_tiles = range(-180, 180)
+        else:
+            delta_lon = math.degrees(math.asin(math.sin(delta) / math.cos(math.radians(lat))))
+            lon_tiles = range(math.floor(lon - delta_lon), math.floor(lon + delta_lon) + 1)
 
-        # All tile names within the bounding box
+        # The tiles intersecting the circle (not just its bounding box)
         tile_names = []
 
+        lon_tiles = sorted({(tile + 180) % 360 - 180 for tile in lon_tiles})
+
         for lat_tile in range(lat_min_tile, lat_max_tile + 1):
-            for lon_tile in range(lon_min_tile, lon_max_tile + 1):
+            for lon_tile in lon_tiles:
+                if Splat._distance_to_tile(lat, lon, lat_tile, lon_tile) > delta + 1e-9:
+                    continue
+
                 ns = "N" if lat_tile >= 0 else "S"
                 ew = "E" if lon_tile >= 0 else "W"
                 tile_name = f"{ns}{abs(lat_tile):02d}{ew}{abs(lon_tile):03d}.hgt.gz"
 
-                # .sdf file boundaries
-                lat_start = lat_tile
-                lon_start = lon_tile
-                lat_end = lat_start + 1
-                lon_end = lon_start + 1
-
                 # Generate .sdf file names
                 sdf_filename = Splat._hgt_filename_to_sdf_filename(tile_name, high_resolution = False)
                 sdf_hd_filename = Splat._hgt_filename_to_sdf_filename(tile_name, high_resolution = True)
-                tile_names.append((tile_name, sdf_filename, sdf_hd_filename))
+                availability = tile_index.get(tile_name) if tile_index is not None else None
+                tile_names.append((tile_name, sdf_filename, sdf_hd_filename, availability))
 
+        absent = sum(1 for tile in tile_names if tile[3] == "absent")
+        if absent:
+            logger.debug(f"{absent} of {len(tile_names)} required tiles are absent and will be at sea level.")
         logger.debug("required tile names are: ")
         logger.debug(tile_names)
         return tile_names
 
+    @staticmethod
+    def _distance_to_tile(lat: float, lon: float, lat_tile: int, lon_tile: int) -> float:
+        """
+        Great-circle distance in radians from a point to the nearest point of a 1x1 degree tile.
+
+        At a fixed latitude the distance grows with the longitude difference, so if the point is outside the
+        tile's longitude range the nearest point is on one of its meridian edges: the foot of the perpendicular
+        to that meridian, clamped to the edge (or the nearest pole if the meridian is on the far side).
+        Otherwise it is straight north or south of the point.
+
+        Args:
+            lat (float): Latitude of the point in degrees.
+            lon (float): Longitude of the point in degrees.
+            lat_tile (int): Latitude of the south edge of the tile in degrees.
+            lon_tile (int): Longitude of the west edge of the tile in degrees.
+
+        Returns:
+            float: The distance in radians, 0 if the point is in the tile.
+        """
+        offset = (lon - lon_tile) % 360
+        if offset <= 1:
+            return math.radians(max(lat_tile - lat, lat - (lat_tile + 1), 0))
+
+        phi = math.radians(lat)
+        distances = []
+        for dlon in (math.radians(offset), math.radians(offset - 1)):
+            foot = math.atan2(math.sin(phi), math.cos(phi) * math.cos(dlon))
+            if abs(foot) > math.pi / 2:
+                foot = math.copysign(math.pi / 2, phi)
+            foot = min(max(foot, math.radians(lat_tile)), math.radians(lat_tile + 1))
+            cos_distance = math.sin(phi) * math.sin(foot) + math.cos(phi) * math.cos(foot) * math.cos(dlon)
+            distances.append(math.acos(min(max(cos_distance, -1.0), 1.0)))
+        return min(distances)
+
+    def terrain_estimate(self, request: CoveragePredictionRequest) -> dict:
+        """
+        Number of terrain tiles a prediction needs, and an estimate of the bytes it will download and read.
+
+        Args:
+            request (CoveragePredictionRequest): The coverage prediction request object.
+
+        Returns:
+            dict: The number of tiles, of tiles absent from the bucket (at sea level), and of tiles that are
+                neither in the SDF store nor the tile cache; the estimated bytes to download and the estimated
+                bytes of .sdf files SPLAT! reads.
+        """
+        request = Splat.normalize_request(request)
+        tiles = Splat._calculate_required_terrain_tiles(request.lat, request.lon, request.radius, self.tile_index)
+        return self._estimate_terrain_tiles(tiles, request.high_resolution)
+
+    def _estimate_terrain_tiles(
+            self, tiles: List[Tuple[str, str, str, Optional[TileAvailability]]], high_resolution: bool
+    ) -> dict:
+        """Estimate of `terrain_estimate` for the tiles from `_calculate_required_terrain_tiles`."""
+        sdf_bytes = SDF_HD_ESTIMATED_BYTES if high_resolution else SDF_ESTIMATED_BYTES
+
+        estimate = {"tiles": len(tiles), "absent": 0, "missing": 0, "download_bytes": 0, "sdf_bytes": 0}
+        for tile_name, sdf_name, sdf_hd_name, availability in tiles:
+            if availability == "absent":
+                estimate["absent"] += 1
+                estimate["sdf_bytes"] += sdf_bytes // 2  # one "0\n" line per sample
+                continue
+
+            estimate["sdf_bytes"] += sdf_bytes
+            if self.sdf_store.contains(sdf_hd_name if high_resolution else sdf_name):
+                continue
+            estimate["missing"] += 1
+            if not self.terrain_cache.has_sdf(sdf_hd_name if high_resolution else sdf_name) and \
+                    not self.terrain_cache.has_raw(tile_name):
+                estimate["download_bytes"] += HGT_ESTIMATED_BYTES
+
+        return estimate
+
     @staticmethod
     def _create_splat_qth(name: str, latitude: float, longitude: float, elevation: float) -> bytes:
         """
@@ -412,7 +688,7 @@ class Splat:
         polarization_map = {"horizontal": 0, "vertical": 1}
 
         # Calculate ERP in Watts
-        erp_watts = 10 ** ((tx_power + tx_gain - system_loss - 30) / 10)
+        erp_watts = Splat._erp_watts(tx_power, tx_gain, system_loss)
         logger.debug(
             f"Calculated ERP in Watts: {erp_watts:.2f} "
             f"(tx_power={tx_power}, tx_gain={tx_gain}, system_loss={system_loss})"
@@ -437,6 +713,250 @@ class Splat:
             logger.error(f"Error generating .lrp file content: {e}")
             raise
 
+    @staticmethod
+    def _erp_watts(tx_power: float, tx_gain: float, system_loss: float) -> float:
+        """Effective radiated power in Watts for a transmitter power in dBm, antenna gain and system loss in dB."""
+        return 10 ** ((tx_power + tx_gain - system_loss - 30) / 10)
+
+    @staticmethod
+    def _splat_erp_dbm(request: CoveragePredictionRequest) -> Optional[float]:
+        """
+        The ERP in dBm SPLAT! runs with for a request, i.e. after rounding to the 0.01 W of the .lrp file.
+
+        Returns None if the ERP rounds to 0 W.
+        """
+        erp_watts = round(Splat._erp_watts(request.tx_power, request.tx_gain, request.system_loss), 2)
+        if erp_watts <= 0:
+            return None
+        return 10 * math.log10(erp_watts) + 30
+
+    @staticmethod
+    def path_loss_key(request: CoveragePredictionRequest) -> str:
+        """
+        Stable hash of the fields of a (normalized) request that determine its path loss.
+
+        Requests with the same key only differ in PATH_LOSS_INDEPENDENT_FIELDS, so their signal levels differ
+        by a constant offset in dB and a different cutoff.
+
+        Args:
+            request (CoveragePredictionRequest): The coverage prediction request object.
+
+        Returns:
+            str: Hex encoded SHA-256 digest of the path-loss relevant fields.
+        """
+        canonical = json.dumps(
+            {
+                "version": PATH_LOSS_GRID_VERSION,
+                "request": request.model_dump(exclude=PATH_LOSS_INDEPENDENT_FIELDS),
+            },
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def _store_path_loss_grid(
+            self, request: CoveragePredictionRequest, signal: np.ndarray, transform: Affine
+    ) -> None:
+        """
+        Cache the decoded signal levels of a SPLAT! run as the path-loss grid for its `path_loss_key`.
+
+        The grid holds the signal levels with the ERP they were computed for, so the path loss of a pixel is
+        the ERP minus its signal level. It covers every pixel up to a path loss of the ERP minus the weakest
+        level SPLAT! drew (the signal threshold or the lowest .dcf level, whichever is higher). An existing
+        grid is kept if it can already derive the request (see `_path_loss_grid_serves`), and replaced otherwise.
+        """
+        if self.path_loss_cache is None:
+            return
+
+        erp_dbm = Splat._splat_erp_dbm(request)
+        if erp_dbm is None:
+            return
+
+        levels, _ = Splat._splat_dcf_levels(request.colormap, request.min_dbm, request.max_dbm)
+        max_path_loss = erp_dbm - max(request.signal_threshold, levels.min())
+
+        key = Splat.path_loss_key(request)
+        cached = self.path_loss_cache.get(key)
+        if cached is not None and Splat._path_loss_grid_serves(cached, request, erp_dbm):
+            return
+
+        self.path_loss_cache.set(
+            key,
+            {
+                "signal": signal,
+                "levels": np.unique(levels),
+                "erp_dbm": erp_dbm,
+                "max_path_loss": max_path_loss,
+                "transform": tuple(transform)[:6],
+            },
+        )
+        logger.info(f"Cached path-loss grid {key} covering up to {max_path_loss:.1f} dB of path loss.")
+
+    def _derive_from_path_loss_grid(self, request: CoveragePredictionRequest) -> Optional[Tuple[bytes, bytes]]:
+        """
+        Derive a (normalized) request's prediction from a cached path-loss grid, without running SPLAT!.
+
+        The cached signal levels are shifted by the difference in ERP, then drawn with the request's .dcf
+        levels and cut off at its signal threshold like SPLAT! does. This is only done when the result is
+        exactly what SPLAT! would draw (see `_path_loss_grid_serves`), e.g. for another colormap or output
+        format, or a power or threshold change by whole contour steps; otherwise SPLAT! runs again.
+
+        Args:
+            request (CoveragePredictionRequest): The normalized coverage prediction request object.
+
+        Returns:
+            Optional[Tuple[bytes, bytes]]: The prediction and signal level GeoTIFFs as returned by
+                `coverage_prediction_with_signal`, or None if no cached grid can derive the request.
+        """
+        if self.path_loss_cache is None:
+            return None
+
+        key = Splat.path_loss_key(request)
+        grid = self.path_loss_cache.get(key)
+        erp_dbm = Splat._splat_erp_dbm(request)
+        if grid is None or erp_dbm is None:
+            return None
+
+        if not Splat._path_loss_grid_serves(grid, request, erp_dbm):
+            logger.debug(f"Cached path-loss grid {key} cannot derive the request exactly, running SPLAT!.")
+            return None
+
+        levels, _ = Splat._splat_dcf_levels(request.colormap, request.min_dbm, request.max_dbm)
+        signal = Splat._shift_signal_levels(
+            grid["signal"], grid["levels"], erp_dbm - grid["erp_dbm"], levels, request.signal_threshold,
+            signal_floor=grid["erp_dbm"] - grid["max_path_loss"],
+        )
+        transform = Affine(*grid["transform"])
+        indexes = Splat._palette_indexes(signal, request.min_dbm, request.max_dbm)
+
+        logger.info(f"Derived coverage prediction from cached path-loss grid {key}.")
+        return (
+            Splat._create_palette_geotiff(
+                indexes, transform, request.colormap, request.min_dbm, request.max_dbm,
+                profile=request.output_profile, compression=request.compression, predictor=request.predictor,
+            ),
+            Splat._create_signal_geotiff(signal, transform),
+        )
+
+    @staticmethod
+    def _path_loss_grid_serves(grid: dict, request: CoveragePredictionRequest, erp_dbm: float) -> bool:
+        """
+        Whether a path-loss grid derives a request exactly as SPLAT! would draw it.
+
+        The grid only knows, for each pixel, between which two of its levels (or its floor, the weakest
+        signal it drew) the signal lies. Drawing the request needs to know on which side of each of the
+        request's cut points (its .dcf levels and signal threshold, from its floor up) a signal lies, once
+        shifted by the difference in ERP. That is exact if the grid reaches the request's floor and every cut
+        point of the request falls on a (shifted) level or floor of the grid, i.e. the grid's contours are
+        at least as fine as the request's and cover them.
+
+        Args:
+            grid (dict): The cached path-loss grid (see `_store_path_loss_grid`).
+            request (CoveragePredictionRequest): The normalized coverage prediction request object.
+            erp_dbm (float): The ERP of the request in dBm (see `_splat_erp_dbm`).
+
+        Returns:
+            bool: True if the grid derives the request exactly.
+        """
+        levels, _ = Splat._splat_dcf_levels(request.colormap, request.min_dbm, request.max_dbm)
+        floor_dbm = max(request.signal_threshold, levels.min())
+        if erp_dbm - floor_dbm > grid["max_path_loss"] + 1e-6:
+            return False
+
+        offset_db = erp_dbm - grid["erp_dbm"]
+        grid_floor = grid["erp_dbm"] - grid["max_path_loss"]
+        grid_cuts = np.append(grid["levels"][grid["levels"] > grid_floor], grid_floor) + offset_db
+        cuts = np.append(levels[levels > floor_dbm], floor_dbm)
+        return bool(np.all(np.min(np.abs(cuts[:, None] - grid_cuts[None, :]), axis=1) < 1e-6))
+
+    @staticmethod
+    def _shift_signal_levels(
+            signal: np.ndarray,
+            signal_levels: np.ndarray,
+            offset_db: float,
+            levels: np.ndarray,
+            signal_threshold: float,
+            signal_floor: float = -np.inf,
+    ) -> np.ndarray:
+        """
+        Offset int16 signal levels and redraw them with other .dcf levels.
+
+        A pixel drawn with one of `signal_levels` has a signal somewhere between that level (or the weakest
+        signal drawn, if higher) and the next stronger one, so the middle of that interval is used as its
+        signal. After adding `offset_db`, it becomes the strongest of `levels` it reaches, or SIGNAL_NODATA if
+        it is below the signal threshold or the weakest level. The mapping is tabulated for every int16 value
+        and applied with a single gather. It is exact when no level or threshold falls inside an interval
+        (see `_path_loss_grid_serves`).
+
+        Args:
+            signal (np.ndarray): int16 signal levels in dBm, SIGNAL_NODATA where there is no coverage.
+            signal_levels (np.ndarray): The ascending .dcf levels `signal` was drawn with.
+            offset_db (float): Offset to add to the signals in dB.
+            levels (np.ndarray): The .dcf levels to redraw the signals with.
+            signal_threshold (float): Signals below this value in dBm are dropped.
+            signal_floor (float): The weakest signal drawn in `signal` in dBm (its signal threshold, if above
+                its weakest level). Defaults to no floor.
+
+        Returns:
+            np.ndarray: The redrawn int16 signal levels.
+        """
+        # the strongest level has no upper bound, assume the average spacing of the levels
+        spacing = (signal_levels[-1] - signal_levels[0]) / max(len(signal_levels) - 1, 1)
+        upper = np.append(signal_levels[1:], signal_levels[-1] + spacing)
+        lower = np.maximum(signal_levels, np.minimum(signal_floor, upper))
+        values = (lower + upper) / 2.0 + offset_db
+
+        levels = np.unique(levels)  # ascending
+        position = np.searchsorted(levels, values, side="right") - 1
+        redrawn = np.where(
+            (position >= 0) & (values >= signal_threshold), levels[np.maximum(position, 0)], SIGNAL_NODATA
+        )
+
+        lookup = np.full(1 << 16, SIGNAL_NODATA, dtype=np.int16)
+        lookup[signal_levels.astype(np.int64) + 32768] = redrawn
+        return lookup[signal.view(np.uint16) ^ 0x8000]
+
+    @staticmethod
+    def _splat_dcf_levels(
+            colormap_name: str, min_dbm: float, max_dbm: float
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Signal levels and colors of the SPLAT! .dcf file for a colormap and dBm range.
+
+        Colors are nudged by one step in a channel where needed, so that every level has a distinct color
+        that is neither white (no coverage) nor black (site markers) and the PPM can be decoded losslessly.
+
+        Args:
+            colormap_name (str): The name of the Matplotlib colormap.
+            min_dbm (float): The minimum signal strength value for the colormap in dBm.
+            max_dbm (float): The maximum signal strength value for the colormap in dBm.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The 32 integer dBm levels from strongest to weakest, and their
+                (32, 3) RGB colors.
+        """
+        # Generate color map values and normalization
+        cmap = plt.get_cmap(colormap_name)
+        cmap_values = np.linspace(max_dbm, min_dbm, 32)  # SPLAT! supports up to 32 levels
+        cmap_norm = plt.Normalize(vmin=min_dbm, vmax=max_dbm)
+
+        # Generate RGB values
+        rgb_colors = (cmap(cmap_norm(cmap_values))[:, :3] * 255).astype(int)
+
+        # Make the colors unique
+        used = {(0, 0, 0), (255, 255, 255)}
+        nudges = [(0, 0, 0), (0, 0, 1), (0, 0, -1), (0, 1, 0), (0, -1, 0), (1, 0, 0), (-1, 0, 0)]
+        for i, rgb in enumerate(rgb_colors):
+            for step in range(1, 256):
+                candidates = [tuple(np.clip(rgb + np.multiply(nudge, step), 0, 255)) for nudge in nudges]
+                color = next((c for c in candidates if c not in used), None)
+                if color is not None:
+                    break
+            used.add(color)
+            rgb_colors[i] = color
+
+        return cmap_values.astype(int), rgb_colors
+
     @staticmethod
     def _create_splat_dcf(
             colormap_name: str, min_dbm: float, max_dbm: float
@@ -458,19 +978,13 @@ class Splat:
         )
 
         try:
-            # Generate color map values and normalization
-            cmap = plt.get_cmap(colormap_name)
-            cmap_values = np.linspace(max_dbm, min_dbm, 32)  # SPLAT! supports up to 32 levels
-            cmap_norm = plt.Normalize(vmin=min_dbm, vmax=max_dbm)
-
-            # Generate RGB values
-            rgb_colors = (cmap(cmap_norm(cmap_values))[:, :3] * 255).astype(int)
+            cmap_values, rgb_colors = Splat._splat_dcf_levels(colormap_name, min_dbm, max_dbm)
 
             # Prepare .dcf content
             contents = "; SPLAT! Auto-generated DBM Signal Level Color Definition\n;\n"
             contents += "; Format: dBm: red, green, blue\n;\n"
             for value, rgb in zip(cmap_values, rgb_colors):
-                contents += f"{int(value):+4d}: {rgb[0]:3d}, {rgb[1]:3d}, {rgb[2]:3d}\n"
+                contents += f"{value:+4d}: {rgb[0]:3d}, {rgb[1]:3d}, {rgb[2]:3d}\n"
 
             logger.debug(f"Generated .dcf file contents:\n{contents}")
             return contents.encode("utf-8")
@@ -496,154 +1010,428 @@ class Splat:
 
 
     @staticmethod
-    def _create_splat_geotiff(
-            ppm_bytes: bytes,
-            kml_bytes: bytes,
+    def _parse_kml_bounds(kml_bytes: bytes) -> Tuple[float, float, float, float]:
+        """
+        Extract the bounding box of the SPLAT! coverage map from its KML file.
+
+        Args:
+            kml_bytes (bytes): Binary content of the KML file containing geospatial bounds.
+
+        Returns:
+            Tuple[float, float, float, float]: The north, south, east and west bounds in degrees.
+        """
+        logger.debug("Parsing KML content.")
+        tree = ET.ElementTree(ET.fromstring(kml_bytes))
+        namespace = {"kml": "http://earth.google.com/kml/2.1"}
+        box = tree.find(".//kml:LatLonBox", namespace)
+
+        north = float(box.find("kml:north", namespace).text)
+        south = float(box.find("kml:south", namespace).text)
+        east = float(box.find("kml:east", namespace).text)
+        west = float(box.find("kml:west", namespace).text)
+
+        logger.debug(
+            f"Extracted bounding box: north={north}, south={south}, east={east}, west={west}"
+        )
+        return north, south, east, west
+
+    @staticmethod
+    def _gdal_colormap(colormap_name: str, min_dbm: float, max_dbm: float) -> dict:
+        """GDAL palette mapping the indexes 0-254 linearly to the colormap over the dBm range."""
+        cmap = plt.get_cmap(colormap_name, 256)  # colormap with 256 levels
+        cmap_norm = plt.Normalize(vmin=min_dbm, vmax=max_dbm)  # Normalize based on dBm range
+        cmap_values = np.linspace(min_dbm, max_dbm, 255)
+
+        # Map data values to RGB for visible colors
+        rgb_colors = (cmap(cmap_norm(cmap_values))[:, :3] * 255).astype(int)
+
+        # Initialize GDAL-compatible colormap with transparency for null values
+        return {i: tuple(rgb) + (255,) for i, rgb in enumerate(rgb_colors)}
+
+    @staticmethod
+    def _decode_splat_ppm(
+            ppm_bytes: bytes, colormap_name: str, min_dbm: float, max_dbm: float, null_value: int = 255
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Recover the signal level of every pixel of a SPLAT! PPM from the .dcf colors it was drawn with.
+
+        SPLAT! paints each pixel with the color of the strongest .dcf level the signal reaches, so the
+        decoded value is that level in dBm. Pixels without a level color (no coverage, map annotations)
+        have no signal.
+
+        Every pixel is read straight from the PPM as a packed 24-bit color and looked up in tables indexed
+        by color (see `_ppm_lookup_tables`). The image is decoded in chunks of `PPM_DECODE_CHUNK` pixels, so
+        the packed colors of a chunk stay in the CPU cache between the two lookups instead of going through a
+        full-size array in memory.
+
+        Args:
+            ppm_bytes (bytes): Binary content of the SPLAT-generated PPM file.
+            colormap_name (str): Name of the matplotlib colormap passed to `_create_splat_dcf`.
+            min_dbm (float): Minimum dBm value passed to `_create_splat_dcf`.
+            max_dbm (float): Maximum dBm value passed to `_create_splat_dcf`.
+            null_value (int): Palette index for pixels without signal. Defaults to 255.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: int16 signal levels in dBm (SIGNAL_NODATA without signal), and
+                uint8 indexes into the `_gdal_colormap` palette (see `_palette_indexes`).
+        """
+        with Image.open(io.BytesIO(ppm_bytes)) as img:
+            width, height = img.size
+            if img.mode == "RGB" and img.tile and img.tile[0][0] == "raw":
+                pixels, offset = ppm_bytes, img.tile[0][2]  # 8-bit binary PPM, use the pixel data in place
+            else:
+                pixels, offset = np.asarray(img.convert("RGB")).tobytes(), 0
+
+        signal_lookup, index_lookup = Splat._ppm_lookup_tables(colormap_name, min_dbm, max_dbm, null_value)
+
+        count = width * height
+        signal = np.empty(count, dtype=np.int16)
+        indexes = np.empty(count, dtype=np.uint8)
+        for start in range(0, count, PPM_DECODE_CHUNK):
+            stop = min(start + PPM_DECODE_CHUNK, count)
+            packed = Splat._pack_rgb(pixels, offset + 3 * start, stop - start)
+            # the packed colors are below 2^24, the size of the tables: "wrap" only skips the bounds checks
+            signal_lookup.take(packed, out=signal[start:stop], mode="wrap")
+            index_lookup.take(packed, out=indexes[start:stop], mode="wrap")
+
+        logger.debug(f"Decoded {np.count_nonzero(signal != SIGNAL_NODATA)} covered pixels from the SPLAT! PPM.")
+        return signal.reshape(height, width), indexes.reshape(height, width)
+
+    @staticmethod
+    def _ppm_lookup_tables(
+            colormap_name: str, min_dbm: float, max_dbm: float, null_value: int = 255
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Tables mapping every packed 24-bit color to its signal level and palette index, for `_decode_splat_ppm`.
+
+        The 48 MB of tables take a few milliseconds to fill, a fraction of the decoding itself, so they are
+        built for each PPM and freed with it rather than kept per colormap and dBm range.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: int16 signal levels (SIGNAL_NODATA for colors that are not .dcf
+                levels) and uint8 palette indexes (`null_value` for those colors), each of 2^24 entries.
+        """
+        levels, rgb_colors = Splat._splat_dcf_levels(colormap_name, min_dbm, max_dbm)
+        keys = rgb_colors[:, 0] | (rgb_colors[:, 1] << 8) | (rgb_colors[:, 2] << 16)
+
+        signal_lookup = np.full(1 << 24, SIGNAL_NODATA, dtype=np.int16)
+        signal_lookup[keys] = levels
+        index_lookup = np.full(1 << 24, null_value, dtype=np.uint8)
+        index_lookup[keys] = Splat._palette_indexes(levels.astype(np.int16), min_dbm, max_dbm, null_value)
+        return signal_lookup, index_lookup
+
+    @staticmethod
+    def _palette_indexes(
+            signal: np.ndarray, min_dbm: float, max_dbm: float, null_value: int = 255
+    ) -> np.ndarray:
+        """
+        Map int16 signal levels to indexes into the `_gdal_colormap` palette for a dBm range.
+
+        The palette has 255 entries spanning `min_dbm` to `max_dbm`, signals outside the range are clamped
+        to its ends and SIGNAL_NODATA becomes `null_value`. The mapping is tabulated for every int16 value
+        and applied with a single gather.
+        """
+        values = np.arange(-32768, 32768, dtype=np.float32)
+        scaled = (values - np.float32(min_dbm)) * np.float32(254.0 / (max_dbm - min_dbm))
+        lookup = np.clip(np.rint(scaled), 0, 254).astype(np.uint8)
+        lookup[SIGNAL_NODATA + 32768] = null_value
+        return lookup[signal.astype(np.int16).view(np.uint16) ^ 0x8000]
+
+    @staticmethod
+    def _pack_rgb(pixels: bytes, offset: int, count: int) -> np.ndarray:
+        """
+        Pack `count` 8-bit RGB pixels starting at `offset` into int64 values `r | g << 8 | b << 16`.
+
+        Each pixel is read as a little-endian 64-bit integer starting at its red byte, through a strided
+        view of the buffer, and masked to its low 24 bits. The last pixels, whose 8 byte read would run
+        past the end of the buffer, are packed separately.
+        """
+        strided = max(0, min(count, (len(pixels) - offset - 8) // 3 + 1))
+        packed = np.empty(count, dtype=np.int64)
+        view = np.ndarray((strided,), dtype="<i8", buffer=pixels, offset=offset, strides=(3,))
+        np.bitwise_and(view, 0xFFFFFF, out=packed[:strided])
+
+        tail = np.frombuffer(
+            pixels, dtype=np.uint8, count=3 * (count - strided), offset=offset + 3 * strided
+        ).reshape(-1, 3).astype(np.int64)
+        packed[strided:] = tail[:, 0] | (tail[:, 1] << 8) | (tail[:, 2] << 16)
+        return packed
+
+    @staticmethod
+    def _create_signal_geotiff(signal: np.ndarray, transform: Affine) -> bytes:
+        """
+        Generate a single-band int16 GeoTIFF of signal levels in dBm, with SIGNAL_NODATA as the NoData value.
+
+        Args:
+            signal (np.ndarray): Signal levels in dBm, SIGNAL_NODATA where there is no coverage.
+            transform (Affine): Geotransform of the signal levels in EPSG:4326.
+
+        Returns:
+            bytes: The binary content of the GeoTIFF file.
+        """
+        height, width = signal.shape
+        with io.BytesIO() as buffer:
+            with rasterio.open(
+                    buffer,
+                    "w",
+                    driver="GTiff",
+                    height=height,
+                    width=width,
+                    count=1,
+                    dtype="int16",
+                    crs="EPSG:4326",
+                    transform=transform,
+                    compress="deflate",
+                    predictor=2,  # horizontal differencing
+                    nodata=SIGNAL_NODATA,
+            ) as dst:
+                dst.write(signal.astype(np.int16), 1)
+
+            return buffer.getvalue()
+
+    @staticmethod
+    def _create_palette_geotiff(
+            indexes: np.ndarray,
+            transform: Affine,
             colormap_name: str,
             min_dbm: float,
             max_dbm: float,
-            null_value: int = 255  # Define the null value for transparency
+            null_value: int = 255,
+            profile: Literal["geotiff", "cog"] = "geotiff",
+            compression: Literal["lzw", "deflate", "zstd"] = "lzw",
+            predictor: bool = False,
     ) -> bytes:
         """
-        Generate GeoTIFF file content from SPLAT! PPM and KML data, with transparency for null areas.
+        Generate a palette GeoTIFF of signal levels, with transparency for areas without coverage.
+
+        The "geotiff" profile writes a plain striped GeoTIFF. The "cog" profile writes a Cloud-Optimized
+        GeoTIFF: internal 256x256 tiles and nearest neighbour overviews, ordered so that clients can read a
+        zoomed-out view or a window with HTTP range requests.
 
         Args:
-            ppm_bytes (bytes): Binary content of the SPLAT-generated PPM file.
-            kml_bytes (bytes): Binary content of the KML file containing geospatial bounds.
+            indexes (np.ndarray): uint8 palette indexes of the signal levels (see `_palette_indexes`).
+            transform (Affine): Geotransform of the signal levels in EPSG:4326.
+            colormap_name (str): Name of the matplotlib colormap to use for the GeoTIFF.
+            min_dbm (float): Minimum dBm value for the colormap scale.
+            max_dbm (float): Maximum dBm value for the colormap scale.
+            null_value (int): Pixel value used for areas without coverage. Defaults to 255.
+            profile (str): GeoTIFF layout, "geotiff" or "cog". Defaults to "geotiff".
+            compression (str): Compression codec, "lzw", "deflate" or "zstd". Defaults to "lzw".
+            predictor (bool): Apply horizontal differencing before compression. Defaults to False.
+
+        Returns:
+            bytes: The binary content of the GeoTIFF file.
+        """
+        height, width = indexes.shape
+        creation_options = {"compress": compression}
+        if predictor:
+            creation_options["predictor"] = 2
+
+        with rasterio.MemoryFile() as memfile:
+            with memfile.open(
+                    driver="GTiff",
+                    height=height,
+                    width=width,
+                    count=1,  # Single-band data
+                    dtype="uint8",
+                    crs="EPSG:4326",
+                    transform=transform,
+                    photometric="palette",  # Colormap interpretation
+                    nodata=null_value,  # Set NoData value
+                    **creation_options,
+            ) as dst:
+                dst.write(indexes, 1)  # Write the raster data
+                dst.write_colormap(1, Splat._gdal_colormap(colormap_name, min_dbm, max_dbm))  # Attach the colormap
+
+            if profile != "cog":
+                return memfile.read()
+
+            with rasterio.MemoryFile() as cog_memfile:
+                rasterio.shutil.copy(
+                    memfile.name,
+                    cog_memfile.name,
+                    driver="COG",
+                    BLOCKSIZE=256,
+                    OVERVIEW_RESAMPLING="NEAREST",
+                    **{key.upper(): str(value).upper() for key, value in creation_options.items()},
+                )
+                return cog_memfile.read()
+
+    @staticmethod
+    def render_signal_geotiff(
+            signal_bytes: bytes,
+            colormap_name: str,
+            min_dbm: float,
+            max_dbm: float,
+            null_value: int = 255,
+    ) -> bytes:
+        """
+        Render a signal level GeoTIFF (see `coverage_prediction_with_signal`) with a colormap and dBm range.
+
+        The result is a palette GeoTIFF like the SPLAT! coverage prediction (see `_create_palette_geotiff`).
+
+        Args:
+            signal_bytes (bytes): Binary content of the signal level GeoTIFF.
             colormap_name (str): Name of the matplotlib colormap to use for the GeoTIFF.
             min_dbm (float): Minimum dBm value for the colormap scale.
             max_dbm (float): Maximum dBm value for the colormap scale.
-            null_value (int): Pixel value in the PPM that represents null areas. Defaults to 255.
+            null_value (int): Pixel value used for areas without coverage. Defaults to 255.
 
         Returns:
-            bytes: The binary content of the resulting GeoTIFF file.
+            bytes: The binary content of the rendered GeoTIFF file.
 
         Raises:
-            RuntimeError: If the conversion process fails.
+            RuntimeError: If rendering fails.
         """
-        logger.info("Starting GeoTIFF generation from SPLAT! PPM and KML data.")
-
         try:
-            # Parse KML and extract bounding box
-            logger.debug("Parsing KML content.")
-            tree = ET.ElementTree(ET.fromstring(kml_bytes))
-            namespace = {"kml": "http://earth.google.com/kml/2.1"}
-            box = tree.find(".//kml:LatLonBox", namespace)
-
-            north = float(box.find("kml:north", namespace).text)
-            south = float(box.find("kml:south", namespace).text)
-            east = float(box.find("kml:east", namespace).text)
-            west = float(box.find("kml:west", namespace).text)
-
-            logger.debug(
-                f"Extracted bounding box: north={north}, south={south}, east={east}, west={west}"
-            )
+            with rasterio.MemoryFile(signal_bytes) as memfile:
+                with memfile.open() as src:
+                    signal = src.read(1, masked=True).filled(SIGNAL_NODATA)
+                    transform = src.transform
 
-            # Read PPM content
-            logger.debug("Reading PPM content.")
-            with Image.open(io.BytesIO(ppm_bytes)) as img:
-                img_array = np.array(
-                    img.convert("L")
-                )  # Convert to single-channel grayscale
-                img_array = np.clip(img_array, 0, 255).astype("uint8")
-
-            logger.debug(f"PPM image dimensions: {img_array.shape}")
-
-            # Mask null values
-            img_array = np.where(img_array == null_value, 255, img_array)  # Optionally set to 0
-            no_data_value = null_value
-
-            # Create GeoTIFF using Rasterio
-            height, width = img_array.shape
-            transform = from_bounds(west, south, east, north, width, height)
-            logger.debug(f"GeoTIFF transform matrix: {transform}")
-
-            # Generate colormap with transparency
-            cmap = plt.get_cmap(colormap_name, 256)  # colormap with 256 levels
-            cmap_norm = plt.Normalize(vmin=min_dbm, vmax=max_dbm)  # Normalize based on dBm range
-            cmap_values = np.linspace(min_dbm, max_dbm, 255)
-
-            # Map data values to RGB for visible colors
-            rgb_colors = (cmap(cmap_norm(cmap_values))[:, :3] * 255).astype(int)
-
-            # Initialize GDAL-compatible colormap with transparency for null values
-            gdal_colormap = {i: tuple(rgb) + (255,) for i, rgb in enumerate(rgb_colors)}
-
-            # Write GeoTIFF to memory
-            with io.BytesIO() as buffer:
-                with rasterio.open(
-                        buffer,
-                        "w",
-                        driver="GTiff",
-                        height=height,
-                        width=width,
-                        count=1,  # Single-band data
-                        dtype="uint8",
-                        crs="EPSG:4326",
-                        transform=transform,
-                        photometric="palette",  # Colormap interpretation
-                        compress="lzw",
-                        nodata=no_data_value,  # Set NoData value
-                ) as dst:
-                    dst.write(img_array, 1)  # Write the raster data
-                    dst.write_colormap(1, gdal_colormap)  # Attach the colormap
-
-                buffer.seek(0)
-                geotiff_bytes = buffer.read()
-
-            logger.info("GeoTIFF generation successful.")
-            return geotiff_bytes
+            indexes = Splat._palette_indexes(signal, min_dbm, max_dbm, null_value)
+            return Splat._create_palette_geotiff(indexes, transform, colormap_name, min_dbm, max_dbm, null_value)
 
         except Exception as e:
-            logger.error(f"Error during GeoTIFF generation: {e}")
-            raise RuntimeError(f"Error during GeoTIFF generation: {e}")
-
-    def _download_terrain_tile(self, tile_name: str) -> bytes:
+            logger.error(f"Error rendering signal GeoTIFF: {e}")
+            raise RuntimeError(f"Error rendering signal GeoTIFF: {e}")
+
+    def _download_terrain_tile(
+            self,
+            tile_name: str,
+            availability: Optional[TileAvailability] = None,
+            decompressor: Optional[sdf.HgtDecompressor] = None,
+    ) -> Optional[bytes]:
         """
-        Downloads a terrain tile from the S3 bucket if not found in the local cache.
+        Downloads a terrain tile from the terrain source if not found in the local cache.
 
         This method checks if the requested tile is available in the cache..
-        If the tile is not cached, it downloads the tile from the specified S3 bucket,
+        If the tile is not cached, it downloads the tile from the terrain source (by default the S3 bucket),
         stores it in the cache, and returns the tile data.
 
+        The tile is looked up under the configured prefix, then under the V1 `skadi/` prefix. Where it was
+        found, or that it is in neither, is recorded in the tile index so the next download goes straight to
+        the right key, and a missing tile is not requested again. Only an authoritative terrain source (see
+        `TerrainSource.authoritative`) can tell that a tile is missing; a tile missing from any other is an
+        error.
+
         Args:
             tile_name (str): The name of the terrain tile to be downloaded.
+            availability (Optional[TileAvailability]): Where the tile is available, if already looked up in
+                the tile index.
+            decompressor (Optional[sdf.HgtDecompressor]): If provided, the tile is fed to it, chunk by chunk
+                as it is downloaded.
 
         Returns:
-            bytes: The binary content of the terrain tile.
+            Optional[bytes]: The binary content of the terrain tile, or None if the tile does not exist.
 
         Raises:
-            Exception: If the tile cannot be downloaded from S3.
+            Exception: If the tile cannot be downloaded from the terrain source.
+            RuntimeError: If the tile is missing from a terrain source that is not authoritative.
         """
-        if tile_name in self.tile_cache:
+        tile_data = self.terrain_cache.get_raw(tile_name)
+        if tile_data is not None:
             logger.info(f"Cache hit: {tile_name} found in the local cache.")
-            return self.tile_cache[tile_name]
+            if decompressor is not None:
+                decompressor.feed_all(tile_data)
+            return tile_data
+
+        availability = availability or self.tile_index.get(tile_name)
+        if availability == "absent":
+            logger.debug(f"Tile {tile_name} is known to be absent from {self.terrain_source.name}.")
+            return None
 
-        # Download the tile from S3 if not in cache
+        # Download the tile if not in cache
         tile_dir_prefix = tile_name[:3]
-        s3_key = f"{self.bucket_prefix}/{tile_dir_prefix}/{tile_name}"
-        logger.info(f"Downloading {tile_name} from {self.bucket_name}/{s3_key}...")
-        try:
-            obj = self.s3.get_object(Bucket=self.bucket_name, Key=s3_key)
-            tile_data = obj['Body'].read()
+        candidates = [("v2", self.bucket_prefix), ("v1", "skadi")]
+        if availability is not None:
+            candidates = [candidate for candidate in candidates if candidate[0] == availability]
+
+        for found, prefix in candidates:
+            key = f"{prefix}/{tile_dir_prefix}/{tile_name}"
+            logger.info(f"Downloading {tile_name} from {self.terrain_source.name}/{key}...")
+            try:
+                chunks = self.terrain_source.iter_chunks(key)
+                if chunks is None:
+                    logger.info(f"Tile {tile_name} not found in {self.terrain_source.name} under {prefix}/.")
+                    continue
+
+                parts = []
+                for chunk in chunks:
+                    parts.append(chunk)
+                    if decompressor is not None:
+                        decompressor.feed(chunk)
+                tile_data = b"".join(parts)
+                if decompressor is not None and not decompressor.complete:
+                    raise ValueError(f"{tile_name} is truncated.")
+            except Exception as e:
+                logger.error(f"Failed to download {tile_name} from {self.terrain_source.name}: {e}")
+                raise
+
             # Store the tile in the cache
-            self.tile_cache[tile_name] = tile_data
+            self.terrain_cache.put_raw(tile_name, tile_data)
+            if found != availability:
+                self.tile_index.record(tile_name, found)
             return tile_data
-        except ClientError as e:
-            if e.response['Error']['Code'] == 'NoSuchKey':
-                logger.info(f"Tile {tile_name} not found in S3 bucket, trying to download V1 SRTM data instead: {e}")
-                s3_key = f"skadi/{tile_dir_prefix}/{tile_name}"
-                obj = self.s3.get_object(Bucket=self.bucket_name, Key=s3_key)
-                tile_data = obj['Body'].read()
-                # Store the tile in the cache
-                self.tile_cache[tile_name] = tile_data
-                return tile_data
-            else:
-                logger.error(f"Failed to download {tile_name} from S3 due to ClientError: {e}")
-                raise
-        except Exception as e:
-            logger.error(f"Failed to download {tile_name} from S3: {e}")
-            raise
+
+        if not self.terrain_source.authoritative:
+            raise RuntimeError(
+                f"Tile {tile_name} not found in {self.terrain_source.name}, which does not hold every tile; "
+                f"chain the S3 bucket after it to fetch the missing ones."
+            )
+
+        logger.info(f"Tile {tile_name} not found in {self.terrain_source.name}, treating it as sea level.")
+        self.tile_index.record(tile_name, "absent")
+        return None
+
+    def _prepare_terrain_tile(
+            self, tile_name: str, high_resolution: bool = False, availability: Optional[TileAvailability] = None
+    ) -> bytes:
+        """
+        Download a terrain tile and convert it to a SPLAT! .sdf or -hd.sdf file, using the cache for both steps.
+
+        The converted file is looked up first, so the raw tile is only read (or downloaded) to convert it again.
+        Conversions are single-flight across threads and processes sharing the cache: if another worker is
+        already preparing the same tile, this waits for it and returns its result.
+        Tiles missing from the bucket are synthesized at sea level (see `sdf.sea_level_sdf`).
+        With the in-process converter, downloaded tiles are decompressed as they stream in.
+
+        Args:
+            tile_name (str): The name of the terrain tile (e.g., N35W120.hgt.gz).
+            high_resolution (bool): Whether to generate a high-resolution -hd.sdf file. Defaults to False.
+            availability (Optional[TileAvailability]): Where the tile is available, if already looked up in
+                the tile index.
+
+        Returns:
+            bytes: The binary content of the converted .sdf or -hd.sdf file.
+        """
+        sdf_filename = Splat._hgt_filename_to_sdf_filename(tile_name, high_resolution)
+        sdf_data = self.terrain_cache.get_sdf(sdf_filename)
+        if sdf_data is not None:
+            logger.info(f"Cache hit: {sdf_filename} found in the local cache.")
+            return sdf_data
+
+        with self.terrain_cache.lock(sdf_filename):
+            # another worker may have prepared the tile while this one waited for the lock
+            if self.terrain_cache.has_sdf(sdf_filename):
+                sdf_data = self.terrain_cache.get_sdf(sdf_filename)
+                if sdf_data is not None:
+                    logger.info(f"Cache hit: {sdf_filename} prepared by another worker.")
+                    return sdf_data
+
+            decompressor = sdf.HgtDecompressor(tile_name) if self.sdf_converter == "numpy" else None
+            try:
+                tile_data = self._download_terrain_tile(tile_name, availability, decompressor)
+                elevation = decompressor.elevation() if decompressor is not None and tile_data is not None else None
+            except ValueError as e:
+                logger.error(f"Error decompressing {tile_name}: {e}")
+                raise RuntimeError(f"Conversion error for {tile_name}: {e}")
+
+            if tile_data is None:
+                sdf_data = sdf.sea_level_sdf(tile_name, high_resolution)
+                self.terrain_cache.put_sdf(sdf_filename, sdf_data)
+                return sdf_data
+            return self._convert_hgt_to_sdf(tile_data, tile_name, high_resolution=high_resolution, elevation=elevation)
 
     @staticmethod
     def _hgt_filename_to_sdf_filename(hgt_filename: str, high_resolution: bool = False) -> str:
@@ -653,19 +1441,25 @@ class Splat:
             lon = 360 - lon if hgt_filename[3] == 'E' else lon
             return f"{lat}:{lat + 1}:{lon}:{lon + 1}{'-hd.sdf' if high_resolution else '.sdf'}"
 
-    def _convert_hgt_to_sdf(self, tile: bytes, tile_name: str, high_resolution: bool = False) -> bytes:
+    def _convert_hgt_to_sdf(
+            self, tile: bytes, tile_name: str, high_resolution: bool = False, elevation: Optional[np.ndarray] = None
+    ) -> bytes:
         """
         Converts a .hgt.gz terrain tile (provided as bytes) to a SPLAT! .sdf or -hd.sdf file.
 
-        This method checks if the converted .sdf or -hd.sdf file corresponding to the tile_name
-        exists in the cache. If not, the method decompresses the tile, places it in a temporary
-        directory, performs the conversion using the SPLAT! utility (srtm2sdf or srtm2sdf-hd),
-        and caches the resulting .sdf file.
+        The method converts the tile in-process with the vectorized converter in app.services.sdf
+        (or, with `sdf_converter="srtm2sdf"`, with the SPLAT! utility srtm2sdf or srtm2sdf-hd), and
+        caches the resulting .sdf file. `_prepare_terrain_tile` looks it up in the cache first.
+
+        A fraction `sdf_validation_rate` of the in-process conversions is also run through srtm2sdf and
+        diffed against it. On a mismatch the srtm2sdf output is used and the difference is logged.
 
         Args:
             tile (bytes): The binary content of the .hgt.gz terrain tile.
             tile_name (str): The name of the terrain tile (e.g., N35W120.hgt.gz).
             high_resolution (bool): Whether to generate a high-resolution -hd.sdf file. Defaults to False.
+            elevation (Optional[np.ndarray]): The tile already decompressed while it was downloaded, used by
+                the in-process converter instead of decompressing `tile` again.
 
         Returns:
             bytes: The binary content of the converted .sdf or -hd.sdf file.
@@ -676,96 +1470,37 @@ class Splat:
 
         sdf_filename = Splat._hgt_filename_to_sdf_filename(tile_name, high_resolution)
 
-        # Check cache for converted file
-        if sdf_filename in self.tile_cache:
-            logger.info(f"Cache hit: {sdf_filename} found in the local cache.")
-            return self.tile_cache[sdf_filename]
-
-        # Create temporary working directory
-        with tempfile.TemporaryDirectory() as tmpdir:
-            try:
-                # Decompress the tile into the temporary directory
-                hgt_path = os.path.join(tmpdir, tile_name.replace(".gz", ""))
-                logger.info(f"Decompressing {tile_name} into {hgt_path}.")
-                with gzip.GzipFile(fileobj=io.BytesIO(tile)) as gz_file:
-                    with open(hgt_path, "wb") as hgt_file:
-                        hgt_file.write(gz_file.read())
-
-                # Downsample to 3-arcsecond resolution if not in high-resolution mode
-                if not high_resolution:
-                    try:
-                        logger.info(f"Downsampling {hgt_path} to 3-arcsecond resolution.")
-                        with rasterio.open(hgt_path) as src:
-                            # Apply a scaling factor to transform for 3-arcsecond resolution
-                            scale_factor = 3  # 3-arcsecond is 3 times coarser than 1-arcsecond
-                            transform = src.transform * Affine.scale(scale_factor, scale_factor)
-
-                            # Resample data to 3-arcsecond resolution
-                            data = src.read(
-                                # 3-arcsecond SRTM tiles always have dimensions of 1201x1201 pixels.
-                                out_shape=(
-                                    src.count,  # Number of bands
-                                    1201,   # Downsampled height
-                                    1201,   # Downsampled width
-                                ),
-                                resampling=Resampling.average,
-                            )
-
-                            # Update metadata for the new dataset
-                            meta = src.meta.copy()
-                            meta.update(
-                                {
-                                    "transform": transform,
-                                    "width": 1201,
-                                    "height": 1201,
-                                }
-                            )
-
-                        # Overwrite the temporary file with downsampled data
-                        with rasterio.open(hgt_path, "w", **meta) as dst:
-                            dst.write(data)
-
-                        logger.info(f"Successfully downsampled {hgt_path}.")
-                    except Exception as e:
-                        logger.error(f"Failed to downsample {hgt_path}: {e}")
-                        raise RuntimeError(f"Downsampling error for {hgt_path}: {e}")
-
-                # Call srtm2sdf or srtm2sdf-hd in the temporary directory
-                cmd = self.srtm2sdf_hd_binary if high_resolution else self.srtm2sdf_binary
-                logger.info(f"Converting {hgt_path} to {sdf_filename} using {cmd}.")
-                result = subprocess.run(
-                    [cmd, os.path.basename(tile_name.replace(".gz", ""))],
-                    cwd=tmpdir,
-                    capture_output=True,
-                    text=True,
-                    check=True,
-                )
-
-                logger.debug(f"srtm2sdf output:\n{result.stderr}")
-                sdf_path = os.path.join(tmpdir, sdf_filename)
-
-                # Ensure the .sdf file was created
-                if not os.path.exists(sdf_path):
-                    logger.error(f"Expected .sdf file not found: {sdf_path}")
-                    raise RuntimeError(f"Failed to generate .sdf file: {sdf_path}")
-
-                # Read and cache the .sdf file
-                with open(sdf_path, "rb") as sdf_file:
-                    sdf_data = sdf_file.read()
-                self.tile_cache[sdf_filename] = sdf_data
-
-                logger.info(f"Successfully converted and cached {sdf_filename}.")
-                return sdf_data
+        cmd = self.srtm2sdf_hd_binary if high_resolution else self.srtm2sdf_binary
+        try:
+            if self.sdf_converter == "srtm2sdf":
+                logger.info(f"Converting {tile_name} to {sdf_filename} using {cmd}.")
+                sdf_data = sdf.srtm2sdf_hgt_to_sdf(tile, tile_name, cmd, high_resolution)
+            else:
+                logger.info(f"Converting {tile_name} to {sdf_filename}.")
+                sdf_data = sdf.hgt_to_sdf(tile, tile_name, high_resolution, elevation=elevation)
+
+                if random.random() < self.sdf_validation_rate:
+                    expected = sdf.srtm2sdf_hgt_to_sdf(tile, tile_name, cmd, high_resolution)
+                    difference = sdf.diff_sdf(expected, sdf_data)
+                    if difference:
+                        logger.error(f"{sdf_filename} differs from {cmd} output, using {cmd}: {difference}")
+                        sdf_data = expected
+                    else:
+                        logger.info(f"Validated {sdf_filename} against {cmd}.")
+
+        except subprocess.CalledProcessError as e:
+            logger.error(f"Subprocess error during conversion of {tile_name}: {e}")
+            logger.error(f"stderr: {e.stderr}")
+            raise RuntimeError(f"Subprocess error during conversion of {tile_name}: {e}")
 
-            except subprocess.CalledProcessError as e:
-                logger.error(f"Subprocess error during conversion of {tile_name}: {e}")
-                logger.error(f"stderr: {e.stderr}")
-                raise RuntimeError(f"Subprocess error during conversion of {tile_name}: {e}")
+        except Exception as e:
+            logger.error(f"Error during conversion of {tile_name} to {sdf_filename}: {e}")
+            raise RuntimeError(f"Conversion error for {tile_name}: {e}")
 
-            except Exception as e:
-                logger.error(f"Error during conversion of {tile_name} to {sdf_filename}: {e}")
-                raise RuntimeError(f"Conversion error for {tile_name}: {e}")
+        self.terrain_cache.put_sdf(sdf_filename, sdf_data)
 
+        logger.info(f"Successfully converted and cached {sdf_filename}.")
+        return sdf_data
 
 
 if __name__ == "__main__":
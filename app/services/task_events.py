@@ -0,0 +1,176 @@
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional, Set
+
+import redis
+import redis.asyncio
+
+
+logger = logging.getLogger(__name__)
+
+EVENTS_PREFIX = "task_events"
+
+# Statuses after which a task publishes no more events
+TERMINAL_STATUSES = ("completed", "failed")
+
+
+def task_event(task_id: str, status: str, stage: Optional[str] = None, details: Optional[dict] = None) -> str:
+    """
+    JSON encoded task event, as published to subscribers and kept in `{task_id}:progress`.
+
+    Args:
+        task_id (str): The unique identifier for the task.
+        status (str): The task status, "processing", "completed" or "failed".
+        stage (Optional[str]): The stage of a processing task, e.g. "tiles_fetched" or "splat_running".
+        details (Optional[dict]): Additional fields of the stage, e.g. the number of terrain tiles fetched.
+
+    Returns:
+        str: The event.
+    """
+    event = {"task_id": task_id, "status": status}
+    if stage is not None:
+        event["stage"] = stage
+    if details:
+        event.update(details)
+    return json.dumps(event)
+
+
+def publish_task_event(
+    redis_client: redis.StrictRedis,
+    task_id: str,
+    status: str,
+    stage: Optional[str] = None,
+    details: Optional[dict] = None,
+    pipe: Optional[redis.client.Pipeline] = None,
+) -> None:
+    """
+    Record the latest event of a task and publish it to the API processes (see `TaskEventBroker`).
+
+    Args:
+        redis_client (redis.StrictRedis): Redis client shared with the task status keys.
+        task_id (str): The unique identifier for the task.
+        status (str): The task status, "processing", "completed" or "failed".
+        stage (Optional[str]): The stage of a processing task.
+        details (Optional[dict]): Additional fields of the stage.
+        pipe (Optional[redis.client.Pipeline]): If provided, the commands are queued on this pipeline
+            (e.g. the transaction setting the final task status) instead of being sent right away.
+    """
+    event = task_event(task_id, status, stage, details)
+    if pipe is not None:
+        pipe.setex(f"{task_id}:progress", 3600, event)
+        pipe.publish(f"{EVENTS_PREFIX}:{task_id}", event)
+        return
+
+    with redis_client.pipeline(transaction=False) as pipe:
+        pipe.setex(f"{task_id}:progress", 3600, event)
+        pipe.publish(f"{EVENTS_PREFIX}:{task_id}", event)
+        pipe.execute()
+
+
+class TaskEventBroker:
+    def __init__(self, redis_client: redis.asyncio.Redis, reconnect_delay: float = 1.0, poll_interval: float = 1.0):
+        """
+        Fans task events published in Redis out to the requests waiting on them in this API process.
+
+        A single pattern subscription to every task's channel is shared by all waiting requests, so a
+        process holds one Redis connection for pub/sub however many clients are waiting, instead of one
+        per client. Events of tasks nobody waits on in this process are dropped.
+
+        While the subscription is down (e.g. Redis restarting), events are lost, so waiting requests read
+        the task status from Redis every `poll_interval` seconds instead (see `subscribed`).
+
+        Args:
+            redis_client (redis.asyncio.Redis): Redis client the subscription connection is taken from.
+            reconnect_delay (float): Seconds to wait before subscribing again after a connection error.
+                Defaults to 1.0.
+            poll_interval (float): Seconds between status reads of waiting requests while the subscription
+                is down. Defaults to 1.0.
+        """
+        self.redis_client = redis_client
+        self.reconnect_delay = reconnect_delay
+        self.poll_interval = poll_interval
+
+        self._queues: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+        self._reader: Optional[asyncio.Task] = None
+        self._subscribed = asyncio.Event()
+
+    @property
+    def subscribed(self) -> bool:
+        """Whether the subscription is active, i.e. no event can be missed."""
+        return self._subscribed.is_set()
+
+    def wait_interval(self, remaining: float) -> float:
+        """Seconds a waiting request can wait for an event before reading the task status from Redis."""
+        return remaining if self.subscribed else min(remaining, self.poll_interval)
+
+    async def _start(self, timeout: Optional[float]) -> None:
+        """Start the subscription if needed, and wait up to `timeout` seconds until it is active."""
+        if self._reader is None or self._reader.done():
+            self._subscribed.clear()
+            self._reader = asyncio.create_task(self._read())
+        try:
+            await asyncio.wait_for(self._subscribed.wait(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Task event subscription is not active, reading task statuses from Redis.")
+
+    async def _read(self) -> None:
+        while True:
+            pubsub = self.redis_client.pubsub()
+            try:
+                await pubsub.psubscribe(f"{EVENTS_PREFIX}:*")
+                self._subscribed.set()
+                async for message in pubsub.listen():
+                    if message["type"] != "pmessage":
+                        continue
+                    task_id = message["channel"].decode("utf-8").split(":", 1)[1]
+                    for queue in self._queues.get(task_id, ()):
+                        queue.put_nowait(json.loads(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Task event subscription lost: {e}, subscribing again.")
+                await asyncio.sleep(self.reconnect_delay)
+            finally:
+                self._subscribed.clear()
+                await pubsub.aclose()
+
+    @asynccontextmanager
+    async def subscribe(self, task_id: str, timeout: Optional[float] = None) -> AsyncIterator[asyncio.Queue]:
+        """
+        Receive the events of a task while the context is open.
+
+        The subscription is normally active when the context is entered, so the caller can read the current
+        task status afterwards without missing an event published in between. If it does not become active
+        within `timeout` seconds, the context is entered anyway and `subscribed` is False: the caller must
+        then read the status from Redis as well (see `wait_interval`).
+
+        Args:
+            task_id (str): The unique identifier for the task.
+            timeout (Optional[float]): Maximum number of seconds to wait for the subscription, or None to
+                wait until it is active.
+
+        Yields:
+            asyncio.Queue: Queue of the task's decoded events.
+        """
+        queue = asyncio.Queue()
+        self._queues[task_id].add(queue)
+        try:
+            await self._start(timeout)
+            yield queue
+        finally:
+            self._queues[task_id].discard(queue)
+            if not self._queues[task_id]:
+                del self._queues[task_id]
+
+    async def close(self) -> None:
+        """Stop the subscription."""
+        if self._reader is not None:
+            self._reader.cancel()
+            try:
+                await self._reader
+            except asyncio.CancelledError:
+                pass
+            self._reader = None
@@ -0,0 +1,90 @@
+import logging
+from typing import Optional
+
+import redis
+
+from app.models.CoveragePredictionRequest import CoveragePredictionRequest
+from app.services.coalesce import JobCoalescer
+from app.services.result_cache import ResultCache, request_digest
+from app.services.result_store import ResultStore
+from app.services.splat import Splat
+from app.services.task_events import publish_task_event
+
+
+logger = logging.getLogger(__name__)
+
+
+def run_splat(
+    splat_service: Splat,
+    redis_client: redis.StrictRedis,
+    result_store: ResultStore,
+    task_id: str,
+    request: CoveragePredictionRequest,
+    result_cache: Optional[ResultCache] = None,
+    coalescer: Optional[JobCoalescer] = None,
+):
+    """
+    Execute the SPLAT! coverage prediction and store the resulting GeoTIFF and signal level data.
+
+    This is shared by the API's local worker pool and the standalone queue workers (app.worker).
+
+    Args:
+        splat_service (Splat): The SPLAT! service used to run the prediction.
+        redis_client (redis.StrictRedis): Redis client used to store the task status and result pointers.
+        result_store (ResultStore): Store holding the GeoTIFF and signal level data.
+        task_id (str): UUID identifier for the task.
+        request (CoveragePredictionRequest): The parameters for the SPLAT! prediction.
+        result_cache (Optional[ResultCache]): If provided, the completed task is recorded in the result cache.
+        coalescer (Optional[JobCoalescer]): If provided, the task's in-flight claim is released when it finishes.
+
+    Workflow:
+        - Runs the SPLAT! coverage prediction, publishing its progress (see `publish_task_event`).
+        - Stores the resulting GeoTIFF data and the signal levels for re-rendering in the result store, for as
+          long as the result cache may keep the task.
+        - Stores pointers to them (`{task_id}` and `{task_id}:signal`) and the task status ("completed") in
+          Redis in one transaction, together with the "completed" event.
+        - Records the task in the result cache, if enabled.
+        - On failure, stores the task status as "failed" and logs the error in Redis, and publishes the
+          "failed" event.
+        - Releases the in-flight claim, so later identical requests no longer attach to this task.
+
+    Raises:
+        Exception: If SPLAT! fails during execution.
+    """
+    def report(stage: str, details: Optional[dict] = None):
+        try:
+            publish_task_event(redis_client, task_id, "processing", stage, details)
+        except redis.RedisError as e:
+            logger.warning(f"Failed to publish progress of task {task_id}: {e}")
+
+    try:
+        logger.info(f"Starting SPLAT! coverage prediction for task {task_id}.")
+        report("started")
+        geotiff_data, signal_data = splat_service.coverage_prediction_with_signal(request, progress=report)
+
+        logger.info(f"Storing result in the result store for task {task_id}")
+        store_ttl = max(3600, result_cache.ttl) if result_cache is not None else 3600
+        result_store.put(task_id, geotiff_data, store_ttl)
+        result_store.put(f"{task_id}:signal", signal_data, store_ttl)
+
+        with redis_client.pipeline(transaction=True) as pipe:
+            pipe.setex(task_id, 3600, task_id)
+            pipe.setex(f"{task_id}:signal", 3600, f"{task_id}:signal")
+            pipe.setex(f"{task_id}:status", 3600, "completed")
+            publish_task_event(redis_client, task_id, "completed", pipe=pipe)
+            pipe.execute()
+        logger.info(f"Task {task_id} marked as completed.")
+
+        if result_cache is not None:
+            result_cache.put(request_digest(request), task_id, len(geotiff_data) + len(signal_data))
+    except Exception as e:
+        logger.error(f"Error in SPLAT! task {task_id}: {e}")
+        with redis_client.pipeline(transaction=True) as pipe:
+            pipe.setex(f"{task_id}:error", 3600, str(e))
+            pipe.setex(f"{task_id}:status", 3600, "failed")
+            publish_task_event(redis_client, task_id, "failed", details={"error": str(e)}, pipe=pipe)
+            pipe.execute()
+        raise
+    finally:
+        if coalescer is not None:
+            coalescer.release(request_digest(request), task_id)
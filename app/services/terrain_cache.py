@@ -0,0 +1,231 @@
+import fcntl
+import logging
+import os
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Optional
+
+from diskcache import Cache
+
+
+logger = logging.getLogger(__name__)
+
+
+class TileLock:
+    def __init__(self, path: str, timeout: float, max_delay: float = 0.25):
+        """
+        Exclusive `fcntl.flock` on a lock file, shared by every process and thread opening the same file.
+
+        The kernel releases the lock when its holder closes the file or dies, so a crashed worker never leaves
+        a tile locked. Waiters poll with an exponential backoff of up to `max_delay` seconds between attempts,
+        and give up after `timeout` seconds in case the holder hangs.
+
+        Args:
+            path (str): Path of the lock file, created if missing.
+            timeout (float): Seconds to wait for the lock before raising RuntimeError.
+            max_delay (float): Maximum delay between two attempts in seconds. Defaults to 0.25.
+        """
+        self.path = path
+        self.timeout = timeout
+        self.max_delay = max_delay
+        self._fd: Optional[int] = None
+
+    def __enter__(self) -> "TileLock":
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        deadline = time.monotonic() + self.timeout
+        delay = 0.001
+        while True:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    os.close(fd)
+                    raise RuntimeError(f"Timed out after {self.timeout}s waiting for the lock '{self.path}'.")
+                time.sleep(min(delay, remaining))
+                delay = min(delay * 2, self.max_delay)
+
+        self._fd = fd
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        # closing the file releases the lock
+        os.close(self._fd)
+        self._fd = None
+
+
+class TerrainCache:
+    def __init__(
+        self,
+        directory: str = ".splat_tiles",
+        raw_size_gb: float = 1.0,
+        sdf_size_gb: float = 1.0,
+        compression_level: int = 6,
+        memory_bytes: int = 0,
+        lock_timeout: int = 600,
+    ):
+        """
+        Two-tier cache of terrain tiles: raw .hgt.gz tiles from S3, and the .sdf files converted from them.
+
+        Each tier is its own diskcache with its own size limit, so raw tiles, which are only needed to convert
+        a tile again, can no longer evict the converted files predictions read. Converted files are evicted
+        least recently used first; raw tiles, read once per conversion, oldest first. Callers look up the .sdf
+        tier first and only fall back to the raw tier (and S3) on a miss.
+
+        .sdf files are plain text with one elevation per line and are stored zlib compressed, typically at a
+        fifth of their size or less (sea-level tiles to a few kilobytes). Raw tiles are already compressed.
+
+        Optionally, the most recently used .sdf files are also kept decompressed in an in-process LRU tier
+        bounded by `memory_bytes`, in front of the .sdf tier, so hot tiles skip SQLite and zlib altogether.
+        Each process has its own memory tier; size it against the container's memory limit, e.g. a few
+        typical tiles of about 6 MB (50 MB for -hd.sdf files) per worker process.
+
+        Preparing a tile that is in neither tier is single-flight (see `lock`): the first process or thread
+        downloads and converts it, the others wait and then read its result from the cache.
+
+        Hits and misses of the disk tiers are counted by diskcache in the cache directory, so they are shared
+        by every process using it; those of the memory tier are counted per process.
+
+        Args:
+            directory (str): Directory of the cache, holding the `raw` and `sdf` tiers. Defaults to `.splat_tiles`.
+            raw_size_gb (float): Maximum size of the raw tiles in gigabytes (GB). Defaults to 1.0.
+            sdf_size_gb (float): Maximum size of the compressed .sdf files in gigabytes (GB). Defaults to 1.0.
+            compression_level (int): zlib compression level (1-9) of the .sdf files. Defaults to 6.
+            memory_bytes (int): Maximum size of the in-process tier in bytes, 0 disables it. Defaults to 0.
+            lock_timeout (int): Seconds to wait for the lock of a tile being prepared by another process or thread
+                before giving up. A holder that died releases it at once. Defaults to 600.
+        """
+        self.compression_level = compression_level
+        self.raw = Cache(
+            os.path.join(directory, "raw"),
+            size_limit=int(raw_size_gb * 1024 * 1024 * 1024),
+            eviction_policy="least-recently-stored",
+        )
+        self.sdf = Cache(
+            os.path.join(directory, "sdf"),
+            size_limit=int(sdf_size_gb * 1024 * 1024 * 1024),
+            eviction_policy="least-recently-used",
+        )
+        self.raw.stats(enable=True)
+        self.sdf.stats(enable=True)
+
+        # one lock file per tile, never deleted so that every process locks the same file
+        self.locks_directory = os.path.join(directory, "locks")
+        os.makedirs(self.locks_directory, exist_ok=True)
+        self.lock_timeout = lock_timeout
+
+        self.memory_bytes = memory_bytes
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_size = 0
+        self._memory_counters = {"hits": 0, "misses": 0, "evictions": 0}
+        self._memory_lock = threading.Lock()
+
+        logger.info(
+            f"Initialized terrain cache at '{directory}' with size limits of {raw_size_gb} GB for raw tiles "
+            f"and {sdf_size_gb} GB for .sdf files, and {memory_bytes / 1024 / 1024:.0f} MB in memory."
+        )
+
+    def get_sdf(self, sdf_name: str) -> Optional[bytes]:
+        """Return a converted .sdf or -hd.sdf file, or None if it is not cached."""
+        if self.memory_bytes > 0:
+            with self._memory_lock:
+                data = self._memory.get(sdf_name)
+                if data is not None:
+                    self._memory.move_to_end(sdf_name)
+                    self._memory_counters["hits"] += 1
+                    return data
+                self._memory_counters["misses"] += 1
+
+        data = self.sdf.get(sdf_name)
+        if data is None:
+            return None
+
+        data = zlib.decompress(data)
+        self._remember(sdf_name, data)
+        return data
+
+    def put_sdf(self, sdf_name: str, data: bytes) -> None:
+        """Cache a converted .sdf or -hd.sdf file."""
+        self.sdf.set(sdf_name, zlib.compress(data, self.compression_level))
+        self._remember(sdf_name, data)
+
+    def _remember(self, sdf_name: str, data: bytes) -> None:
+        """Add an .sdf file to the memory tier, evicting the least recently used ones beyond its size."""
+        if len(data) > self.memory_bytes:
+            return
+
+        with self._memory_lock:
+            previous = self._memory.pop(sdf_name, None)
+            if previous is not None:
+                self._memory_size -= len(previous)
+            self._memory[sdf_name] = data
+            self._memory_size += len(data)
+            while self._memory_size > self.memory_bytes:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_size -= len(evicted)
+                self._memory_counters["evictions"] += 1
+
+    def has_sdf(self, sdf_name: str) -> bool:
+        """Whether a converted file is cached, without counting a hit or miss."""
+        with self._memory_lock:
+            if sdf_name in self._memory:
+                return True
+        return sdf_name in self.sdf
+
+    def lock(self, sdf_name: str) -> TileLock:
+        """
+        Process-safe lock for preparing an .sdf file, shared by every process using the cache directory.
+
+        Holders should check the cache again once they have the lock, as another process may have prepared
+        the file while they waited.
+
+        Args:
+            sdf_name (str): The .sdf or -hd.sdf filename.
+
+        Returns:
+            TileLock: The lock, to use as a context manager.
+        """
+        return TileLock(os.path.join(self.locks_directory, f"{sdf_name}.lock"), self.lock_timeout)
+
+    def get_raw(self, tile_name: str) -> Optional[bytes]:
+        """Return a raw .hgt.gz tile, or None if it is not cached."""
+        return self.raw.get(tile_name)
+
+    def put_raw(self, tile_name: str, data: bytes) -> None:
+        """Cache a raw .hgt.gz tile."""
+        self.raw.set(tile_name, data)
+
+    def has_raw(self, tile_name: str) -> bool:
+        """Whether a raw tile is cached, without counting a hit or miss."""
+        return tile_name in self.raw
+
+    def stats(self) -> dict:
+        """Usage, limits and hit/miss counters of each tier."""
+        tiers = {}
+        if self.memory_bytes > 0:
+            with self._memory_lock:
+                hits, misses = self._memory_counters["hits"], self._memory_counters["misses"]
+                tiers["memory"] = {
+                    "entries": len(self._memory),
+                    "bytes": self._memory_size,
+                    "max_bytes": self.memory_bytes,
+                    "hits": hits,
+                    "misses": misses,
+                    "hit_rate": hits / (hits + misses) if hits + misses else None,
+                    "evictions": self._memory_counters["evictions"],
+                }
+
+        for name, cache in (("sdf", self.sdf), ("raw", self.raw)):
+            hits, misses = cache.stats()
+            tiers[name] = {
+                "entries": len(cache),
+                "bytes": cache.volume(),
+                "max_bytes": cache.size_limit,
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": hits / (hits + misses) if hits + misses else None,
+            }
+        return tiers
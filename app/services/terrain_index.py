@@ -0,0 +1,62 @@
+import logging
+from typing import Dict, Iterable, Literal, Optional
+
+from diskcache import Cache
+
+
+logger = logging.getLogger(__name__)
+
+# Where a terrain tile was found: under the configured (v2) prefix, only under the v1 `skadi/` prefix,
+# or nowhere, e.g. open ocean, for which a sea-level tile is synthesized instead.
+TileAvailability = Literal["v2", "v1", "absent"]
+TILE_AVAILABILITIES = ("v2", "v1", "absent")
+
+
+class TerrainTileIndex:
+    def __init__(self, directory: str = ".splat_tile_index", namespace: str = "", absent_ttl: Optional[int] = None):
+        """
+        Persistent index of where each terrain tile exists in the S3 bucket.
+
+        Without it, every prediction near a coast asks S3 for the same missing ocean tiles under both the v2
+        and the v1 prefix, and tiles only present under v1 cost a failed v2 request each time they are not
+        in the tile cache. The index outlives the tile cache (its entries are a few bytes and are never
+        evicted for size), so a tile is looked up in the bucket at most once.
+
+        Args:
+            directory (str): Directory of the index. Defaults to `.splat_tile_index`.
+            namespace (str): Prefix of the index keys, e.g. the bucket name, so several buckets can share
+                the directory. Defaults to "".
+            absent_ttl (Optional[int]): Seconds after which a tile recorded as absent is looked up again, or
+                None to trust the record forever. Defaults to None.
+        """
+        self.namespace = namespace
+        self.absent_ttl = absent_ttl
+        self.cache = Cache(directory)
+
+        logger.info(f"Initialized terrain tile index at '{directory}' with {len(self.cache)} tiles.")
+
+    def _key(self, tile_name: str) -> str:
+        return f"{self.namespace}:{tile_name}"
+
+    def get(self, tile_name: str) -> Optional[TileAvailability]:
+        """Return where a tile (e.g. N35W120.hgt.gz) is available, or None if it was never looked up."""
+        return self.cache.get(self._key(tile_name))
+
+    def get_many(self, tile_names: Iterable[str]) -> Dict[str, Optional[TileAvailability]]:
+        """Return the availability of several tiles, None for the ones never looked up."""
+        return {tile_name: self.get(tile_name) for tile_name in tile_names}
+
+    def record(self, tile_name: str, availability: TileAvailability) -> None:
+        """
+        Record where a tile was found.
+
+        Args:
+            tile_name (str): The name of the terrain tile.
+            availability (TileAvailability): "v2", "v1" or "absent".
+        """
+        if availability not in TILE_AVAILABILITIES:
+            raise ValueError(f"Unknown tile availability '{availability}'.")
+
+        expire = self.absent_ttl if availability == "absent" else None
+        self.cache.set(self._key(tile_name), availability, expire=expire)
+        logger.debug(f"Recorded terrain tile {tile_name} as {availability}.")
@@ -0,0 +1,231 @@
+import logging
+import os
+from abc import ABC, abstractmethod
+from typing import Iterator, List, Optional
+
+import boto3
+import urllib3
+from botocore import UNSIGNED
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+
+logger = logging.getLogger(__name__)
+
+
+class TerrainSource(ABC):
+    """
+    Where terrain tiles are fetched from.
+
+    Tiles are addressed by their key in the layout of the AWS terrain tiles bucket, e.g.
+    `v2/skadi/N35/N35W120.hgt.gz`, so a local mirror or an HTTP server only needs a copy of (part of) that
+    layout. Tiles are read as a stream of chunks, which callers can decompress as they arrive instead of
+    holding the whole compressed tile in memory first (see `sdf.HgtDecompressor`).
+
+    Tiles that do not exist (e.g. over the sea) are recorded as absent in the tile availability index and
+    synthesized at sea level. Only an authoritative source, i.e. the bucket itself, can tell that a tile does not
+    exist; a tile missing from a partial mirror or behind a misconfigured proxy is an error instead.
+    """
+
+    # Identifies the source in logs and in the keys of the tile availability index
+    name: str = ""
+
+    # Whether a tile missing from the source does not exist at all
+    authoritative: bool = False
+
+    @abstractmethod
+    def iter_chunks(self, key: str) -> Optional[Iterator[bytes]]:
+        """
+        Open a tile for streaming.
+
+        Args:
+            key (str): The key of the tile, e.g. `v2/skadi/N35/N35W120.hgt.gz`.
+
+        Returns:
+            Optional[Iterator[bytes]]: The content of the tile in chunks, or None if the source has no such tile.
+
+        Raises:
+            Exception: If the source cannot be read.
+        """
+
+    def fetch(self, key: str) -> Optional[bytes]:
+        """Return the content of a tile, or None if the source has no such tile."""
+        chunks = self.iter_chunks(key)
+        return b"".join(chunks) if chunks is not None else None
+
+
+class S3TerrainSource(TerrainSource):
+    authoritative = True
+
+    def __init__(
+        self,
+        bucket_name: str = "elevation-tiles-prod",
+        endpoint_url: Optional[str] = None,
+        unsigned: bool = True,
+        max_pool_connections: int = 16,
+        chunk_size: int = 1024 * 1024,
+    ):
+        """
+        Terrain tiles in an S3 bucket, by default the AWS open data bucket (https://registry.opendata.aws/terrain-tiles/).
+
+        A single client with a connection pool of `max_pool_connections` is shared by every thread fetching
+        tiles (predictions and pre-warming), with TCP keep-alive and adaptive retries so that bursts of
+        parallel downloads reuse connections and back off when throttled.
+
+        Args:
+            bucket_name (str): Name of the bucket. Defaults to `elevation-tiles-prod`.
+            endpoint_url (Optional[str]): Endpoint of an S3-compatible service (e.g. MinIO), or None for AWS.
+            unsigned (bool): Whether to make anonymous requests, as the public bucket allows. Defaults to True.
+            max_pool_connections (int): Size of the connection pool. Defaults to 16.
+            chunk_size (int): Size of the chunks tiles are streamed in. Defaults to 1 MB.
+        """
+        self.bucket_name = bucket_name
+        self.chunk_size = chunk_size
+        self.name = f"s3://{bucket_name}" if endpoint_url is None else f"{endpoint_url.rstrip('/')}/{bucket_name}"
+        self.s3 = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url,
+            config=Config(
+                signature_version=UNSIGNED if unsigned else None,
+                max_pool_connections=max_pool_connections,
+                tcp_keepalive=True,
+                retries={"max_attempts": 5, "mode": "adaptive"},
+            ),
+        )
+
+    def iter_chunks(self, key: str) -> Optional[Iterator[bytes]]:
+        try:
+            obj = self.s3.get_object(Bucket=self.bucket_name, Key=key)
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("NoSuchKey", "404"):
+                return None
+            raise
+        return self._stream(obj["Body"])
+
+    def _stream(self, body) -> Iterator[bytes]:
+        with body:
+            yield from body.iter_chunks(self.chunk_size)
+
+
+class LocalTerrainSource(TerrainSource):
+    def __init__(self, directory: str, chunk_size: int = 1024 * 1024, authoritative: bool = False):
+        """
+        Terrain tiles in a local directory mirroring the bucket layout, for air-gapped and CI environments,
+        or hot regions mirrored onto local disks, e.g. with `aws s3 sync --no-sign-request
+        s3://elevation-tiles-prod/v2/skadi/N45 <directory>/v2/skadi/N45`. A partial mirror is chained in
+        front of the bucket (see ChainedTerrainSource).
+
+        Args:
+            directory (str): The mirror directory.
+            chunk_size (int): Size of the chunks tiles are read in. Defaults to 1 MB.
+            authoritative (bool): Whether the mirror is a complete copy of the bucket, so tiles missing from it
+                do not exist. Defaults to False.
+        """
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self.authoritative = authoritative
+        self.name = f"file://{os.path.abspath(directory)}"
+
+    def iter_chunks(self, key: str) -> Optional[Iterator[bytes]]:
+        try:
+            tile_file = open(os.path.join(self.directory, *key.split("/")), "rb")
+        except FileNotFoundError:
+            return None
+        return self._stream(tile_file)
+
+    def _stream(self, tile_file) -> Iterator[bytes]:
+        with tile_file:
+            while chunk := tile_file.read(self.chunk_size):
+                yield chunk
+
+
+class HttpTerrainSource(TerrainSource):
+    def __init__(
+        self,
+        base_url: str = "https://elevation-tiles-prod.s3.amazonaws.com",
+        max_pool_connections: int = 16,
+        timeout: float = 60.0,
+        chunk_size: int = 1024 * 1024,
+        authoritative: bool = False,
+    ):
+        """
+        Terrain tiles served over HTTP(S) in the bucket layout, e.g. the public bucket's website endpoint or an
+        internal mirror behind a caching proxy.
+
+        Only 404 means that the server has no such tile. Any other status, including 403 (which S3 also answers
+        for missing keys, but proxies for denied requests) and 5xx after the retries, is an error, so a
+        misbehaving server cannot get tiles recorded as absent.
+
+        Args:
+            base_url (str): URL the tile keys are appended to. Defaults to the public bucket.
+            max_pool_connections (int): Maximum number of kept-alive connections. Defaults to 16.
+            timeout (float): Connect and read timeout in seconds. Defaults to 60.
+            chunk_size (int): Size of the chunks tiles are streamed in. Defaults to 1 MB.
+            authoritative (bool): Whether the server holds every tile of the bucket, so tiles it does not have
+                do not exist. Defaults to False.
+        """
+        self.base_url = base_url.rstrip("/")
+        self.chunk_size = chunk_size
+        self.authoritative = authoritative
+        self.name = self.base_url
+        self.http = urllib3.PoolManager(
+            maxsize=max_pool_connections,
+            block=False,
+            timeout=urllib3.Timeout(total=timeout),
+            retries=urllib3.Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504)),
+        )
+
+    def iter_chunks(self, key: str) -> Optional[Iterator[bytes]]:
+        response = self.http.request("GET", f"{self.base_url}/{key}", preload_content=False)
+        if response.status == 404:
+            response.release_conn()
+            return None
+        if response.status != 200:
+            response.release_conn()
+            raise RuntimeError(f"GET {self.base_url}/{key} returned HTTP {response.status}.")
+        return self._stream(response)
+
+    def _stream(self, response) -> Iterator[bytes]:
+        try:
+            yield from response.stream(self.chunk_size)
+        finally:
+            response.release_conn()
+
+
+class ChainedTerrainSource(TerrainSource):
+    def __init__(self, sources: List[TerrainSource]):
+        """
+        Terrain sources tried in order, e.g. a local or HTTP mirror of hot regions in front of the S3 bucket.
+
+        A tile is read from the first source that has it. A source that fails is logged and skipped, so an
+        unavailable mirror falls back to the bucket; the error is only raised if no later source has the tile
+        either. A tile is missing from the chain once an authoritative source answered that it has no such
+        tile, or if every source did.
+
+        Args:
+            sources (List[TerrainSource]): The sources, in order of preference.
+        """
+        if not sources:
+            raise ValueError("A chain of terrain sources needs at least one source.")
+        self.sources = sources
+        self.name = ",".join(source.name for source in sources)
+        self.authoritative = any(source.authoritative for source in sources)
+
+    def iter_chunks(self, key: str) -> Optional[Iterator[bytes]]:
+        error = None
+        for source in self.sources:
+            try:
+                chunks = source.iter_chunks(key)
+            except Exception as e:
+                logger.warning(f"Failed to read {key} from {source.name}: {e}")
+                error = e
+                continue
+            if chunks is not None:
+                return chunks
+            if source.authoritative:
+                # the tile does not exist, whatever the sources that failed would have answered
+                return None
+
+        if error is not None:
+            raise error
+        return None
@@ -0,0 +1,206 @@
+import io
+import logging
+import math
+import threading
+from collections import OrderedDict
+from typing import Literal, Optional, Tuple
+
+import numpy as np
+import rasterio
+from PIL import Image
+from rasterio.enums import Resampling
+from rasterio.transform import from_bounds
+from rasterio.warp import reproject
+
+
+logger = logging.getLogger(__name__)
+
+TILE_SIZE = 256
+
+# Half the circumference of the earth in EPSG:3857 meters, the extent of the Web Mercator tile grid
+_ORIGIN_SHIFT = math.pi * 6378137.0
+
+
+def tile_bounds(z: int, x: int, y: int) -> Tuple[float, float, float, float]:
+    """
+    Web Mercator bounds of an XYZ tile.
+
+    Args:
+        z (int): Zoom level.
+        x (int): Tile column, from the west.
+        y (int): Tile row, from the north.
+
+    Returns:
+        Tuple[float, float, float, float]: The west, south, east and north bounds in EPSG:3857 meters.
+    """
+    span = 2 * _ORIGIN_SHIFT / 2 ** z
+    west = -_ORIGIN_SHIFT + x * span
+    north = _ORIGIN_SHIFT - y * span
+    return west, north - span, west + span, north
+
+
+def _mercator_to_lon_lat(mx: float, my: float) -> Tuple[float, float]:
+    """Convert EPSG:3857 meters to longitude and latitude in degrees."""
+    lon = math.degrees(mx / 6378137.0)
+    lat = math.degrees(math.atan(math.sinh(my / 6378137.0)))
+    return lon, lat
+
+
+class TileSource:
+    def __init__(self, geotiff_data: bytes):
+        """
+        Decoded palette GeoTIFF (a SPLAT! coverage prediction) ready to be cut into tiles.
+
+        Args:
+            geotiff_data (bytes): Binary content of the single-band palette GeoTIFF in EPSG:4326.
+        """
+        with rasterio.MemoryFile(geotiff_data) as memfile:
+            with memfile.open() as src:
+                self.indexes = src.read(1)
+                self.transform = src.transform
+                self.bounds = src.bounds
+                self.nodata = int(src.nodata) if src.nodata is not None else 255
+                colormap = src.colormap(1)
+
+        # RGBA lookup table of the palette, transparent where there is no coverage
+        self.rgba = np.zeros((256, 4), dtype=np.uint8)
+        for index, color in colormap.items():
+            self.rgba[index] = color
+        self.rgba[self.nodata] = (0, 0, 0, 0)
+
+        self.nbytes = self.indexes.nbytes
+
+    def intersects(self, bounds: Tuple[float, float, float, float]) -> bool:
+        """Whether Web Mercator bounds overlap the source."""
+        west, south = _mercator_to_lon_lat(bounds[0], bounds[1])
+        east, north = _mercator_to_lon_lat(bounds[2], bounds[3])
+        return (
+            west < self.bounds.right
+            and east > self.bounds.left
+            and south < self.bounds.top
+            and north > self.bounds.bottom
+        )
+
+
+class TileRenderer:
+    def __init__(self, cache_bytes: int = 64 * 1024 * 1024, max_sources: int = 8):
+        """
+        Cuts coverage predictions into Web Mercator XYZ tiles on demand.
+
+        Tiles are reprojected from the EPSG:4326 palette GeoTIFF with nearest neighbour resampling, so every
+        tile pixel keeps an exact palette color. Rendered tiles are kept in an in-process LRU cache bounded by
+        size, and the decoded GeoTIFFs of the most recently used tasks are kept so that panning across a
+        prediction does not decode it again for every tile.
+
+        Args:
+            cache_bytes (int): Maximum total size of the cached tiles in bytes. Defaults to 64 MB.
+            max_sources (int): Maximum number of decoded GeoTIFFs to keep. Defaults to 8.
+        """
+        self.cache_bytes = cache_bytes
+        self.max_sources = max_sources
+
+        self._tiles: "OrderedDict[tuple, bytes]" = OrderedDict()
+        self._tiles_size = 0
+        self._sources: "OrderedDict[str, TileSource]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._empty_tiles = {}
+
+    def cached_tile(self, task_id: str, z: int, x: int, y: int, fmt: str) -> Optional[bytes]:
+        """Return a previously rendered tile, or None."""
+        key = (task_id, z, x, y, fmt)
+        with self._lock:
+            tile = self._tiles.get(key)
+            if tile is not None:
+                self._tiles.move_to_end(key)
+            return tile
+
+    def source(self, task_id: str) -> Optional[TileSource]:
+        """Return the decoded GeoTIFF of a task, or None if it has to be loaded with `load_source`."""
+        with self._lock:
+            source = self._sources.get(task_id)
+            if source is not None:
+                self._sources.move_to_end(task_id)
+            return source
+
+    def load_source(self, task_id: str, geotiff_data: bytes) -> TileSource:
+        """Decode the GeoTIFF of a task and keep it for the following tiles."""
+        source = TileSource(geotiff_data)
+        with self._lock:
+            self._sources[task_id] = source
+            self._sources.move_to_end(task_id)
+            while len(self._sources) > self.max_sources:
+                self._sources.popitem(last=False)
+        return source
+
+    def render_tile(
+        self, task_id: str, source: TileSource, z: int, x: int, y: int, fmt: Literal["png", "webp"] = "png"
+    ) -> bytes:
+        """
+        Render and cache one tile of a task.
+
+        Args:
+            task_id (str): The unique identifier for the task.
+            source (TileSource): The decoded GeoTIFF of the task.
+            z (int): Zoom level.
+            x (int): Tile column, from the west.
+            y (int): Tile row, from the north.
+            fmt (str): Image format, "png" or "webp". Defaults to "png".
+
+        Returns:
+            bytes: The encoded RGBA tile.
+        """
+        bounds = tile_bounds(z, x, y)
+        if not source.intersects(bounds):
+            return self._empty_tile(fmt)
+
+        indexes = np.full((TILE_SIZE, TILE_SIZE), source.nodata, dtype=np.uint8)
+        reproject(
+            source=source.indexes,
+            destination=indexes,
+            src_transform=source.transform,
+            src_crs="EPSG:4326",
+            src_nodata=source.nodata,
+            dst_transform=from_bounds(*bounds, TILE_SIZE, TILE_SIZE),
+            dst_crs="EPSG:3857",
+            dst_nodata=source.nodata,
+            resampling=Resampling.nearest,
+        )
+        tile = self._encode(source.rgba[indexes], fmt)
+
+        key = (task_id, z, x, y, fmt)
+        with self._lock:
+            if key not in self._tiles:
+                self._tiles[key] = tile
+                self._tiles_size += len(tile)
+            self._tiles.move_to_end(key)
+            while self._tiles_size > self.cache_bytes and self._tiles:
+                _, evicted = self._tiles.popitem(last=False)
+                self._tiles_size -= len(evicted)
+
+        return tile
+
+    def stats(self) -> dict:
+        """Snapshot of the cache limits and usage."""
+        with self._lock:
+            return {
+                "tiles": len(self._tiles),
+                "bytes": self._tiles_size,
+                "max_bytes": self.cache_bytes,
+                "sources": len(self._sources),
+                "max_sources": self.max_sources,
+            }
+
+    def _empty_tile(self, fmt: str) -> bytes:
+        """A fully transparent tile, for tiles outside the prediction."""
+        if fmt not in self._empty_tiles:
+            self._empty_tiles[fmt] = self._encode(np.zeros((TILE_SIZE, TILE_SIZE, 4), dtype=np.uint8), fmt)
+        return self._empty_tiles[fmt]
+
+    @staticmethod
+    def _encode(rgba: np.ndarray, fmt: str) -> bytes:
+        with io.BytesIO() as buffer:
+            if fmt == "webp":
+                Image.fromarray(rgba, "RGBA").save(buffer, format="WEBP", lossless=True, method=0)
+            else:
+                Image.fromarray(rgba, "RGBA").save(buffer, format="PNG", optimize=False)
+            return buffer.getvalue()
@@ -0,0 +1,118 @@
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(RuntimeError):
+    """Raised when a job is submitted to a SplatWorkerPool whose queue is already full."""
+
+
+class SplatWorkerPool:
+    def __init__(self, max_workers: int = 2, max_queue: int = 16):
+        """
+        Bounded executor for SPLAT! coverage prediction jobs.
+
+        SPLAT! does its heavy lifting in a subprocess, so a thread pool is enough to keep the API's
+        event loop and request threadpool free while limiting how many SPLAT! processes run at once.
+        Jobs beyond `max_workers` wait in a queue of at most `max_queue` entries; once the queue is
+        full, `submit` fails fast with QueueFullError instead of accepting unbounded work.
+
+        Args:
+            max_workers (int): Maximum number of jobs executing concurrently. Defaults to 2.
+            max_queue (int): Maximum number of jobs waiting for a free worker. Defaults to 16.
+        """
+        if max_workers < 1:
+            raise ValueError(f"max_workers must be at least 1, got {max_workers}.")
+        if max_queue < 0:
+            raise ValueError(f"max_queue must not be negative, got {max_queue}.")
+
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="splat-worker"
+        )
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._lock = threading.Lock()
+        self._submitted = 0
+        self._running = 0
+
+        logger.info(
+            f"Initialized SPLAT! worker pool with {max_workers} workers and a queue of {max_queue} jobs."
+        )
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """
+        Schedule `fn(*args, **kwargs)` on the pool.
+
+        Returns:
+            Future: The future of the scheduled job.
+
+        Raises:
+            QueueFullError: If all workers are busy and the queue is full.
+        """
+        if not self._slots.acquire(blocking=False):
+            raise QueueFullError(
+                f"SPLAT! job queue is full ({self.max_workers} running, {self.max_queue} queued)."
+            )
+
+        with self._lock:
+            self._submitted += 1
+
+        try:
+            return self._executor.submit(self._run, fn, *args, **kwargs)
+        except Exception:
+            self._release(started=False)
+            raise
+
+    def _run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        with self._lock:
+            self._running += 1
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self._release(started=True)
+
+    def _release(self, started: bool) -> None:
+        with self._lock:
+            self._submitted -= 1
+            if started:
+                self._running -= 1
+        self._slots.release()
+
+    @property
+    def running(self) -> int:
+        """Number of jobs currently executing."""
+        with self._lock:
+            return self._running
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of jobs accepted but still waiting for a free worker."""
+        with self._lock:
+            return self._submitted - self._running
+
+    @property
+    def available(self) -> int:
+        """Number of jobs that can still be submitted before the queue is full."""
+        with self._lock:
+            return self.max_workers + self.max_queue - self._submitted
+
+    def stats(self) -> dict:
+        """Snapshot of the pool limits and current load."""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "running": self._running,
+                "queued": self._submitted - self._running,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting jobs and optionally wait for the queued and running jobs to finish."""
+        logger.info("Shutting down SPLAT! worker pool.")
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
@@ -231,4 +231,4 @@ This usually happens for one of two reasons: We are either at peak workload righ
     <ul style="list-style-type: none; padding: 0; margin: 0;">
         <li style="color: red; font-size: 30px;">📍</li>
     </ul>`,iconSize:[30,30],iconAnchor:[15,30]});jl.divIcon({html:`
-    <svg xmlns="http://www.w3.org/2000/svg" id="Layer_1" data-name="Layer 1" viewBox="0 0 1871.69 2607.94"><defs><style>.cls-1,.cls-4{fill:#2c2d3c;stroke-width:0}.cls-4{fill:#fff}</style></defs><path id="Body_background" fill="#67ea94" stroke-width="0" d="M1349.07 573.19h-855.5c-11.05 0-20.01 8.96-20.01 20.01v1219.19c0 10.12 8.21 18.33 18.33 18.33h854.27c8.7 0 15.75-7.05 15.75-15.75V586.04c0-7.1-5.75-12.85-12.85-12.85Zm-220.55 569.8h-411V787h411v355.99Z" data-name="Body background"/><path id="Body" d="M1166.62 5.54c-21.2 13.2-31.7 24.3-34.1 36-2.2 10.6-1.8 11.4 13.6 26.9 7.7 7.6 15.3 15.7 17.1 18l3.2 4.1-13.7 5.8c-26.6 11.4-109.5 54-125.2 64.4-4.6 3-5.5 4.1-5.5 6.5 0 3.5 2.7 5.6 5.1 4.1 1.3-.8 2.9-.5 6.4 1.2 9.4 4.5 34.3 10.5 59 14.3 6.9 1.1 27.6 3.3 46 5 49.1 4.5 71 8 71 11.5 0 2.2-21.1 23.5-37.5 38-8.2 7.2-24.4 20.9-36 30.5-29 24-42.2 35.9-62 56.1-27.2 27.7-54.4 60.8-60.9 74.1-2.5 5-2.7 6.1-1.7 9.1.7 1.9 8.9 12.6 18.4 23.9 9.5 11.2 24.2 29.2 32.8 39.9 30.8 38.2 48.3 56.9 75.2 80.4l13.7 12-118.2.6c-65.1.3-203.8.7-308.4.8-182.2.3-221.1.8-237.2 3.1-11.6 1.6-16.2 4.8-18.1 12.7-.9 3.3-1.3 130.7-1.6 479.6-.3 261.4-.7 530.3-.9 597.7-.5 142.7-.1 152.6 6.6 163.8 2.6 4.2 6.9 6.4 13.7 6.8 3.1.2 55 .6 115.4 1 99.7.6 109.7.8 109.7 2.3.2 11.7-9.3 741.7-9.6 742-.2.3-75.5-1.9-167.2-4.8-158.1-4.9-167.1-5.1-171-3.5-11.6 4.6-12.2 20.8-1 26.3 4.1 1.9 10.2 2.2 165.3 7.1 88.6 2.8 168.2 5.1 177 5.1h16l4.7-5.3c2.6-2.9 5.2-6.2 5.7-7.3.7-1.5 10.4-722.4 10.1-757.4v-4.4l159.2.7c87.6.4 159.3.8 159.4.9 0 .1 2.7 169.2 5.9 375.7l5.7 375.5 3 6c1.6 3.3 4.2 7.6 5.8 9.5l2.9 3.5 167.8-.3c158.5-.4 168-.5 171.9-2.2 11.2-4.9 12.1-19.9 1.5-25.8l-3.9-2.2h-318.7l-.3-7.7c-.3-10.8-11.2-710.5-11.2-722.6v-9.7h121.8c85.3.1 123.8-.2 128.7-1 12.4-2 18.1-6.1 21.9-15.8 1.5-4 1.6-46.7 1.6-608.5 0-332.3-.3-610.5-.6-618.2-.7-15.7-1.6-20-4.7-21.8-1.7-.9-24.6-1.3-101.2-1.5l-99-.2-3-3.4c-1.6-1.9-9.1-8.8-16.5-15.4-24.3-21.5-43.4-42.2-71.5-77.2-8.2-10.2-21.9-26.8-30.5-37-8.5-10.2-16.8-20-18.3-21.9-3.4-4.1-3.2-5.1 3.8-15.6 11.1-16.9 35.8-45.8 59-69 16.8-16.9 30.6-29.2 57-51 36-29.7 54.9-46.8 67.7-60.9 8.5-9.4 8.9-10.1 8.6-14-.3-3.8-.7-4.3-5-6.4-8-4-29.7-7.2-76.3-11.2-36.5-3.1-62.7-7.4-84.3-13.6-8.9-2.6-17.8-6.1-17.1-6.8 1.4-1.3 31.8-17.6 56.9-30.4 31.9-16.3 56.3-27.9 73.3-34.8l10.7-4.5 6.3 5.2c11.6 9.7 23.7 13.6 38.1 12.1 8.3-.8 10-2.6 11.7-11.7 2.1-11.2-.9-22.9-12-47.4-9.8-21.7-19.8-36.9-31.4-47.9-7.3-6.8-8.8-6.8-20.6.5Zm190.1 570.1c1.1 1.1 1.3 114 1.6 619.5l.2 618.3-2.2 4.4c-3.2 6.3-8.1 8.7-19.8 10-9.2.9-48.7.8-618.5-.9-254.3-.8-236.4-.3-239.4-6.6-3.2-6.6-4.2-16-4.7-44-.2-15.4 0-283.4.4-595.5.5-312.1.5-569.2 0-571.3-.9-4.2.5-18.4 2.5-24.5 1-3.2 1.9-3.9 6.3-5.4 10.9-3.6 32.3-3.9 396.9-4.7 448.7-1 475-1 476.7.7Z" class="cls-1"/><path d="M717.52 787h411v355.99h-411z" class="cls-4"/><path id="Dot" fill="#454656" stroke="#2c2d3c" stroke-miterlimit="10" stroke-width="7" d="M1246.61 622.56c-10.79 3.78-18.53 10.79-23.69 21.39-2.77 5.62-2.95 6.45-2.95 16.59s.18 10.97 2.95 16.87c7.56 15.86 22.03 24.34 40.29 23.51 7.38-.28 9.31-.74 15.58-3.69 8.67-4.15 15.4-10.6 18.99-18.25 9.96-21.02 1.94-43.79-19.18-54.21-6.55-3.23-7.47-3.41-17.06-3.69-8.02-.18-11.25.18-14.94 1.48Z"/><path id="Eyes" d="M651.62 705.94c-8 1.6-10.3 5.2-12 19.4-1.4 12-1.8 452.5-.4 459.2 1.4 6.4 2.7 8.9 5.7 10.8 2.1 1.4 31.7 1.6 275.1 1.5 150 0 275.3-.3 278.4-.6 6.8-.7 9.6-1.9 10.7-4.8.5-1.1.7-106.1.4-235.6-.6-263.8.3-239.2-8.5-243.1-5.2-2.3-17.1-5-23-5.1-8-.3-489.4-2.8-505.5-2.7-9.1.1-18.5.5-20.9 1Zm186.5 82c6.5 1.2 8.4 2.3 8.4 4.9s-2.3 3.1-11.3 1.8c-12.3-1.6-35.6-.4-50.4 2.7-14.5 3-33.7 9.1-43.7 13.9-7.3 3.5-16.6 10-16.6 11.6 0 .5 1.7 1 3.8 1.2 3.2.3 3.7.6 3.7 2.8s-.4 2.5-5.8 2.8c-7 .4-8.7-.8-8.7-5.6 0-10.9 30.8-26.7 65.5-33.7 6.6-1.3 13.6-2.6 15.5-2.8 7.9-.9 34-.6 39.6.4Zm224.9 3.3c35.7 7.5 65.5 22.9 65.5 33.8 0 4.8-1.7 6-8.7 5.6-5.4-.3-5.8-.5-5.8-2.8s.5-2.5 3.8-2.8c2-.2 3.7-.7 3.7-1.2 0-1.6-9.3-8.1-16.6-11.6-10-4.8-29.2-10.9-43.7-13.9-14.8-3.1-38.1-4.3-50.4-2.7-9 1.3-11.3.9-11.3-1.8 0-4.7 7.5-6 32-5.5 16.1.3 21.6.8 31.5 2.9Zm-238.5 58.4c4.6 2.3 5.9 3.6 8.4 8.4 3.2 6.3 3.7 10.2 5.6 42.3.6 9.9 1.5 26.3 2.1 36.5 1.2 20.5.5 96.3-1.1 122.6-3.3 53.9-5 74.5-6.1 76.6-.5 1-1.6 1.8-2.5 1.8-.8 0-4.1.9-7.3 2-17.1 5.7-43.2-.5-50.3-12-6-9.7-7.6-27-8.8-97-.5-27.2-1.4-56.5-2.2-65-.7-8.5-1.3-29-1.3-45.5 0-40.5 1.5-46.7 14.4-59.6 5.3-5.2 8.2-7.2 14.6-9.9 10.4-4.3 13.6-5 22-4.4 4.9.3 8.6 1.3 12.5 3.2Zm230.7 1.9c7.3 3 10 4.8 15.4 10.2 12.9 12.9 14.4 19.1 14.4 59.6 0 16.5-.6 37-1.3 45.5-.8 8.5-1.7 37.8-2.2 65-1.2 70-2.8 87.3-8.8 97-7.1 11.5-33.2 17.7-50.3 12-3.2-1.1-6.5-2-7.3-2-.9 0-2-.8-2.5-1.8-1.1-2.1-2.8-22.7-6.1-76.6-1.6-26.3-2.3-102.1-1.1-122.6 4.3-73.4 4.1-71.4 7.5-78.5 6.2-12.6 23.2-15.8 42.3-7.8Z" class="cls-1"/><path id="Meshtastic_M" fill="#2c2d3c" fill-rule="evenodd" stroke-width="0" d="m1034.49 1359.63-215.84 316.53-45.53-31.04 238.56-349.85c5.12-7.52 13.64-12.02 22.74-12.03 9.1 0 17.62 4.48 22.76 11.99l239.11 349.3-45.47 31.13-216.33-316.02Zm-452.9 316.2 252.13-369.74-45.53-31.05-252.13 369.73 45.53 31.05Z" data-name="Meshtastic M"/><path id="Left_hand_background" d="M407.1 1220.22v-6.7h-23.16v-8.98c0-11.12-1.6-21.87-4.56-32.04-3.4-45.86-33.88-84.17-75.5-99.01v-2.21c0-10.27-5.04-19.37-12.77-24.96v-2.05c0-10.55-5.65-19.77-14.08-24.82v-5.24c0-6.87-2.64-13.12-6.95-17.81l-39.54-206.2c-1.2-6.26-4.31-11.66-8.6-15.74-.62-15.68-13.52-28.2-29.35-28.2-15.68 0-28.49 12.29-29.33 27.76-5.01 5.27-8.1 12.39-8.1 20.24v3.47c-5.03 6.13-8.05 13.97-8.05 22.52v146.27c0 8.02 2.66 15.43 7.15 21.38h-10.15c-6.08-10.25-17.26-17.12-30.04-17.12h-10.13c-13.97 0-25.55 10.26-27.61 23.65-16.09 8.06-28.16 22.94-32.44 40.85-9.36 8.59-16.53 19.51-20.63 31.83-11.66 13.48-18.74 31.05-18.74 50.28v32.99c0 18.66 10.95 34.76 26.77 42.23 6.87 11.27 18.91 19.02 32.83 19.97 8.64 8.63 20.58 13.97 33.76 13.97h.65c.06 18.39 10.27 34.39 25.32 42.7v2.98l-31.54 15.79c-3.23 1.62-4.54 5.54-2.92 8.77l27.13 54.21c2.71 5.41 8.24 8.47 13.91 8.31 7.05 12.52 19.2 21.77 33.64 24.94 4.35 8.18 12.87 13.82 22.79 14.02l45.97.91c12.54.25 23.88-5.09 31.68-13.72h2.9c19.87 0 38.76-4.16 55.88-11.64 57.39-6.54 101.98-55.26 101.98-114.4v-12.05c0-12.25-7.5-22.75-18.16-27.16Z" class="cls-4" data-name="Left hand background"/><path id="Left_Hand" d="M180.02 744.24c-2.7 1.3-7.1 4.6-9.7 7.3-9.1 9.9-19.7 35.8-25.5 63l-2.8 12.8.1 49.5c0 52.1 1.1 75.2 4.5 94.8 1 6.3 1.9 11.9 1.9 12.4 0 .6-3.7-2.5-8.3-6.9-11.1-10.6-15.7-12.8-26.7-12.7-9.8.1-14.6 1.8-24.4 8.8-13 9.3-34.8 35.8-54.7 66.6-19 29.4-26.9 47.1-32 71.5-3.4 16.1-3.2 36.1.5 50 3.2 12.1 8.1 22.9 13.1 28.3 2 2.3 7.1 6.3 11.3 9 10.8 6.9 43 22.9 53.6 26.6l8.8 3.1 7.2 12.8c9 16.1 14.1 22.7 21.1 27.4l5.6 3.7-4.3 1.6c-26.9 10.4-28.9 11.3-30.8 14-1.1 1.6-2 3.7-2 4.7 0 2.4 13.9 34.6 18.7 43.3 7.2 13.2 15.8 23.2 29.7 34.7 16.4 13.7 26.1 20.2 39 26.4 13.9 6.6 25.5 9.3 36.6 8.4 12.4-1 22.4-3.1 38.5-8.1 7.9-2.4 19.1-5.5 24.9-6.9 5.8-1.4 14.7-3.8 19.9-5.5 5.1-1.6 18-5.2 28.5-8 30.2-7.9 59.5-19.7 70.7-28.7 6.4-5.1 16.6-19.3 22.2-31 2.7-5.6 6-15.4 8.6-25 4.1-15.4 4.2-16.2 4.2-31.8 0-17.1-1.1-23.6-5.1-31.6-5.5-11-13.1-16.3-23.4-16.4-3.6 0-8 .3-9.8.7-3.1.7-3.2.7-2.5-2 .5-1.5.8-7.7.7-13.7 0-9.7-.4-12.4-3.8-23.5-11.8-39.3-19.9-57.4-34.4-76.7-5.3-7.1-7.6-8.8-10.3-7.8-.8.3-2.6-.3-4-1.2-17.5-11.7-23-17.7-35.4-38.4-22.6-38.2-34.7-77-44.4-143.4-1.7-11.6-4.2-28.7-5.6-38-1.4-9.4-3.2-21.6-4-27.2-1.5-10.9-3-17.4-10.1-43.3-4.9-17.7-6.8-22.3-14.2-33.4-12.9-19.5-16.9-22.6-29.3-22.6-5.7 0-8.6.6-12.4 2.4Zm20.1 5.5c4.4 2 8.2 6.5 16.6 19.7 6.8 10.5 7.4 12.1 11.7 27.1 7 24.4 10.2 38.5 12.1 52.8 1 7.7 2.5 18 3.4 23 .8 4.9 1.8 11.7 2.1 15 1.1 10.6 7.4 49 10.1 61.7 6.9 33.1 15.3 59.9 24.9 79.7 6.6 13.4 16.5 31.1 19.3 34.3 1.9 2.2 1.8 2.2-4.6-.2-7.7-3-21-2.8-27.7.4-9.8 4.6-18.9 16.8-23.6 31.6-3.8 12.3-4.7 20.2-3.7 32.3 1 12.7 3 21.2 7.2 30.2 7.3 15.7 16.1 25.9 30.2 35.2 22.4 14.5 47.8 22.4 82.1 25.5l13.7 1.2-4.3 1.8c-2.3 1-9.9 2.9-16.9 4.4-7 1.5-20.3 5.3-29.5 8.5-29.2 10.1-50.1 14.5-99.7 20.9-28.9 3.7-62.9 9.1-78.5 12.4-8.3 1.7-11.4 1.2-19.9-3.3-8.1-4.3-16.2-14.3-23.5-28.9l-3.1-6.2h8.2c4.6 0 12.8-.7 18.2-1.5 5.5-.8 11.6-1.5 13.7-1.5 6.1 0 18.1-4.3 26.1-9.4 4.2-2.7 13.4-10.5 21.5-18.4 15.9-15.4 18.4-19.4 23.9-38.2 3.9-13.5 3.8-22.5-.3-35-1.7-5.2-4.8-15.1-6.8-22-11.3-38.1-20.2-61.5-30.5-80.3-3.7-6.8-7-13.5-7.3-14.9-.4-1.4-2.2-5.1-4.1-8.2-8.9-14.9-12.5-50.6-12.9-128.4-.1-34.8.1-38.6 2-49.2 5.5-28.9 16.4-57.2 26-66.7 6.7-6.7 16.2-8.9 23.9-5.4Zm-75.9 223.2c2.5 1.2 9.2 6.6 15.1 12 9 8.4 11.4 11.3 15.2 18.4 2.5 4.6 6.1 11.2 8.1 14.7 7.3 12.8 9.2 16.5 13.5 26.9 8.3 20.2 30.1 88.8 29 91.4-.7 1.9-3.2 1.9-13.9 0-19.4-3.4-34.8-11.1-53.2-26.5-22.6-19.1-38.4-35.1-53.4-54.5-8.7-11.1-23.7-33.2-25-36.7-1.6-4.3 23.2-33.2 35.5-41.3 10.2-6.8 20.9-8.4 29.1-4.4Zm-59.7 65.4c18.6 28 33.5 45.1 59.5 68.3 17.3 15.5 25.2 21.1 38 27.3 12.8 6.1 22.5 8.8 34.8 9.6 8.2.5 9.7.9 9.7 2.3 0 2.5-5.9 21.7-8.5 27.5-2.4 5.6-10.9 15.2-19.9 22.7l-5.8 4.9-8.2-.6c-14.7-1.2-43.1-12.1-64-24.5-33.2-19.8-62.4-49.6-77.6-79.3-2.7-5.4-5-10.5-5-11.3 0-5.6 35-63.9 37.1-61.7.3.5 4.8 7.1 9.9 14.8Zm231.1 31.7c5.3 2.4 22.2 13.2 33.5 21.3 3.1 2.2 6.6 3.8 8.5 4 3.1.2 4.1 1.2 10.2 10.1 11.9 17.3 19 34.1 29.6 69.9 4 13.7 5.2 21.9 4.2 28.2-1.3 8.5-1.6 8.7-16.1 8-40.6-1.9-82-17.7-99.4-37.8-5-5.9-11.1-16.4-14.2-24.6-3.3-8.8-5.7-24.9-5-33.8.6-8.7 5.8-25.5 9.7-31.6 3.9-6.2 13-14.7 16.5-15.4 1.6-.4 3.4-.8 3.9-1.1 3-1.1 13.5.4 18.6 2.8Zm-268.6 46.6c16.2 24.3 40.8 47.5 67.1 63.5 22.1 13.5 49.9 24.7 65.5 26.5l6.4.8-4.5 2.9c-6.7 4.3-15.9 7.8-21.5 8.1-2.7.2-9.2 1.1-14.2 2-6.8 1.2-12.9 1.5-23 1.2-16.4-.6-20.1-1.7-44.8-14-29.6-14.8-38-21-42.9-31.8-10-22-11.1-45.9-3.4-74.3l2.1-7.9 4.3 8.2c2.4 4.5 6.4 11.1 8.9 14.8Zm378.2 103.3c1.5.5 4.3 2.5 6.1 4.2 7.3 6.9 10.2 17.1 10.2 35.8 0 10.9-.4 14.3-3.4 26.5-1.9 7.7-4.7 17.2-6.1 21-5.1 13.4-16.7 30.6-24.8 36.5-11.8 8.6-40.4 19.8-69 26.9-6.7 1.7-17.8 4.9-24.7 7-6.9 2.2-17.4 5.1-23.5 6.5-6 1.4-15.7 4.1-21.5 6-14.3 4.8-26.7 7.4-38 8.1-8 .6-10.8.3-17.5-1.5-15.3-4.2-33.7-14.7-51.3-29.3-16.7-14-22.8-21.2-31.4-36.8-5.1-9.3-17.1-37.9-16.5-39.4s30.2-12.6 39.7-15c17-4.1 61-11.4 95.5-15.6 43.6-5.4 62.3-9.3 93.5-19.6 12.4-4 27.7-8.4 34-9.8 6.3-1.3 14.4-3.6 18-5.1 18.2-7.7 24.1-8.9 30.7-6.4Z" class="cls-1" data-name="Left Hand"/><path id="Right_hand_background" d="M1819.8 966.37c-25.94-6.6-55.37 12.34-80.21 47.23-7.22 2.11-13.85 6.48-18.71 12.96l-62.66 83.5c-3.95 5.27-6.58 11.11-7.97 17.13l-5.41 1.59c-13.38 3.92-23.69 13.25-29.27 24.9-5.72 2.53-10.71 6.15-14.76 10.55-3.12-3.5-6.87-6.34-11.02-8.41l-8.6-29.33c-2.43-8.29-7.39-15.15-13.8-19.98-1.3-3.05-2.95-5.86-4.89-8.42l-1.83-6.25c-5.53-18.87-25.32-29.69-44.19-24.16l-1.17.34c-17.05 5-27.52 21.63-25.3 38.71-2.25 3.8-4 7.88-5.2 12.14-6.93 11-9.29 24.81-5.34 38.27l4.28 14.6c-2.84 8.7-3.18 18.32-.41 27.76l43.82 149.44-4.59-1.51c-5.42-1.79-11.01-1.75-16.1-.23l-5.24-1.73c-6.73-2.22-14 1.43-16.22 8.17-1.95 5.9-1.07 12.05 1.87 17.01-2.25 10.55-.41 21.21 4.6 30.14 1.2 12.02 7.42 23.12 17.2 30.4 5.03 12.25 15.17 22.32 28.74 26.8l6.25 2.06c4.14 7.04 10.75 12.68 19.12 15.44l20.53 6.78 1.08 3.7 5.36-1.57 15.54 5.13 1.09 3.73 5.4-1.58 78.79 26.01c6.91 2.28 14.02 2.19 20.48.2l18.24 6.02c18.8 6.21 39.08-4 45.29-22.81 6.21-18.8-4-39.08-22.81-45.29l-4.43-1.46c-1.72-4.44-4.32-8.51-7.65-11.96l13.47-3.95-.5-1.72c10.19-4.24 17.61-12.72 20.8-22.72l4.6 3.75 41.26-50.64c3.18-3.9 5.25-8.34 6.27-12.94 25.27-12.22 42.7-38.1 42.7-68.05v-186.05c5.89-69.09-12.51-124.56-48.47-133.71Z" class="cls-4" data-name="Right hand background"/><path id="Right_Hand" d="M1797.02 960.24c-13.1 3.3-25.8 12.9-52.1 39.1-30.1 30-54.1 58.2-80.5 94.5-15.4 21.1-16.2 22.5-15.6 25.7.5 2.7.2 2.9-5.5 4.7-3.3 1-7.2 2.9-8.7 4-1.4 1.2-3.9 3-5.6 4-7.2 4.5-16.8 13.3-22.5 20.7-5.2 6.7-6.5 7.8-7.6 6.7-2.9-3-12.7-23.3-17.8-37.1-3-8.1-7.4-18.3-9.7-22.7-7.7-14.4-23.3-30.5-34.8-35.8-7.3-3.4-18-2.9-26.1 1.3-7.9 4-17.1 13.8-21.3 22.7-8.5 17.7-11.2 34-11.1 66.8 0 24.7 1.1 36.1 6 62.9 5.7 31.1 21.6 85.9 33.3 114.6 2.2 5.4 3.8 10.1 3.6 10.3s-5.8-.1-12.4-.7c-14.8-1.5-18.2-.9-22 3.5-6.6 7.5-6.7 17.7-.6 51.3 1.2 6.6 2.8 10.9 7.1 19 3.1 5.8 6.4 11.7 7.3 13.1s2.3 3.8 3.1 5.4 4.9 6.3 9 10.5c6.7 6.8 10.1 9.1 32.5 21.8 32.7 18.6 41.4 22.6 69.5 32.1 41.9 14.1 68.2 21 94.5 24.6 6.1.8 16.3 2.4 22.8 3.6 20.4 3.5 26.1 2.6 34.3-5.1 2.8-2.8 6.3-6.7 7.7-8.7 3.8-5.5 6.8-15.6 7-23.3.2-5.7-.2-7.2-2.1-9.6-1.2-1.5-4.4-5.7-7-9.3-8.5-11.8-35.6-37.2-44.4-41.6-7.5-3.8-22.4-9-33.6-11.8-10.4-2.6-27.5-9.1-46.7-17.9-43.6-19.9-57.9-26.8-76.7-36.6-11.6-6.2-23.4-11.9-26.2-12.8s-5.5-2-6-2.4c-.6-.5-1.8-.9-2.8-.9s-1.8-.5-1.8-1.1-1.6-2.5-3.5-4.4c-4-3.7-8-13.2-16.3-38.5-25.9-79.2-34.5-139.3-26.7-185 4-23.4 13.7-40 27.2-46.7 11.6-5.6 20.3-3.1 33.6 9.6s18.2 20.7 26.2 42.6c5.2 14.3 17.1 38.5 21.8 44.3 4 5 16.6 30.8 21.1 43.4 9.7 26.8 16.6 65.4 16.6 92.4v13.4h2.4c1.9 0 2.7-.8 3.7-3.7 2.5-7.8-.7-41.8-6.8-70.8-4.5-21.7-12.8-44.4-23.8-65l-5.4-10 2.7-3.1c1.5-1.7 3.9-4.7 5.4-6.6 1.5-1.9 6-6.1 10.2-9.2 4.1-3.1 7.7-6.4 8-7.4.9-2.6 10.3-8 19.3-11 12.9-4.2 20.3-3.7 39.3 2.8 8.5 2.9 18.3 6.6 21.8 8.2 6.9 3.3 9.6 3.3 10 .2.4-2.6-5-6.9-11.3-9.1-2.5-.8-4.7-1.9-5.1-2.4-.3-.5-1.6-.9-2.9-.9s-4.8-.9-7.7-2c-11.8-4.3-21.7-6.2-30.8-5.8l-8.8.3 1-2.4c1.1-3.1 26.2-37 39.2-53 16.1-19.8 40.9-47.2 59.2-65.2 34.3-33.6 47-39.6 65.4-30.8 10.3 4.9 16.8 11.2 25.6 24.6 13.3 20.1 15.3 26.3 19.9 61.4l.5 3.5-14.3 3.9c-26.3 7-48.8 16-84.2 33.6-24.9 12.4-33 17.4-33 20.4 0 3.5 4.1 2.9 12.3-1.8 20.3-11.7 60.9-30.7 81.9-38.3 13.4-4.9 36.3-11.5 37.4-10.8 1 .6 1.2 89.5.3 93.1-.4 1.6-1.7 2.3-4.7 2.8-14.3 2.5-43.6 18.3-57.9 31.4-6.7 6.1-8.6 9.4-6.8 11.6.7.8 1.6 1.5 2.1 1.5s3.7-2.7 7-6c11.7-11.3 37.2-26.7 51.7-31 4-1.2 7.5-2.1 7.6-1.9.4.4 1 78.5.8 89.4l-.2 7-5.2 1.9c-7.2 2.5-19.6 9.4-20.7 11.4-2 4 2.3 5.7 6.8 2.6 1.2-.9 5.7-3.4 9.9-5.5l7.7-3.9.3 12.3c.1 6.7-.1 17.2-.7 23.3-.7 9.4-1.3 12-3.7 16-6 10.6-16.7 21.8-24.9 26.1-2 1.1-2 .7-2.3-13.5-.3-15.1-1.1-18-4.4-16.7-1.4.5-1.7 3.1-2 15.3-.4 13.5-.6 15.3-3.3 21.7-3.7 8.8-18.4 28.6-28.4 38-4 3.8-9.4 9.2-11.9 12-9.2 10-16 16.1-25 22.5-6.8 4.7-9.2 7-9.2 8.6 0 2.9 2.5 3.7 5.9 1.9 6.1-3.1 23.6-17.7 29.6-24.6 3.5-4.1 9.4-10.1 13.1-13.4 8.2-7.2 24.8-27.9 28.9-35.8 2.8-5.4 3.6-6.1 10.5-9.6 4.1-2 8.7-4.5 10.2-5.5 4.3-2.9 16.4-18 19.7-24.8 2.9-5.9 3.2-7.6 4.3-22.8.6-9.1 1.2-44.9 1.3-79.5.1-34.7.4-84.4.6-110.5.3-50.6-.2-59.6-5.2-84.4-2.9-14.5-11.3-31-23.8-46.9-11.9-15.3-31.5-24-45.6-20.3Zm-287 388.6c6.1.6 13.3 1.7 16 2.5 2.8.8 7.5 2.1 10.5 3 3 .8 16.3 7.1 29.5 14 13.2 7 30.1 15.3 37.5 18.7 7.4 3.3 20.9 9.5 30 13.8 22.9 10.8 46.9 20.5 57 22.8 9.6 2.3 27.5 8.4 33.1 11.3 7.5 3.8 36.6 30.4 39.5 36.2.8 1.5 3.7 5.2 6.4 8.3 6 6.5 6.4 9.6 2.5 21.3-2.1 6.3-3.6 8.6-8.2 13.5-6.5 6.7-8.4 7.6-15.6 7.6-12.4 0-68.1-10.2-90.2-16.6-28.9-8.3-65.5-21.3-79-27.9-13.3-6.5-40.2-21.3-51-28-7.7-4.8-16.5-15.2-24.2-28.5-10.7-18.5-10.8-18.9-14.9-47.9-1.7-11.8-.8-18.9 2.8-22.8 2.4-2.6 3.3-2.7 18.3-1.3Z" class="cls-1" data-name="Right Hand"/></svg>`,className:"",iconSize:[24,40],iconAnchor:[12,40]});const Bp=zF("store",{state(){return{map:void 0,currentMarker:void 0,localSites:[],simulationState:"idle",splatParams:{transmitter:{name:qC.randanimalSync(),tx_lat:51.102167,tx_lon:-114.098667,tx_power:.1,tx_freq:907,tx_height:2,tx_gain:2},receiver:{rx_sensitivity:-130,rx_height:1,rx_gain:2,rx_loss:2},environment:{radio_climate:"continental_temperate",polarization:"vertical",clutter_height:1,ground_dielectric:15,ground_conductivity:.005,atmosphere_bending:301},simulation:{situation_fraction:95,time_fraction:95,simulation_extent:30,high_resolution:!1},display:{color_scale:"plasma",min_dbm:-130,max_dbm:-80,overlay_transparency:50}}}},actions:{setTxCoords(t,r){this.splatParams.transmitter.tx_lat=t,this.splatParams.transmitter.tx_lon=r},removeSite(t){this.map&&(this.localSites.splice(t,1),this.map.eachLayer(r=>{r instanceof Tg&&this.map.removeLayer(r)}),this.redrawSites())},redrawSites(){this.map&&(this.map.eachLayer(t=>{t instanceof Tg&&this.map.removeLayer(t)}),this.localSites.forEach(t=>{const r=new Tg({georaster:{...t}.raster,opacity:.7,noDataValue:255,resolution:256});r.addTo(this.map),r.bringToFront()}))},initMap(){this.map=jl.map("map",{zoom:10,zoomControl:!1});const t=[this.splatParams.transmitter.tx_lat,this.splatParams.transmitter.tx_lon];this.map.setView(t,10),jl.control.zoom({position:"bottomleft"}).addTo(this.map);const r=jl.tileLayer("https://{s}.basemaps.cartocdn.com/light_all/{z}/{x}/{y}{r}.png",{attribution:"© OpenStreetMap contributors © CARTO"}),n=jl.tileLayer("https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png",{attribution:"© OpenStreetMap contributors"}),i=jl.tileLayer("https://server.arcgisonline.com/ArcGIS/rest/services/World_Imagery/MapServer/tile/{z}/{y}/{x}",{attribution:"Tiles © Esri — Source: Esri, USGS, NOAA"}),e=jl.tileLayer("https://{s}.tile.opentopomap.org/{z}/{x}/{y}.png",{attribution:"Map data: © OpenStreetMap contributors, SRTM | OpenTopoMap"});n.addTo(this.map);const c={OSM:n,"Carto Light":r,Satellite:i,"Topo Map":e};jl.easyPrint({title:"Save",position:"bottomleft",sizeModes:["A4Portrait","A4Landscape"],filename:"sites",exportOnly:!0}).addTo(this.map),jl.control.layers(c,{},{position:"bottomleft"}).addTo(this.map),this.map.on("baselayerchange",()=>{this.redrawSites()}),this.currentMarker=jl.marker(t,{icon:$P}).addTo(this.map).bindPopup("Transmitter site"),this.redrawSites()},async runSimulation(){console.log("Simulation running...");try{const t={lat:this.splatParams.transmitter.tx_lat,lon:this.splatParams.transmitter.tx_lon,tx_height:this.splatParams.transmitter.tx_height,tx_power:10*Math.log10(this.splatParams.transmitter.tx_power)+30,tx_gain:this.splatParams.transmitter.tx_gain,frequency_mhz:this.splatParams.transmitter.tx_freq,rx_height:this.splatParams.receiver.rx_height,rx_gain:this.splatParams.receiver.rx_gain,signal_threshold:this.splatParams.receiver.rx_sensitivity,system_loss:this.splatParams.receiver.rx_loss,clutter_height:this.splatParams.environment.clutter_height,ground_dielectric:this.splatParams.environment.ground_dielectric,ground_conductivity:this.splatParams.environment.ground_conductivity,atmosphere_bending:this.splatParams.environment.atmosphere_bending,radio_climate:this.splatParams.environment.radio_climate,polarization:this.splatParams.environment.polarization,radius:this.splatParams.simulation.simulation_extent*1e3,situation_fraction:this.splatParams.simulation.situation_fraction,time_fraction:this.splatParams.simulation.time_fraction,high_resolution:this.splatParams.simulation.high_resolution,colormap:this.splatParams.display.color_scale,min_dbm:this.splatParams.display.min_dbm,max_dbm:this.splatParams.display.max_dbm};console.log("Payload:",t),this.simulationState="running";const r=await fetch("/predict",{method:"POST",headers:{"Content-Type":"application/json"},body:JSON.stringify(t)});if(!r.ok){this.simulationState="failed";const u=await r.text();throw new Error(`Failed to start prediction: ${u}`)}const i=(await r.json()).task_id;console.log(`Prediction started with task ID: ${i}`);const e=1e3,c=async()=>{const u=await fetch(`/status/${i}`);if(!u.ok)throw new Error("Failed to fetch task status.");const s=await u.json();if(console.log("Task status:",s),s.status==="completed"){this.simulationState="completed",console.log("Simulation completed! Adding result to the map...");const a=await fetch(`/result/${i}`);if(a.ok){const f=await a.arrayBuffer(),d=await mq(f);this.localSites.push({params:yq(this.splatParams),taskId:i,raster:d}),this.currentMarker.removeFrom(this.map),this.splatParams.transmitter.name=await qC.randanimalSync(),this.redrawSites()}else throw new Error("Failed to fetch simulation result.")}else s.status==="failed"?this.simulationState="failed":setTimeout(c,e)};c()}catch(t){console.error("Error:",t)}}}}),_q={novalidate:""},vq={class:"row g-2"},bq={class:"col-12"},wq={class:"row g-2"},xq={class:"col-6"},kq={class:"col-6"},Sq={class:"row g-2 mt-2"},Eq={class:"col-6"},Cq={class:"col-6"},Aq={class:"row g-2 mt-2"},Mq={class:"col-6"},Tq={class:"col-6"},Pq=Pp({__name:"Transmitter",setup(t){const r=Bp(),n=r.splatParams.transmitter,i=()=>{!isNaN(n.tx_lat)&&!isNaN(n.tx_lon)?r.map.setView([n.tx_lat,n.tx_lon],r.map.getZoom()):alert("Please enter valid Latitude and Longitude values.")};let e=new Fg(document.createElement("input"),{trigger:"manual"});const c=()=>{e.show(),r.map.once("click",function(u){let{lat:s,lng:a}=u.latlng;a=((a+180)%360+360)%360-180,r.setTxCoords(s.toFixed(6),a.toFixed(6)),r.currentMarker&&r.map.removeLayer(r.currentMarker),r.currentMarker=jl.marker([s,a],{icon:$P}).addTo(r.map),e.hide()})};return EM(()=>{e=new Fg(document.getElementById("setWithMap"),{trigger:"manual"}),r.initMap()}),(u,s)=>(Xd(),$d("form",_q,[Kt("div",vq,[Kt("div",bq,[s[7]||(s[7]=Kt("label",{for:"name",class:"form-label"},"Site name",-1)),ei(Kt("input",{"onUpdate:modelValue":s[0]||(s[0]=a=>tn(n).name=a),class:"form-control form-control-sm",id:"name",required:"","data-bs-toggle":"tooltip",title:"Site Name"},null,512),[[Ri,tn(n).name]])])]),Kt("div",wq,[Kt("div",xq,[s[8]||(s[8]=Kt("label",{for:"tx_lat",class:"form-label"},"Latitude (degrees)",-1)),ei(Kt("input",{"onUpdate:modelValue":s[1]||(s[1]=a=>tn(n).tx_lat=a),type:"number",class:"form-control form-control-sm",id:"tx_lat",required:"",min:"-90",max:"90",step:"0.000001","data-bs-toggle":"tooltip",title:"Transmitter latitude in degrees (-90 to 90)."},null,512),[[Ri,tn(n).tx_lat]]),s[9]||(s[9]=Kt("div",{class:"invalid-feedback"},"Please enter a valid latitude (-90 to 90).",-1))]),Kt("div",kq,[s[10]||(s[10]=Kt("label",{for:"tx_lon",class:"form-label"},"Longitude (degrees)",-1)),ei(Kt("input",{"onUpdate:modelValue":s[2]||(s[2]=a=>tn(n).tx_lon=a),type:"number",class:"form-control form-control-sm",id:"tx_lon",required:"",min:"-180",max:"180",step:"0.000001","data-bs-toggle":"tooltip",title:"Transmitter longitude in degrees (-180 to 180)."},null,512),[[Ri,tn(n).tx_lon]]),s[11]||(s[11]=Kt("div",{class:"invalid-feedback"},"Please enter a valid longitude (-180 to 180).",-1))])]),Kt("div",Sq,[Kt("div",Eq,[s[12]||(s[12]=Kt("label",{for:"tx_power",class:"form-label"},"Power (W)",-1)),ei(Kt("input",{"onUpdate:modelValue":s[3]||(s[3]=a=>tn(n).tx_power=a),type:"number",class:"form-control form-control-sm",id:"tx_power",required:"",min:"0",step:"0.1","data-bs-toggle":"tooltip",title:"Transmitter power in watts (>0)."},null,512),[[Ri,tn(n).tx_power]]),s[13]||(s[13]=Kt("div",{class:"invalid-feedback"},"Power must be a positive number.",-1))]),Kt("div",Cq,[s[14]||(s[14]=Kt("label",{for:"frequency",class:"form-label"},"Frequency (MHz)",-1)),ei(Kt("input",{"onUpdate:modelValue":s[4]||(s[4]=a=>tn(n).tx_freq=a),type:"number",class:"form-control form-control-sm",id:"tx_freq",required:"",min:"20",max:"20000",step:"0.1","data-bs-toggle":"tooltip",title:"Transmitter frequency in MHz (20 to 20,000)."},null,512),[[Ri,tn(n).tx_freq]]),s[15]||(s[15]=Kt("div",{class:"invalid-feedback"},"Frequency must be a positive number.",-1))])]),Kt("div",Aq,[Kt("div",Mq,[s[16]||(s[16]=Kt("label",{for:"tx_height",class:"form-label"},"Height AGL (m)",-1)),ei(Kt("input",{"onUpdate:modelValue":s[5]||(s[5]=a=>tn(n).tx_height=a),type:"number",class:"form-control form-control-sm",id:"tx_height",required:"",min:"1.0",step:"0.1","data-bs-toggle":"tooltip",title:"Transmitter height above ground in meters (>= 1.0)."},null,512),[[Ri,tn(n).tx_height]]),s[17]||(s[17]=Kt("div",{class:"invalid-feedback"},"Height must be a positive number.",-1))]),Kt("div",Tq,[s[18]||(s[18]=Kt("label",{for:"tx_gain",class:"form-label"},"Antenna Gain (dB)",-1)),ei(Kt("input",{"onUpdate:modelValue":s[6]||(s[6]=a=>tn(n).tx_gain=a),type:"number",class:"form-control form-control-sm",id:"tx_gain",required:"",min:"0",step:"0.1"},null,512),[[Ri,tn(n).tx_gain]]),s[19]||(s[19]=Kt("div",{class:"invalid-feedback"},"Gain must be a positive number.",-1))])]),Kt("div",{class:"mt-3 d-flex gap-2"},[Kt("button",{onClick:c,type:"button",id:"setWithMap",class:"btn btn-primary btn-sm","data-bs-toggle":"popover","data-bs-trigger":"manual","data-bs-placement":"left",title:"Set Coordinates","data-bs-content":"",content:"Click on the map to set the transmitter location."}," Set with Map "),Kt("button",{onClick:i,type:"button",class:"btn btn-secondary btn-sm"},"Center map on transmitter")])]))}}),Oq={novalidate:""},Iq={class:"row g-2"},Lq={class:"col-6"},Dq={class:"col-6"},Rq={class:"row g-2 mt-2"},Nq={class:"col-6"},Bq={class:"col-6"},Fq=Pp({__name:"Receiver",setup(t){const r=Bp().splatParams.receiver;return(n,i)=>(Xd(),$d("form",Oq,[Kt("div",Iq,[Kt("div",Lq,[i[4]||(i[4]=Kt("label",{for:"rx_sensitivity",class:"form-label"},"Sensitivity (dBm)",-1)),ei(Kt("input",{"onUpdate:modelValue":i[0]||(i[0]=e=>tn(r).rx_sensitivity=e),type:"number",class:"form-control form-control-sm",id:"rx_sensitivity",required:"",step:"1",min:"-150",max:"-30"},null,512),[[Ri,tn(r).rx_sensitivity]]),i[5]||(i[5]=Kt("div",{class:"invalid-feedback"},"Please enter a valid sensitivity.",-1))]),Kt("div",Dq,[i[6]||(i[6]=Kt("label",{for:"rx_height",class:"form-label"},"Height AGL (m)",-1)),ei(Kt("input",{"onUpdate:modelValue":i[1]||(i[1]=e=>tn(r).rx_height=e),type:"number",class:"form-control form-control-sm",id:"rx_height",required:"",min:"0",step:"0.1"},null,512),[[Ri,tn(r).rx_height]]),i[7]||(i[7]=Kt("div",{class:"invalid-feedback"},"Height must be a positive number.",-1))])]),Kt("div",Rq,[Kt("div",Nq,[i[8]||(i[8]=Kt("label",{for:"rx_gain",class:"form-label"},"Antenna Gain (dB)",-1)),ei(Kt("input",{"onUpdate:modelValue":i[2]||(i[2]=e=>tn(r).rx_gain=e),type:"number",class:"form-control form-control-sm",id:"rx_gain",required:"",min:"0",max:"30",step:"0.1"},null,512),[[Ri,tn(r).rx_gain]]),i[9]||(i[9]=Kt("div",{class:"invalid-feedback"},"Gain must be a positive number.",-1))]),Kt("div",Bq,[i[10]||(i[10]=Kt("label",{for:"rx_loss",class:"form-label"},"Cable Loss (dB)",-1)),ei(Kt("input",{"onUpdate:modelValue":i[3]||(i[3]=e=>tn(r).rx_loss=e),type:"number",class:"form-control form-control-sm",id:"rx_loss",required:"",min:"0",max:"100",step:"0.1"},null,512),[[Ri,tn(r).rx_loss]]),i[11]||(i[11]=Kt("div",{class:"invalid-feedback"},"Loss must be a positive number.",-1))])])]))}}),jq={novalidate:""},Uq={class:"row g-2"},Gq={class:"col-6"},zq={class:"col-6"},Hq={class:"col-6"},Wq={class:"col-6"},qq={class:"col-6"},Vq={class:"col-6"},Zq=Pp({__name:"Environment",setup(t){const r=Bp().splatParams.environment;return(n,i)=>(Xd(),$d("form",jq,[Kt("div",Uq,[Kt("div",Gq,[i[7]||(i[7]=Kt("label",{for:"radio_climate",class:"form-label"},"Radio Climate",-1)),ei(Kt("select",{"onUpdate:modelValue":i[0]||(i[0]=e=>tn(r).radio_climate=e),id:"radio_climate",class:"form-select form-select-sm",required:""},i[6]||(i[6]=[VM('<option value="equatorial">Equatorial</option><option value="continental_subtropical">Continental Subtropical</option><option value="maritime_subtropical">Maritime Subtropical</option><option value="desert">Desert</option><option value="continental_temperate">Continental Temperate</option><option value="maritime_temperate_land">Maritime Temperate (Land)</option><option value="maritime_temperate_sea">Maritime Temperate (Sea)</option>',7)]),512),[[V4,tn(r).radio_climate]]),i[8]||(i[8]=Kt("div",{class:"invalid-feedback"},"Please select a radio climate.",-1))]),Kt("div",zq,[i[10]||(i[10]=Kt("label",{for:"polarization",class:"form-label"},"Polarization",-1)),ei(Kt("select",{"onUpdate:modelValue":i[1]||(i[1]=e=>tn(r).polarization=e),id:"polarization",class:"form-select form-select-sm",required:""},i[9]||(i[9]=[Kt("option",{value:"horizontal"},"Horizontal",-1),Kt("option",{value:"vertical"},"Vertical",-1)]),512),[[V4,tn(r).polarization]]),i[11]||(i[11]=Kt("div",{class:"invalid-feedback"},"Please select a polarization type.",-1))]),Kt("div",Hq,[i[12]||(i[12]=Kt("label",{for:"clutter_height",class:"form-label"},[Nb("Clutter Height "),Kt("br"),Nb("(m)")],-1)),ei(Kt("input",{"onUpdate:modelValue":i[2]||(i[2]=e=>tn(r).clutter_height=e),type:"number",class:"form-control form-control-sm",id:"clutter_height",required:"",min:"0",step:"0.1"},null,512),[[Ri,tn(r).clutter_height]]),i[13]||(i[13]=Kt("div",{class:"invalid-feedback"},"Height must be >= 0 (default: 1.0).",-1))]),Kt("div",Wq,[i[14]||(i[14]=Kt("label",{for:"ground_dielectric",class:"form-label"},"Ground Dielectric (V/m)",-1)),ei(Kt("input",{"onUpdate:modelValue":i[3]||(i[3]=e=>tn(r).ground_dielectric=e),type:"number",class:"form-control form-control-sm",id:"ground_dielectric",required:"",min:"1",step:"0.1"},null,512),[[Ri,tn(r).ground_dielectric]]),i[15]||(i[15]=Kt("div",{class:"invalid-feedback"},"Dielectric constant must be >= 1 (default: 15.0).",-1))]),Kt("div",qq,[i[16]||(i[16]=Kt("label",{for:"ground_conductivity",class:"form-label"},"Ground Conductivity (S/m)",-1)),ei(Kt("input",{"onUpdate:modelValue":i[4]||(i[4]=e=>tn(r).ground_conductivity=e),type:"number",class:"form-control form-control-sm",id:"ground_conductivity",required:"",min:"0",step:"0.001"},null,512),[[Ri,tn(r).ground_conductivity]]),i[17]||(i[17]=Kt("div",{class:"invalid-feedback"},"Conductivity must be >= 0 (default: 0.005).",-1))]),Kt("div",Vq,[i[18]||(i[18]=Kt("label",{for:"atmosphere_bending",class:"form-label"},"Atmospheric Bending (N-units)",-1)),ei(Kt("input",{"onUpdate:modelValue":i[5]||(i[5]=e=>tn(r).atmosphere_bending=e),type:"number",class:"form-control form-control-sm",id:"atmosphere_bending",required:"",min:"0",step:"0.1"},null,512),[[Ri,tn(r).atmosphere_bending]]),i[19]||(i[19]=Kt("div",{class:"invalid-feedback"},"Bending constant must be >= 0 (default: 301.0).",-1))])])]))}}),Kq={novalidate:""},Qq={class:"row g-2"},Yq={class:"col-6"},Xq={class:"col-6"},$q={class:"row g-2 mt-2"},Jq={class:"col-6"},tV=Pp({__name:"Simulation",setup(t){const r=Bp().splatParams.simulation;return(n,i)=>(Xd(),$d("form",Kq,[Kt("div",Qq,[Kt("div",Yq,[i[3]||(i[3]=Kt("label",{for:"situation_fraction",class:"form-label"},"Situation Fraction (%)",-1)),ei(Kt("input",{"onUpdate:modelValue":i[0]||(i[0]=e=>tn(r).situation_fraction=e),type:"number",class:"form-control form-control-sm",id:"situation_fraction",required:"",min:"1",max:"100",step:"0.1"},null,512),[[Ri,tn(r).situation_fraction]]),i[4]||(i[4]=Kt("div",{class:"invalid-feedback"},"Percentage must be between 1 and 100 (default: 50).",-1))]),Kt("div",Xq,[i[5]||(i[5]=Kt("label",{for:"time_fraction",class:"form-label"},"Time Fraction (%)",-1)),ei(Kt("input",{"onUpdate:modelValue":i[1]||(i[1]=e=>tn(r).time_fraction=e),type:"number",class:"form-control form-control-sm",id:"time_fraction",required:"",min:"1",max:"100",step:"0.1"},null,512),[[Ri,tn(r).time_fraction]]),i[6]||(i[6]=Kt("div",{class:"invalid-feedback"},"Percentage must be between 1 and 100 (default: 90).",-1))])]),Kt("div",$q,[Kt("div",Jq,[i[7]||(i[7]=Kt("label",{for:"simulation_extent",class:"form-label"},"Max Range (km)",-1)),ei(Kt("input",{"onUpdate:modelValue":i[2]||(i[2]=e=>tn(r).simulation_extent=e),type:"number",class:"form-control form-control-sm",id:"simulation_extent",required:"",min:"1",max:"100",step:"1"},null,512),[[Ri,tn(r).simulation_extent]]),i[8]||(i[8]=Kt("div",{class:"invalid-feedback"},"Radius must be a positive number (default: 30 km).",-1))])])]))}}),eV={novalidate:""},nV={class:"row g-2"},rV={class:"col-6"},iV={class:"col-6"},oV={class:"row g-2 mt-2"},sV={class:"col-6"},aV={class:"col-6"},lV={class:"mt-3 text-center"},cV=["src"],uV={class:"d-flex justify-content-between mt-1"},hV={class:"badge bg-primary"},fV={class:"badge bg-primary"},dV=Pp({__name:"Display",setup(t){const r=Bp().splatParams.display;return(n,i)=>(Xd(),$d("form",eV,[Kt("div",nV,[Kt("div",rV,[i[4]||(i[4]=Kt("label",{for:"min_dbm",class:"form-label"},"Minimum dBm",-1)),ei(Kt("input",{"onUpdate:modelValue":i[0]||(i[0]=e=>tn(r).min_dbm=e),type:"number",class:"form-control form-control-sm",id:"min_dbm",required:"",step:"0.1"},null,512),[[Ri,tn(r).min_dbm]]),i[5]||(i[5]=Kt("div",{class:"invalid-feedback"},"Minimum dBm must be provided (default: -130.0).",-1))]),Kt("div",iV,[i[6]||(i[6]=Kt("label",{for:"max_dbm",class:"form-label"},"Maximum dBm",-1)),ei(Kt("input",{"onUpdate:modelValue":i[1]||(i[1]=e=>tn(r).max_dbm=e),type:"number",class:"form-control form-control-sm",id:"max_dbm",required:"",step:"0.1"},null,512),[[Ri,tn(r).max_dbm]]),i[7]||(i[7]=Kt("div",{class:"invalid-feedback"},"Maximum dBm must be provided (default: -30.0).",-1))])]),Kt("div",oV,[Kt("div",sV,[i[9]||(i[9]=Kt("label",{for:"color_scale",class:"form-label"},"Color Scale",-1)),ei(Kt("select",{"onUpdate:modelValue":i[2]||(i[2]=e=>tn(r).color_scale=e),id:"color_scale",class:"form-select form-select-sm",required:""},i[8]||(i[8]=[VM('<option value="plasma" selected>Plasma</option><option value="CMRmap">CMR map</option><option value="cool">Cool</option><option value="viridis">Viridis</option><option value="turbo">Turbo</option><option value="jet">Jet</option>',6)]),512),[[V4,tn(r).color_scale]]),i[10]||(i[10]=Kt("div",{class:"invalid-feedback"},"Please select a color scale.",-1))]),Kt("div",aV,[i[11]||(i[11]=Kt("label",{for:"overlay_transparency",class:"form-label"},"Transparency (%)",-1)),ei(Kt("input",{"onUpdate:modelValue":i[3]||(i[3]=e=>tn(r).overlay_transparency=e),type:"number",class:"form-control form-control-sm",id:"overlay_transparency",required:"",min:"0",max:"100",step:"1"},null,512),[[Ri,tn(r).overlay_transparency]]),i[12]||(i[12]=Kt("div",{class:"invalid-feedback"},"Transparency must be between 0 and 100 (default: 50).",-1))])]),Kt("div",lV,[Kt("div",null,[Kt("img",{src:`/colormaps/${tn(r).color_scale}.png`,alt:"Colorbar",width:"256",height:"30",style:{border:"1px solid #ccc",display:"block",margin:"0 auto"}},null,8,cV)]),Kt("div",uV,[Kt("span",hV,Pg(tn(r).min_dbm)+" dBm",1),Kt("span",fV,Pg(tn(r).max_dbm)+" dBm",1)])])]))}}),pV={class:"navbar navbar-dark bg-dark fixed-top"},mV={class:"container-fluid"},gV={class:"offcanvas offcanvas-end text-bg-dark show",tabindex:"-1",id:"offcanvasDarkNavbar","aria-labelledby":"offcanvasDarkNavbarLabel","data-bs-backdrop":"false"},yV={class:"offcanvas-body"},_V={class:"navbar-nav"},vV={class:"nav-item dropdown"},bV={class:"dropdown-menu dropdown-menu-dark p-3 show"},wV={class:"nav-item dropdown"},xV={class:"dropdown-menu dropdown-menu-dark p-3"},kV={class:"nav-item dropdown"},SV={class:"dropdown-menu dropdown-menu-dark p-3"},EV={class:"nav-item dropdown"},CV={class:"dropdown-menu dropdown-menu-dark p-3"},AV={class:"nav-item dropdown"},MV={class:"dropdown-menu dropdown-menu-dark p-3 show"},TV={class:"mt-3 d-flex gap-2"},PV=["disabled"],OV={class:"button-text"},IV={class:"list-group mt-3"},LV=["onClick"],DV={id:"map",ref:"map"},RV=Pp({__name:"App",setup(t){const r=Bp(),n=()=>r.simulationState==="running"?"Running":r.simulationState==="failed"?"Failed":"Run Simulation";return(i,e)=>(Xd(),$d("div",null,[Kt("nav",pV,[Kt("div",mV,[e[7]||(e[7]=Kt("a",{class:"navbar-brand",href:"#"},[Kt("img",{src:ML,alt:"Meshtastic Logo",width:"30",height:"30",class:"d-inline"}),Nb(" Meshtastic Site Planner ")],-1)),e[8]||(e[8]=Kt("button",{class:"navbar-toggler",type:"button","data-bs-toggle":"offcanvas","data-bs-target":"#offcanvasDarkNavbar","aria-controls":"offcanvasDarkNavbar","aria-label":"Toggle navigation"},[Kt("span",{class:"navbar-toggler-icon"})],-1)),Kt("div",gV,[e[6]||(e[6]=Kt("div",{class:"offcanvas-header"},[Kt("h5",{class:"offcanvas-title",id:"offcanvasDarkNavbarLabel"},"Site Parameters"),Kt("button",{type:"button",class:"btn-close btn-close-white","data-bs-dismiss":"offcanvas","aria-label":"Close"})],-1)),Kt("div",yV,[Kt("ul",_V,[Kt("li",vV,[e[1]||(e[1]=Kt("a",{class:"nav-link dropdown-toggle",href:"#",role:"button","data-bs-toggle":"dropdown","data-bs-auto-close":"outside","aria-expanded":"true"},"Site / Transmitter",-1)),Kt("ul",bV,[Kt("li",null,[Ul(Pq)])])]),Kt("li",wV,[e[2]||(e[2]=Kt("a",{class:"nav-link dropdown-toggle",href:"#",role:"button","data-bs-toggle":"dropdown","data-bs-auto-close":"outside","aria-expanded":"false"},"Receiver",-1)),Kt("ul",xV,[Kt("li",null,[Ul(Fq)])])]),Kt("li",kV,[e[3]||(e[3]=Kt("a",{class:"nav-link dropdown-toggle",href:"#",role:"button","data-bs-toggle":"dropdown","data-bs-auto-close":"outside","aria-expanded":"false"},"Environment",-1)),Kt("ul",SV,[Kt("li",null,[Ul(Zq)])])]),Kt("li",EV,[e[4]||(e[4]=Kt("a",{class:"nav-link dropdown-toggle",href:"#",role:"button","data-bs-toggle":"dropdown","data-bs-auto-close":"outside","aria-expanded":"false"},"Simulation Options",-1)),Kt("ul",CV,[Kt("li",null,[Ul(tV)])])]),Kt("li",AV,[e[5]||(e[5]=Kt("a",{class:"nav-link dropdown-toggle",href:"#",role:"button","data-bs-toggle":"dropdown","data-bs-auto-close":"outside","aria-expanded":"true"}," Display ",-1)),Kt("ul",MV,[Kt("li",null,[Ul(dV)])])])]),Kt("div",TV,[Kt("button",{disabled:tn(r).simulationState==="running",onClick:e[0]||(e[0]=(...c)=>tn(r).runSimulation&&tn(r).runSimulation(...c)),type:"button",class:"btn btn-success btn-sm",id:"runSimulation"},[Kt("span",{class:e2([{"d-none":tn(r).simulationState!=="running"},"spinner-border spinner-border-sm"]),role:"status","aria-hidden":"true"},null,2),Kt("span",OV,Pg(n()),1)],8,PV)]),Kt("ul",IV,[(Xd(!0),$d(lh,null,fI(tn(r).$state.localSites,(c,u)=>(Xd(),$d("li",{class:"list-group-item d-flex justify-content-between align-items-center",key:c.taskId},[Kt("span",null,Pg(c.params.transmitter.name),1),Kt("button",{type:"button",onClick:s=>tn(r).removeSite(u),class:"btn-close","aria-label":"Close"},null,8,LV)]))),128))])])])])]),Kt("div",DV,null,512)]))}}),JP=EL(RV);JP.use(NF());JP.mount("#app")});export default NV();
+    <svg xmlns="http://www.w3.org/2000/svg" id="Layer_1" data-name="Layer 1" viewBox="0 0 1871.69 2607.94"><defs><style>.cls-1,.cls-4{fill:#2c2d3c;stroke-width:0}.cls-4{fill:#fff}</style></defs><path id="Body_background" fill="#67ea94" stroke-width="0" d="M1349.07 573.19h-855.5c-11.05 0-20.01 8.96-20.01 20.01v1219.19c0 10.12 8.21 18.33 18.33 18.33h854.27c8.7 0 15.75-7.05 15.75-15.75V586.04c0-7.1-5.75-12.85-12.85-12.85Zm-220.55 569.8h-411V787h411v355.99Z" data-name="Body background"/><path id="Body" d="M1166.62 5.54c-21.2 13.2-31.7 24.3-34.1 36-2.2 10.6-1.8 11.4 13.6 26.9 7.7 7.6 15.3 15.7 17.1 18l3.2 4.1-13.7 5.8c-26.6 11.4-109.5 54-125.2 64.4-4.6 3-5.5 4.1-5.5 6.5 0 3.5 2.7 5.6 5.1 4.1 1.3-.8 2.9-.5 6.4 1.2 9.4 4.5 34.3 10.5 59 14.3 6.9 1.1 27.6 3.3 46 5 49.1 4.5 71 8 71 11.5 0 2.2-21.1 23.5-37.5 38-8.2 7.2-24.4 20.9-36 30.5-29 24-42.2 35.9-62 56.1-27.2 27.7-54.4 60.8-60.9 74.1-2.5 5-2.7 6.1-1.7 9.1.7 1.9 8.9 12.6 18.4 23.9 9.5 11.2 24.2 29.2 32.8 39.9 30.8 38.2 48.3 56.9 75.2 80.4l13.7 12-118.2.6c-65.1.3-203.8.7-308.4.8-182.2.3-221.1.8-237.2 3.1-11.6 1.6-16.2 4.8-18.1 12.7-.9 3.3-1.3 130.7-1.6 479.6-.3 261.4-.7 530.3-.9 597.7-.5 142.7-.1 152.6 6.6 163.8 2.6 4.2 6.9 6.4 13.7 6.8 3.1.2 55 .6 115.4 1 99.7.6 109.7.8 109.7 2.3.2 11.7-9.3 741.7-9.6 742-.2.3-75.5-1.9-167.2-4.8-158.1-4.9-167.1-5.1-171-3.5-11.6 4.6-12.2 20.8-1 26.3 4.1 1.9 10.2 2.2 165.3 7.1 88.6 2.8 168.2 5.1 177 5.1h16l4.7-5.3c2.6-2.9 5.2-6.2 5.7-7.3.7-1.5 10.4-722.4 10.1-757.4v-4.4l159.2.7c87.6.4 159.3.8 159.4.9 0 .1 2.7 169.2 5.9 375.7l5.7 375.5 3 6c1.6 3.3 4.2 7.6 5.8 9.5l2.9 3.5 167.8-.3c158.5-.4 168-.5 171.9-2.2 11.2-4.9 12.1-19.9 1.5-25.8l-3.9-2.2h-318.7l-.3-7.7c-.3-10.8-11.2-710.5-11.2-722.6v-9.7h121.8c85.3.1 123.8-.2 128.7-1 12.4-2 18.1-6.1 21.9-15.8 1.5-4 1.6-46.7 1.6-608.5 0-332.3-.3-610.5-.6-618.2-.7-15.7-1.6-20-4.7-21.8-1.7-.9-24.6-1.3-101.2-1.5l-99-.2-3-3.4c-1.6-1.9-9.1-8.8-16.5-15.4-24.3-21.5-43.4-42.2-71.5-77.2-8.2-10.2-21.9-26.8-30.5-37-8.5-10.2-16.8-20-18.3-21.9-3.4-4.1-3.2-5.1 3.8-15.6 11.1-16.9 35.8-45.8 59-69 16.8-16.9 30.6-29.2 57-51 36-29.7 54.9-46.8 67.7-60.9 8.5-9.4 8.9-10.1 8.6-14-.3-3.8-.7-4.3-5-6.4-8-4-29.7-7.2-76.3-11.2-36.5-3.1-62.7-7.4-84.3-13.6-8.9-2.6-17.8-6.1-17.1-6.8 1.4-1.3 31.8-17.6 56.9-30.4 31.9-16.3 56.3-27.9 73.3-34.8l10.7-4.5 6.3 5.2c11.6 9.7 23.7 13.6 38.1 12.1 8.3-.8 10-2.6 11.7-11.7 2.1-11.2-.9-22.9-12-47.4-9.8-21.7-19.8-36.9-31.4-47.9-7.3-6.8-8.8-6.8-20.6.5Zm190.1 570.1c1.1 1.1 1.3 114 1.6 619.5l.2 618.3-2.2 4.4c-3.2 6.3-8.1 8.7-19.8 10-9.2.9-48.7.8-618.5-.9-254.3-.8-236.4-.3-239.4-6.6-3.2-6.6-4.2-16-4.7-44-.2-15.4 0-283.4.4-595.5.5-312.1.5-569.2 0-571.3-.9-4.2.5-18.4 2.5-24.5 1-3.2 1.9-3.9 6.3-5.4 10.9-3.6 32.3-3.9 396.9-4.7 448.7-1 475-1 476.7.7Z" class="cls-1"/><path d="M717.52 787h411v355.99h-411z" class="cls-4"/><path id="Dot" fill="#454656" stroke="#2c2d3c" stroke-miterlimit="10" stroke-width="7" d="M1246.61 622.56c-10.79 3.78-18.53 10.79-23.69 21.39-2.77 5.62-2.95 6.45-2.95 16.59s.18 10.97 2.95 16.87c7.56 15.86 22.03 24.34 40.29 23.51 7.38-.28 9.31-.74 15.58-3.69 8.67-4.15 15.4-10.6 18.99-18.25 9.96-21.02 1.94-43.79-19.18-54.21-6.55-3.23-7.47-3.41-17.06-3.69-8.02-.18-11.25.18-14.94 1.48Z"/><path id="Eyes" d="M651.62 705.94c-8 1.6-10.3 5.2-12 19.4-1.4 12-1.8 452.5-.4 459.2 1.4 6.4 2.7 8.9 5.7 10.8 2.1 1.4 31.7 1.6 275.1 1.5 150 0 275.3-.3 278.4-.6 6.8-.7 9.6-1.9 10.7-4.8.5-1.1.7-106.1.4-235.6-.6-263.8.3-239.2-8.5-243.1-5.2-2.3-17.1-5-23-5.1-8-.3-489.4-2.8-505.5-2.7-9.1.1-18.5.5-20.9 1Zm186.5 82c6.5 1.2 8.4 2.3 8.4 4.9s-2.3 3.1-11.3 1.8c-12.3-1.6-35.6-.4-50.4 2.7-14.5 3-33.7 9.1-43.7 13.9-7.3 3.5-16.6 10-16.6 11.6 0 .5 1.7 1 3.8 1.2 3.2.3 3.7.6 3.7 2.8s-.4 2.5-5.8 2.8c-7 .4-8.7-.8-8.7-5.6 0-10.9 30.8-26.7 65.5-33.7 6.6-1.3 13.6-2.6 15.5-2.8 7.9-.9 34-.6 39.6.4Zm224.9 3.3c35.7 7.5 65.5 22.9 65.5 33.8 0 4.8-1.7 6-8.7 5.6-5.4-.3-5.8-.5-5.8-2.8s.5-2.5 3.8-2.8c2-.2 3.7-.7 3.7-1.2 0-1.6-9.3-8.1-16.6-11.6-10-4.8-29.2-10.9-43.7-13.9-14.8-3.1-38.1-4.3-50.4-2.7-9 1.3-11.3.9-11.3-1.8 0-4.7 7.5-6 32-5.5 16.1.3 21.6.8 31.5 2.9Zm-238.5 58.4c4.6 2.3 5.9 3.6 8.4 8.4 3.2 6.3 3.7 10.2 5.6 42.3.6 9.9 1.5 26.3 2.1 36.5 1.2 20.5.5 96.3-1.1 122.6-3.3 53.9-5 74.5-6.1 76.6-.5 1-1.6 1.8-2.5 1.8-.8 0-4.1.9-7.3 2-17.1 5.7-43.2-.5-50.3-12-6-9.7-7.6-27-8.8-97-.5-27.2-1.4-56.5-2.2-65-.7-8.5-1.3-29-1.3-45.5 0-40.5 1.5-46.7 14.4-59.6 5.3-5.2 8.2-7.2 14.6-9.9 10.4-4.3 13.6-5 22-4.4 4.9.3 8.6 1.3 12.5 3.2Zm230.7 1.9c7.3 3 10 4.8 15.4 10.2 12.9 12.9 14.4 19.1 14.4 59.6 0 16.5-.6 37-1.3 45.5-.8 8.5-1.7 37.8-2.2 65-1.2 70-2.8 87.3-8.8 97-7.1 11.5-33.2 17.7-50.3 12-3.2-1.1-6.5-2-7.3-2-.9 0-2-.8-2.5-1.8-1.1-2.1-2.8-22.7-6.1-76.6-1.6-26.3-2.3-102.1-1.1-122.6 4.3-73.4 4.1-71.4 7.5-78.5 6.2-12.6 23.2-15.8 42.3-7.8Z" class="cls-1"/><path id="Meshtastic_M" fill="#2c2d3c" fill-rule="evenodd" stroke-width="0" d="m1034.49 1359.63-215.84 316.53-45.53-31.04 238.56-349.85c5.12-7.52 13.64-12.02 22.74-12.03 9.1 0 17.62 4.48 22.76 11.99l239.11 349.3-45.47 31.13-216.33-316.02Zm-452.9 316.2 252.13-369.74-45.53-31.05-252.13 369.73 45.53 31.05Z" data-name="Meshtastic M"/><path id="Left_hand_background" d="M407.1 1220.22v-6.7h-23.16v-8.98c0-11.12-1.6-21.87-4.56-32.04-3.4-45.86-33.88-84.17-75.5-99.01v-2.21c0-10.27-5.04-19.37-12.77-24.96v-2.05c0-10.55-5.65-19.77-14.08-24.82v-5.24c0-6.87-2.64-13.12-6.95-17.81l-39.54-206.2c-1.2-6.26-4.31-11.66-8.6-15.74-.62-15.68-13.52-28.2-29.35-28.2-15.68 0-28.49 12.29-29.33 27.76-5.01 5.27-8.1 12.39-8.1 20.24v3.47c-5.03 6.13-8.05 13.97-8.05 22.52v146.27c0 8.02 2.66 15.43 7.15 21.38h-10.15c-6.08-10.25-17.26-17.12-30.04-17.12h-10.13c-13.97 0-25.55 10.26-27.61 23.65-16.09 8.06-28.16 22.94-32.44 40.85-9.36 8.59-16.53 19.51-20.63 31.83-11.66 13.48-18.74 31.05-18.74 50.28v32.99c0 18.66 10.95 34.76 26.77 42.23 6.87 11.27 18.91 19.02 32.83 19.97 8.64 8.63 20.58 13.97 33.76 13.97h.65c.06 18.39 10.27 34.39 25.32 42.7v2.98l-31.54 15.79c-3.23 1.62-4.54 5.54-2.92 8.77l27.13 54.21c2.71 5.41 8.24 8.47 13.91 8.31 7.05 12.52 19.2 21.77 33.64 24.94 4.35 8.18 12.87 13.82 22.79 14.02l45.97.91c12.54.25 23.88-5.09 31.68-13.72h2.9c19.87 0 38.76-4.16 55.88-11.64 57.39-6.54 101.98-55.26 101.98-114.4v-12.05c0-12.25-7.5-22.75-18.16-27.16Z" class="cls-4" data-name="Left hand background"/><path id="Left_Hand" d="M180.02 744.24c-2.7 1.3-7.1 4.6-9.7 7.3-9.1 9.9-19.7 35.8-25.5 63l-2.8 12.8.1 49.5c0 52.1 1.1 75.2 4.5 94.8 1 6.3 1.9 11.9 1.9 12.4 0 .6-3.7-2.5-8.3-6.9-11.1-10.6-15.7-12.8-26.7-12.7-9.8.1-14.6 1.8-24.4 8.8-13 9.3-34.8 35.8-54.7 66.6-19 29.4-26.9 47.1-32 71.5-3.4 16.1-3.2 36.1.5 50 3.2 12.1 8.1 22.9 13.1 28.3 2 2.3 7.1 6.3 11.3 9 10.8 6.9 43 22.9 53.6 26.6l8.8 3.1 7.2 12.8c9 16.1 14.1 22.7 21.1 27.4l5.6 3.7-4.3 1.6c-26.9 10.4-28.9 11.3-30.8 14-1.1 1.6-2 3.7-2 4.7 0 2.4 13.9 34.6 18.7 43.3 7.2 13.2 15.8 23.2 29.7 34.7 16.4 13.7 26.1 20.2 39 26.4 13.9 6.6 25.5 9.3 36.6 8.4 12.4-1 22.4-3.1 38.5-8.1 7.9-2.4 19.1-5.5 24.9-6.9 5.8-1.4 14.7-3.8 19.9-5.5 5.1-1.6 18-5.2 28.5-8 30.2-7.9 59.5-19.7 70.7-28.7 6.4-5.1 16.6-19.3 22.2-31 2.7-5.6 6-15.4 8.6-25 4.1-15.4 4.2-16.2 4.2-31.8 0-17.1-1.1-23.6-5.1-31.6-5.5-11-13.1-16.3-23.4-16.4-3.6 0-8 .3-9.8.7-3.1.7-3.2.7-2.5-2 .5-1.5.8-7.7.7-13.7 0-9.7-.4-12.4-3.8-23.5-11.8-39.3-19.9-57.4-34.4-76.7-5.3-7.1-7.6-8.8-10.3-7.8-.8.3-2.6-.3-4-1.2-17.5-11.7-23-17.7-35.4-38.4-22.6-38.2-34.7-77-44.4-143.4-1.7-11.6-4.2-28.7-5.6-38-1.4-9.4-3.2-21.6-4-27.2-1.5-10.9-3-17.4-10.1-43.3-4.9-17.7-6.8-22.3-14.2-33.4-12.9-19.5-16.9-22.6-29.3-22.6-5.7 0-8.6.6-12.4 2.4Zm20.1 5.5c4.4 2 8.2 6.5 16.6 19.7 6.8 10.5 7.4 12.1 11.7 27.1 7 24.4 10.2 38.5 12.1 52.8 1 7.7 2.5 18 3.4 23 .8 4.9 1.8 11.7 2.1 15 1.1 10.6 7.4 49 10.1 61.7 6.9 33.1 15.3 59.9 24.9 79.7 6.6 13.4 16.5 31.1 19.3 34.3 1.9 2.2 1.8 2.2-4.6-.2-7.7-3-21-2.8-27.7.4-9.8 4.6-18.9 16.8-23.6 31.6-3.8 12.3-4.7 20.2-3.7 32.3 1 12.7 3 21.2 7.2 30.2 7.3 15.7 16.1 25.9 30.2 35.2 22.4 14.5 47.8 22.4 82.1 25.5l13.7 1.2-4.3 1.8c-2.3 1-9.9 2.9-16.9 4.4-7 1.5-20.3 5.3-29.5 8.5-29.2 10.1-50.1 14.5-99.7 20.9-28.9 3.7-62.9 9.1-78.5 12.4-8.3 1.7-11.4 1.2-19.9-3.3-8.1-4.3-16.2-14.3-23.5-28.9l-3.1-6.2h8.2c4.6 0 12.8-.7 18.2-1.5 5.5-.8 11.6-1.5 13.7-1.5 6.1 0 18.1-4.3 26.1-9.4 4.2-2.7 13.4-10.5 21.5-18.4 15.9-15.4 18.4-19.4 23.9-38.2 3.9-13.5 3.8-22.5-.3-35-1.7-5.2-4.8-15.1-6.8-22-11.3-38.1-20.2-61.5-30.5-80.3-3.7-6.8-7-13.5-7.3-14.9-.4-1.4-2.2-5.1-4.1-8.2-8.9-14.9-12.5-50.6-12.9-128.4-.1-34.8.1-38.6 2-49.2 5.5-28.9 16.4-57.2 26-66.7 6.7-6.7 16.2-8.9 23.9-5.4Zm-75.9 223.2c2.5 1.2 9.2 6.6 15.1 12 9 8.4 11.4 11.3 15.2 18.4 2.5 4.6 6.1 11.2 8.1 14.7 7.3 12.8 9.2 16.5 13.5 26.9 8.3 20.2 30.1 88.8 29 91.4-.7 1.9-3.2 1.9-13.9 0-19.4-3.4-34.8-11.1-53.2-26.5-22.6-19.1-38.4-35.1-53.4-54.5-8.7-11.1-23.7-33.2-25-36.7-1.6-4.3 23.2-33.2 35.5-41.3 10.2-6.8 20.9-8.4 29.1-4.4Zm-59.7 65.4c18.6 28 33.5 45.1 59.5 68.3 17.3 15.5 25.2 21.1 38 27.3 12.8 6.1 22.5 8.8 34.8 9.6 8.2.5 9.7.9 9.7 2.3 0 2.5-5.9 21.7-8.5 27.5-2.4 5.6-10.9 15.2-19.9 22.7l-5.8 4.9-8.2-.6c-14.7-1.2-43.1-12.1-64-24.5-33.2-19.8-62.4-49.6-77.6-79.3-2.7-5.4-5-10.5-5-11.3 0-5.6 35-63.9 37.1-61.7.3.5 4.8 7.1 9.9 14.8Zm231.1 31.7c5.3 2.4 22.2 13.2 33.5 21.3 3.1 2.2 6.6 3.8 8.5 4 3.1.2 4.1 1.2 10.2 10.1 11.9 17.3 19 34.1 29.6 69.9 4 13.7 5.2 21.9 4.2 28.2-1.3 8.5-1.6 8.7-16.1 8-40.6-1.9-82-17.7-99.4-37.8-5-5.9-11.1-16.4-14.2-24.6-3.3-8.8-5.7-24.9-5-33.8.6-8.7 5.8-25.5 9.7-31.6 3.9-6.2 13-14.7 16.5-15.4 1.6-.4 3.4-.8 3.9-1.1 3-1.1 13.5.4 18.6 2.8Zm-268.6 46.6c16.2 24.3 40.8 47.5 67.1 63.5 22.1 13.5 49.9 24.7 65.5 26.5l6.4.8-4.5 2.9c-6.7 4.3-15.9 7.8-21.5 8.1-2.7.2-9.2 1.1-14.2 2-6.8 1.2-12.9 1.5-23 1.2-16.4-.6-20.1-1.7-44.8-14-29.6-14.8-38-21-42.9-31.8-10-22-11.1-45.9-3.4-74.3l2.1-7.9 4.3 8.2c2.4 4.5 6.4 11.1 8.9 14.8Zm378.2 103.3c1.5.5 4.3 2.5 6.1 4.2 7.3 6.9 10.2 17.1 10.2 35.8 0 10.9-.4 14.3-3.4 26.5-1.9 7.7-4.7 17.2-6.1 21-5.1 13.4-16.7 30.6-24.8 36.5-11.8 8.6-40.4 19.8-69 26.9-6.7 1.7-17.8 4.9-24.7 7-6.9 2.2-17.4 5.1-23.5 6.5-6 1.4-15.7 4.1-21.5 6-14.3 4.8-26.7 7.4-38 8.1-8 .6-10.8.3-17.5-1.5-15.3-4.2-33.7-14.7-51.3-29.3-16.7-14-22.8-21.2-31.4-36.8-5.1-9.3-17.1-37.9-16.5-39.4s30.2-12.6 39.7-15c17-4.1 61-11.4 95.5-15.6 43.6-5.4 62.3-9.3 93.5-19.6 12.4-4 27.7-8.4 34-9.8 6.3-1.3 14.4-3.6 18-5.1 18.2-7.7 24.1-8.9 30.7-6.4Z" class="cls-1" data-name="Left Hand"/><path id="Right_hand_background" d="M1819.8 966.37c-25.94-6.6-55.37 12.34-80.21 47.23-7.22 2.11-13.85 6.48-18.71 12.96l-62.66 83.5c-3.95 5.27-6.58 11.11-7.97 17.13l-5.41 1.59c-13.38 3.92-23.69 13.25-29.27 24.9-5.72 2.53-10.71 6.15-14.76 10.55-3.12-3.5-6.87-6.34-11.02-8.41l-8.6-29.33c-2.43-8.29-7.39-15.15-13.8-19.98-1.3-3.05-2.95-5.86-4.89-8.42l-1.83-6.25c-5.53-18.87-25.32-29.69-44.19-24.16l-1.17.34c-17.05 5-27.52 21.63-25.3 38.71-2.25 3.8-4 7.88-5.2 12.14-6.93 11-9.29 24.81-5.34 38.27l4.28 14.6c-2.84 8.7-3.18 18.32-.41 27.76l43.82 149.44-4.59-1.51c-5.42-1.79-11.01-1.75-16.1-.23l-5.24-1.73c-6.73-2.22-14 1.43-16.22 8.17-1.95 5.9-1.07 12.05 1.87 17.01-2.25 10.55-.41 21.21 4.6 30.14 1.2 12.02 7.42 23.12 17.2 30.4 5.03 12.25 15.17 22.32 28.74 26.8l6.25 2.06c4.14 7.04 10.75 12.68 19.12 15.44l20.53 6.78 1.08 3.7 5.36-1.57 15.54 5.13 1.09 3.73 5.4-1.58 78.79 26.01c6.91 2.28 14.02 2.19 20.48.2l18.24 6.02c18.8 6.21 39.08-4 45.29-22.81 6.21-18.8-4-39.08-22.81-45.29l-4.43-1.46c-1.72-4.44-4.32-8.51-7.65-11.96l13.47-3.95-.5-1.72c10.19-4.24 17.61-12.72 20.8-22.72l4.6 3.75 41.26-50.64c3.18-3.9 5.25-8.34 6.27-12.94 25.27-12.22 42.7-38.1 42.7-68.05v-186.05c5.89-69.09-12.51-124.56-48.47-133.71Z" class="cls-4" data-name="Right hand background"/><path id="Right_Hand" d="M1797.02 960.24c-13.1 3.3-25.8 12.9-52.1 39.1-30.1 30-54.1 58.2-80.5 94.5-15.4 21.1-16.2 22.5-15.6 25.7.5 2.7.2 2.9-5.5 4.7-3.3 1-7.2 2.9-8.7 4-1.4 1.2-3.9 3-5.6 4-7.2 4.5-16.8 13.3-22.5 20.7-5.2 6.7-6.5 7.8-7.6 6.7-2.9-3-12.7-23.3-17.8-37.1-3-8.1-7.4-18.3-9.7-22.7-7.7-14.4-23.3-30.5-34.8-35.8-7.3-3.4-18-2.9-26.1 1.3-7.9 4-17.1 13.8-21.3 22.7-8.5 17.7-11.2 34-11.1 66.8 0 24.7 1.1 36.1 6 62.9 5.7 31.1 21.6 85.9 33.3 114.6 2.2 5.4 3.8 10.1 3.6 10.3s-5.8-.1-12.4-.7c-14.8-1.5-18.2-.9-22 3.5-6.6 7.5-6.7 17.7-.6 51.3 1.2 6.6 2.8 10.9 7.1 19 3.1 5.8 6.4 11.7 7.3 13.1s2.3 3.8 3.1 5.4 4.9 6.3 9 10.5c6.7 6.8 10.1 9.1 32.5 21.8 32.7 18.6 41.4 22.6 69.5 32.1 41.9 14.1 68.2 21 94.5 24.6 6.1.8 16.3 2.4 22.8 3.6 20.4 3.5 26.1 2.6 34.3-5.1 2.8-2.8 6.3-6.7 7.7-8.7 3.8-5.5 6.8-15.6 7-23.3.2-5.7-.2-7.2-2.1-9.6-1.2-1.5-4.4-5.7-7-9.3-8.5-11.8-35.6-37.2-44.4-41.6-7.5-3.8-22.4-9-33.6-11.8-10.4-2.6-27.5-9.1-46.7-17.9-43.6-19.9-57.9-26.8-76.7-36.6-11.6-6.2-23.4-11.9-26.2-12.8s-5.5-2-6-2.4c-.6-.5-1.8-.9-2.8-.9s-1.8-.5-1.8-1.1-1.6-2.5-3.5-4.4c-4-3.7-8-13.2-16.3-38.5-25.9-79.2-34.5-139.3-26.7-185 4-23.4 13.7-40 27.2-46.7 11.6-5.6 20.3-3.1 33.6 9.6s18.2 20.7 26.2 42.6c5.2 14.3 17.1 38.5 21.8 44.3 4 5 16.6 30.8 21.1 43.4 9.7 26.8 16.6 65.4 16.6 92.4v13.4h2.4c1.9 0 2.7-.8 3.7-3.7 2.5-7.8-.7-41.8-6.8-70.8-4.5-21.7-12.8-44.4-23.8-65l-5.4-10 2.7-3.1c1.5-1.7 3.9-4.7 5.4-6.6 1.5-1.9 6-6.1 10.2-9.2 4.1-3.1 7.7-6.4 8-7.4.9-2.6 10.3-8 19.3-11 12.9-4.2 20.3-3.7 39.3 2.8 8.5 2.9 18.3 6.6 21.8 8.2 6.9 3.3 9.6 3.3 10 .2.4-2.6-5-6.9-11.3-9.1-2.5-.8-4.7-1.9-5.1-2.4-.3-.5-1.6-.9-2.9-.9s-4.8-.9-7.7-2c-11.8-4.3-21.7-6.2-30.8-5.8l-8.8.3 1-2.4c1.1-3.1 26.2-37 39.2-53 16.1-19.8 40.9-47.2 59.2-65.2 34.3-33.6 47-39.6 65.4-30.8 10.3 4.9 16.8 11.2 25.6 24.6 13.3 20.1 15.3 26.3 19.9 61.4l.5 3.5-14.3 3.9c-26.3 7-48.8 16-84.2 33.6-24.9 12.4-33 17.4-33 20.4 0 3.5 4.1 2.9 12.3-1.8 20.3-11.7 60.9-30.7 81.9-38.3 13.4-4.9 36.3-11.5 37.4-10.8 1 .6 1.2 89.5.3 93.1-.4 1.6-1.7 2.3-4.7 2.8-14.3 2.5-43.6 18.3-57.9 31.4-6.7 6.1-8.6 9.4-6.8 11.6.7.8 1.6 1.5 2.1 1.5s3.7-2.7 7-6c11.7-11.3 37.2-26.7 51.7-31 4-1.2 7.5-2.1 7.6-1.9.4.4 1 78.5.8 89.4l-.2 7-5.2 1.9c-7.2 2.5-19.6 9.4-20.7 11.4-2 4 2.3 5.7 6.8 2.6 1.2-.9 5.7-3.4 9.9-5.5l7.7-3.9.3 12.3c.1 6.7-.1 17.2-.7 23.3-.7 9.4-1.3 12-3.7 16-6 10.6-16.7 21.8-24.9 26.1-2 1.1-2 .7-2.3-13.5-.3-15.1-1.1-18-4.4-16.7-1.4.5-1.7 3.1-2 15.3-.4 13.5-.6 15.3-3.3 21.7-3.7 8.8-18.4 28.6-28.4 38-4 3.8-9.4 9.2-11.9 12-9.2 10-16 16.1-25 22.5-6.8 4.7-9.2 7-9.2 8.6 0 2.9 2.5 3.7 5.9 1.9 6.1-3.1 23.6-17.7 29.6-24.6 3.5-4.1 9.4-10.1 13.1-13.4 8.2-7.2 24.8-27.9 28.9-35.8 2.8-5.4 3.6-6.1 10.5-9.6 4.1-2 8.7-4.5 10.2-5.5 4.3-2.9 16.4-18 19.7-24.8 2.9-5.9 3.2-7.6 4.3-22.8.6-9.1 1.2-44.9 1.3-79.5.1-34.7.4-84.4.6-110.5.3-50.6-.2-59.6-5.2-84.4-2.9-14.5-11.3-31-23.8-46.9-11.9-15.3-31.5-24-45.6-20.3Zm-287 388.6c6.1.6 13.3 1.7 16 2.5 2.8.8 7.5 2.1 10.5 3 3 .8 16.3 7.1 29.5 14 13.2 7 30.1 15.3 37.5 18.7 7.4 3.3 20.9 9.5 30 13.8 22.9 10.8 46.9 20.5 57 22.8 9.6 2.3 27.5 8.4 33.1 11.3 7.5 3.8 36.6 30.4 39.5 36.2.8 1.5 3.7 5.2 6.4 8.3 6 6.5 6.4 9.6 2.5 21.3-2.1 6.3-3.6 8.6-8.2 13.5-6.5 6.7-8.4 7.6-15.6 7.6-12.4 0-68.1-10.2-90.2-16.6-28.9-8.3-65.5-21.3-79-27.9-13.3-6.5-40.2-21.3-51-28-7.7-4.8-16.5-15.2-24.2-28.5-10.7-18.5-10.8-18.9-14.9-47.9-1.7-11.8-.8-18.9 2.8-22.8 2.4-2.6 3.3-2.7 18.3-1.3Z" class="cls-1" data-name="Right Hand"/></svg>`,className:"",iconSize:[24,40],iconAnchor:[12,40]});const Bp=zF("store",{state(){return{map:void 0,currentMarker:void 0,localSites:[],simulationState:"idle",splatParams:{transmitter:{name:qC.randanimalSync(),tx_lat:51.102167,tx_lon:-114.098667,tx_power:.1,tx_freq:907,tx_height:2,tx_gain:2},receiver:{rx_sensitivity:-130,rx_height:1,rx_gain:2,rx_loss:2},environment:{radio_climate:"continental_temperate",polarization:"vertical",clutter_height:1,ground_dielectric:15,ground_conductivity:.005,atmosphere_bending:301},simulation:{situation_fraction:95,time_fraction:95,simulation_extent:30,high_resolution:!1},display:{color_scale:"plasma",min_dbm:-130,max_dbm:-80,overlay_transparency:50}}}},actions:{setTxCoords(t,r){this.splatParams.transmitter.tx_lat=t,this.splatParams.transmitter.tx_lon=r},removeSite(t){this.map&&(this.localSites.splice(t,1),this.map.eachLayer(r=>{r instanceof Tg&&this.map.removeLayer(r)}),this.redrawSites())},redrawSites(){this.map&&(this.map.eachLayer(t=>{t instanceof Tg&&this.map.removeLayer(t)}),this.localSites.forEach(t=>{const r=new Tg({georaster:{...t}.raster,opacity:.7,noDataValue:255,resolution:256});r.addTo(this.map),r.bringToFront()}))},initMap(){this.map=jl.map("map",{zoom:10,zoomControl:!1});const t=[this.splatParams.transmitter.tx_lat,this.splatParams.transmitter.tx_lon];this.map.setView(t,10),jl.control.zoom({position:"bottomleft"}).addTo(this.map);const r=jl.tileLayer("https://{s}.basemaps.cartocdn.com/light_all/{z}/{x}/{y}{r}.png",{attribution:"© OpenStreetMap contributors © CARTO"}),n=jl.tileLayer("https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png",{attribution:"© OpenStreetMap contributors"}),i=jl.tileLayer("https://server.arcgisonline.com/ArcGIS/rest/services/World_Imagery/MapServer/tile/{z}/{y}/{x}",{attribution:"Tiles © Esri — Source: Esri, USGS, NOAA"}),e=jl.tileLayer("https://{s}.tile.opentopomap.org/{z}/{x}/{y}.png",{attribution:"Map data: © OpenStreetMap contributors, SRTM | OpenTopoMap"});n.addTo(this.map);const c={OSM:n,"Carto Light":r,Satellite:i,"Topo Map":e};jl.easyPrint({title:"Save",position:"bottomleft",sizeModes:["A4Portrait","A4Landscape"],filename:"sites",exportOnly:!0}).addTo(this.map),jl.control.layers(c,{},{position:"bottomleft"}).addTo(this.map),this.map.on("baselayerchange",()=>{this.redrawSites()}),this.currentMarker=jl.marker(t,{icon:$P}).addTo(this.map).bindPopup("Transmitter site"),this.redrawSites()},async runSimulation(){console.log("Simulation running...");try{const t={lat:this.splatParams.transmitter.tx_lat,lon:this.splatParams.transmitter.tx_lon,tx_height:this.splatParams.transmitter.tx_height,tx_power:10*Math.log10(this.splatParams.transmitter.tx_power)+30,tx_gain:this.splatParams.transmitter.tx_gain,frequency_mhz:this.splatParams.transmitter.tx_freq,rx_height:this.splatParams.receiver.rx_height,rx_gain:this.splatParams.receiver.rx_gain,signal_threshold:this.splatParams.receiver.rx_sensitivity,system_loss:this.splatParams.receiver.rx_loss,clutter_height:this.splatParams.environment.clutter_height,ground_dielectric:this.splatParams.environment.ground_dielectric,ground_conductivity:this.splatParams.environment.ground_conductivity,atmosphere_bending:this.splatParams.environment.atmosphere_bending,radio_climate:this.splatParams.environment.radio_climate,polarization:this.splatParams.environment.polarization,radius:this.splatParams.simulation.simulation_extent*1e3,situation_fraction:this.splatParams.simulation.situation_fraction,time_fraction:this.splatParams.simulation.time_fraction,high_resolution:this.splatParams.simulation.high_resolution,colormap:this.splatParams.display.color_scale,min_dbm:this.splatParams.display.min_dbm,max_dbm:this.splatParams.display.max_dbm};console.log("Payload:",t),this.simulationState="running";const r=await fetch("/predict",{method:"POST",headers:{"Content-Type":"application/json"},body:JSON.stringify(t)});if(!r.ok){this.simulationState="failed";const u=await r.text();throw new Error(`Failed to start prediction: ${u}`)}const i=(await r.json()).task_id;console.log(`Prediction started with task ID: ${i}`);const e=30,c=async()=>{const u=await fetch(`/status/${i}?wait=${e}`);if(!u.ok)throw new Error("Failed to fetch task status.");const s=await u.json();if(console.log("Task status:",s),s.status==="completed"){this.simulationState="completed",console.log("Simulation completed! Adding result to the map...");const a=await fetch(`/result/${i}`);if(a.ok){const f=await a.arrayBuffer(),d=await mq(f);this.localSites.push({params:yq(this.splatParams),taskId:i,raster:d}),this.currentMarker.removeFrom(this.map),this.splatParams.transmitter.name=await qC.randanimalSync(),this.redrawSites()}else throw new Error("Failed to fetch simulation result.")}else s.status==="failed"?this.simulationState="failed":c()};c()}catch(t){console.error("Error:",t)}}}}),_q={novalidate:""},vq={class:"row g-2"},bq={class:"col-12"},wq={class:"row g-2"},xq={class:"col-6"},kq={class:"col-6"},Sq={class:"row g-2 mt-2"},Eq={class:"col-6"},Cq={class:"col-6"},Aq={class:"row g-2 mt-2"},Mq={class:"col-6"},Tq={class:"col-6"},Pq=Pp({__name:"Transmitter",setup(t){const r=Bp(),n=r.splatParams.transmitter,i=()=>{!isNaN(n.tx_lat)&&!isNaN(n.tx_lon)?r.map.setView([n.tx_lat,n.tx_lon],r.map.getZoom()):alert("Please enter valid Latitude and Longitude values.")};let e=new Fg(document.createElement("input"),{trigger:"manual"});const c=()=>{e.show(),r.map.once("click",function(u){let{lat:s,lng:a}=u.latlng;a=((a+180)%360+360)%360-180,r.setTxCoords(s.toFixed(6),a.toFixed(6)),r.currentMarker&&r.map.removeLayer(r.currentMarker),r.currentMarker=jl.marker([s,a],{icon:$P}).addTo(r.map),e.hide()})};return EM(()=>{e=new Fg(document.getElementById("setWithMap"),{trigger:"manual"}),r.initMap()}),(u,s)=>(Xd(),$d("form",_q,[Kt("div",vq,[Kt("div",bq,[s[7]||(s[7]=Kt("label",{for:"name",class:"form-label"},"Site name",-1)),ei(Kt("input",{"onUpdate:modelValue":s[0]||(s[0]=a=>tn(n).name=a),class:"form-control form-control-sm",id:"name",required:"","data-bs-toggle":"tooltip",title:"Site Name"},null,512),[[Ri,tn(n).name]])])]),Kt("div",wq,[Kt("div",xq,[s[8]||(s[8]=Kt("label",{for:"tx_lat",class:"form-label"},"Latitude (degrees)",-1)),ei(Kt("input",{"onUpdate:modelValue":s[1]||(s[1]=a=>tn(n).tx_lat=a),type:"number",class:"form-control form-control-sm",id:"tx_lat",required:"",min:"-90",max:"90",step:"0.000001","data-bs-toggle":"tooltip",title:"Transmitter latitude in degrees (-90 to 90)."},null,512),[[Ri,tn(n).tx_lat]]),s[9]||(s[9]=Kt("div",{class:"invalid-feedback"},"Please enter a valid latitude (-90 to 90).",-1))]),Kt("div",kq,[s[10]||(s[10]=Kt("label",{for:"tx_lon",class:"form-label"},"Longitude (degrees)",-1)),ei(Kt("input",{"onUpdate:modelValue":s[2]||(s[2]=a=>tn(n).tx_lon=a),type:"number",class:"form-control form-control-sm",id:"tx_lon",required:"",min:"-180",max:"180",step:"0.000001","data-bs-toggle":"tooltip",title:"Transmitter longitude in degrees (-180 to 180)."},null,512),[[Ri,tn(n).tx_lon]]),s[11]||(s[11]=Kt("div",{class:"invalid-feedback"},"Please enter a valid longitude (-180 to 180).",-1))])]),Kt("div",Sq,[Kt("div",Eq,[s[12]||(s[12]=Kt("label",{for:"tx_power",class:"form-label"},"Power (W)",-1)),ei(Kt("input",{"onUpdate:modelValue":s[3]||(s[3]=a=>tn(n).tx_power=a),type:"number",class:"form-control form-control-sm",id:"tx_power",required:"",min:"0",step:"0.1","data-bs-toggle":"tooltip",title:"Transmitter power in watts (>0)."},null,512),[[Ri,tn(n).tx_power]]),s[13]||(s[13]=Kt("div",{class:"invalid-feedback"},"Power must be a positive number.",-1))]),Kt("div",Cq,[s[14]||(s[14]=Kt("label",{for:"frequency",class:"form-label"},"Frequency (MHz)",-1)),ei(Kt("input",{"onUpdate:modelValue":s[4]||(s[4]=a=>tn(n).tx_freq=a),type:"number",class:"form-control form-control-sm",id:"tx_freq",required:"",min:"20",max:"20000",step:"0.1","data-bs-toggle":"tooltip",title:"Transmitter frequency in MHz (20 to 20,000)."},null,512),[[Ri,tn(n).tx_freq]]),s[15]||(s[15]=Kt("div",{class:"invalid-feedback"},"Frequency must be a positive number.",-1))])]),Kt("div",Aq,[Kt("div",Mq,[s[16]||(s[16]=Kt("label",{for:"tx_height",class:"form-label"},"Height AGL (m)",-1)),ei(Kt("input",{"onUpdate:modelValue":s[5]||(s[5]=a=>tn(n).tx_height=a),type:"number",class:"form-control form-control-sm",id:"tx_height",required:"",min:"1.0",step:"0.1","data-bs-toggle":"tooltip",title:"Transmitter height above ground in meters (>= 1.0)."},null,512),[[Ri,tn(n).tx_height]]),s[17]||(s[17]=Kt("div",{class:"invalid-feedback"},"Height must be a positive number.",-1))]),Kt("div",Tq,[s[18]||(s[18]=Kt("label",{for:"tx_gain",class:"form-label"},"Antenna Gain (dB)",-1)),ei(Kt("input",{"onUpdate:modelValue":s[6]||(s[6]=a=>tn(n).tx_gain=a),type:"number",class:"form-control form-control-sm",id:"tx_gain",required:"",min:"0",step:"0.1"},null,512),[[Ri,tn(n).tx_gain]]),s[19]||(s[19]=Kt("div",{class:"invalid-feedback"},"Gain must be a positive number.",-1))])]),Kt("div",{class:"mt-3 d-flex gap-2"},[Kt("button",{onClick:c,type:"button",id:"setWithMap",class:"btn btn-primary btn-sm","data-bs-toggle":"popover","data-bs-trigger":"manual","data-bs-placement":"left",title:"Set Coordinates","data-bs-content":"",content:"Click on the map to set the transmitter location."}," Set with Map "),Kt("button",{onClick:i,type:"button",class:"btn btn-secondary btn-sm"},"Center map on transmitter")])]))}}),Oq={novalidate:""},Iq={class:"row g-2"},Lq={class:"col-6"},Dq={class:"col-6"},Rq={class:"row g-2 mt-2"},Nq={class:"col-6"},Bq={class:"col-6"},Fq=Pp({__name:"Receiver",setup(t){const r=Bp().splatParams.receiver;return(n,i)=>(Xd(),$d("form",Oq,[Kt("div",Iq,[Kt("div",Lq,[i[4]||(i[4]=Kt("label",{for:"rx_sensitivity",class:"form-label"},"Sensitivity (dBm)",-1)),ei(Kt("input",{"onUpdate:modelValue":i[0]||(i[0]=e=>tn(r).rx_sensitivity=e),type:"number",class:"form-control form-control-sm",id:"rx_sensitivity",required:"",step:"1",min:"-150",max:"-30"},null,512),[[Ri,tn(r).rx_sensitivity]]),i[5]||(i[5]=Kt("div",{class:"invalid-feedback"},"Please enter a valid sensitivity.",-1))]),Kt("div",Dq,[i[6]||(i[6]=Kt("label",{for:"rx_height",class:"form-label"},"Height AGL (m)",-1)),ei(Kt("input",{"onUpdate:modelValue":i[1]||(i[1]=e=>tn(r).rx_height=e),type:"number",class:"form-control form-control-sm",id:"rx_height",required:"",min:"0",step:"0.1"},null,512),[[Ri,tn(r).rx_height]]),i[7]||(i[7]=Kt("div",{class:"invalid-feedback"},"Height must be a positive number.",-1))])]),Kt("div",Rq,[Kt("div",Nq,[i[8]||(i[8]=Kt("label",{for:"rx_gain",class:"form-label"},"Antenna Gain (dB)",-1)),ei(Kt("input",{"onUpdate:modelValue":i[2]||(i[2]=e=>tn(r).rx_gain=e),type:"number",class:"form-control form-control-sm",id:"rx_gain",required:"",min:"0",max:"30",step:"0.1"},null,512),[[Ri,tn(r).rx_gain]]),i[9]||(i[9]=Kt("div",{class:"invalid-feedback"},"Gain must be a positive number.",-1))]),Kt("div",Bq,[i[10]||(i[10]=Kt("label",{for:"rx_loss",class:"form-label"},"Cable Loss (dB)",-1)),ei(Kt("input",{"onUpdate:modelValue":i[3]||(i[3]=e=>tn(r).rx_loss=e),type:"number",class:"form-control form-control-sm",id:"rx_loss",required:"",min:"0",max:"100",step:"0.1"},null,512),[[Ri,tn(r).rx_loss]]),i[11]||(i[11]=Kt("div",{class:"invalid-feedback"},"Loss must be a positive number.",-1))])])]))}}),jq={novalidate:""},Uq={class:"row g-2"},Gq={class:"col-6"},zq={class:"col-6"},Hq={class:"col-6"},Wq={class:"col-6"},qq={class:"col-6"},Vq={class:"col-6"},Zq=Pp({__name:"Environment",setup(t){const r=Bp().splatParams.environment;return(n,i)=>(Xd(),$d("form",jq,[Kt("div",Uq,[Kt("div",Gq,[i[7]||(i[7]=Kt("label",{for:"radio_climate",class:"form-label"},"Radio Climate",-1)),ei(Kt("select",{"onUpdate:modelValue":i[0]||(i[0]=e=>tn(r).radio_climate=e),id:"radio_climate",class:"form-select form-select-sm",required:""},i[6]||(i[6]=[VM('<option value="equatorial">Equatorial</option><option value="continental_subtropical">Continental Subtropical</option><option value="maritime_subtropical">Maritime Subtropical</option><option value="desert">Desert</option><option value="continental_temperate">Continental Temperate</option><option value="maritime_temperate_land">Maritime Temperate (Land)</option><option value="maritime_temperate_sea">Maritime Temperate (Sea)</option>',7)]),512),[[V4,tn(r).radio_climate]]),i[8]||(i[8]=Kt("div",{class:"invalid-feedback"},"Please select a radio climate.",-1))]),Kt("div",zq,[i[10]||(i[10]=Kt("label",{for:"polarization",class:"form-label"},"Polarization",-1)),ei(Kt("select",{"onUpdate:modelValue":i[1]||(i[1]=e=>tn(r).polarization=e),id:"polarization",class:"form-select form-select-sm",required:""},i[9]||(i[9]=[Kt("option",{value:"horizontal"},"Horizontal",-1),Kt("option",{value:"vertical"},"Vertical",-1)]),512),[[V4,tn(r).polarization]]),i[11]||(i[11]=Kt("div",{class:"invalid-feedback"},"Please select a polarization type.",-1))]),Kt("div",Hq,[i[12]||(i[12]=Kt("label",{for:"clutter_height",class:"form-label"},[Nb("Clutter Height "),Kt("br"),Nb("(m)")],-1)),ei(Kt("input",{"onUpdate:modelValue":i[2]||(i[2]=e=>tn(r).clutter_height=e),type:"number",class:"form-control form-control-sm",id:"clutter_height",required:"",min:"0",step:"0.1"},null,512),[[Ri,tn(r).clutter_height]]),i[13]||(i[13]=Kt("div",{class:"invalid-feedback"},"Height must be >= 0 (default: 1.0).",-1))]),Kt("div",Wq,[i[14]||(i[14]=Kt("label",{for:"ground_dielectric",class:"form-label"},"Ground Dielectric (V/m)",-1)),ei(Kt("input",{"onUpdate:modelValue":i[3]||(i[3]=e=>tn(r).ground_dielectric=e),type:"number",class:"form-control form-control-sm",id:"ground_dielectric",required:"",min:"1",step:"0.1"},null,512),[[Ri,tn(r).ground_dielectric]]),i[15]||(i[15]=Kt("div",{class:"invalid-feedback"},"Dielectric constant must be >= 1 (default: 15.0).",-1))]),Kt("div",qq,[i[16]||(i[16]=Kt("label",{for:"ground_conductivity",class:"form-label"},"Ground Conductivity (S/m)",-1)),ei(Kt("input",{"onUpdate:modelValue":i[4]||(i[4]=e=>tn(r).ground_conductivity=e),type:"number",class:"form-control form-control-sm",id:"ground_conductivity",required:"",min:"0",step:"0.001"},null,512),[[Ri,tn(r).ground_conductivity]]),i[17]||(i[17]=Kt("div",{class:"invalid-feedback"},"Conductivity must be >= 0 (default: 0.005).",-1))]),Kt("div",Vq,[i[18]||(i[18]=Kt("label",{for:"atmosphere_bending",class:"form-label"},"Atmospheric Bending (N-units)",-1)),ei(Kt("input",{"onUpdate:modelValue":i[5]||(i[5]=e=>tn(r).atmosphere_bending=e),type:"number",class:"form-control form-control-sm",id:"atmosphere_bending",required:"",min:"0",step:"0.1"},null,512),[[Ri,tn(r).atmosphere_bending]]),i[19]||(i[19]=Kt("div",{class:"invalid-feedback"},"Bending constant must be >= 0 (default: 301.0).",-1))])])]))}}),Kq={novalidate:""},Qq={class:"row g-2"},Yq={class:"col-6"},Xq={class:"col-6"},$q={class:"row g-2 mt-2"},Jq={class:"col-6"},tV=Pp({__name:"Simulation",setup(t){const r=Bp().splatParams.simulation;return(n,i)=>(Xd(),$d("form",Kq,[Kt("div",Qq,[Kt("div",Yq,[i[3]||(i[3]=Kt("label",{for:"situation_fraction",class:"form-label"},"Situation Fraction (%)",-1)),ei(Kt("input",{"onUpdate:modelValue":i[0]||(i[0]=e=>tn(r).situation_fraction=e),type:"number",class:"form-control form-control-sm",id:"situation_fraction",required:"",min:"1",max:"100",step:"0.1"},null,512),[[Ri,tn(r).situation_fraction]]),i[4]||(i[4]=Kt("div",{class:"invalid-feedback"},"Percentage must be between 1 and 100 (default: 50).",-1))]),Kt("div",Xq,[i[5]||(i[5]=Kt("label",{for:"time_fraction",class:"form-label"},"Time Fraction (%)",-1)),ei(Kt("input",{"onUpdate:modelValue":i[1]||(i[1]=e=>tn(r).time_fraction=e),type:"number",class:"form-control form-control-sm",id:"time_fraction",required:"",min:"1",max:"100",step:"0.1"},null,512),[[Ri,tn(r).time_fraction]]),i[6]||(i[6]=Kt("div",{class:"invalid-feedback"},"Percentage must be between 1 and 100 (default: 90).",-1))])]),Kt("div",$q,[Kt("div",Jq,[i[7]||(i[7]=Kt("label",{for:"simulation_extent",class:"form-label"},"Max Range (km)",-1)),ei(Kt("input",{"onUpdate:modelValue":i[2]||(i[2]=e=>tn(r).simulation_extent=e),type:"number",class:"form-control form-control-sm",id:"simulation_extent",required:"",min:"1",max:"100",step:"1"},null,512),[[Ri,tn(r).simulation_extent]]),i[8]||(i[8]=Kt("div",{class:"invalid-feedback"},"Radius must be a positive number (default: 30 km).",-1))])])]))}}),eV={novalidate:""},nV={class:"row g-2"},rV={class:"col-6"},iV={class:"col-6"},oV={class:"row g-2 mt-2"},sV={class:"col-6"},aV={class:"col-6"},lV={class:"mt-3 text-center"},cV=["src"],uV={class:"d-flex justify-content-between mt-1"},hV={class:"badge bg-primary"},fV={class:"badge bg-primary"},dV=Pp({__name:"Display",setup(t){const r=Bp().splatParams.display;return(n,i)=>(Xd(),$d("form",eV,[Kt("div",nV,[Kt("div",rV,[i[4]||(i[4]=Kt("label",{for:"min_dbm",class:"form-label"},"Minimum dBm",-1)),ei(Kt("input",{"onUpdate:modelValue":i[0]||(i[0]=e=>tn(r).min_dbm=e),type:"number",class:"form-control form-control-sm",id:"min_dbm",required:"",step:"0.1"},null,512),[[Ri,tn(r).min_dbm]]),i[5]||(i[5]=Kt("div",{class:"invalid-feedback"},"Minimum dBm must be provided (default: -130.0).",-1))]),Kt("div",iV,[i[6]||(i[6]=Kt("label",{for:"max_dbm",class:"form-label"},"Maximum dBm",-1)),ei(Kt("input",{"onUpdate:modelValue":i[1]||(i[1]=e=>tn(r).max_dbm=e),type:"number",class:"form-control form-control-sm",id:"max_dbm",required:"",step:"0.1"},null,512),[[Ri,tn(r).max_dbm]]),i[7]||(i[7]=Kt("div",{class:"invalid-feedback"},"Maximum dBm must be provided (default: -30.0).",-1))])]),Kt("div",oV,[Kt("div",sV,[i[9]||(i[9]=Kt("label",{for:"color_scale",class:"form-label"},"Color Scale",-1)),ei(Kt("select",{"onUpdate:modelValue":i[2]||(i[2]=e=>tn(r).color_scale=e),id:"color_scale",class:"form-select form-select-sm",required:""},i[8]||(i[8]=[VM('<option value="plasma" selected>Plasma</option><option value="CMRmap">CMR map</option><option value="cool">Cool</option><option value="viridis">Viridis</option><option value="turbo">Turbo</option><option value="jet">Jet</option>',6)]),512),[[V4,tn(r).color_scale]]),i[10]||(i[10]=Kt("div",{class:"invalid-feedback"},"Please select a color scale.",-1))]),Kt("div",aV,[i[11]||(i[11]=Kt("label",{for:"overlay_transparency",class:"form-label"},"Transparency (%)",-1)),ei(Kt("input",{"onUpdate:modelValue":i[3]||(i[3]=e=>tn(r).overlay_transparency=e),type:"number",class:"form-control form-control-sm",id:"overlay_transparency",required:"",min:"0",max:"100",step:"1"},null,512),[[Ri,tn(r).overlay_transparency]]),i[12]||(i[12]=Kt("div",{class:"invalid-feedback"},"Transparency must be between 0 and 100 (default: 50).",-1))])]),Kt("div",lV,[Kt("div",null,[Kt("img",{src:`/colormaps/${tn(r).color_scale}.png`,alt:"Colorbar",width:"256",height:"30",style:{border:"1px solid #ccc",display:"block",margin:"0 auto"}},null,8,cV)]),Kt("div",uV,[Kt("span",hV,Pg(tn(r).min_dbm)+" dBm",1),Kt("span",fV,Pg(tn(r).max_dbm)+" dBm",1)])])]))}}),pV={class:"navbar navbar-dark bg-dark fixed-top"},mV={class:"container-fluid"},gV={class:"offcanvas offcanvas-end text-bg-dark show",tabindex:"-1",id:"offcanvasDarkNavbar","aria-labelledby":"offcanvasDarkNavbarLabel","data-bs-backdrop":"false"},yV={class:"offcanvas-body"},_V={class:"navbar-nav"},vV={class:"nav-item dropdown"},bV={class:"dropdown-menu dropdown-menu-dark p-3 show"},wV={class:"nav-item dropdown"},xV={class:"dropdown-menu dropdown-menu-dark p-3"},kV={class:"nav-item dropdown"},SV={class:"dropdown-menu dropdown-menu-dark p-3"},EV={class:"nav-item dropdown"},CV={class:"dropdown-menu dropdown-menu-dark p-3"},AV={class:"nav-item dropdown"},MV={class:"dropdown-menu dropdown-menu-dark p-3 show"},TV={class:"mt-3 d-flex gap-2"},PV=["disabled"],OV={class:"button-text"},IV={class:"list-group mt-3"},LV=["onClick"],DV={id:"map",ref:"map"},RV=Pp({__name:"App",setup(t){const r=Bp(),n=()=>r.simulationState==="running"?"Running":r.simulationState==="failed"?"Failed":"Run Simulation";return(i,e)=>(Xd(),$d("div",null,[Kt("nav",pV,[Kt("div",mV,[e[7]||(e[7]=Kt("a",{class:"navbar-brand",href:"#"},[Kt("img",{src:ML,alt:"Meshtastic Logo",width:"30",height:"30",class:"d-inline"}),Nb(" Meshtastic Site Planner ")],-1)),e[8]||(e[8]=Kt("button",{class:"navbar-toggler",type:"button","data-bs-toggle":"offcanvas","data-bs-target":"#offcanvasDarkNavbar","aria-controls":"offcanvasDarkNavbar","aria-label":"Toggle navigation"},[Kt("span",{class:"navbar-toggler-icon"})],-1)),Kt("div",gV,[e[6]||(e[6]=Kt("div",{class:"offcanvas-header"},[Kt("h5",{class:"offcanvas-title",id:"offcanvasDarkNavbarLabel"},"Site Parameters"),Kt("button",{type:"button",class:"btn-close btn-close-white","data-bs-dismiss":"offcanvas","aria-label":"Close"})],-1)),Kt("div",yV,[Kt("ul",_V,[Kt("li",vV,[e[1]||(e[1]=Kt("a",{class:"nav-link dropdown-toggle",href:"#",role:"button","data-bs-toggle":"dropdown","data-bs-auto-close":"outside","aria-expanded":"true"},"Site / Transmitter",-1)),Kt("ul",bV,[Kt("li",null,[Ul(Pq)])])]),Kt("li",wV,[e[2]||(e[2]=Kt("a",{class:"nav-link dropdown-toggle",href:"#",role:"button","data-bs-toggle":"dropdown","data-bs-auto-close":"outside","aria-expanded":"false"},"Receiver",-1)),Kt("ul",xV,[Kt("li",null,[Ul(Fq)])])]),Kt("li",kV,[e[3]||(e[3]=Kt("a",{class:"nav-link dropdown-toggle",href:"#",role:"button","data-bs-toggle":"dropdown","data-bs-auto-close":"outside","aria-expanded":"false"},"Environment",-1)),Kt("ul",SV,[Kt("li",null,[Ul(Zq)])])]),Kt("li",EV,[e[4]||(e[4]=Kt("a",{class:"nav-link dropdown-toggle",href:"#",role:"button","data-bs-toggle":"dropdown","data-bs-auto-close":"outside","aria-expanded":"false"},"Simulation Options",-1)),Kt("ul",CV,[Kt("li",null,[Ul(tV)])])]),Kt("li",AV,[e[5]||(e[5]=Kt("a",{class:"nav-link dropdown-toggle",href:"#",role:"button","data-bs-toggle":"dropdown","data-bs-auto-close":"outside","aria-expanded":"true"}," Display ",-1)),Kt("ul",MV,[Kt("li",null,[Ul(dV)])])])]),Kt("div",TV,[Kt("button",{disabled:tn(r).simulationState==="running",onClick:e[0]||(e[0]=(...c)=>tn(r).runSimulation&&tn(r).runSimulation(...c)),type:"button",class:"btn btn-success btn-sm",id:"runSimulation"},[Kt("span",{class:e2([{"d-none":tn(r).simulationState!=="running"},"spinner-border spinner-border-sm"]),role:"status","aria-hidden":"true"},null,2),Kt("span",OV,Pg(n()),1)],8,PV)]),Kt("ul",IV,[(Xd(!0),$d(lh,null,fI(tn(r).$state.localSites,(c,u)=>(Xd(),$d("li",{class:"list-group-item d-flex justify-content-between align-items-center",key:c.taskId},[Kt("span",null,Pg(c.params.transmitter.name),1),Kt("button",{type:"button",onClick:s=>tn(r).removeSite(u),class:"btn-close","aria-label":"Close"},null,8,LV)]))),128))])])])])]),Kt("div",DV,null,512)]))}}),JP=EL(RV);JP.use(NF());JP.mount("#app")});export default NV();
@@ -0,0 +1,168 @@
+"""
+SPLAT! Queue Worker
+
+Runs coverage prediction jobs queued in Redis by API instances started with SPLAT_QUEUE_MODE=redis, and
+stores the results in the result store and the task statuses in Redis, where the API serves them from.
+
+Each worker process keeps a heartbeat in Redis while it runs, and requeues the jobs of workers whose heartbeat
+expired (see `RedisJobQueue.reap`), so a job whose worker was killed mid-run is picked up by another worker.
+Batches (see /predict/batch) also enqueue a job preparing the terrain their predictions share.
+
+Usage:
+    python -m app.worker
+
+Configuration is read from environment variables shared with the API, see app.config.
+"""
+
+import logging
+import os
+import signal
+import socket
+import threading
+from typing import Optional
+from uuid import uuid4
+
+import redis
+
+from app import config
+from app.services.coalesce import JobCoalescer
+from app.services.job_queue import QueuedJob, RedisJobQueue
+from app.services.result_cache import ResultCache, request_digest
+from app.services.result_store import ResultStore
+from app.services.splat import Splat
+from app.services.tasks import run_splat
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Delay before retrying after a Redis error, doubled on each consecutive error up to the maximum.
+REDIS_RETRY_DELAY = 1
+REDIS_RETRY_MAX_DELAY = 30
+
+
+def work(
+    splat_service: Splat,
+    redis_client: redis.StrictRedis,
+    result_store: ResultStore,
+    job_queue: RedisJobQueue,
+    result_cache: Optional[ResultCache],
+    coalescer: JobCoalescer,
+    worker_id: str,
+    stop: threading.Event,
+):
+    """Pull and execute jobs until `stop` is set, backing off while Redis is unavailable."""
+    delay = REDIS_RETRY_DELAY
+    while not stop.is_set():
+        try:
+            job = job_queue.dequeue(worker_id, timeout=5)
+        except redis.RedisError as e:
+            logger.warning(f"Failed to take a job from '{job_queue.queue_name}', retrying in {delay}s: {e}")
+            stop.wait(delay)
+            delay = min(delay * 2, REDIS_RETRY_MAX_DELAY)
+            continue
+
+        delay = REDIS_RETRY_DELAY
+        if job is None:
+            continue
+
+        if job.terrain is not None:
+            try:
+                splat_service.prepare_terrain(job.terrain)
+            except RuntimeError as e:
+                # each prediction of the batch prepares (and fails on) its own terrain anyway
+                logger.error(f"Failed to prepare the terrain of batch {job.task_id}: {e}")
+            finally:
+                ack(job_queue, worker_id, job, stop)
+            continue
+
+        # the claim of the job's request now lives as long as this worker's heartbeat
+        coalescer.keep_alive(request_digest(job.request), job.task_id)
+        try:
+            run_splat(splat_service, redis_client, result_store, job.task_id, job.request, result_cache, coalescer)
+        except Exception:
+            # run_splat has already recorded the failure in Redis
+            pass
+        finally:
+            ack(job_queue, worker_id, job, stop)
+
+
+def ack(job_queue: RedisJobQueue, worker_id: str, job: QueuedJob, stop: threading.Event):
+    """
+    Acknowledge a finished job, retrying while Redis is unavailable.
+
+    Gives up once `stop` is set: the job then stays in the processing list of this worker, and is requeued
+    (and run again) once the heartbeat of the worker expired.
+    """
+    delay = REDIS_RETRY_DELAY
+    while True:
+        try:
+            job_queue.ack(worker_id, job)
+            return
+        except redis.RedisError as e:
+            if stop.is_set():
+                logger.error(f"Failed to acknowledge task {job.task_id}, it will run again: {e}")
+                return
+            logger.warning(f"Failed to acknowledge task {job.task_id}, retrying in {delay}s: {e}")
+            stop.wait(delay)
+            delay = min(delay * 2, REDIS_RETRY_MAX_DELAY)
+
+
+def keep_alive(job_queue: RedisJobQueue, worker_id: str, stopped: threading.Event):
+    """Refresh the heartbeat of this worker and requeue the jobs of dead workers until `stopped` is set."""
+    while True:
+        try:
+            job_queue.heartbeat(worker_id)
+            job_queue.reap()
+        except redis.RedisError as e:
+            logger.warning(f"Failed to refresh the heartbeat of worker {worker_id}: {e}")
+        if stopped.wait(job_queue.heartbeat_ttl / 3):
+            break
+
+
+def main():
+    redis_client = config.create_redis_client()
+    splat_service = config.create_splat_service()
+    result_store = config.create_result_store()
+    job_queue = RedisJobQueue(redis_client)
+    result_cache = config.create_result_cache(redis_client, result_store)
+    coalescer = JobCoalescer(redis_client)
+    concurrency = config.SPLAT_WORKER_CONCURRENCY
+    worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+
+    stop = threading.Event()
+    stopped = threading.Event()
+
+    def handle_signal(signum, frame):
+        logger.info(f"Received signal {signum}, finishing running jobs.")
+        stop.set()
+
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+
+    threads = [
+        threading.Thread(
+            target=work,
+            args=(splat_service, redis_client, result_store, job_queue, result_cache, coalescer, worker_id, stop),
+            name=f"splat-worker-{i}",
+        )
+        for i in range(concurrency)
+    ]
+    # the heartbeat must be alive before the first job is taken, and until the last one is acknowledged
+    job_queue.heartbeat(worker_id)
+    heartbeat = threading.Thread(target=keep_alive, args=(job_queue, worker_id, stopped), name="splat-heartbeat")
+    heartbeat.start()
+    for thread in threads:
+        thread.start()
+
+    logger.info(
+        f"SPLAT! worker {worker_id} started with {concurrency} thread(s) on queue '{job_queue.queue_name}'."
+    )
+    for thread in threads:
+        thread.join()
+    stopped.set()
+    heartbeat.join()
+    logger.info("SPLAT! worker stopped.")
+
+
+if __name__ == "__main__":
+    main()
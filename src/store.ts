@@ -214,11 +214,12 @@ const useStore = defineStore('store', {
     
         console.log(`Prediction started with task ID: ${taskId}`);
 
-        // Poll for task status and result
-        const pollInterval = 1000; // 1 seconds
+        // Long-poll for task status and result: the server holds each request until the task
+        // finishes or the wait expires
+        const pollWait = 30; // seconds
         const pollStatus = async () => {
           const statusResponse = await fetch(
-            `/status/${taskId}`,
+            `/status/${taskId}?wait=${pollWait}`,
           );
           if (!statusResponse.ok) {
             throw new Error("Failed to fetch task status.");
@@ -255,7 +256,7 @@ const useStore = defineStore('store', {
           else if (statusData.status === "failed") {
             this.simulationState = 'failed';
           } else {
-            setTimeout(pollStatus, pollInterval); // Retry after interval
+            pollStatus(); // Wait again
           }
         };
     
@@ -0,0 +1,36 @@
+import itertools
+import stat
+
+import pytest
+
+from app.services.splat import Splat
+
+
+@pytest.fixture
+def splat_path(tmp_path):
+    """Directory of placeholder SPLAT! binaries, for tests that do not run SPLAT! itself."""
+    directory = tmp_path / "splat"
+    directory.mkdir()
+    for binary in ("splat", "splat-hd", "srtm2sdf", "srtm2sdf-hd"):
+        path = directory / binary
+        path.write_text("#!/bin/sh\nexit 1\n")
+        path.chmod(path.stat().st_mode | stat.S_IXUSR)
+    return str(directory)
+
+
+@pytest.fixture
+def make_splat(tmp_path, splat_path):
+    """Factory of Splat services whose caches and stores live in the test's temporary directory."""
+    counter = itertools.count()
+
+    def make(**kwargs) -> Splat:
+        directory = tmp_path / f"service{next(counter)}"
+        return Splat(
+            splat_path,
+            cache_dir=str(directory / "tiles"),
+            tile_index_dir=str(directory / "index"),
+            sdf_store_dir=str(directory / "sdf"),
+            path_loss_cache_dir=str(directory / "path_loss"),
+            **kwargs,
+        )
+    return make
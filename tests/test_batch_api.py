@@ -0,0 +1,117 @@
+import importlib
+import json
+import sys
+import threading
+import time
+
+import pytest
+
+from app import config
+from app.services.job_queue import RedisJobQueue
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+
+@pytest.fixture
+def api(monkeypatch, tmp_path):
+    """The API in redis queue mode against a fake Redis, and a synchronous client of the same Redis."""
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(config, "SPLAT_QUEUE_MODE", "redis")
+    monkeypatch.setattr(config, "SPLAT_MAX_QUEUE", 0)
+    monkeypatch.setattr(config, "SPLAT_RESULT_STORE_DIR", str(tmp_path / "results"))
+    monkeypatch.setattr(config, "SPLAT_NETWORK_STORE_DIR", str(tmp_path / "networks"))
+    monkeypatch.setattr(config, "create_redis_client", lambda: fakeredis.FakeStrictRedis(server=server))
+    monkeypatch.setattr(config, "create_async_redis_client", lambda: fakeredis.aioredis.FakeRedis(server=server))
+
+    sys.modules.pop("app.main", None)
+    main = importlib.import_module("app.main")
+    with TestClient(main.app) as client:
+        yield main, client, fakeredis.FakeStrictRedis(server=server)
+    sys.modules.pop("app.main", None)
+
+
+def transmitter(lat, lon):
+    return {"lat": lat, "lon": lon}
+
+
+def test_batch_enqueues_its_terrain_ahead_of_its_tasks(api):
+    main, client, redis_client = api
+    response = client.post(
+        "/predict/batch",
+        json={"transmitters": [transmitter(45.5, -75.5), transmitter(45.6, -75.4)], "settings": {"tx_power": 30}},
+    )
+    assert response.status_code == 200
+    task_ids = [site["task_id"] for site in response.json()["sites"]]
+
+    queue = RedisJobQueue(redis_client)
+    terrain = queue.dequeue("w1", timeout=1)
+    assert terrain.task_id == response.json()["batch_id"]
+    assert [request.lat for request in terrain.terrain] == [45.5, 45.6]
+    assert [queue.dequeue("w1", timeout=1).task_id for _ in task_ids] == task_ids
+
+
+def test_batch_with_an_oversized_composite_is_rejected(api, monkeypatch):
+    main, client, redis_client = api
+    response = client.post(
+        "/predict/batch",
+        json={"transmitters": [transmitter(45.5, -75.5), transmitter(-35.5, 150.5)], "settings": {"tx_power": 30}},
+    )
+    assert response.status_code == 422
+    assert redis_client.llen("splat:jobs") == 0
+
+
+def completed_batch(main, redis_client, sites):
+    """Record a batch of completed tasks with signal levels, like the workers do."""
+    for task_id in sites:
+        main.result_store.put(f"{task_id}:signal", b"signal", 3600)
+        redis_client.set(f"{task_id}:status", "completed")
+        redis_client.set(f"{task_id}:signal", f"{task_id}:signal")
+
+    output = {
+        "colormap": "rainbow", "min_dbm": -130.0, "max_dbm": -30.0,
+        "output_profile": "geotiff", "compression": "lzw", "predictor": False,
+    }
+    batch = {"sites": [{"name": None, "task_id": task_id} for task_id in sites], "output": output}
+    redis_client.setex("b1:batch", 3600, json.dumps(batch))
+
+
+def test_composite_is_built_once(api, monkeypatch):
+    main, client, redis_client = api
+    completed_batch(main, redis_client, ["t1", "t2"])
+
+    builds = []
+
+    def render(signal_geotiffs, *args):
+        builds.append(args[-1])
+        time.sleep(0.3)
+        return {"coverage": b"coverage", "signal": b"signal", "best_server": b"best"}
+
+    monkeypatch.setattr(main, "render_composite", render)
+    responses = []
+    threads = [
+        threading.Thread(target=lambda: responses.append(client.get("/batch/b1/composite"))) for _ in range(3)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+
+    assert [response.status_code for response in responses] == [200, 200, 200]
+    assert {response.content for response in responses} == {b"coverage"}
+    assert builds == [config.SPLAT_COMPOSITE_MAX_PIXELS]
+
+
+def test_oversized_composite_is_refused(api, monkeypatch):
+    main, client, redis_client = api
+    completed_batch(main, redis_client, ["t1"])
+
+    def render(*args):
+        raise ValueError("A composite of 20000x20000 pixels exceeds the limit of 100000000 pixels.")
+
+    monkeypatch.setattr(main, "render_composite", render)
+    response = client.get("/batch/b1/composite")
+    assert response.status_code == 422
+    assert redis_client.get("b1:composite:lock") is None
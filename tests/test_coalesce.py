@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+
+from app.services import coalesce
+from app.services.coalesce import AsyncJobCoalescer, JobCoalescer
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture
+def redis_client():
+    return fakeredis.FakeStrictRedis()
+
+
+def test_identical_requests_attach_to_the_running_task(redis_client):
+    coalescer = JobCoalescer(redis_client)
+    redis_client.set("t1:status", "processing")
+    assert coalescer.claim("digest", "t1") is None
+    assert coalescer.claim("digest", "t2") == "t1"
+
+
+@pytest.mark.parametrize("status", [b"failed", None])
+def test_stale_claims_are_taken_over(redis_client, status):
+    coalescer = JobCoalescer(redis_client)
+    coalescer.claim("digest", "t1")
+    if status is not None:
+        redis_client.set("t1:status", status)
+
+    assert coalescer.claim("digest", "t2") is None
+    assert redis_client.get("inflight:digest") == b"t2"
+    # the failed task no longer releases the claim of its successor
+    coalescer.release("digest", "t1")
+    assert redis_client.get("inflight:digest") == b"t2"
+    coalescer.release("digest", "t2")
+    assert redis_client.get("inflight:digest") is None
+
+
+def test_takeover_loses_to_a_newer_claim(redis_client):
+    coalescer = JobCoalescer(redis_client)
+    redis_client.set("inflight:digest", "t3")
+    # another request took the stale claim of t1 over first
+    assert not coalescer._takeover_script(keys=["inflight:digest"], args=["t1", "t2", 60])
+    assert redis_client.get("inflight:digest") == b"t3"
+
+
+class HeartbeatStopped(Exception):
+    pass
+
+
+def test_heartbeat_shortens_held_claims_and_drops_lost_ones(monkeypatch, redis_client):
+    coalescer = JobCoalescer(redis_client, ttl=3600, heartbeat_ttl=30)
+    coalescer.claim("digest", "t1")
+    coalescer.claim("other", "t9")
+    assert redis_client.ttl("inflight:digest") > 30
+
+    monkeypatch.setattr(coalescer, "_heartbeat", object())  # no background thread
+    coalescer.keep_alive("digest", "t1")
+    coalescer.keep_alive("other", "t9")
+    redis_client.set("inflight:other", "t10")  # taken over meanwhile
+
+    sleeps = []
+
+    def sleep(seconds):
+        if sleeps:
+            raise HeartbeatStopped
+        sleeps.append(seconds)
+
+    monkeypatch.setattr(coalesce.time, "sleep", sleep)
+    with pytest.raises(HeartbeatStopped):
+        coalescer._beat()
+
+    assert sleeps == [10]
+    assert 0 < redis_client.ttl("inflight:digest") <= 30
+    assert redis_client.ttl("inflight:other") == -1
+    assert coalescer._held == {("digest", "t1")}
+
+    coalescer.release("digest", "t1")
+    assert coalescer._held == set()
+
+
+def test_async_claims_coalesce_with_sync_releases():
+    server = fakeredis.FakeServer()
+    coalescer = AsyncJobCoalescer(fakeredis.aioredis.FakeRedis(server=server))
+    sync_coalescer = JobCoalescer(fakeredis.FakeStrictRedis(server=server))
+
+    async def scenario():
+        await coalescer.redis_client.set("t1:status", "processing")
+        assert await coalescer.claim("digest", "t1") is None
+        assert await coalescer.claim("digest", "t2") == "t1"
+        sync_coalescer.release("digest", "t1")
+        assert await coalescer.claim("digest", "t3") is None
+
+    asyncio.run(scenario())
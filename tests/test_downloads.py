@@ -0,0 +1,63 @@
+import pytest
+
+from app.services.downloads import etag_matches, parse_range
+
+ETAG = '"0123456789abcdef"'
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (None, False),
+        ("", False),
+        ("*", True),
+        (" * ", True),
+        (ETAG, True),
+        (f"W/{ETAG}", True),
+        (f'"other", {ETAG}', True),
+        (f'"other",W/{ETAG} ', True),
+        ('"other"', False),
+        ("0123456789abcdef", False),
+    ],
+)
+def test_etag_matches(header, expected):
+    assert etag_matches(ETAG, header) is expected
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("bytes=0-0", (0, 0)),
+        ("bytes=0-1023", (0, 1023)),
+        ("bytes=100-", (100, 9999)),
+        ("bytes=9000-20000", (9000, 9999)),
+        ("bytes=-512", (9488, 9999)),
+        ("bytes=-20000", (0, 9999)),
+        ("Bytes = 10 - 19", (10, 19)),
+        # unsupported ranges are ignored and the full content is sent
+        ("bytes=0-9,20-29", None),
+        ("items=0-9", None),
+        ("bytes=", None),
+        ("bytes=-", None),
+        ("bytes=a-9", None),
+        ("bytes=5", None),
+    ],
+)
+def test_parse_range(header, expected):
+    assert parse_range(header, 10000) == expected
+
+
+@pytest.mark.parametrize(
+    "header, size",
+    [
+        ("bytes=10000-", 10000),
+        ("bytes=10000-10010", 10000),
+        ("bytes=20-10", 10000),
+        ("bytes=-0", 10000),
+        ("bytes=-1", 0),
+        ("bytes=0-", 0),
+    ],
+)
+def test_parse_range_unsatisfiable(header, size):
+    with pytest.raises(ValueError):
+        parse_range(header, size)
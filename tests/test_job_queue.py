@@ -0,0 +1,152 @@
+import threading
+
+import pytest
+import redis
+
+from app import worker
+from app.models.CoveragePredictionRequest import CoveragePredictionRequest
+from app.services.job_queue import RedisJobQueue
+from app.services.worker_pool import QueueFullError
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture
+def redis_client():
+    return fakeredis.FakeStrictRedis()
+
+
+@pytest.fixture
+def request_payload():
+    return CoveragePredictionRequest(lat=45, lon=-75, tx_height=10, tx_power=30)
+
+
+def test_dequeues_in_order_and_acks(redis_client, request_payload):
+    queue = RedisJobQueue(redis_client)
+    for index in range(3):
+        queue.enqueue(f"t{index}", request_payload)
+
+    jobs = [queue.dequeue("w1", timeout=1) for _ in range(2)]
+    assert [job.task_id for job in jobs] == ["t0", "t1"]
+    assert jobs[0].request == request_payload
+    assert queue.depth() == 1
+
+    queue.ack("w1", jobs[0])
+    assert redis_client.lrange(queue._processing_key("w1"), 0, -1) == [jobs[1].payload]
+
+
+def test_enqueue_fails_when_full(redis_client, request_payload):
+    queue = RedisJobQueue(redis_client, max_queue=1)
+    queue.enqueue("t0", request_payload)
+    with pytest.raises(QueueFullError):
+        queue.enqueue("t1", request_payload)
+
+
+def test_reap_requeues_the_jobs_of_dead_workers_only(redis_client, request_payload):
+    queue = RedisJobQueue(redis_client)
+    for index in range(3):
+        queue.enqueue(f"t{index}", request_payload)
+    queue.heartbeat("dead")
+    queue.heartbeat("alive")
+    queue.dequeue("dead", timeout=1)
+    queue.dequeue("dead", timeout=1)
+    queue.dequeue("alive", timeout=1)
+
+    assert queue.reap() == 0
+    redis_client.delete(queue._heartbeat_key("dead"))  # expired
+    assert queue.reap() == 2
+    assert redis_client.smembers(queue._workers_key) == {b"alive"}
+
+    # the oldest job is picked up first again
+    assert [queue.dequeue("alive", timeout=1).task_id for _ in range(2)] == ["t0", "t1"]
+
+
+@pytest.mark.parametrize("payload", [b"not json", b'{"task_id": "t0"}', b'{"task_id": "t0", "request": {"lat": 91}}'])
+def test_undecodable_jobs_are_dead_lettered(redis_client, request_payload, payload):
+    queue = RedisJobQueue(redis_client)
+    redis_client.lpush(queue.queue_name, payload)
+    queue.enqueue("t1", request_payload)
+
+    assert queue.dequeue("w1", timeout=1) is None
+    assert redis_client.lrange(queue._dead_key, 0, -1) == [payload]
+    assert redis_client.llen(queue._processing_key("w1")) == 0
+    assert queue.dequeue("w1", timeout=1).task_id == "t1"
+
+
+class FlakyQueue:
+    """Job queue failing the first call to each method, then stopping the worker once the job is acknowledged."""
+
+    queue_name = "flaky"
+
+    def __init__(self, job, stop):
+        self.job = job
+        self.stop = stop
+        self.failed = set()
+        self.acked = []
+
+    def fail_once(self, method):
+        if method not in self.failed:
+            self.failed.add(method)
+            raise redis.ConnectionError("Connection refused")
+
+    def dequeue(self, worker_id, timeout):
+        self.fail_once("dequeue")
+        return None if self.acked else self.job
+
+    def ack(self, worker_id, job):
+        self.fail_once("ack")
+        self.acked.append(job)
+        self.stop.set()
+
+
+class StubCoalescer:
+    def keep_alive(self, digest, task_id):
+        pass
+
+
+def test_worker_survives_redis_errors(monkeypatch, redis_client, request_payload):
+    monkeypatch.setattr(worker, "REDIS_RETRY_DELAY", 0.01)
+    ran = []
+    monkeypatch.setattr(worker, "run_splat", lambda *args: ran.append(args[3]))
+
+    real_queue = RedisJobQueue(redis_client)
+    real_queue.enqueue("t0", request_payload)
+    job = real_queue.dequeue("w1", timeout=1)
+
+    stop = threading.Event()
+    queue = FlakyQueue(job, stop)
+    thread = threading.Thread(
+        target=worker.work, args=(None, redis_client, None, queue, None, StubCoalescer(), "w1", stop)
+    )
+    thread.start()
+    thread.join(5)
+
+    assert not thread.is_alive()
+    assert ran == ["t0"]
+    assert queue.acked == [job]
+
+
+class StubSplat:
+    def __init__(self, stop):
+        self.stop = stop
+        self.prepared = []
+
+    def prepare_terrain(self, requests):
+        self.prepared.append(requests)
+        self.stop.set()
+        raise RuntimeError("S3 is down")
+
+
+def test_worker_prepares_the_terrain_of_a_batch(monkeypatch, redis_client, request_payload):
+    monkeypatch.setattr(worker, "run_splat", lambda *args: pytest.fail("a terrain job is not a prediction"))
+    queue = RedisJobQueue(redis_client)
+    queue.heartbeat("w1")
+    queue.enqueue_terrain("b1", [request_payload, request_payload])
+
+    stop = threading.Event()
+    splat_service = StubSplat(stop)
+    worker.work(splat_service, redis_client, None, queue, None, StubCoalescer(), "w1", stop)
+
+    assert splat_service.prepared == [[request_payload, request_payload]]
+    # acknowledged even though the preparation failed
+    assert redis_client.llen(queue._processing_key("w1")) == 0
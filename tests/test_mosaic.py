@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+from rasterio.transform import Affine
+
+from app.models.CoveragePredictionRequest import CoveragePredictionRequest
+from app.services.mosaic import (
+    BEST_SERVER_NODATA,
+    SPLAT_PIXELS_PER_DEGREE,
+    composite_signals,
+    estimate_composite_pixels,
+)
+from app.services.splat import SIGNAL_NODATA
+
+RES = 1.0 / SPLAT_PIXELS_PER_DEGREE
+
+
+def site(west_px, north_px, levels):
+    """Signal levels on the global SPLAT! grid, `west_px` and `north_px` pixels from 180°W / 90°N."""
+    levels = np.asarray(levels, dtype=np.int16)
+    return levels, Affine(RES, 0.0, -180.0 + west_px * RES, 0.0, -RES, 90.0 - north_px * RES)
+
+
+def test_composite_keeps_the_strongest_site():
+    first = site(0, 0, [[-60, -70, SIGNAL_NODATA]])
+    second = site(1, 0, [[-65, -80], [-90, SIGNAL_NODATA]])
+
+    signal, best_server, transform = composite_signals([first, None, second])
+    assert transform == first[1]
+    assert signal.tolist() == [[-60, -65, -80], [SIGNAL_NODATA, -90, SIGNAL_NODATA]]
+    assert best_server.tolist() == [[0, 2, 2], [BEST_SERVER_NODATA, 2, BEST_SERVER_NODATA]]
+
+
+def test_composite_rejects_grids_over_the_limit():
+    sites = [site(0, 0, [[-60]]), site(99, 49, [[-60]])]
+    assert composite_signals(sites, max_pixels=100 * 50)[0].shape == (50, 100)
+    with pytest.raises(ValueError):
+        composite_signals(sites, max_pixels=100 * 50 - 1)
+
+
+def test_composite_needs_a_site():
+    with pytest.raises(ValueError):
+        composite_signals([None])
+
+
+def request(lat, lon, radius=50000):
+    return CoveragePredictionRequest(lat=lat, lon=lon, tx_power=30, radius=radius)
+
+
+def test_estimate_covers_whole_terrain_tiles():
+    # 50 km around 45.5N 75.5W stays within 45-46N, 77-74W
+    assert estimate_composite_pixels([request(45.5, -75.5)]) == 1 * 3 * SPLAT_PIXELS_PER_DEGREE ** 2
+    # radii are capped at 100 km like predictions
+    assert estimate_composite_pixels([request(0.5, 0.5, 500000)]) == 3 * 3 * SPLAT_PIXELS_PER_DEGREE ** 2
+
+
+def test_estimate_grows_with_the_spread_of_the_sites():
+    near = estimate_composite_pixels([request(45.5, -75.5), request(45.55, -75.45)])
+    far = estimate_composite_pixels([request(45.5, -75.5), request(35.5, -120.5)])
+    assert near == estimate_composite_pixels([request(45.5, -75.5)])
+    assert far == (46 - 35) * (-74 + 122) * SPLAT_PIXELS_PER_DEGREE ** 2
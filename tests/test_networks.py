@@ -0,0 +1,91 @@
+import asyncio
+
+import numpy as np
+import pytest
+from rasterio.transform import Affine
+
+from app.services.mosaic import SPLAT_PIXELS_PER_DEGREE, NetworkMosaic, composite_signals
+from app.services.networks import NetworkRegistry
+from app.services.result_store import FilesystemResultStore
+from app.services.splat import SIGNAL_NODATA, Splat
+
+fakeredis = pytest.importorskip("fakeredis")
+
+RES = 1.0 / SPLAT_PIXELS_PER_DEGREE
+
+
+def site(west_px, north_px, shape, level):
+    """Uniform signal levels on the global SPLAT! grid, `west_px` and `north_px` pixels from 180°W / 90°N."""
+    signal = np.full(shape, level, dtype=np.int16)
+    signal[0, 0] = SIGNAL_NODATA
+    return signal, Affine(RES, 0.0, -180.0 + west_px * RES, 0.0, -RES, 90.0 - north_px * RES)
+
+
+SITES = [site(0, 0, (4, 5), -70), site(3, 2, (5, 4), -60), site(2, 1, (3, 3), -80)]
+
+
+def test_mosaic_matches_the_composite_of_its_sites():
+    mosaic = NetworkMosaic(RES, RES)
+    for index, (signal, transform) in enumerate(SITES):
+        assert mosaic.add(signal, transform, task_id=f"t{index}")[0] == index
+
+    signal, best_server, transform = composite_signals(SITES)
+    assert mosaic.transform == transform
+    assert np.array_equal(mosaic.signal, signal)
+    assert np.array_equal(mosaic.best_server, best_server)
+
+    mosaic.remove(1, lambda slot: SITES[slot])
+    signal, best_server, _ = composite_signals([SITES[0], None, SITES[2]])
+    assert np.array_equal(mosaic.signal[:signal.shape[0], :signal.shape[1]], signal)
+    assert np.array_equal(mosaic.best_server[:signal.shape[0], :signal.shape[1]], best_server)
+    # the slot is reused
+    assert mosaic.add(*SITES[1])[0] == 1
+
+
+def test_mosaic_refuses_to_grow_beyond_the_limit():
+    mosaic = NetworkMosaic(RES, RES)
+    mosaic.add(*SITES[0], max_pixels=20)
+    before = mosaic.copy()
+
+    with pytest.raises(ValueError):
+        mosaic.add(*SITES[1], max_pixels=(7 * 7) - 1)
+    assert mosaic.sites == before.sites
+    assert np.array_equal(mosaic.signal, before.signal)
+    assert mosaic.add(*SITES[1], max_pixels=7 * 7)[0] == 1
+
+
+def test_mosaic_copy_is_independent():
+    mosaic = NetworkMosaic(RES, RES)
+    mosaic.add(*SITES[0])
+    copy = mosaic.copy()
+    copy.add(*SITES[1])
+    copy.remove(0, lambda slot: SITES[slot])
+
+    assert list(mosaic.sites) == [0]
+    assert mosaic.signal.shape == (4, 5)
+    assert np.array_equal(mosaic.signal, composite_signals([SITES[0]])[0])
+
+
+def test_registry_changes_leave_the_cached_version_intact(tmp_path):
+    redis_client = fakeredis.aioredis.FakeRedis()
+    result_store = FilesystemResultStore(str(tmp_path / "results"))
+    registry = NetworkRegistry(redis_client, result_store, FilesystemResultStore(str(tmp_path / "networks")))
+
+    async def scenario():
+        for index, (signal, transform) in enumerate(SITES[:2]):
+            result_store.put(f"t{index}:signal", Splat._create_signal_geotiff(signal, transform), 3600)
+            await redis_client.set(f"t{index}:status", "completed")
+            await redis_client.set(f"t{index}:signal", f"t{index}:signal")
+
+        network_id = await registry.create({})
+        await registry.add_site(network_id, "t0")
+        first = registry._load_mosaic(network_id, 1)
+        signal = first.signal.copy()
+
+        await registry.add_site(network_id, "t1")
+        # a layer of version 1 being rendered meanwhile still sees version 1
+        assert list(first.sites) == [0]
+        assert np.array_equal(first.signal, signal)
+        assert list(registry._load_mosaic(network_id, 2).sites) == [0, 1]
+
+    asyncio.run(scenario())
@@ -0,0 +1,88 @@
+import numpy as np
+import rasterio
+from rasterio.transform import Affine
+
+from app.models.CoveragePredictionRequest import CoveragePredictionRequest
+from app.services.splat import SIGNAL_NODATA, Splat
+
+TRANSFORM = Affine(1 / 1200, 0.0, -75.5, 0.0, -1 / 1200, 45.5)
+
+
+def request(**kwargs):
+    return CoveragePredictionRequest(**{"lat": 45.4, "lon": -75.4, "tx_height": 10, "tx_power": 30, **kwargs})
+
+
+def drawn_signal(prediction):
+    """Signal levels drawn by SPLAT! for a prediction: every .dcf level above its threshold, and no coverage."""
+    levels, _ = Splat._splat_dcf_levels(prediction.colormap, prediction.min_dbm, prediction.max_dbm)
+    drawn = np.append(np.sort(levels[levels >= prediction.signal_threshold]), SIGNAL_NODATA)
+    return np.resize(drawn, (8, 10)).astype(np.int16)
+
+
+def derived_signal(splat_service, prediction):
+    derived = splat_service._derive_from_path_loss_grid(prediction)
+    if derived is None:
+        return None
+    with rasterio.MemoryFile(derived[1]) as memfile, memfile.open() as src:
+        assert src.transform == TRANSFORM
+        return src.read(1)
+
+
+def test_path_loss_key_ignores_the_rendering_and_power_fields():
+    key = Splat.path_loss_key(request())
+    assert Splat.path_loss_key(request(colormap="viridis", tx_power=40, signal_threshold=-90)) == key
+    assert Splat.path_loss_key(request(radius=2000)) != key
+    assert Splat.path_loss_key(request(tx_height=20)) != key
+
+
+def test_other_colormaps_are_derived_from_the_grid(make_splat):
+    splat_service = make_splat()
+    original = request()
+    signal = drawn_signal(original)
+    splat_service._store_path_loss_grid(original, signal, TRANSFORM)
+
+    assert np.array_equal(derived_signal(splat_service, request(colormap="viridis", output_profile="cog")), signal)
+
+
+def test_higher_thresholds_on_a_drawn_level_are_derived(make_splat):
+    splat_service = make_splat()
+    original = request()
+    signal = drawn_signal(original)
+    splat_service._store_path_loss_grid(original, signal, TRANSFORM)
+
+    levels, _ = Splat._splat_dcf_levels(original.colormap, original.min_dbm, original.max_dbm)
+    threshold = float(levels[10])
+    expected = np.where(signal >= threshold, signal, SIGNAL_NODATA)
+    assert np.array_equal(derived_signal(splat_service, request(signal_threshold=threshold)), expected)
+
+
+def test_inexact_derivations_run_splat_again(make_splat):
+    splat_service = make_splat()
+    original = request()
+    splat_service._store_path_loss_grid(original, drawn_signal(original), TRANSFORM)
+
+    # the grid does not reach a lower threshold
+    assert derived_signal(splat_service, request(signal_threshold=-120)) is None
+    # a threshold between two drawn levels
+    assert derived_signal(splat_service, request(signal_threshold=-75.5)) is None
+    # another ERP moves the contours off the drawn levels
+    assert derived_signal(splat_service, request(tx_gain=2.5)) is None
+    # a different path loss
+    assert derived_signal(splat_service, request(radius=2000)) is None
+
+
+def test_a_grid_reaching_further_replaces_the_cached_one(make_splat):
+    splat_service = make_splat()
+    splat_service._store_path_loss_grid(request(), drawn_signal(request()), TRANSFORM)
+    lower = request(signal_threshold=-120)
+    splat_service._store_path_loss_grid(lower, drawn_signal(lower), TRANSFORM)
+
+    signal = drawn_signal(lower)
+    assert np.array_equal(derived_signal(splat_service, lower), signal)
+    assert np.array_equal(derived_signal(splat_service, request()), np.where(signal >= -100, signal, SIGNAL_NODATA))
+
+
+def test_disabled_cache_derives_nothing(make_splat):
+    splat_service = make_splat(path_loss_cache_size_gb=0)
+    splat_service._store_path_loss_grid(request(), drawn_signal(request()), TRANSFORM)
+    assert splat_service._derive_from_path_loss_grid(request()) is None
@@ -0,0 +1,56 @@
+import io
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from app.services import splat
+from app.services.splat import SIGNAL_NODATA, Splat
+
+
+def painted_ppm(width, height, colormap, min_dbm, max_dbm, ascii=False):
+    """PPM painted with the .dcf colors in vertical bands, like SPLAT! does, and the levels that were painted."""
+    levels, rgb_colors = Splat._splat_dcf_levels(colormap, min_dbm, max_dbm)
+    columns = np.arange(width) % (len(levels) + 2)
+
+    rgb = np.full((height, width, 3), 255, dtype=np.uint8)  # no coverage
+    expected = np.full((height, width), SIGNAL_NODATA, dtype=np.int16)
+    for index, (level, color) in enumerate(zip(levels, rgb_colors)):
+        rgb[:, columns == index] = color
+        expected[:, columns == index] = level
+    rgb[:, columns == len(levels)] = 0  # site markers
+    rgb[0, 0], expected[0, 0] = (1, 2, 3), SIGNAL_NODATA  # annotations in another color
+
+    if ascii:
+        header = f"P3\n{width} {height}\n255\n".encode()
+        return header + " ".join(map(str, rgb.ravel())).encode(), expected
+    with io.BytesIO() as buffer:
+        Image.fromarray(rgb).save(buffer, format="PPM")
+        return buffer.getvalue(), expected
+
+
+@pytest.mark.parametrize("chunk", [7, 4096])
+@pytest.mark.parametrize("colormap", ["rainbow", "viridis", "gray"])
+def test_decode_recovers_the_painted_levels(monkeypatch, chunk, colormap):
+    monkeypatch.setattr(splat, "PPM_DECODE_CHUNK", chunk)
+    ppm_bytes, expected = painted_ppm(101, 37, colormap, -130.0, -30.0)
+
+    signal, indexes = Splat._decode_splat_ppm(ppm_bytes, colormap, -130.0, -30.0)
+    assert signal.dtype == np.int16 and signal.shape == (37, 101)
+    assert np.array_equal(signal, expected)
+    assert np.array_equal(indexes, Splat._palette_indexes(expected, -130.0, -30.0))
+    assert indexes[0, 0] == 255
+
+
+def test_decode_ascii_ppm():
+    ppm_bytes, expected = painted_ppm(40, 3, "rainbow", -120.0, -60.0, ascii=True)
+    signal, _ = Splat._decode_splat_ppm(ppm_bytes, "rainbow", -120.0, -60.0)
+    assert np.array_equal(signal, expected)
+
+
+def test_dcf_colors_are_distinct():
+    for colormap in ("gray", "binary", "rainbow"):
+        _, rgb_colors = Splat._splat_dcf_levels(colormap, -130.0, -30.0)
+        colors = {tuple(color) for color in rgb_colors}
+        assert len(colors) == 32
+        assert not colors & {(0, 0, 0), (255, 255, 255)}
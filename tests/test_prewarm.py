@@ -0,0 +1,79 @@
+import pytest
+
+from app.services.prewarm import prewarm, sites_from_request_log, tiles_for_sites, tiles_in_bbox
+
+
+def test_tiles_in_bbox():
+    assert tiles_in_bbox(44.5, -76.5, 45.5, -75.5) == [
+        "N44W077.hgt.gz", "N44W076.hgt.gz", "N45W077.hgt.gz", "N45W076.hgt.gz"
+    ]
+    # a box within a single tile
+    assert tiles_in_bbox(45.1, -75.9, 45.2, -75.8) == ["N45W076.hgt.gz"]
+
+
+def test_tiles_in_bbox_across_the_antimeridian():
+    assert tiles_in_bbox(-17.5, 179.5, -16.5, -179.5) == [
+        "S18W180.hgt.gz", "S18E179.hgt.gz", "S17W180.hgt.gz", "S17E179.hgt.gz"
+    ]
+
+
+@pytest.mark.parametrize("bbox", [(46, -76, 45, -75), (float("nan"), -76, 45, -75), (44, -76, float("inf"), -75)])
+def test_tiles_in_bbox_rejects_invalid_boxes(bbox):
+    with pytest.raises(ValueError):
+        tiles_in_bbox(*bbox)
+
+
+def test_tiles_for_sites_are_deduplicated():
+    tiles = tiles_for_sites([(45.5, -75.5, 1000), (45.6, -75.4, 1000)])
+    assert tiles == ["N45W076.hgt.gz"]
+
+
+def test_sites_from_request_log():
+    lines = [
+        'DEBUG Coverage prediction request: {"lat": 45.4, "lon": -75.7, "radius": 20000, "tx_power": 30}\n',
+        '{"lat": 43.6, "lon": -79.4}\n',
+        '{"lat": 45.4, "lon": -75.7, "radius": 20000}\n',  # duplicate
+        '{"lat": NaN, "lon": -75.7}\n',
+        '{"lat": 45.4}\n',
+        "INFO Started worker\n",
+        "{not json\n",
+    ]
+    assert sites_from_request_log(lines) == [(45.4, -75.7, 20000.0), (43.6, -79.4, 1000.0)]
+
+
+class StubTerrainCache:
+    def __init__(self, cached):
+        self.cached = cached
+
+    def has_sdf(self, sdf_name):
+        return sdf_name in self.cached
+
+
+class StubTileIndex:
+    def get_many(self, tile_names):
+        return dict.fromkeys(tile_names)
+
+
+class StubSplat:
+    def __init__(self, cached=(), failing=()):
+        self.terrain_cache = StubTerrainCache(set(cached))
+        self.tile_index = StubTileIndex()
+        self.failing = set(failing)
+        self.prepared = []
+
+    def _prepare_terrain_tile(self, tile_name, high_resolution, availability):
+        if tile_name in self.failing:
+            raise RuntimeError("S3 is down")
+        self.prepared.append(tile_name)
+
+
+def test_prewarm_counts_each_outcome():
+    splat_service = StubSplat(cached={"45:46:75:76.sdf"}, failing={"N44W076.hgt.gz"})
+    updates = []
+    counters = prewarm(
+        splat_service, ["N45W076.hgt.gz", "N44W076.hgt.gz", "N43W076.hgt.gz"], workers=2, progress=updates.append
+    )
+
+    assert counters == {"total": 3, "done": 3, "cached": 1, "prepared": 1, "failed": 1}
+    assert splat_service.prepared == ["N43W076.hgt.gz"]
+    assert sorted(update["done"] for update in updates) == [1, 2, 3]
@@ -0,0 +1,101 @@
+import pytest
+
+from app.services.result_cache import PRUNE_BATCH, ResultCache
+from app.services.result_store import FilesystemResultStore
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture
+def redis_client():
+    return fakeredis.FakeStrictRedis()
+
+
+@pytest.fixture
+def result_store(tmp_path):
+    return FilesystemResultStore(str(tmp_path / "results"))
+
+
+def complete_task(redis_client, result_store, task_id, size):
+    """Store the result of a task like `run_splat`, returning its size."""
+    result_store.put(task_id, b"x" * (size - 1), 3600)
+    result_store.put(f"{task_id}:signal", b"s", 3600)
+    redis_client.set(task_id, task_id)
+    redis_client.set(f"{task_id}:signal", f"{task_id}:signal")
+    return size
+
+
+def usage(cache):
+    stats = cache.stats()
+    return stats["entries"], stats["bytes"]
+
+
+def test_put_counts_each_digest_once(redis_client):
+    cache = ResultCache(redis_client, max_bytes=1000)
+    cache.put("a", "t1", 300)
+    cache.put("b", "t2", 200)
+    assert usage(cache) == (2, 500)
+
+    # caching a digest again replaces its size
+    cache.put("a", "t3", 100)
+    assert usage(cache) == (2, 300)
+
+
+def test_expired_entries_stop_counting(redis_client):
+    cache = ResultCache(redis_client, max_bytes=1000)
+    cache.put("a", "t1", 300)
+    redis_client.delete(cache._entry_key("a"))  # expired after its TTL
+
+    cache.put("b", "t2", 100)
+    assert usage(cache) == (1, 100)
+
+    # and a digest cached again after its entry expired is not counted twice
+    redis_client.delete(cache._entry_key("b"))
+    cache.put("b", "t3", 200)
+    assert usage(cache) == (1, 200)
+
+
+def test_prune_only_checks_the_oldest_entries(redis_client):
+    cache = ResultCache(redis_client, max_bytes=10000)
+    digests = [f"d{index:03d}" for index in range(PRUNE_BATCH + 2)]
+    for index, digest in enumerate(digests):
+        redis_client.zadd(cache._index_key, {digest: index})
+        redis_client.hset(cache._sizes_key, digest, 10)
+        redis_client.set(cache._entry_key(digest), f"t{index}")
+    redis_client.set(cache._bytes_key, 10 * len(digests))
+
+    redis_client.delete(cache._entry_key(digests[0]), cache._entry_key(digests[-1]))
+    cache._prune()
+    # the expired entry beyond the batch still counts until it reaches the oldest end
+    assert usage(cache) == (len(digests) - 1, 10 * (len(digests) - 1))
+    assert redis_client.zscore(cache._index_key, digests[-1]) is not None
+
+
+def test_evicts_least_recently_used(redis_client, result_store):
+    cache = ResultCache(redis_client, result_store, max_bytes=1000)
+    for index in range(3):
+        cache.put(f"d{index}", f"t{index}", complete_task(redis_client, result_store, f"t{index}", 300))
+    assert cache.get("d0") == "t0"
+
+    cache.put("d3", "t3", complete_task(redis_client, result_store, "t3", 300))
+    assert usage(cache) == (3, 900)
+    assert cache.get("d1") is None
+    assert {cache.get(digest) for digest in ("d0", "d2", "d3")} == {"t0", "t2", "t3"}
+
+
+def test_oversized_results_are_not_cached(redis_client):
+    cache = ResultCache(redis_client, max_bytes=1000)
+    cache.put("a", "t1", 1001)
+    assert usage(cache) == (0, 0)
+
+
+def test_get_drops_entries_whose_result_is_gone(redis_client, result_store):
+    cache = ResultCache(redis_client, result_store, max_bytes=1000)
+    cache.put("a", "t1", complete_task(redis_client, result_store, "t1", 300))
+    cache.put("b", "t2", complete_task(redis_client, result_store, "t2", 200))
+    assert cache.get("a") == "t1"
+
+    result_store.cache.delete("t1:signal")  # evicted by the result store
+    assert cache.get("a") is None
+    assert usage(cache) == (1, 200)
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
@@ -0,0 +1,110 @@
+import gzip
+import os
+import random
+
+import numpy as np
+import pytest
+import rasterio
+from rasterio.enums import Resampling
+
+from app.services import sdf
+from app.services.splat import Splat
+
+SPLAT_PATH = os.environ.get("SPLAT_PATH", "/app/splat")
+
+
+def synthetic_elevation(size, seed=0):
+    """Smooth terrain with sea, voids and negative elevations, as found in real tiles."""
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:size, 0:size] / size
+    elevation = 1500 * np.sin(3 * x) * np.cos(5 * y) + rng.normal(0, 40, (size, size))
+    elevation = elevation.round().astype(np.int16)
+    elevation[rng.random((size, size)) < 0.01] = sdf.HGT_NODATA
+    elevation[: size // 10, : size // 10] = sdf.HGT_NODATA
+    return elevation
+
+
+def hgt_gz(elevation):
+    return gzip.compress(elevation.astype(">i2").tobytes())
+
+
+def reference_sdf(elevation, tile_name):
+    """Line by line port of srtm2sdf's writer."""
+    ippd = elevation.shape[0] - 1
+    lines = [f"{value}\n" for value in sdf._tile_bounds(tile_name)]
+    last = 0
+    for y in range(ippd, 0, -1):
+        for x in range(ippd - 1, -1, -1):
+            value = int(elevation[y][x])
+            if value > 0:
+                last = value
+            lines.append(f"{last if value < 0 else value}\n")
+    return "".join(lines).encode("ascii")
+
+
+@pytest.mark.parametrize("tile_name", ["N35W120.hgt.gz", "S34E151.hgt.gz", "N00W001.hgt.gz"])
+def test_elevation_to_sdf_matches_srtm2sdf_writer(tile_name):
+    elevation = synthetic_elevation(121)
+    assert sdf.elevation_to_sdf(elevation, tile_name) == reference_sdf(elevation, tile_name)
+
+
+@pytest.mark.parametrize("tile_name", ["N35W120.hgt.gz", "S34E151.hgt.gz"])
+def test_header_matches_sdf_filename(tile_name):
+    max_west, min_north, min_west, max_north = sdf._tile_bounds(tile_name)
+    assert Splat._hgt_filename_to_sdf_filename(tile_name) == f"{min_north}:{max_north}:{min_west}:{max_west}.sdf"
+
+
+def test_downsample_average_matches_rasterio(tmp_path):
+    elevation = synthetic_elevation(3601)
+    hgt_path = tmp_path / "N35W120.hgt"
+    hgt_path.write_bytes(elevation.astype(">i2").tobytes())
+    with rasterio.open(hgt_path) as src:
+        expected = src.read(1, out_shape=(1201, 1201), resampling=Resampling.average)
+
+    np.testing.assert_array_equal(sdf.downsample_average(elevation, 1201), expected)
+
+
+def test_streamed_decompression():
+    elevation = synthetic_elevation(1201)
+    tile = hgt_gz(elevation)
+
+    decompressor = sdf.HgtDecompressor("N35W120.hgt.gz")
+    position = 0
+    chunks = random.Random(0)
+    while position < len(tile):
+        size = chunks.randint(1, 4096)
+        decompressor.feed(tile[position:position + size])
+        position += size
+    assert decompressor.complete
+    np.testing.assert_array_equal(decompressor.elevation(), elevation)
+    np.testing.assert_array_equal(sdf.hgt_elevation(tile, "N35W120.hgt.gz"), elevation)
+
+
+def test_truncated_and_malformed_tiles():
+    tile = hgt_gz(synthetic_elevation(1201))
+    with pytest.raises(ValueError, match="truncated"):
+        sdf.hgt_elevation(tile[: len(tile) // 2], "N35W120.hgt.gz")
+    with pytest.raises(ValueError, match="1201x1201"):
+        sdf.hgt_elevation(hgt_gz(synthetic_elevation(100)), "N35W120.hgt.gz")
+    with pytest.raises(ValueError, match="high-resolution"):
+        sdf.hgt_to_sdf(tile, "N35W120.hgt.gz", high_resolution=True)
+
+
+def test_sea_level_sdf():
+    data = sdf.sea_level_sdf("N35W120.hgt.gz")
+    lines = data.split(b"\n")
+    assert lines[:4] == [b"120", b"35", b"119", b"36"]
+    assert len(lines) == 4 + 1200 * 1200 + 1
+    assert set(lines[4:-1]) == {b"0"}
+
+
+@pytest.mark.parametrize("high_resolution", [False, True])
+def test_hgt_to_sdf_matches_srtm2sdf(high_resolution):
+    binary = os.path.join(SPLAT_PATH, "srtm2sdf-hd" if high_resolution else "srtm2sdf")
+    if not os.access(binary, os.X_OK):
+        pytest.skip(f"{binary} is not available, set SPLAT_PATH to the directory of the SPLAT! binaries")
+
+    tile_name = "N35W120.hgt.gz"
+    tile = hgt_gz(synthetic_elevation(3601))
+    expected = sdf.srtm2sdf_hgt_to_sdf(tile, tile_name, binary, high_resolution)
+    assert sdf.diff_sdf(expected, sdf.hgt_to_sdf(tile, tile_name, high_resolution)) is None
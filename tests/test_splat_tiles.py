@@ -0,0 +1,72 @@
+import math
+
+import pytest
+
+from app.services.splat import EARTH_RADIUS, Splat
+
+
+def required_tiles(lat, lon, radius):
+    return {tile[0] for tile in Splat._calculate_required_terrain_tiles(lat, lon, radius)}
+
+
+def tile_of(lat, lon):
+    lon = (lon + 180) % 360 - 180
+    lat_tile, lon_tile = math.floor(lat), math.floor(lon)
+    return f"{'N' if lat_tile >= 0 else 'S'}{abs(lat_tile):02d}{'E' if lon_tile >= 0 else 'W'}{abs(lon_tile):03d}.hgt.gz"
+
+
+def destination(lat, lon, bearing, distance):
+    """Point at `distance` meters from (lat, lon) along the initial `bearing` (radians), on SPLAT!'s sphere."""
+    delta = distance / EARTH_RADIUS
+    lat1, lon1 = math.radians(lat), math.radians(lon)
+    lat2 = math.asin(math.sin(lat1) * math.cos(delta) + math.cos(lat1) * math.sin(delta) * math.cos(bearing))
+    lon2 = lon1 + math.atan2(
+        math.sin(bearing) * math.sin(delta) * math.cos(lat1), math.cos(delta) - math.sin(lat1) * math.sin(lat2)
+    )
+    return math.degrees(lat2), math.degrees(lon2)
+
+
+def test_tile_names():
+    tiles = Splat._calculate_required_terrain_tiles(35.5, -119.5, 1000)
+    # SPLAT! counts longitudes westwards
+    assert tiles == [("N35W120.hgt.gz", "35:36:119:120.sdf", "35:36:119:120-hd.sdf", None)]
+
+    tiles = Splat._calculate_required_terrain_tiles(-33.5, 151.5, 1000)
+    assert [tile[0] for tile in tiles] == ["S34E151.hgt.gz"]
+
+
+def test_small_radius_near_a_corner():
+    assert required_tiles(45.999, -75.001, 1000) == {
+        "N45W076.hgt.gz", "N45W075.hgt.gz", "N46W076.hgt.gz", "N46W075.hgt.gz"
+    }
+    assert required_tiles(45.5, -75.5, 1000) == {"N45W076.hgt.gz"}
+
+
+def test_tiles_of_the_bounding_box_outside_the_circle_are_skipped():
+    # the circle spans 43.7°N to 47.3°N and 78.1°W to 72.9°W, but does not reach the corners of that box
+    tiles = required_tiles(45.5, -75.5, 200000)
+    assert {"N43W076.hgt.gz", "N47W076.hgt.gz", "N45W079.hgt.gz", "N45W073.hgt.gz"} <= tiles
+    assert not {"N43W079.hgt.gz", "N43W073.hgt.gz", "N47W079.hgt.gz", "N47W073.hgt.gz"} & tiles
+    assert len(tiles) < 5 * 7
+
+
+def test_antimeridian():
+    tiles = required_tiles(10.5, 179.99, 5000)
+    assert tiles == {"N10E179.hgt.gz", "N10W180.hgt.gz"}
+
+
+def test_pole():
+    tiles = required_tiles(89.9, 0, 20000)
+    assert {tile_of(89.5, lon) for lon in range(-180, 180)} <= tiles
+
+
+@pytest.mark.parametrize(
+    "lat, lon, radius",
+    [(45.42, -75.69, 50000), (45.42, -75.69, 100000), (-0.3, 36.9, 100000), (64.1, -21.9, 100000), (10.0, 179.7, 80000)],
+)
+def test_every_point_of_the_circle_is_covered(lat, lon, radius):
+    tiles = required_tiles(lat, lon, radius)
+    for step in range(1, 11):
+        for bearing in range(0, 360, 2):
+            point = destination(lat, lon, math.radians(bearing), radius * step / 10)
+            assert tile_of(*point) in tiles
@@ -0,0 +1,95 @@
+import threading
+import time
+
+import pytest
+
+from app.services.terrain_cache import TerrainCache
+
+
+@pytest.fixture
+def terrain_cache(tmp_path):
+    return TerrainCache(str(tmp_path / "tiles"), lock_timeout=5)
+
+
+def test_lock_is_exclusive_across_threads(terrain_cache):
+    holding, inside = [], []
+
+    def prepare():
+        with terrain_cache.lock("35:36:119:120.sdf"):
+            holding.append(1)
+            inside.append(len(holding))
+            time.sleep(0.05)
+            holding.pop()
+
+    threads = [threading.Thread(target=prepare) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert inside == [1, 1, 1, 1]
+
+
+def test_locks_of_different_tiles_are_independent(terrain_cache):
+    with terrain_cache.lock("35:36:119:120.sdf"):
+        with terrain_cache.lock("35:36:120:121.sdf"):
+            pass
+
+
+def test_lock_wait_is_bounded(tmp_path):
+    terrain_cache = TerrainCache(str(tmp_path / "tiles"), lock_timeout=0.1)
+    with terrain_cache.lock("35:36:119:120.sdf"):
+        started = time.monotonic()
+        with pytest.raises(RuntimeError):
+            with terrain_cache.lock("35:36:119:120.sdf"):
+                pass
+        assert time.monotonic() - started < 1
+
+    # released by its holder
+    with terrain_cache.lock("35:36:119:120.sdf"):
+        pass
+
+
+def test_tiers_are_separate(terrain_cache):
+    terrain_cache.put_raw("N35W120.hgt.gz", b"raw")
+    terrain_cache.put_sdf("35:36:119:120.sdf", b"-119\n" * 1000)
+
+    assert terrain_cache.get_raw("N35W120.hgt.gz") == b"raw"
+    assert terrain_cache.get_sdf("35:36:119:120.sdf") == b"-119\n" * 1000
+    assert terrain_cache.has_sdf("35:36:119:120.sdf") and not terrain_cache.has_sdf("N35W120.hgt.gz")
+    assert terrain_cache.has_raw("N35W120.hgt.gz") and not terrain_cache.has_raw("35:36:119:120.sdf")
+
+    # .sdf files are stored compressed
+    assert len(terrain_cache.sdf.get("35:36:119:120.sdf")) < 100
+
+
+def test_raw_tiles_do_not_evict_sdf_files(tmp_path):
+    terrain_cache = TerrainCache(str(tmp_path / "tiles"), raw_size_gb=1 / 1024, sdf_size_gb=1.0)
+    terrain_cache.put_sdf("35:36:119:120.sdf", b"0\n")
+    for index in range(32):
+        terrain_cache.put_raw(f"tile{index}", bytes(128 * 1024))
+
+    assert terrain_cache.get_sdf("35:36:119:120.sdf") == b"0\n"
+    assert terrain_cache.raw.volume() < 2 * 1024 * 1024
+
+
+def test_memory_tier_keeps_the_most_recently_used_files(tmp_path):
+    terrain_cache = TerrainCache(str(tmp_path / "tiles"), memory_bytes=250)
+    for name in ("a.sdf", "b.sdf"):
+        terrain_cache.put_sdf(name, bytes(100))
+    assert terrain_cache.get_sdf("a.sdf") == bytes(100)
+
+    terrain_cache.put_sdf("c.sdf", bytes(100))
+    assert list(terrain_cache._memory) == ["a.sdf", "c.sdf"]
+    memory = terrain_cache.stats()["memory"]
+    assert (memory["entries"], memory["bytes"], memory["hits"], memory["evictions"]) == (2, 200, 1, 1)
+
+    # evicted from memory only, and read back from disk
+    assert terrain_cache.get_sdf("b.sdf") == bytes(100)
+    assert terrain_cache.stats()["memory"]["misses"] == 1
+
+
+def test_memory_tier_skips_files_larger_than_itself(tmp_path):
+    terrain_cache = TerrainCache(str(tmp_path / "tiles"), memory_bytes=50)
+    terrain_cache.put_sdf("a.sdf", bytes(100))
+    assert not terrain_cache._memory
+    assert terrain_cache.get_sdf("a.sdf") == bytes(100)
@@ -0,0 +1,89 @@
+import gzip
+
+import pytest
+
+from app.services.terrain_source import ChainedTerrainSource, LocalTerrainSource, TerrainSource
+
+
+class FakeTerrainSource(TerrainSource):
+    def __init__(self, name, tiles, authoritative=False, fail=False):
+        self.name = name
+        self.tiles = tiles
+        self.authoritative = authoritative
+        self.fail = fail
+
+    def iter_chunks(self, key):
+        if self.fail:
+            raise RuntimeError(f"{self.name} is down")
+        return iter([self.tiles[key]]) if key in self.tiles else None
+
+
+@pytest.fixture
+def bucket():
+    return FakeTerrainSource("s3", {"a": b"A", "b": b"B"}, authoritative=True)
+
+
+def test_terrain_source_is_abstract():
+    with pytest.raises(TypeError):
+        TerrainSource()
+
+
+def test_local_source(tmp_path):
+    tile = tmp_path / "v2" / "skadi" / "N45" / "N45W076.hgt.gz"
+    tile.parent.mkdir(parents=True)
+    tile.write_bytes(b"tile" * 100)
+
+    source = LocalTerrainSource(str(tmp_path), chunk_size=64)
+    assert source.fetch("v2/skadi/N45/N45W076.hgt.gz") == b"tile" * 100
+    assert len(list(source.iter_chunks("v2/skadi/N45/N45W076.hgt.gz"))) == 7
+    assert source.fetch("v2/skadi/N46/N46W076.hgt.gz") is None
+    assert not source.authoritative
+
+
+def test_chain_prefers_the_first_source(bucket):
+    chain = ChainedTerrainSource([FakeTerrainSource("mirror", {"a": b"mirrored"}), bucket])
+    assert (chain.fetch("a"), chain.fetch("b"), chain.fetch("c")) == (b"mirrored", b"B", None)
+    assert chain.name == "mirror,s3" and chain.authoritative
+
+
+def test_chain_falls_back_when_a_source_fails(bucket):
+    chain = ChainedTerrainSource([FakeTerrainSource("mirror", {}, fail=True), bucket])
+    assert chain.fetch("b") == b"B"
+    # the bucket alone can tell that a tile does not exist
+    assert chain.fetch("c") is None
+
+
+def test_chain_raises_unless_an_authoritative_source_answered():
+    chain = ChainedTerrainSource([FakeTerrainSource("mirror", {}), FakeTerrainSource("s3", {}, True, fail=True)])
+    with pytest.raises(RuntimeError):
+        chain.fetch("c")
+
+    mirrors = ChainedTerrainSource([FakeTerrainSource("m1", {}), FakeTerrainSource("m2", {})])
+    assert not mirrors.authoritative and mirrors.fetch("c") is None
+
+    with pytest.raises(ValueError):
+        ChainedTerrainSource([])
+
+
+def test_missing_tiles_of_an_authoritative_source_are_absent(tmp_path, make_splat):
+    splat_service = make_splat(terrain_source=LocalTerrainSource(str(tmp_path / "mirror"), authoritative=True))
+    assert splat_service._download_terrain_tile("N10W150.hgt.gz") is None
+    assert splat_service.tile_index.get("N10W150.hgt.gz") == "absent"
+
+
+def test_missing_tiles_of_a_partial_mirror_are_errors(tmp_path, make_splat):
+    splat_service = make_splat(terrain_source=LocalTerrainSource(str(tmp_path / "mirror")))
+    with pytest.raises(RuntimeError):
+        splat_service._download_terrain_tile("N10W150.hgt.gz")
+    assert splat_service.tile_index.get("N10W150.hgt.gz") is None
+
+
+def test_downloaded_tiles_are_cached_and_indexed(tmp_path, make_splat):
+    tile = tmp_path / "mirror" / "skadi" / "N45" / "N45W076.hgt.gz"
+    tile.parent.mkdir(parents=True)
+    tile.write_bytes(gzip.compress(b"tile"))
+
+    splat_service = make_splat(terrain_source=LocalTerrainSource(str(tmp_path / "mirror"), authoritative=True))
+    assert splat_service._download_terrain_tile("N45W076.hgt.gz") == gzip.compress(b"tile")
+    assert splat_service.tile_index.get("N45W076.hgt.gz") == "v1"
+    assert splat_service.terrain_cache.has_raw("N45W076.hgt.gz")
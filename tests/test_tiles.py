@@ -0,0 +1,84 @@
+import io
+import math
+
+import numpy as np
+import pytest
+from PIL import Image
+from rasterio.transform import from_origin
+
+from app.services.splat import Splat
+from app.services.tiles import TILE_SIZE, TileRenderer, TileSource, tile_bounds
+
+
+def xyz_tile(lat, lon, z):
+    """XYZ tile containing a point."""
+    n = 2 ** z
+    x = int((lon + 180.0) / 360.0 * n)
+    y = int((1.0 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2.0 * n)
+    return z, x, y
+
+
+@pytest.fixture(scope="module")
+def source():
+    """Prediction of one degree around 45.5N 75W, in bands of palette indexes with a hole without coverage."""
+    indexes = np.repeat(np.arange(0, 250, 10, dtype=np.uint8), 4)[None, :].repeat(100, axis=0)
+    indexes[40:60, 40:60] = 255
+    transform = from_origin(-75.5, 46.0, 0.01, 0.01)
+    return TileSource(Splat._create_palette_geotiff(indexes, transform, "rainbow", -130, -30))
+
+
+def decode(tile):
+    return np.asarray(Image.open(io.BytesIO(tile)).convert("RGBA"))
+
+
+def test_tile_bounds():
+    assert tile_bounds(0, 0, 0) == pytest.approx((-20037508.34, -20037508.34, 20037508.34, 20037508.34))
+    west, south, east, north = tile_bounds(2, 1, 3)
+    assert (west, north) == pytest.approx((-10018754.17, -10018754.17))
+    assert east - west == pytest.approx(north - south)
+
+
+@pytest.mark.parametrize("fmt", ["png", "webp"])
+def test_tiles_keep_the_exact_palette_colors(source, fmt):
+    tile = decode(TileRenderer().render_tile("t1", source, *xyz_tile(45.5, -75.0, 8), fmt))
+    assert tile.shape == (TILE_SIZE, TILE_SIZE, 4)
+
+    colors = {tuple(color) for color in tile.reshape(-1, 4)}
+    palette = {tuple(color) for color in source.rgba}
+    assert colors <= palette
+    assert (0, 0, 0, 0) in colors  # around the prediction and in the hole
+    assert len(colors) > 10
+
+
+def test_tiles_outside_the_prediction_are_transparent(source):
+    renderer = TileRenderer()
+    tile = renderer.render_tile("t1", source, *xyz_tile(-33.9, 151.2, 8))
+    assert not decode(tile).any()
+    assert renderer.cached_tile("t1", *xyz_tile(-33.9, 151.2, 8), "png") is None
+
+
+def test_rendered_tiles_are_cached_within_the_size_limit(source):
+    renderer = TileRenderer()
+    first = xyz_tile(45.5, -75.0, 10)
+    tile = renderer.render_tile("t1", source, *first)
+    assert renderer.cached_tile("t1", *first, "png") == tile
+    assert renderer.cached_tile("t1", *first, "webp") is None
+
+    renderer = TileRenderer(cache_bytes=len(tile))
+    renderer.render_tile("t1", source, *first)
+    second = xyz_tile(45.5, -75.3, 10)
+    renderer.render_tile("t1", source, *second)
+    assert renderer.cached_tile("t1", *first, "png") is None
+    assert renderer.stats()["bytes"] <= len(tile)
+
+
+def test_decoded_sources_are_bounded(source):
+    renderer = TileRenderer(max_sources=2)
+    data = Splat._create_palette_geotiff(source.indexes, source.transform, "rainbow", -130, -30)
+    for task_id in ("t1", "t2", "t3"):
+        renderer.load_source(task_id, data)
+    renderer.source("t2")
+    renderer.load_source("t4", data)
+
+    assert renderer.source("t1") is None and renderer.source("t3") is None
+    assert renderer.source("t2") is not None and renderer.source("t4") is not None
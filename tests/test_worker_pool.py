@@ -0,0 +1,58 @@
+import threading
+
+import pytest
+
+from app.services.worker_pool import QueueFullError, SplatWorkerPool
+
+
+@pytest.fixture
+def pool():
+    pool = SplatWorkerPool(max_workers=1, max_queue=1)
+    yield pool
+    pool.shutdown(wait=True)
+
+
+def blocking_job(started: threading.Event, release: threading.Event):
+    def job():
+        started.set()
+        assert release.wait(5)
+        return "done"
+    return job
+
+
+def test_rejects_invalid_limits():
+    with pytest.raises(ValueError):
+        SplatWorkerPool(max_workers=0)
+    with pytest.raises(ValueError):
+        SplatWorkerPool(max_queue=-1)
+
+
+def test_submit_returns_the_result(pool):
+    assert pool.submit(lambda a, b: a + b, 1, b=2).result(timeout=5) == 3
+    assert pool.stats() == {"max_workers": 1, "max_queue": 1, "running": 0, "queued": 0}
+
+
+def test_queue_full_fails_fast(pool):
+    started, release = threading.Event(), threading.Event()
+    running = pool.submit(blocking_job(started, release))
+    assert started.wait(5)
+    queued = pool.submit(lambda: "queued")
+
+    assert (pool.running, pool.queue_depth, pool.available) == (1, 1, 0)
+    with pytest.raises(QueueFullError):
+        pool.submit(lambda: "rejected")
+
+    release.set()
+    assert running.result(timeout=5) == "done"
+    assert queued.result(timeout=5) == "queued"
+    assert pool.available == 2
+
+
+def test_failed_job_releases_its_slot(pool):
+    def fail():
+        raise RuntimeError("SPLAT! failed")
+
+    for _ in range(3):
+        with pytest.raises(RuntimeError):
+            pool.submit(fail).result(timeout=5)
+    assert pool.available == 2
@@ -0,0 +1,74 @@
+"""
+GeoTIFF codec benchmark
+
+CLI tool comparing the encode time and size of the result GeoTIFF for every output profile ("geotiff" or
+"cog"), compression codec and predictor setting accepted by /predict. The palette indexes are read from
+existing result GeoTIFFs (e.g. downloaded from /result) so the numbers reflect real SPLAT! outputs; without
+any file a synthetic coverage map with concentric rings is used instead.
+
+Args:
+    files (str): Paths of result GeoTIFFs to re-encode.
+    size (int): Width and height of the synthetic coverage map in pixels, when no file is given (e.g., 3600).
+    repeat (int): Number of timed encodes of each combination.
+"""
+
+import argparse
+import itertools
+import os
+import time
+
+import numpy as np
+import rasterio
+from rasterio.transform import from_bounds
+
+from app.services.splat import Splat
+
+
+PROFILES = ["geotiff", "cog"]
+COMPRESSIONS = ["lzw", "deflate", "zstd"]
+
+
+def synthetic_indexes(size, levels=40, null_value=255):
+    yy, xx = np.mgrid[0:size, 0:size]
+    distance = np.hypot(yy - size / 2, xx - size / 2) / (size / 2)
+    indexes = np.clip(distance * levels, 0, levels - 1).astype(np.uint8) * (254 // levels)
+    indexes[distance > 1] = null_value
+    return indexes, from_bounds(-76.0, 44.0, -74.0, 46.0, size, size)
+
+
+def read_indexes(path):
+    with rasterio.open(path) as src:
+        return src.read(1), src.transform
+
+
+def benchmark(name, indexes, transform, repeat):
+    height, width = indexes.shape
+    print(f"{name} ({width}x{height}), {repeat} runs each:")
+    for profile, compression, predictor in itertools.product(PROFILES, COMPRESSIONS, [False, True]):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            geotiff_data = Splat._create_palette_geotiff(
+                indexes, transform, "rainbow", -130.0, -30.0,
+                profile=profile, compression=compression, predictor=predictor,
+            )
+            timings.append(time.perf_counter() - start)
+        label = f"{profile} {compression}{' + predictor' if predictor else ''}"
+        print(
+            f"{label:>28}: {len(geotiff_data) / 1024:10.1f} KB, "
+            f"best {min(timings) * 1000:.1f} ms, median {np.median(timings) * 1000:.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark result GeoTIFF profiles and codecs")
+    parser.add_argument("files", nargs="*", help="Result GeoTIFFs to re-encode")
+    parser.add_argument("--size", type=int, default=3600, help="Size of the synthetic map when no file is given")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of timed encodes of each combination")
+
+    args = parser.parse_args()
+
+    if not args.files:
+        benchmark("synthetic", *synthetic_indexes(args.size), args.repeat)
+    for path in args.files:
+        benchmark(os.path.basename(path), *read_indexes(path), args.repeat)
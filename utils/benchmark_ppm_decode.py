@@ -0,0 +1,110 @@
+"""
+PPM decoding benchmark
+
+CLI tool comparing the decoding of SPLAT! PPM coverage maps into GeoTIFF pixel values: the former grayscale
+conversion (`img.convert("L")`) against the packed-RGB lookup of `Splat._decode_splat_ppm`, on their own
+and including the palette GeoTIFF encoding. A synthetic PPM is painted with the .dcf colors in concentric
+rings, like SPLAT! does, so the decoded levels can also be checked against the levels that were painted.
+
+Args:
+    size (int): Width and height of the synthetic PPM in pixels (e.g., 3600).
+    repeat (int): Number of timed runs of each decoder.
+    colormap (str): Name of the matplotlib colormap (e.g., "viridis").
+"""
+
+import argparse
+import io
+import time
+
+import numpy as np
+import rasterio
+from PIL import Image
+from rasterio.transform import from_bounds
+
+from app.services.splat import SIGNAL_NODATA, Splat
+
+
+def synthetic_ppm(size, colormap, min_dbm=-130.0, max_dbm=-30.0):
+    levels, rgb_colors = Splat._splat_dcf_levels(colormap, min_dbm, max_dbm)
+
+    # signal falling off with distance from the center, painted with the strongest level it reaches
+    yy, xx = np.mgrid[0:size, 0:size]
+    distance = np.hypot(yy - size / 2, xx - size / 2) / (size / 2)
+    signal = max_dbm - (max_dbm - min_dbm) * distance * 1.1
+
+    expected = np.full((size, size), SIGNAL_NODATA, dtype=np.int16)
+    rgb = np.full((size, size, 3), 255, dtype=np.uint8)
+    for level, color in sorted(zip(levels, rgb_colors), key=lambda l: l[0]):
+        mask = signal >= level
+        rgb[mask] = color
+        expected[mask] = level
+
+    with io.BytesIO() as buffer:
+        Image.fromarray(rgb).save(buffer, format="PPM")
+        return buffer.getvalue(), expected
+
+
+def decode_grayscale(ppm_bytes, null_value=255):
+    with Image.open(io.BytesIO(ppm_bytes)) as img:
+        img_array = np.array(img.convert("L"))
+        img_array = np.clip(img_array, 0, 255).astype("uint8")
+    return np.where(img_array == null_value, 255, img_array)
+
+
+def geotiff_grayscale(ppm_bytes, transform, colormap, min_dbm=-130.0, max_dbm=-30.0):
+    img_array = decode_grayscale(ppm_bytes)
+    height, width = img_array.shape
+    with io.BytesIO() as buffer:
+        with rasterio.open(
+            buffer, "w", driver="GTiff", height=height, width=width, count=1, dtype="uint8",
+            crs="EPSG:4326", transform=transform, photometric="palette", compress="lzw", nodata=255,
+        ) as dst:
+            dst.write(img_array, 1)
+            dst.write_colormap(1, Splat._gdal_colormap(colormap, min_dbm, max_dbm))
+        return buffer.getvalue()
+
+
+def geotiff_packed_rgb(ppm_bytes, transform, colormap, min_dbm=-130.0, max_dbm=-30.0):
+    _, indexes = Splat._decode_splat_ppm(ppm_bytes, colormap, min_dbm, max_dbm)
+    return Splat._create_palette_geotiff(indexes, transform, colormap, min_dbm, max_dbm)
+
+
+def benchmark(size, repeat, colormap):
+    ppm_bytes, expected = synthetic_ppm(size, colormap)
+    print(f"Synthetic {size}x{size} PPM ({len(ppm_bytes) / 1024 / 1024:.1f} MB), {repeat} runs each.")
+
+    transform = from_bounds(-76.0, 44.0, -74.0, 46.0, size, size)
+    for name, decoder in [
+        ("grayscale", lambda: decode_grayscale(ppm_bytes)),
+        ("packed RGB", lambda: Splat._decode_splat_ppm(ppm_bytes, colormap, -130.0, -30.0)),
+        ("grayscale + GeoTIFF", lambda: geotiff_grayscale(ppm_bytes, transform, colormap)),
+        ("packed RGB + GeoTIFF", lambda: geotiff_packed_rgb(ppm_bytes, transform, colormap)),
+    ]:
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            decoder()
+            timings.append(time.perf_counter() - start)
+        print(f"{name:>20}: best {min(timings) * 1000:.1f} ms, median {np.median(timings) * 1000:.1f} ms")
+
+    signal, _ = Splat._decode_splat_ppm(ppm_bytes, colormap, -130.0, -30.0)
+    exact = np.array_equal(signal, expected)
+    print(f"Packed RGB decoding matches the painted levels: {exact}")
+
+    gray = decode_grayscale(ppm_bytes)
+    covered = expected != SIGNAL_NODATA
+    print(
+        f"Distinct values for {len(np.unique(expected[covered]))} painted levels: "
+        f"grayscale {len(np.unique(gray[covered]))}, packed RGB {len(np.unique(signal[covered]))}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark SPLAT! PPM decoding")
+    parser.add_argument("--size", type=int, default=3600, help="Width and height of the synthetic PPM in pixels")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of timed runs of each decoder")
+    parser.add_argument("--colormap", type=str, default="rainbow", help="A valid matplotlib colormap name")
+
+    args = parser.parse_args()
+
+    benchmark(args.size, args.repeat, args.colormap)